@@ -0,0 +1,436 @@
+"""
+Sürümlü migration çalıştırıcı
+
+database/migrations altındaki dosyalar sürüm numarası sırasıyla uygulanır ve her
+biri schema_version tablosuna (sürüm, ad, checksum, süre) kaydedilir. Uygulanmış
+migration'lar tekrar çalıştırılmaz; aynı anda iki çalıştırıcı advisory lock ile
+engellenir.
+
+Dosya tipleri:
+    NNN_ad.sql  Tek transaction içinde çalışır. Dosyanın başında
+                '-- migrate:no-transaction' satırı varsa ifadeler autocommit
+                modunda tek tek çalıştırılır (CREATE INDEX CONCURRENTLY için).
+                Bu dosyalar tekrar çalıştırılabilir (IF [NOT] EXISTS) yazılmalıdır.
+    NNN_ad.py   upgrade(ctx) fonksiyonu tanımlar. TRANSACTIONAL = False ise büyük
+                tablolar ctx.batched_update() ile parça parça (her parça ayrı
+                commit) güncellenebilir:
+
+                    TRANSACTIONAL = False
+
+                    def upgrade(ctx):
+                        ctx.batched_update(
+                            "UPDATE student_courses SET is_active = TRUE "
+                            "WHERE id >= %(lo)s AND id < %(hi)s AND is_active IS NULL",
+                            table='student_courses'
+                        )
+
+                Ön koşulu (ör. bir eklenti) henüz sağlanmayan migration
+                ctx.defer(neden) çağırır: geri alınır, schema_version'a
+                yazılmaz ve sonraki çalıştırmada tekrar denenir. Sonraki
+                migration'lar uygulanmaya devam eder.
+
+Kullanım:
+    python database/core/migrate.py                # bekleyen migration'ları uygula
+    python database/core/migrate.py --status       # uygulanmış/bekleyen listesi
+    python database/core/migrate.py --target 003   # 003 dahil olmak üzere uygula
+    python database/core/migrate.py --dry-run      # yalnızca ne yapılacağını göster
+"""
+import os
+import re
+import sys
+import time
+import hashlib
+import argparse
+import importlib.util
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import psycopg2
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DB_CONFIG = {
+    "host": os.getenv("DB_HOST", "localhost"),
+    "user": os.getenv("DB_USER", "postgres"),
+    "password": os.getenv("DB_PASSWORD", "postgres"),
+    "port": os.getenv("DB_PORT", "5432"),
+}
+
+TARGET_DB_NAME = os.getenv("DB_NAME", "universite_sinav_db")
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'migrations')
+
+# pg_advisory_lock anahtarı (aynı anda tek çalıştırıcı)
+MIGRATION_LOCK_ID = 731_034
+
+NO_TRANSACTION_DIRECTIVE = '-- migrate:no-transaction'
+
+_FILENAME_PATTERN = re.compile(r'^(\d+)_([\w\-]+)\.(sql|py)$')
+
+SCHEMA_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version VARCHAR(20) PRIMARY KEY,
+        name VARCHAR(200) NOT NULL,
+        checksum CHAR(32) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        execution_ms INTEGER
+    )
+"""
+
+
+class MigrationDeferred(Exception):
+    """Migration'ın ön koşulu sağlanmadı; bekleyen olarak kalır."""
+
+
+@dataclass
+class Migration:
+    version: str
+    name: str
+    path: str
+    kind: str
+    checksum: str
+    transactional: bool
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.path)
+
+
+class MigrationContext:
+    """Python migration'larına verilen çalıştırma ortamı."""
+
+    def __init__(self, conn, transactional: bool, out: Callable[[str], None] = print):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.transactional = transactional
+        self.out = out
+
+    def execute(self, query: str, params=None) -> int:
+        self.cursor.execute(query, params)
+        return self.cursor.rowcount
+
+    def defer(self, reason: str) -> None:
+        """Migration'ı uygulanmış saymadan bırakır (sonraki çalıştırmada tekrar denenir)."""
+        raise MigrationDeferred(reason)
+
+    def batched_update(self, query: str, table: str, key: str = 'id', batch_size: int = 10000) -> int:
+        """
+        Anahtar aralıklarına bölünmüş set-based güncelleme. Sorgu %(lo)s ve %(hi)s
+        parametreleriyle [lo, hi) aralığını sınırlamalıdır. Transaction dışı
+        migration'larda her parça ayrı commit edilir; böylece satır kilitleri kısa sürer.
+
+        Returns:
+            int: Toplam etkilenen satır sayısı
+        """
+        self.cursor.execute(f"SELECT MIN({key}), MAX({key}) FROM {table}")
+        low, high = self.cursor.fetchone()
+        if low is None:
+            return 0
+
+        total = 0
+        for start in range(low, high + 1, batch_size):
+            self.cursor.execute(query, {'lo': start, 'hi': start + batch_size})
+            total += max(self.cursor.rowcount, 0)
+            if not self.transactional:
+                self.conn.commit()
+        self.out(f"      {table}: {total} satır güncellendi")
+        return total
+
+
+def split_sql_statements(text: str) -> List[str]:
+    """
+    SQL metnini ifadelere böler. Tırnaklı metin, $tag$ blokları ve yorumlar
+    içindeki noktalı virgüller ayırıcı sayılmaz. Yalnızca yorumdan oluşan
+    parçalar atlanır.
+    """
+    statements = []
+    current = []
+    has_code = False
+    i = 0
+    length = len(text)
+
+    while i < length:
+        char = text[i]
+
+        if text.startswith('--', i):
+            end = text.find('\n', i)
+            end = length if end == -1 else end + 1
+            current.append(text[i:end])
+            i = end
+            continue
+
+        if text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            end = length if end == -1 else end + 2
+            current.append(text[i:end])
+            i = end
+            continue
+
+        if char in ("'", '"'):
+            end = i + 1
+            while end < length:
+                if text[end] == char:
+                    if end + 1 < length and text[end + 1] == char:
+                        end += 2
+                        continue
+                    break
+                end += 1
+            current.append(text[i:end + 1])
+            has_code = True
+            i = end + 1
+            continue
+
+        if char == '$':
+            match = re.match(r'\$[A-Za-z_]*\$', text[i:])
+            if match:
+                tag = match.group(0)
+                end = text.find(tag, i + len(tag))
+                end = length if end == -1 else end + len(tag)
+                current.append(text[i:end])
+                has_code = True
+                i = end
+                continue
+
+        if char == ';':
+            if has_code:
+                statements.append(''.join(current).strip())
+            current = []
+            has_code = False
+            i += 1
+            continue
+
+        if not char.isspace():
+            has_code = True
+        current.append(char)
+        i += 1
+
+    if has_code:
+        statements.append(''.join(current).strip())
+    return statements
+
+
+def _checksum(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def _is_transactional(path: str, kind: str) -> bool:
+    if kind == 'sql':
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                stripped = line.strip()
+                if not stripped:
+                    continue
+                if not stripped.startswith('--'):
+                    break
+                if stripped.lower().replace(' ', '') == NO_TRANSACTION_DIRECTIVE.replace(' ', ''):
+                    return False
+        return True
+    module = _load_module(path)
+    return getattr(module, 'TRANSACTIONAL', True)
+
+
+def _load_module(path: str):
+    spec = importlib.util.spec_from_file_location(
+        f"migration_{os.path.splitext(os.path.basename(path))[0]}", path
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def discover_migrations(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+    """Migration dosyalarını sürüm sırasıyla döndürür."""
+    if not os.path.isdir(directory):
+        return []
+
+    migrations: Dict[str, Migration] = {}
+    for filename in os.listdir(directory):
+        match = _FILENAME_PATTERN.match(filename)
+        if not match:
+            continue
+        version, name, kind = match.groups()
+        if version in migrations:
+            raise ValueError(
+                f"Aynı sürüm numarasına sahip iki migration var: "
+                f"{migrations[version].filename}, {filename}"
+            )
+        path = os.path.join(directory, filename)
+        migrations[version] = Migration(
+            version=version,
+            name=name,
+            path=path,
+            kind=kind,
+            checksum=_checksum(path),
+            transactional=_is_transactional(path, kind)
+        )
+    return [migrations[v] for v in sorted(migrations, key=int)]
+
+
+def get_applied_versions(conn) -> Dict[str, Dict]:
+    """schema_version tablosundaki kayıtları döndürür."""
+    cur = conn.cursor()
+    cur.execute(SCHEMA_VERSION_TABLE)
+    cur.execute("SELECT version, name, checksum, applied_at, execution_ms FROM schema_version")
+    applied = {
+        row[0]: {'name': row[1], 'checksum': row[2], 'applied_at': row[3], 'execution_ms': row[4]}
+        for row in cur.fetchall()
+    }
+    conn.commit()
+    cur.close()
+    return applied
+
+
+def _invalid_indexes(conn) -> List[str]:
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT c.relname FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE NOT i.indisvalid
+    """)
+    names = [row[0] for row in cur.fetchall()]
+    cur.close()
+    return names
+
+
+def _apply(conn, migration: Migration, out: Callable[[str], None]) -> None:
+    if migration.transactional:
+        cur = conn.cursor()
+        if migration.kind == 'sql':
+            with open(migration.path, encoding='utf-8') as f:
+                cur.execute(f.read())
+        else:
+            _load_module(migration.path).upgrade(MigrationContext(conn, True, out))
+        cur.close()
+        return
+
+    # Transaction dışı: her ifade kendi başına commit edilir
+    conn.autocommit = True
+    try:
+        if migration.kind == 'sql':
+            with open(migration.path, encoding='utf-8') as f:
+                statements = split_sql_statements(f.read())
+            cur = conn.cursor()
+            for statement in statements:
+                cur.execute(statement)
+            cur.close()
+        else:
+            _load_module(migration.path).upgrade(MigrationContext(conn, False, out))
+    finally:
+        conn.autocommit = False
+
+
+def run_migrations(
+    conn,
+    target: Optional[str] = None,
+    dry_run: bool = False,
+    out: Callable[[str], None] = print,
+    directory: str = MIGRATIONS_DIR
+) -> List[str]:
+    """
+    Bekleyen migration'ları uygular.
+
+    Args:
+        conn: psycopg2 bağlantısı (açık transaction olmamalı)
+        target: Bu sürüm dahil olmak üzere uygula (None: tümü)
+        dry_run: Hiçbir şey çalıştırmadan bekleyenleri listele
+        out: Çıktı fonksiyonu
+        directory: Migration klasörü
+
+    Returns:
+        List[str]: Uygulanan (dry_run'da uygulanacak) migration dosya adları
+    """
+    migrations = discover_migrations(directory)
+    if target is not None:
+        migrations = [m for m in migrations if int(m.version) <= int(target)]
+
+    cur = conn.cursor()
+    cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+    conn.commit()
+    try:
+        applied = get_applied_versions(conn)
+        done = []
+        for migration in migrations:
+            record = applied.get(migration.version)
+            if record is not None:
+                if record['checksum'].strip() != migration.checksum:
+                    out(f"   ⚠️ {migration.filename} uygulandıktan sonra değiştirilmiş (tekrar çalıştırılmadı)")
+                continue
+
+            mode = '' if migration.transactional else ' [transaction dışı]'
+            if dry_run:
+                out(f"   ↳ {migration.filename}{mode} (uygulanacak)")
+                done.append(migration.filename)
+                continue
+
+            started = time.perf_counter()
+            try:
+                _apply(conn, migration, out)
+                elapsed_ms = int((time.perf_counter() - started) * 1000)
+                cur.execute(
+                    "INSERT INTO schema_version (version, name, checksum, execution_ms) VALUES (%s, %s, %s, %s)",
+                    (migration.version, migration.name, migration.checksum, elapsed_ms)
+                )
+                conn.commit()
+            except MigrationDeferred as e:
+                conn.rollback()
+                out(f"   ⏸️ {migration.filename} ertelendi: {e}")
+                continue
+            except Exception as e:
+                conn.rollback()
+                out(f"   ❌ {migration.filename} başarısız: {e}")
+                if not migration.transactional:
+                    invalid = _invalid_indexes(conn)
+                    if invalid:
+                        out(f"      Geçersiz kalan indeksler (DROP INDEX CONCURRENTLY ile silip tekrar çalıştırın): "
+                            f"{', '.join(invalid)}")
+                raise
+            out(f"   ↳ {migration.filename}{mode} ({elapsed_ms} ms)")
+            done.append(migration.filename)
+        return done
+    finally:
+        cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+        conn.commit()
+        cur.close()
+
+
+def print_status(conn, out: Callable[[str], None] = print) -> None:
+    applied = get_applied_versions(conn)
+    for migration in discover_migrations():
+        record = applied.get(migration.version)
+        if record is None:
+            state = 'bekliyor'
+        elif record['checksum'].strip() != migration.checksum:
+            state = f"uygulandı {record['applied_at']:%Y-%m-%d %H:%M} (dosya değişmiş)"
+        else:
+            state = f"uygulandı {record['applied_at']:%Y-%m-%d %H:%M}"
+        out(f"   {migration.filename:<40} {state}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Veritabanı migration'larını uygular")
+    parser.add_argument('--status', action='store_true', help="Uygulanmış ve bekleyen migration'ları listele")
+    parser.add_argument('--target', help="Bu sürüm dahil olmak üzere uygula (ör. 003)")
+    parser.add_argument('--dry-run', action='store_true', help="Çalıştırmadan bekleyenleri göster")
+    options = parser.parse_args()
+
+    conn = psycopg2.connect(**DB_CONFIG, database=TARGET_DB_NAME)
+    try:
+        if options.status:
+            print_status(conn)
+            return 0
+        print("🧩 Migration'lar uygulanıyor...")
+        applied = run_migrations(conn, target=options.target, dry_run=options.dry_run)
+        if not applied:
+            print("✅ Veritabanı güncel")
+        return 0
+    except Exception as e:
+        print(f"❌ Migration'lar tamamlanamadı: {e}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,8 +2,13 @@ import psycopg2
 from psycopg2 import sql
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 import os
+import sys
 from dotenv import load_dotenv
 
+# migrate.py bu dosyanın yanında; script olarak veya proje kökünden modül olarak içe aktarılsa da bulunur
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from migrate import run_migrations
+
 # .env dosyasını yükle
 load_dotenv()
 
@@ -42,6 +47,14 @@ def create_database_if_not_exists():
         if conn is not None:
             conn.close()
 
+def apply_migrations(conn):
+    """
+    database/migrations altındaki bekleyen migration'ları uygular (bkz. migrate.py).
+    Uygulananlar schema_version tablosuna kaydedilir; açık transaction olmamalıdır.
+    """
+    return run_migrations(conn)
+
+
 def create_updated_at_trigger(cur):
     # Trigger fonksiyonunu oluştur
     cur.execute("""
@@ -239,7 +252,6 @@ def create_tables():
             "CREATE INDEX IF NOT EXISTS idx_courses_department_id ON courses(department_id)",
             "CREATE INDEX IF NOT EXISTS idx_courses_lecturer_id ON courses(lecturer_id)",
             "CREATE INDEX IF NOT EXISTS idx_courses_department_lecturer ON courses(department_id, lecturer_id)",
-            "CREATE INDEX IF NOT EXISTS idx_exam_schedule_date ON exam_schedule(exam_date)",
             "CREATE INDEX IF NOT EXISTS idx_exam_schedule_course_id ON exam_schedule(course_id)",
             "CREATE INDEX IF NOT EXISTS idx_exam_schedule_classroom_id ON exam_schedule(classroom_id)",
             "CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)",
@@ -248,7 +260,6 @@ def create_tables():
             "CREATE INDEX IF NOT EXISTS idx_students_department_id ON students(department_id)",
             "CREATE INDEX IF NOT EXISTS idx_students_year ON students(year)",
             "CREATE INDEX IF NOT EXISTS idx_students_active ON students(is_active)",
-            "CREATE INDEX IF NOT EXISTS idx_student_courses_student_id ON student_courses(student_id)",
             "CREATE INDEX IF NOT EXISTS idx_student_courses_course_id ON student_courses(course_id)",
             "CREATE INDEX IF NOT EXISTS idx_student_courses_active ON student_courses(is_active)"
         ]
@@ -258,6 +269,10 @@ def create_tables():
         
         cur.close()
         conn.commit()
+        
+        # Migration'lar kendi transaction'larını yönetir (CONCURRENTLY indeksler dahil)
+        print("🧩 Migration dosyaları uygulanıyor...")
+        apply_migrations(conn)
         print("✅ Tüm tablolar, trigger'lar ve indeksler başarıyla oluşturuldu/kontrol edildi!")
         
     except (Exception, psycopg2.DatabaseError) as error:
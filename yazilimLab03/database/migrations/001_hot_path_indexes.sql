@@ -0,0 +1,70 @@
+-- migrate:no-transaction
+-- 001: Sıcak sorgu şekillerine göre composite, partial ve covering indeksler
+--
+-- İndeksler CONCURRENTLY oluşturulur; büyük student_courses / exam_schedule
+-- tablolarında yazmalar kilitlenmez. Bu yüzden dosya transaction dışında çalışır.
+--
+-- Kaynak sorgular:
+--   ExamScheduleRepository.check_conflict / get_by_classroom_and_date
+--       WHERE classroom_id = ? AND exam_date = ? AND status != 'cancelled'
+--   ExamScheduleRepository.get_by_date / get_by_date_range
+--       WHERE exam_date [= ? | BETWEEN ? AND ?] ORDER BY exam_date, start_time
+--   ExamScheduleRepository.get_page
+--       WHERE (exam_date, start_time, id) > (?, ?, ?) ORDER BY exam_date, start_time, id
+--   ExamScheduleRepository.get_by_lecturer_and_date / check_lecturer_conflict / get_by_student_id
+--       courses.lecturer_id (veya student_courses) -> exam_schedule.course_id + exam_date
+--   ExamScheduleRepository.check_course_exam_exists
+--       WHERE course_id = ? AND exam_type = ? AND status != 'cancelled'
+--   ExamScheduleRepository.check_student_conflict
+--       WHERE c.department_id = ? AND c.year = ? AND es.exam_date = ?
+--   StudentCourseRepository.get_student_ids_by_course(s) / check_student_overlap
+--       WHERE course_id = ? AND is_active (yalnızca student_id okunur)
+--   StudentCourseRepository.get_by_student_id / çakışma self-join'leri
+--       WHERE student_id = ? AND is_active
+--
+-- Partial indeks yüklemleri sorgulardaki ifadelerle birebir aynıdır
+-- (status != 'cancelled', is_active = TRUE); aksi halde planlayıcı kullanamaz.
+
+-- Sınıf + tarih çakışma kontrolü: index-only scan için end_time ve id dahil
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_exam_schedule_active_classroom_date
+    ON exam_schedule (classroom_id, exam_date, start_time)
+    INCLUDE (end_time, id)
+    WHERE status != 'cancelled';
+
+-- Tarih bazlı listeler ve keyset sayfalama sıralamayı indeksten alır
+-- (exam_date tek sütun indeksinin yerine; id sayfa sınırının eşitlik bozucusudur)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_exam_schedule_date_start_id
+    ON exam_schedule (exam_date, start_time, id);
+DROP INDEX CONCURRENTLY IF EXISTS idx_exam_schedule_date;
+
+-- Ders -> sınav erişimi (hoca ve öğrenci programları)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_exam_schedule_active_course_date
+    ON exam_schedule (course_id, exam_date)
+    INCLUDE (start_time, end_time)
+    WHERE status != 'cancelled';
+
+-- Aynı ders için aynı tipte sınav var mı?
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_exam_schedule_active_course_type
+    ON exam_schedule (course_id, exam_type)
+    WHERE status != 'cancelled';
+
+-- Bölüm + sınıf yılı çakışma kontrolü
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_courses_department_year
+    ON courses (department_id, year);
+
+-- Dersi alan aktif öğrenciler: (course_id, student_id) ile index-only scan
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_student_courses_active_course
+    ON student_courses (course_id, student_id)
+    WHERE is_active = TRUE;
+
+-- Öğrencinin aktif dersleri
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_student_courses_active_student
+    ON student_courses (student_id, course_id)
+    WHERE is_active = TRUE;
+
+-- UNIQUE (student_id, course_id) kısıtının indeksi student_id önekini zaten karşılar
+DROP INDEX CONCURRENTLY IF EXISTS idx_student_courses_student_id;
+
+ANALYZE exam_schedule;
+ANALYZE student_courses;
+ANALYZE courses;
@@ -0,0 +1,31 @@
+-- 002: Derslik çift rezervasyonunu veritabanı seviyesinde engelleyen exclusion constraint
+--
+-- period: sınavın [başlangıç, bitiş) zaman aralığı. exam_date + start_time/end_time
+-- sütunlarından türetilir (GENERATED), uygulama tarafından yazılmaz.
+--
+-- Aynı derslikte iptal edilmemiş iki sınavın aralıkları çakışamaz. Derslik eşitliği
+-- için btree_gist eklentisi yerine int4range(classroom_id, classroom_id, '[]') kullanılır;
+-- böylece yalnızca çekirdek GiST range_ops ile çalışır.
+--
+-- Mevcut veride çakışan kayıt varsa constraint eklenemez; önce bu kayıtlar
+-- düzeltilmeli veya 'cancelled' durumuna alınmalıdır.
+
+ALTER TABLE exam_schedule
+    ADD COLUMN IF NOT EXISTS period tsrange
+    GENERATED ALWAYS AS (tsrange(exam_date + start_time, exam_date + end_time, '[)')) STORED;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'exam_schedule_no_classroom_overlap'
+    ) THEN
+        ALTER TABLE exam_schedule
+            ADD CONSTRAINT exam_schedule_no_classroom_overlap
+            EXCLUDE USING gist (
+                int4range(classroom_id, classroom_id, '[]') WITH =,
+                period WITH &&
+            )
+            WHERE (status != 'cancelled');
+    END IF;
+END
+$$;
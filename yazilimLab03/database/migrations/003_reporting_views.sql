@@ -0,0 +1,54 @@
+-- 003: Dashboard ve istatistik ekranları için materialized view'lar
+--
+-- Raporlama sorguları tüm sınav satırlarını Python'a çekip saymak yerine bu
+-- önceden toplanmış view'lardan okur. View'lar ReportingRepository.refresh()
+-- ile (otomatik planlama sonrası ve veri değiştiğinde ilk okumada) yenilenir.
+--
+-- Her view'da REFRESH MATERIALIZED VIEW CONCURRENTLY için gereken unique index
+-- vardır; bu yüzden gruplama anahtarlarındaki NULL değerler 0'a çevrilir.
+
+-- Tarih / derslik / bölüm / durum kırılımında sınav sayıları
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_exam_schedule_stats AS
+SELECT es.exam_date,
+       COALESCE(es.classroom_id, 0) AS classroom_id,
+       cl.name AS classroom_name,
+       COALESCE(c.department_id, 0) AS department_id,
+       d.name AS department_name,
+       es.status,
+       COUNT(*) AS exam_count
+FROM exam_schedule es
+LEFT JOIN classrooms cl ON es.classroom_id = cl.id
+LEFT JOIN courses c ON es.course_id = c.id
+LEFT JOIN departments d ON c.department_id = d.id
+GROUP BY es.exam_date, COALESCE(es.classroom_id, 0), cl.name,
+         COALESCE(c.department_id, 0), d.name, es.status;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_exam_schedule_stats_key
+    ON mv_exam_schedule_stats (exam_date, classroom_id, department_id, status);
+
+-- Fakülte başına bölüm sayısı
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_faculty_department_counts AS
+SELECT f.id AS faculty_id,
+       f.name AS faculty_name,
+       f.code,
+       COUNT(d.id) AS department_count
+FROM faculties f
+LEFT JOIN departments d ON d.faculty_id = f.id
+GROUP BY f.id, f.name, f.code;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_faculty_department_counts_key
+    ON mv_faculty_department_counts (faculty_id);
+
+-- Dashboard toplamları (tek satır)
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_dashboard_counts AS
+SELECT 1 AS id,
+       (SELECT COUNT(*) FROM faculties) AS total_faculties,
+       (SELECT COUNT(*) FROM departments) AS total_departments,
+       (SELECT COUNT(*) FROM classrooms) AS total_classrooms,
+       (SELECT COUNT(*) FROM lecturers) AS total_lecturers,
+       (SELECT COUNT(*) FROM courses) AS total_courses,
+       (SELECT COUNT(*) FROM exam_schedule) AS total_exams,
+       (SELECT COUNT(*) FROM exam_schedule WHERE status = 'planned') AS pending_exams;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_dashboard_counts_key
+    ON mv_dashboard_counts (id);
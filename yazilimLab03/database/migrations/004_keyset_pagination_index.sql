@@ -0,0 +1,12 @@
+-- migrate:no-transaction
+-- 004: Sınav listesi keyset sayfalama indeksi
+--
+-- ExamScheduleRepository.get_page sınavları (exam_date, start_time, id) sırasıyla
+-- ve WHERE (exam_date, start_time, id) > (?, ?, ?) sınırıyla okur. id'nin de
+-- indekste olması her sayfanın sıralama yapmadan indeks üzerinden başlamasını
+-- sağlar. Aynı öneke sahip idx_exam_schedule_date_start artık gereksizdir.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_exam_schedule_date_start_id
+    ON exam_schedule (exam_date, start_time, id);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_exam_schedule_date_start;
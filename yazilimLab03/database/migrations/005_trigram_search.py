@@ -0,0 +1,40 @@
+"""
+005: Global arama için pg_trgm GIN indeksleri
+
+SearchRepository ve liste ekranlarının get_page() aramaları ILIKE '%terim%'
+ve pg_trgm benzerlik (%) operatörüyle çalışır; gin_trgm_ops indeksleri her
+ikisini de karşılar. İndeks ifadeleri sorgulardaki ifadelerle birebir aynıdır
+(ör. first_name || ' ' || last_name), aksi halde planlayıcı kullanamaz.
+
+pg_trgm sunucuda kurulu değilse migration ertelenir (ctx.defer): uygulanmış
+sayılmaz, sonraki migration'lar çalışmaya devam eder ve arama indekssiz ILIKE
+ile çalışır. Eklenti sonradan kurulduğunda bir sonraki migrate.py
+çalıştırmasında indeksler oluşturulur.
+"""
+
+# CREATE INDEX CONCURRENTLY transaction içinde çalışamaz
+TRANSACTIONAL = False
+
+# (indeks adı, tablo, indekslenen ifade)
+TRIGRAM_INDEXES = [
+    ('idx_courses_code_trgm', 'courses', 'code'),
+    ('idx_courses_name_trgm', 'courses', 'name'),
+    ('idx_lecturers_full_name_trgm', 'lecturers', "(first_name || ' ' || last_name)"),
+    ('idx_classrooms_name_trgm', 'classrooms', 'name'),
+    ('idx_students_full_name_trgm', 'students', "(first_name || ' ' || last_name)"),
+    ('idx_students_number_trgm', 'students', 'student_number'),
+]
+
+
+def upgrade(ctx):
+    ctx.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    if ctx.cursor.fetchone() is None:
+        ctx.defer("pg_trgm kurulu değil; trigram indeksleri eklenti kurulunca oluşturulacak (arama ILIKE ile çalışır)")
+
+    ctx.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, expression in TRIGRAM_INDEXES:
+        ctx.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+            f"ON {table} USING gin ({expression} gin_trgm_ops)"
+        )
+        ctx.out(f"      {name}")
@@ -0,0 +1,17 @@
+-- 006: Sınıf listesi içe aktarma manifestosu
+--
+-- Klasör içe aktarması her dosya için boyut, değişiklik zamanı (ns) ve içerik
+-- özetini (SHA-256) burada tutar. Boyutu ve zamanı değişmeyen dosyalar hiç
+-- açılmadan atlanır; yalnızca zamanı değişen dosyaların özeti karşılaştırılır.
+-- course_id ve enrollment_count dosyanın son içe aktarma sonucudur.
+
+CREATE TABLE IF NOT EXISTS import_manifest (
+    id SERIAL PRIMARY KEY,
+    file_path TEXT NOT NULL UNIQUE,
+    file_size BIGINT NOT NULL,
+    file_mtime_ns BIGINT NOT NULL,
+    content_hash CHAR(64) NOT NULL,
+    course_id INTEGER REFERENCES courses(id) ON DELETE SET NULL,
+    enrollment_count INTEGER NOT NULL DEFAULT 0,
+    imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,25 @@
+-- 007: Dersliği olmayan sınavları exam_schedule_no_classroom_overlap kısıtından çıkarır
+--
+-- classroom_id NULL iken int4range(NULL, NULL, '[]') sınırsız aralıktır ve diğer
+-- sınırsız aralıklarla çakışır; bu yüzden dersliği atanmamış iki sınav aynı saatte
+-- yazılamıyordu. 002 yeni kurulumlar için düzeltildi. 002'yi eski haliyle uygulamış
+-- veritabanlarında kısıt burada yeni koşulla yeniden oluşturulur.
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'exam_schedule_no_classroom_overlap'
+          AND pg_get_constraintdef(oid) NOT LIKE '%classroom_id IS NOT NULL%'
+    ) THEN
+        ALTER TABLE exam_schedule DROP CONSTRAINT exam_schedule_no_classroom_overlap;
+        ALTER TABLE exam_schedule
+            ADD CONSTRAINT exam_schedule_no_classroom_overlap
+            EXCLUDE USING gist (
+                int4range(classroom_id, classroom_id, '[]') WITH =,
+                period WITH &&
+            )
+            WHERE (status != 'cancelled' AND classroom_id IS NOT NULL);
+    END IF;
+END
+$$;
@@ -0,0 +1,47 @@
+-- 008: Raporlama view'ları için veritabanında tutulan bayatlık işaretleri
+--
+-- reporting_table_versions: view'ları besleyen her tablonun değişiklik sayacı.
+-- Tabloya yapılan her INSERT/UPDATE/DELETE/TRUNCATE ifadesinden sonra (satır
+-- başına değil, ifade başına) tetikleyiciyle bir artırılır. Böylece başka bir
+-- süreçten, içe aktarma scriptlerinden veya elle yapılan yazmalar da görülür.
+--
+-- reporting_view_state: her view'ın son yenilendiği andaki kaynak tablo
+-- sayaçlarının toplamı. Sayaçlar yalnızca artar; toplam değiştiyse view bayattır
+-- (bkz. ReportingRepository.refresh_if_stale).
+
+CREATE TABLE IF NOT EXISTS reporting_table_versions (
+    table_name VARCHAR(63) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS reporting_view_state (
+    view_name VARCHAR(63) PRIMARY KEY,
+    source_version BIGINT NOT NULL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE OR REPLACE FUNCTION bump_reporting_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO reporting_table_versions (table_name, version)
+    VALUES (TG_TABLE_NAME, 1)
+    ON CONFLICT (table_name) DO UPDATE SET version = reporting_table_versions.version + 1;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    source_table TEXT;
+BEGIN
+    FOREACH source_table IN ARRAY ARRAY['faculties', 'departments', 'classrooms', 'lecturers', 'courses', 'exam_schedule']
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || source_table || '_reporting_version', source_table);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_reporting_table_version()',
+            'trg_' || source_table || '_reporting_version', source_table
+        );
+        INSERT INTO reporting_table_versions (table_name) VALUES (source_table) ON CONFLICT DO NOTHING;
+    END LOOP;
+END
+$$;
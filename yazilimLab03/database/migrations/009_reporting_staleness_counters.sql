@@ -0,0 +1,28 @@
+-- 009: Raporlama bayatlığı kilitsiz sayaçlarla izlenir
+--
+-- 008'deki ifade tetikleyicileri her yazmada reporting_table_versions'taki tablo
+-- satırını güncelliyordu; satır commit'e kadar kilitli kaldığı için aynı tabloya
+-- yazan tüm transaction'lar birbirini bekliyordu (ör. uzun bir içe aktarmanın
+-- courses güncellemesi yönetici düzenlemelerini ve planlayıcıyı durduruyordu).
+--
+-- Artık sayaç pg_stat_user_tables'taki n_tup_ins + n_tup_upd + n_tup_del
+-- toplamıdır: kilit almaz, tüm süreçlerin yazmalarını görür ve transaction
+-- bittikten sonra raporlanır (commit edilmemiş yazma view'ı taze göstermez).
+-- Tetikleyiciler ve sayaç tablosu kaldırılır. reporting_view_state eski sayaç
+-- değerlerini tuttuğu için boşaltılır; view'lar bir kez yeniden yenilenir.
+
+DO $$
+DECLARE
+    source_table TEXT;
+BEGIN
+    FOREACH source_table IN ARRAY ARRAY['faculties', 'departments', 'classrooms', 'lecturers', 'courses', 'exam_schedule']
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || source_table || '_reporting_version', source_table);
+    END LOOP;
+END
+$$;
+
+DROP FUNCTION IF EXISTS bump_reporting_table_version();
+DROP TABLE IF EXISTS reporting_table_versions;
+
+DELETE FROM reporting_view_state;
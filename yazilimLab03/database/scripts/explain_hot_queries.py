@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Sıcak sorguların indeks kullanımını EXPLAIN ile doğrulayan script
+
+ExamScheduleRepository ve StudentCourseRepository'deki sık çalışan sorgular
+repository metotlarından yakalanır (SQL kopyalanmaz), örnek parametrelerle
+EXPLAIN (FORMAT JSON) çalıştırılır ve hedef tabloya index scan ile erişilip
+erişilmediği kontrol edilir.
+
+Kullanım:
+    python database/scripts/explain_hot_queries.py
+    python database/scripts/explain_hot_queries.py --no-seqscan   # küçük/geliştirme veritabanı
+    python database/scripts/explain_hot_queries.py --verbose      # tam planı yazdır
+
+--no-seqscan, az satırlı tablolarda planlayıcının haklı olarak seçtiği seq scan'i
+kapatır; böylece indeksin sorgu için *kullanılabilir* olduğu doğrulanır.
+"""
+import os
+import sys
+import json
+import argparse
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.config.database import get_connection, release_connection
+from src.repositories.exam_schedule_repository import ExamScheduleRepository
+from src.repositories.student_repository import StudentCourseRepository
+from src.repositories.classroom_repository import ClassroomRepository
+from src.repositories.course_repository import CourseRepository
+
+INDEX_NODE_TYPES = ('Index Scan', 'Index Only Scan', 'Bitmap Heap Scan')
+
+SAMPLE_DATE = date(2025, 1, 20)
+
+# (açıklama, repository, metot adı, argümanlar, hedef tablo)
+HOT_QUERIES = [
+    ("ExamSchedule.check_conflict", ExamScheduleRepository, 'check_conflict',
+     (1, SAMPLE_DATE, '09:00', '10:30'), 'exam_schedule'),
+    ("ExamSchedule.get_by_classroom_and_date", ExamScheduleRepository, 'get_by_classroom_and_date',
+     (1, SAMPLE_DATE), 'exam_schedule'),
+    ("ExamSchedule.get_by_date", ExamScheduleRepository, 'get_by_date',
+     (SAMPLE_DATE,), 'exam_schedule'),
+    ("ExamSchedule.get_by_date_range", ExamScheduleRepository, 'get_by_date_range',
+     (SAMPLE_DATE, SAMPLE_DATE), 'exam_schedule'),
+    ("ExamSchedule.get_by_lecturer_and_date", ExamScheduleRepository, 'get_by_lecturer_and_date',
+     (1, SAMPLE_DATE), 'exam_schedule'),
+    ("ExamSchedule.check_lecturer_conflict", ExamScheduleRepository, 'check_lecturer_conflict',
+     (1, SAMPLE_DATE, '09:00', '10:30'), 'exam_schedule'),
+    ("ExamSchedule.check_student_conflict", ExamScheduleRepository, 'check_student_conflict',
+     (1, 1, SAMPLE_DATE, '09:00', '10:30'), 'exam_schedule'),
+    ("ExamSchedule.check_course_exam_exists", ExamScheduleRepository, 'check_course_exam_exists',
+     (1, 'final'), 'exam_schedule'),
+    ("ExamSchedule.get_by_course_id", ExamScheduleRepository, 'get_by_course_id',
+     (1,), 'exam_schedule'),
+    ("ExamSchedule.get_by_student_id", ExamScheduleRepository, 'get_by_student_id',
+     (1,), 'student_courses'),
+    ("StudentCourse.get_student_ids_by_course", StudentCourseRepository, 'get_student_ids_by_course',
+     (1,), 'student_courses'),
+    ("StudentCourse.get_student_ids_by_courses", StudentCourseRepository, 'get_student_ids_by_courses',
+     ([1, 2, 3],), 'student_courses'),
+    ("StudentCourse.get_by_course_id", StudentCourseRepository, 'get_by_course_id',
+     (1,), 'student_courses'),
+    ("StudentCourse.get_by_student_id", StudentCourseRepository, 'get_by_student_id',
+     (1,), 'student_courses'),
+    ("StudentCourse.check_student_overlap", StudentCourseRepository, 'check_student_overlap',
+     (1, 2), 'student_courses'),
+    ("Classroom.get_available_for_exam", ClassroomRepository, 'get_available_for_exam',
+     (SAMPLE_DATE, '09:00', '10:30'), 'exam_schedule'),
+    ("Classroom.get_availability_matrix", ClassroomRepository, 'get_availability_matrix',
+     (SAMPLE_DATE, [('09:00', '10:30'), ('11:00', '12:30')]), 'exam_schedule'),
+    ("Course.get_unscheduled_courses", CourseRepository, 'get_unscheduled_courses',
+     ('final',), 'exam_schedule'),
+    ("ExamSchedule.get_page", ExamScheduleRepository, 'get_page',
+     ((SAMPLE_DATE, '09:00', 1),), 'exam_schedule'),
+    ("ExamSchedule.get_schedule_rows", ExamScheduleRepository, 'get_schedule_rows',
+     (None, None, None, True, SAMPLE_DATE, 5), 'exam_schedule'),
+    ("ExamSchedule.get_schedule_rows(student)", ExamScheduleRepository, 'get_schedule_rows',
+     (None, None, 1, False), 'student_courses'),
+]
+
+
+def capture_query(repo_class, method_name, args):
+    """Repository metodunu çalıştırmadan ürettiği SQL ve parametreleri yakalar."""
+    repo = repo_class()
+    captured = []
+
+    def fake_execute_query(query, params=None):
+        captured.append((query, params))
+        return [], []
+
+    repo._execute_query = fake_execute_query
+    getattr(repo, method_name)(*args)
+    if not captured:
+        raise RuntimeError(f"{repo_class.__name__}.{method_name} sorgu üretmedi")
+    return captured[0]
+
+
+def bitmap_index_names(node):
+    """Bitmap Heap Scan altındaki (BitmapAnd/Or dahil) indeks adlarını döndürür."""
+    names = [node['Index Name']] if node.get('Index Name') else []
+    for child in node.get('Plans', []):
+        names.extend(bitmap_index_names(child))
+    return names
+
+
+def walk_plan(node, relation_nodes):
+    """Plan ağacında tablo erişim düğümlerini toplar."""
+    relation = node.get('Relation Name')
+    if relation:
+        index_name = node.get('Index Name')
+        if node.get('Node Type') == 'Bitmap Heap Scan':
+            index_name = '+'.join(bitmap_index_names(node)) or None
+        relation_nodes.append((relation, node.get('Node Type'), index_name))
+    for child in node.get('Plans', []):
+        walk_plan(child, relation_nodes)
+
+
+def explain(cursor, query, params):
+    cursor.execute("EXPLAIN (FORMAT JSON) " + query, params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]['Plan']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sıcak sorguların indeks kullanımını doğrular")
+    parser.add_argument('--no-seqscan', action='store_true',
+                        help="enable_seqscan=off ile indeksin kullanılabilirliğini doğrula")
+    parser.add_argument('--verbose', action='store_true', help="Tam EXPLAIN planını yazdır")
+    options = parser.parse_args()
+
+    print('=' * 70)
+    print('SICAK SORGU İNDEKS KONTROLÜ')
+    print('=' * 70)
+
+    failures = 0
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        if options.no_seqscan:
+            cursor.execute("SET enable_seqscan = off")
+
+        for label, repo_class, method_name, args, target in HOT_QUERIES:
+            query, params = capture_query(repo_class, method_name, args)
+            plan = explain(cursor, query, params)
+
+            relation_nodes = []
+            walk_plan(plan, relation_nodes)
+            target_nodes = [n for n in relation_nodes if n[0] == target]
+            indexed = [n for n in target_nodes if n[1] in INDEX_NODE_TYPES]
+            ok = bool(target_nodes) and len(indexed) == len(target_nodes)
+
+            status = '✅' if ok else '❌'
+            detail = ', '.join(f"{node_type}({index_name or '-'})" for _, node_type, index_name in target_nodes)
+            print(f"{status} {label:<45} {target}: {detail or 'erişim yok'}")
+            if options.verbose:
+                print(json.dumps(plan, indent=2, ensure_ascii=False))
+            if not ok:
+                failures += 1
+
+        cursor.close()
+        conn.rollback()
+    finally:
+        release_connection(conn)
+
+    print('-' * 70)
+    if failures:
+        print(f"❌ {failures} sorgu hedef tabloda index scan kullanmıyor")
+        return 1
+    print("✅ Tüm sıcak sorgular index scan kullanıyor")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
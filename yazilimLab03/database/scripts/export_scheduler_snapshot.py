@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Planlayıcı girdilerinin anlık görüntüsünü dışa aktaran script
+
+Kullanım:
+    python database/scripts/export_scheduler_snapshot.py                      # scheduler_snapshot.npz
+    python database/scripts/export_scheduler_snapshot.py snapshots/hafta1.npz
+    python database/scripts/export_scheduler_snapshot.py --check snapshots/hafta1.npz   # yalnızca aç ve özetle
+
+Dosya load_snapshot() ile memmap olarak açılır; bkz. src/services/scheduler_snapshot.py
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.services.scheduler_snapshot import export_snapshot, load_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Planlayıcı girdilerini .npz anlık görüntüsüne yazar")
+    parser.add_argument('path', nargs='?', default='scheduler_snapshot.npz', help="Çıktı dosyası")
+    parser.add_argument('--check', action='store_true', help="Dışa aktarmadan mevcut dosyayı aç ve özetle")
+    options = parser.parse_args()
+
+    if not options.check:
+        started = time.perf_counter()
+        export_snapshot(options.path)
+        print(f"✅ Anlık görüntü yazıldı: {options.path} "
+              f"({os.path.getsize(options.path) / 1024:.0f} KB, {(time.perf_counter() - started) * 1000:.0f} ms)")
+
+    started = time.perf_counter()
+    snapshot = load_snapshot(options.path)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"📂 Açılış: {elapsed:.1f} ms (oluşturulma: {snapshot.created_at})")
+    print(f"   Ders: {len(snapshot.column('course', 'id'))}, "
+          f"Derslik: {len(snapshot.column('classroom', 'id'))}, "
+          f"Öğretim üyesi: {len(snapshot.column('lecturer', 'id'))}, "
+          f"Ders kaydı: {len(snapshot.arrays['enrollment_student_ids'])}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Sınıf listelerini aşamalı içe aktaran script
+
+Kullanım:
+    python database/scripts/stage_class_lists.py --dry-run            # yalnızca doğrula ve raporla
+    python database/scripts/stage_class_lists.py exceller/ --semester "2024-2025 Güz"
+
+Tüm dosyalar ayrıştırılıp doğrulanır; rapor hatasızsa kayıtlar tek transaction'da
+yazılır. Hata varsa hiçbir şey yazılmaz ve script 1 ile çıkar.
+"""
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.services.student_import_service import StudentImportService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sınıf listelerini doğrulayıp tek transaction'da içe aktarır")
+    parser.add_argument('directory', nargs='?', default=None, help="Sınıf listesi klasörü (varsayılan: exceller)")
+    parser.add_argument('--semester', default=None, help="Dönem (örn. '2024-2025 Güz')")
+    parser.add_argument('--dry-run', action='store_true', help="Yazmadan yalnızca doğrulama raporu üret")
+    options = parser.parse_args()
+
+    result, report = StudentImportService().import_staged(
+        directory_path=options.directory,
+        semester=options.semester,
+        dry_run=options.dry_run
+    )
+    print(report.summary())
+    print(f"\n{'✅' if result.success else '❌'} {result.message}")
+    return 0 if result.success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,18 @@
 """
 PostgreSQL veritabanı bağlantı ayarları
+
+DB_READ_DSN tanımlıysa raporlama okumaları (bkz. repositories/read_routing.py)
+bu salt okunur sunucuya (replika) yönlendirilir. Replika tanımlı değilse veya
+erişilemiyorsa okumalar birincil havuzdan yapılır.
 """
 
 import os
+import time
 import logging
+import threading
 import psycopg2
 from psycopg2 import pool
-from typing import Optional
+from typing import Dict, Optional
 from dotenv import load_dotenv
 
 # .env dosyasını yükle
@@ -82,7 +88,94 @@ class DatabaseConnection:
             logger.info("Tüm veritabanı bağlantıları kapatıldı.")
 
 
+class ReadReplicaConnection:
+    """
+    Salt okunur replika için bağlantı havuzu. Bağlantı kurulamazsa replika
+    RETRY_INTERVAL saniye boyunca devre dışı sayılır ve None döner; çağıran
+    birincil havuza düşer.
+
+    Devre dışı bırakılan havuzdan yeni bağlantı verilmez, ancak havuz hemen
+    kapatılmaz: başka thread'lerin elindeki bağlantılar geri geldikçe kapatılır,
+    sonuncusu dönünce havuz tamamen kapanır.
+    """
+    
+    RETRY_INTERVAL = 30.0
+    
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self._pool: Optional[pool.SimpleConnectionPool] = None
+        # Verilen bağlantı -> geldiği havuz (devre dışı kalmış eski havuz olabilir)
+        self._owned: Dict[int, pool.SimpleConnectionPool] = {}
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+    
+    def _initialize_pool(self):
+        self._pool = pool.SimpleConnectionPool(
+            minconn=1,
+            maxconn=10,
+            dsn=self.dsn,
+            # Yanlışlıkla primary'ye işaret eden bir DSN'de bile yazma yapılamaz
+            options='-c default_transaction_read_only=on'
+        )
+        logger.info("Salt okunur replika bağlantı havuzu oluşturuldu.")
+    
+    def get_connection(self):
+        with self._lock:
+            if time.monotonic() < self._down_until:
+                return None
+            try:
+                if self._pool is None:
+                    self._initialize_pool()
+                conn = self._pool.getconn()
+            except (psycopg2.Error, pool.PoolError) as e:
+                self._mark_down(e)
+                return None
+            self._owned[id(conn)] = self._pool
+            return conn
+    
+    def owns(self, conn) -> bool:
+        return id(conn) in self._owned
+    
+    def _borrowed_from(self, source: pool.SimpleConnectionPool) -> bool:
+        return any(owner is source for owner in self._owned.values())
+    
+    def release_connection(self, conn, close: bool = False):
+        with self._lock:
+            source = self._owned.pop(id(conn), None)
+            if source is None:
+                return
+            retired = source is not self._pool
+            source.putconn(conn, close=close or retired or bool(conn.closed))
+            if retired and not self._borrowed_from(source):
+                source.closeall()
+    
+    def mark_down(self, error: Exception):
+        with self._lock:
+            self._mark_down(error)
+    
+    def _mark_down(self, error: Exception):
+        logger.warning(f"Salt okunur replikaya erişilemiyor, okumalar birincil sunucudan yapılacak: {error}")
+        self._down_until = time.monotonic() + self.RETRY_INTERVAL
+        if self._pool is not None:
+            retired, self._pool = self._pool, None
+            # Ödünç verilmiş bağlantı varsa havuz, sonuncusu release_connection ile dönünce kapanır
+            if not self._borrowed_from(retired):
+                try:
+                    retired.closeall()
+                except pool.PoolError:
+                    pass
+    
+    def close_all(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+            self._owned.clear()
+
+
 _db_connection: Optional[DatabaseConnection] = None
+_read_replica: Optional[ReadReplicaConnection] = None
+_read_replica_lock = threading.Lock()
 
 
 def get_connection():
@@ -98,8 +191,53 @@ def release_connection(conn):
         _db_connection.release_connection(conn)
 
 
+def _get_read_replica() -> Optional[ReadReplicaConnection]:
+    global _read_replica
+    dsn = os.getenv('DB_READ_DSN')
+    if not dsn:
+        return None
+    if _read_replica is None:
+        with _read_replica_lock:
+            if _read_replica is None:
+                _read_replica = ReadReplicaConnection(dsn)
+    return _read_replica
+
+
+def get_read_connection():
+    """
+    Raporlama okuması için bağlantı döndürür: replika tanımlı ve erişilebilirse
+    oradan, değilse birincil havuzdan. release_read_connection ile bırakılmalıdır.
+    """
+    replica = _get_read_replica()
+    if replica is not None:
+        conn = replica.get_connection()
+        if conn is not None:
+            return conn
+    return get_connection()
+
+
+def is_read_replica_connection(conn) -> bool:
+    return _read_replica is not None and _read_replica.owns(conn)
+
+
+def release_read_connection(conn, broken: bool = False):
+    if is_read_replica_connection(conn):
+        _read_replica.release_connection(conn, close=broken)
+    else:
+        release_connection(conn)
+
+
+def mark_read_replica_down(error: Exception):
+    """Sorgu sırasında kopan replikayı bir süre devre dışı bırakır."""
+    if _read_replica is not None:
+        _read_replica.mark_down(error)
+
+
 def close_all_connections():
-    global _db_connection
+    global _db_connection, _read_replica
     if _db_connection is not None:
         _db_connection.close_all()
         _db_connection = None
+    if _read_replica is not None:
+        _read_replica.close_all()
+        _read_replica = None
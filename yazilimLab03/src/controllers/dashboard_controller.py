@@ -13,7 +13,11 @@ from src.services.course_service import CourseService
 from src.services.exam_schedule_service import ExamScheduleService
 from src.services.scheduler_service import SchedulerService
 from src.services.student_import_service import StudentImportService
+from src.services.reporting_service import ReportingService
+from src.services.search_service import SearchService
 from src.utils.classroom_proximity_loader import ClassroomProximityLoader
+from src.repositories.query_stats import track_queries
+from src.repositories.base_repository import Page, DEFAULT_PAGE_SIZE
 
 
 class DashboardController:
@@ -28,28 +32,12 @@ class DashboardController:
         self.exam_service = ExamScheduleService()
         self.scheduler_service = SchedulerService()
         self.student_import_service = StudentImportService()
+        self.reporting_service = ReportingService()
+        self.search_service = SearchService()
     
+    @track_queries()
     def get_dashboard_stats(self) -> Dict[str, Any]:
-        stats = {
-            'total_faculties': self.faculty_service.get_count(),
-            'total_departments': self.department_service.get_count(),
-            'total_classrooms': self.classroom_service.get_count(),
-            'total_lecturers': self.lecturer_service.get_count(),
-            'total_courses': self.course_service.get_count(),
-            'total_exams': self.exam_service.get_count()
-        }
-        
-        today = date.today()
-        week_end = today + timedelta(days=7)
-        week_exams = self.exam_service.get_by_date_range(today, week_end)
-        stats['this_week_exams'] = len([e for e in week_exams if e.exam_date >= today])
-        
-        stats['pending_exams'] = len(self.exam_service.get_by_status('planned'))
-        
-        today_exams = self.exam_service.get_by_date(today)
-        stats['today_exams'] = len(today_exams)
-        
-        return stats
+        return self.reporting_service.get_dashboard_stats()
     
     def get_recent_exams(self, limit: int = 10) -> List[Dict]:
         exams = self.exam_service.get_all()
@@ -122,21 +110,12 @@ class DashboardController:
         
         return result
     
+    @track_queries()
     def get_faculty_distribution(self) -> List[Dict]:
         """Fakülte dağılımını döndürür"""
-        faculties = self.faculty_service.get_all()
-        
-        result = []
-        for faculty in faculties:
-            departments = self.department_service.get_by_faculty_id(faculty.id)
-            result.append({
-                'faculty_name': faculty.name,
-                'department_count': len(departments),
-                'code': faculty.code
-            })
-        
-        return result
+        return self.reporting_service.get_faculty_distribution()
     
+    @track_queries()
     def get_classroom_utilization(self, exam_date: date) -> Dict[str, Any]:
         all_classrooms = self.classroom_service.get_all()
         scheduled_exams = self.exam_service.get_by_date(exam_date)
@@ -150,6 +129,7 @@ class DashboardController:
         
         utilization = {}
         total_capacity = sum(c.capacity for c in all_classrooms)
+        capacity_by_id = {c.id: c.capacity for c in all_classrooms}
         
         for slot_name, start, end in time_slots:
             slot_exams = [
@@ -160,9 +140,9 @@ class DashboardController:
             if slot_exams:
                 used_classrooms = set(e.classroom_id for e in slot_exams)
                 used_capacity = sum(
-                    self.classroom_service.get_by_id(c_id).capacity
+                    capacity_by_id[c_id]
                     for c_id in used_classrooms
-                    if self.classroom_service.get_by_id(c_id)
+                    if c_id in capacity_by_id
                 )
                 
                 utilization[slot_name] = {
@@ -324,6 +304,11 @@ class DashboardController:
     def get_all_classrooms(self) -> list:
         return self.classroom_service.get_all()
     
+    def get_classrooms_page(self, after: Optional[tuple] = None, search: str = '',
+                            suitable_only: bool = False, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return self.classroom_service.get_page(after=after, limit=limit, search=search or None,
+                                               suitable_only=suitable_only)
+    
     def get_classrooms_by_faculty(self, faculty_id: int) -> list:
         return self.classroom_service.get_by_faculty(faculty_id)
     
@@ -380,6 +365,11 @@ class DashboardController:
     def get_all_lecturers(self) -> list:
         return self.lecturer_service.get_all()
     
+    def get_lecturers_page(self, after: Optional[tuple] = None, search: str = '',
+                           department_id: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return self.lecturer_service.get_page(after=after, limit=limit, search=search or None,
+                                              department_id=department_id)
+    
     def get_lecturers_by_department(self, department_id: int) -> list:
         return self.lecturer_service.get_by_department_id(department_id)
     
@@ -435,6 +425,11 @@ class DashboardController:
     def get_all_courses(self) -> list:
         return self.course_service.get_all()
     
+    def get_courses_page(self, after: Optional[tuple] = None, search: str = '',
+                         department_id: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return self.course_service.get_page(after=after, limit=limit, search=search or None,
+                                            department_id=department_id)
+    
     def get_courses_by_department(self, department_id: int) -> list:
         return self.course_service.get_by_department_id(department_id)
     
@@ -509,9 +504,47 @@ class DashboardController:
     
     # ==================== SINAV PROGRAMI İŞLEMLERİ ====================
     
+    def global_search(self, term: str, role: str, limit: int = 20) -> list:
+        """Ders, öğretim üyesi, derslik ve öğrencilerde rol kapsamında sıralı arama."""
+        try:
+            return self.search_service.search_for_role(term, role, limit=limit)
+        except Exception:
+            return []
+    
     def get_all_exams(self) -> list:
         return self.exam_service.get_all()
     
+    def get_exams_page(self, user_info: Optional[Dict], after: Optional[tuple] = None,
+                       search: str = '', limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        """
+        Sınav listesinin kullanıcı rolüne göre filtrelenmiş bir sayfasını döndürür.
+        - Öğrenci: Aldığı derslerin sınavları (iptal edilenler hariç)
+        - Hoca: Verdiği derslerin sınavları (iptal edilenler hariç)
+        - Bölüm Yetkilisi: Bölümünün sınavları
+        - Admin: Tüm sınavlar
+        """
+        scope = self._exam_scope(user_info)
+        if scope is None:
+            return Page()
+        return self.exam_service.get_page(after=after, limit=limit, search=search or None, **scope)
+    
+    @staticmethod
+    def _exam_scope(user_info: Optional[Dict]) -> Optional[Dict[str, Any]]:
+        """Rol için get_page filtrelerini döndürür; kullanıcı hiçbir sınavı göremiyorsa None."""
+        role = (user_info or {}).get('role', '')
+        if role in ('ogrenci', 'student'):
+            student_id = user_info.get('student_id')
+            return {'student_id': student_id, 'include_cancelled': False} if student_id else None
+        if role in ('hoca', 'lecturer'):
+            lecturer_id = user_info.get('lecturer_id')
+            return {'lecturer_id': lecturer_id, 'include_cancelled': False} if lecturer_id else None
+        if role in ('bolum_yetkilisi', 'department_head'):
+            department_id = user_info.get('department_id')
+            return {'department_id': department_id} if department_id else None
+        if role == 'admin':
+            return {}
+        return None
+    
     def get_exams_by_date(self, exam_date: str) -> list:
         if isinstance(exam_date, str):
             exam_date = date.fromisoformat(exam_date)
@@ -617,8 +650,17 @@ class DashboardController:
         except Exception as e:
             return {'success': False, 'message': str(e)}
     
+    def delete_exams(self, ids: List[int]) -> dict:
+        success, message, deleted_ids = self.exam_service.delete_many(ids)
+        return {'success': success, 'message': message, 'ids': deleted_ids}
+    
+    def update_exams_status(self, ids: List[int], status: str) -> dict:
+        success, message, updated_ids = self.exam_service.update_status_many(ids, status)
+        return {'success': success, 'message': message, 'ids': updated_ids}
+    
     # ==================== OTOMATİK PLANLAMA İŞLEMLERİ ====================
     
+    @track_queries()
     def generate_schedule(self, start_date: str, end_date: str) -> dict:
         try:
             if isinstance(start_date, str):
@@ -703,143 +745,6 @@ class DashboardController:
         else:
             return self.get_upcoming_exams(days=365)
     
-    # ==================== KULLANICI BAZLI FİLTRELEME ====================
-    
-    def filter_schedule_by_user(self, user_info: dict) -> List[Dict]:
-        """
-        Kullanıcı rolüne göre sınav programını filtreler.
-        
-        - Hoca (lecturer): Kendi verdiği derslerin sınavlarını görür
-        - Öğrenci (ogrenci): Aldığı derslerin sınavlarını görür
-        
-        Args:
-            user_info: {'id', 'username', 'role', 'department_id', 'student_number', 'lecturer_id'}
-            
-        Returns:
-            List[Dict]: Filtrelenmiş sınav listesi
-        """
-        if not user_info:
-            return []
-        
-        role = user_info.get('role', '').lower()
-        
-        # Hoca ise kendi derslerinin sınavlarını göster
-        if role in ('hoca', 'lecturer'):
-            lecturer_id = user_info.get('lecturer_id')
-            if lecturer_id:
-                return self._get_exams_for_lecturer(lecturer_id)
-            # lecturer_id yoksa bölüm bazlı fallback
-            department_id = user_info.get('department_id')
-            if department_id:
-                return self.get_exams_by_department(department_id)
-        
-        # Öğrenci ise aldığı derslerin sınavlarını göster
-        elif role in ('ogrenci', 'student'):
-            student_id = user_info.get('student_id')
-            student_number = user_info.get('student_number')
-            
-            if student_id:
-                return self._get_exams_for_student(student_id)
-            elif student_number:
-                return self._get_exams_for_student_number(student_number)
-            # Hiçbiri yoksa bölüm bazlı fallback
-            department_id = user_info.get('department_id')
-            if department_id:
-                return self.get_exams_by_department(department_id)
-        
-        # Admin ve Bölüm Yetkilisi için tüm sınavları döndür
-        return self.get_upcoming_exams(days=365)
-    
-    def _get_exams_for_lecturer(self, lecturer_id: int) -> List[Dict]:
-        """
-        Belirli bir öğretim üyesinin derslerinin sınavlarını döndürür.
-        """
-        exams = self.exam_service.get_by_lecturer_all(lecturer_id)
-        
-        result = []
-        for exam in exams:
-            result.append({
-                'id': exam.id,
-                'date': exam.exam_date,
-                'time': str(exam.start_time),
-                'start_time': str(exam.start_time),
-                'end_time': str(exam.end_time) if exam.end_time else '',
-                'course_id': exam.course_id,
-                'course_code': exam.course_code,
-                'course_name': exam.course_name,
-                'lecturer': exam.lecturer_name,
-                'lecturer_name': exam.lecturer_name,
-                'classroom': exam.classroom_name,
-                'classroom_name': exam.classroom_name,
-                'faculty_name': exam.faculty_name or 'Belirsiz',
-                'department_name': exam.department_name or 'Belirsiz',
-                'student_count': exam.student_count,
-                'exam_type': exam.exam_type,
-                'status': exam.status
-            })
-        
-        return result
-    
-    def _get_exams_for_student(self, student_id: int) -> List[Dict]:
-        """
-        Belirli bir öğrencinin aldığı derslerin sınavlarını döndürür.
-        """
-        exams = self.exam_service.get_by_student_id(student_id)
-        
-        result = []
-        for exam in exams:
-            result.append({
-                'id': exam.id,
-                'date': exam.exam_date,
-                'time': str(exam.start_time),
-                'start_time': str(exam.start_time),
-                'end_time': str(exam.end_time) if exam.end_time else '',
-                'course_id': exam.course_id,
-                'course_code': exam.course_code,
-                'course_name': exam.course_name,
-                'lecturer': exam.lecturer_name,
-                'lecturer_name': exam.lecturer_name,
-                'classroom': exam.classroom_name,
-                'classroom_name': exam.classroom_name,
-                'faculty_name': exam.faculty_name or 'Belirsiz',
-                'department_name': exam.department_name or 'Belirsiz',
-                'student_count': exam.student_count,
-                'exam_type': exam.exam_type,
-                'status': exam.status
-            })
-        
-        return result
-    
-    def _get_exams_for_student_number(self, student_number: str) -> List[Dict]:
-        """
-        Öğrenci numarasına göre sınavları döndürür.
-        """
-        exams = self.exam_service.get_by_student_number(student_number)
-        
-        result = []
-        for exam in exams:
-            result.append({
-                'id': exam.id,
-                'date': exam.exam_date,
-                'time': str(exam.start_time),
-                'start_time': str(exam.start_time),
-                'end_time': str(exam.end_time) if exam.end_time else '',
-                'course_id': exam.course_id,
-                'course_code': exam.course_code,
-                'course_name': exam.course_name,
-                'lecturer': exam.lecturer_name,
-                'lecturer_name': exam.lecturer_name,
-                'classroom': exam.classroom_name,
-                'classroom_name': exam.classroom_name,
-                'faculty_name': exam.faculty_name or 'Belirsiz',
-                'department_name': exam.department_name or 'Belirsiz',
-                'student_count': exam.student_count,
-                'exam_type': exam.exam_type,
-                'status': exam.status
-            })
-        
-        return result
-    
     # ==================== VERİ İTHAL İŞLEMLERİ ====================
     
     def import_class_lists_folder(self, folder_path: str, semester: str = None) -> Dict:
@@ -972,108 +877,36 @@ class DashboardController:
             student_id: Öğrenci ID'si
             
         Returns:
-            Öğrencinin sınavlarının listesi (tarih/saat/derslik ile)
+            Öğrencinin sınavlarının tarih/saat sıralı listesi (tarih/saat/derslik ile)
         """
         try:
-            exams = self.exam_service.repository.get_by_student_id(student_id)
-            
-            result = []
-            for exam in exams:
-                result.append({
-                    'id': exam.id,
-                    'course_id': exam.course_id,
-                    'course_code': exam.course_code,
-                    'course_name': exam.course_name,
-                    'exam_date': exam.exam_date,
-                    'date': exam.exam_date,
-                    'start_time': str(exam.start_time) if exam.start_time else '',
-                    'end_time': str(exam.end_time) if exam.end_time else '',
-                    'time': f"{exam.start_time} - {exam.end_time}" if exam.start_time and exam.end_time else '',
-                    'classroom': exam.classroom_name or 'Belirsiz',
-                    'classroom_name': exam.classroom_name,
-                    'faculty_name': exam.faculty_name or 'Belirsiz',
-                    'exam_type': exam.exam_type,
-                    'status': exam.status,
-                    'lecturer_name': exam.lecturer_name or 'Belirsiz',
-                    'department_name': exam.department_name or 'Belirsiz'
-                })
-            
-            # Tarih/saat'e göre sırala
-            result.sort(key=lambda x: (x['exam_date'], x['start_time']))
-            
-            return result
+            return self.exam_service.get_schedule_rows(student_id=student_id, include_cancelled=False)
         except Exception as e:
             return []
     
-    def filter_schedule_by_user(self, user_info: Dict) -> List[Dict]:
+    @track_queries()
+    def filter_schedule_by_user(self, user_info: Dict, from_date: Optional[date] = None,
+                                limit: Optional[int] = None) -> List[Dict]:
         """
-        Kullanıcı rolüne göre filtrelenmiş sınav programını getirir.
+        Kullanıcı rolüne göre filtrelenmiş sınav programını tek sorguda getirir.
         
         Args:
             user_info: Kullanıcı bilgisi dictionary'si
-                - id: Kullanıcı ID'si
                 - role: Kullanıcı rolü (student, lecturer, department_head, admin)
                 - student_id: Öğrenci ID'si (öğrenci için)
                 - lecturer_id: Öğretim üyesi ID'si (hoca için)
                 - department_id: Bölüm ID'si (bölüm yetkilisi için)
+            from_date: Yalnızca bu tarihten itibaren olan sınavlar
+            limit: En fazla sınav sayısı
         
         Returns:
-            Filtrelenmiş sınav programı
+            Tarih/saat sıralı sınav satırları (get_schedule_rows sütunları)
         """
-        try:
-            role = user_info.get('role', '')
-            
-            # Öğrenci: Kendi dersleri
-            if role == 'ogrenci' or role == 'student':
-                student_id = user_info.get('student_id')
-                if student_id:
-                    return self.get_student_schedule(student_id)
-                return []
-            
-            # Hoca: Kendi dersleri
-            elif role == 'hoca' or role == 'lecturer':
-                lecturer_id = user_info.get('lecturer_id')
-                if lecturer_id:
-                    exams = self.exam_service.repository.get_by_lecturer_id_all(lecturer_id)
-                    result = []
-                    for exam in exams:
-                        result.append({
-                            'id': exam.id,
-                            'course_id': exam.course_id,
-                            'course_code': exam.course_code,
-                            'course_name': exam.course_name,
-                            'exam_date': exam.exam_date,
-                            'date': exam.exam_date,
-                            'start_time': str(exam.start_time) if exam.start_time else '',
-                            'end_time': str(exam.end_time) if exam.end_time else '',
-                            'time': f"{exam.start_time} - {exam.end_time}" if exam.start_time and exam.end_time else '',
-                            'classroom': exam.classroom_name or 'Belirsiz',
-                            'classroom_name': exam.classroom_name,
-                            'faculty_name': exam.faculty_name or 'Belirsiz',
-                            'exam_type': exam.exam_type,
-                            'status': exam.status,
-                            'student_count': exam.student_count,
-                            'department_name': exam.department_name or 'Belirsiz'
-                        })
-                    result.sort(key=lambda x: (x['exam_date'], x['start_time']))
-                    return result
-                return []
-            
-            # Bölüm Yetkilisi: Bölümün tüm dersleri
-            elif role == 'bolum_yetkilisi' or role == 'department_head':
-                department_id = user_info.get('department_id')
-                if department_id:
-                    exams = self.exam_service.get_by_department_id(department_id)
-                    return exams if exams else []
-                return []
-            
-            # Admin: Tüm dersler
-            elif role == 'admin':
-                exams = self.exam_service.get_all_with_details() if hasattr(self.exam_service, 'get_all_with_details') else self.exam_service.get_all()
-                return exams if exams else []
-            
-            # Varsayılan: Boş liste
+        scope = self._exam_scope(user_info)
+        if scope is None:
             return []
+        try:
+            return self.exam_service.get_schedule_rows(from_date=from_date, limit=limit, **scope)
         except Exception as e:
             return []
     
@@ -1102,6 +935,7 @@ class DashboardController:
                     'total_classrooms': result.total_classrooms,
                     'updated_classrooms': result.updated_classrooms,
                     'new_classrooms': result.new_classrooms,
+                    'unchanged_classrooms': result.unchanged_classrooms,
                     'failed_count': result.failed_count
                 },
                 'errors': result.errors
@@ -14,6 +14,7 @@ from src.services.classroom_service import ClassroomService
 from src.services.student_import_service import StudentImportService
 from src.repositories.student_repository import StudentRepository
 from src.repositories.course_repository import CourseRepository
+from src.repositories.read_routing import reporting_query
 from src.utils.excel_generator import ExcelGenerator
 from src.utils.pdf_generator import PDFReportGenerator
 
@@ -38,6 +39,7 @@ class ExportController:
         self.excel_generator = ExcelGenerator()
         self.pdf_generator = PDFReportGenerator()
     
+    @reporting_query
     def export_exam_schedule_to_excel(self, start_date: date, end_date: date,
                                       output_path: str = None) -> tuple:
         try:
@@ -118,6 +120,7 @@ class ExportController:
             'exam_schedule_excel': 'Sınav Programı (Excel)',
         }
     
+    @reporting_query
     def export_to_excel(self, data: list = None, file_path: str = None,
                         filter_type: str = None, filter_value: int = None) -> dict:
         try:
@@ -153,6 +156,7 @@ class ExportController:
         except Exception as e:
             return {'success': False, 'message': str(e), 'path': None}
     
+    @reporting_query
     def export_exam_schedule_to_pdf(
         self,
         start_date: Optional[date] = None,
@@ -203,6 +207,7 @@ class ExportController:
             logger.error(f"PDF export hatası: {e}")
             return False, f"PDF oluşturulurken hata: {str(e)}", None
     
+    @reporting_query
     def export_student_schedule_excel(
         self,
         student_number: str,
@@ -229,7 +234,7 @@ class ExportController:
                 return False, f"Öğrenci bulunamadı: {student_number}", None
             
             # Öğrencinin derslerini ve sınavlarını al
-            from src.repositories.student_course_repository import StudentCourseRepository
+            from src.repositories.student_repository import StudentCourseRepository
             sc_repo = StudentCourseRepository()
             student_courses = sc_repo.get_by_student_id(student.id)
             
@@ -263,6 +268,7 @@ class ExportController:
             logger.error(f"Öğrenci programı export hatası: {e}")
             return False, f"Dışa aktarılırken hata: {str(e)}", None
     
+    @reporting_query
     def export_course_schedule_excel(
         self,
         course_code: str,
@@ -294,7 +300,7 @@ class ExportController:
             exam_data = []
             for exam in exams:
                 # Öğrencileri de ekle
-                from src.repositories.student_course_repository import StudentCourseRepository
+                from src.repositories.student_repository import StudentCourseRepository
                 sc_repo = StudentCourseRepository()
                 student_courses = sc_repo.get_by_course_id(course.id)
                 
@@ -313,6 +319,7 @@ class ExportController:
             logger.error(f"Ders programı export hatası: {e}")
             return False, f"Dışa aktarılırken hata: {str(e)}", None
     
+    @reporting_query
     def export_all_courses_report(
         self,
         output_path: Optional[str] = None,
@@ -363,7 +370,7 @@ class ExportController:
             
             row = 2
             for course in courses:
-                from src.repositories.student_course_repository import StudentCourseRepository
+                from src.repositories.student_repository import StudentCourseRepository
                 sc_repo = StudentCourseRepository()
                 student_count = len(sc_repo.get_by_course_id(course.id))
                 
@@ -407,7 +414,7 @@ class ExportController:
                 
                 row = 2
                 for student in students:
-                    from src.repositories.student_course_repository import StudentCourseRepository
+                    from src.repositories.student_repository import StudentCourseRepository
                     sc_repo = StudentCourseRepository()
                     student_courses = sc_repo.get_by_student_id(student.id)
                     
@@ -20,3 +20,4 @@ from .course import (
 from .exam_schedule import ExamSchedule
 from .user import User
 from .student import Student, StudentCourse
+from .import_manifest import ImportManifest
@@ -3,7 +3,7 @@ Derslik model sınıfı
 """
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -26,7 +26,7 @@ CLASSROOM_TYPE_MAP = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Classroom:
     """Derslik entity sınıfı"""
     
@@ -42,12 +42,15 @@ class Classroom:
     updated_at: Optional[datetime] = None
     
     faculty_name: Optional[str] = None
+    nearby_classrooms: Optional[List[str]] = None  # Yakınlık grafiğinden doldurulur
     
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
     
     def to_dict(self) -> dict:
         return {
@@ -64,6 +67,11 @@ class Classroom:
             'faculty_name': self.faculty_name
         }
     
+    def _post_load(self):
+        """Veritabanı satırından yüklendikten sonra oda tipini normalize eder."""
+        room_type = (self.room_type or 'STANDART').upper()
+        self.room_type = room_type if room_type in CLASSROOM_TYPE_MAP else 'STANDART'
+    
     @classmethod
     def from_dict(cls, data: dict) -> 'Classroom':
         room_type_raw = data.get('room_type', 'STANDART')
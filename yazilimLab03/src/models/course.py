@@ -74,7 +74,7 @@ REQUIRED_ROOM_TYPE_MAP = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Course:
     
     id: Optional[int] = None
@@ -104,10 +104,12 @@ class Course:
     faculty_name: Optional[str] = None
 
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
         if self.period is None:
             self.period = self.semester
         elif self.semester == 1 and self.period != 1:
@@ -141,6 +143,32 @@ class Course:
             'updated_at': self.updated_at
         }
 
+    def _post_load(self):
+        """
+        Veritabanı satırından yüklendikten sonra from_dict ile aynı
+        normalizasyonu uygular (satır eşleyici __post_init__'i atlar).
+        """
+        if self.period is None:
+            self.period = self.semester
+        elif self.semester == 1 and self.period != 1:
+            self.semester = self.period
+        
+        self.course_type = COURSE_TYPE_MAP.get(self.course_type, self.course_type)
+        if self.has_exam is None:
+            self.has_exam = self.course_type != 'Proje'
+        
+        if self.exam_type:
+            self.exam_type = EXAM_TYPE_MAP.get(self.exam_type, self.exam_type)
+        else:
+            self.exam_type = 'Yazılı'
+        
+        if not self.has_exam:
+            self.exam_duration = 0
+            self.exam_type = ""
+        
+        required_room_type = (self.required_room_type or 'ANY').upper()
+        self.required_room_type = required_room_type if required_room_type in REQUIRED_ROOM_TYPE_MAP else 'ANY'
+
     @classmethod
     def from_dict(cls, data: dict) -> 'Course':
         semester_val = data.get('semester', 1)
@@ -7,7 +7,7 @@ from typing import Optional
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Department:
     
     id: Optional[int] = None
@@ -23,10 +23,12 @@ class Department:
     faculty_name: Optional[str] = None
     
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
         if self.head_of_department and not self.head_name:
             self.head_name = self.head_of_department
         elif self.head_name and not self.head_of_department:
@@ -45,6 +47,12 @@ class Department:
             'updated_at': self.updated_at
         }
     
+    def _post_load(self):
+        """Veritabanı satırından yüklendikten sonra bölüm başkanı alanlarını eşitler."""
+        head = self.head_name or self.head_of_department
+        self.head_name = head
+        self.head_of_department = head
+    
     @classmethod
     def from_dict(cls, data: dict) -> 'Department':
         head = data.get('head_name') or data.get('head_of_department')
@@ -7,7 +7,7 @@ from typing import Optional, List
 from datetime import datetime, date, time
 
 
-@dataclass
+@dataclass(slots=True)
 class ExamSchedule:
     
     id: Optional[int] = None
@@ -31,10 +31,12 @@ class ExamSchedule:
     student_count: Optional[int] = None
     
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
     
     def to_dict(self) -> dict:
         return {
@@ -78,7 +80,7 @@ class ExamSchedule:
         return f"{self.course_code} - {self.exam_date} {self.start_time}"
 
 
-@dataclass
+@dataclass(slots=True)
 class ExamSupervisor:
     
     id: Optional[int] = None
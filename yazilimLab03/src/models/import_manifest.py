@@ -0,0 +1,24 @@
+"""
+İçe aktarma manifestosu model sınıfı
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+from datetime import datetime
+
+
+@dataclass(slots=True)
+class ImportManifest:
+    
+    id: Optional[int] = None
+    file_path: str = ""
+    file_size: int = 0
+    file_mtime_ns: int = 0
+    content_hash: str = ""
+    course_id: Optional[int] = None
+    enrollment_count: int = 0
+    imported_at: Optional[datetime] = None
+    
+    def matches_stat(self, file_size: int, file_mtime_ns: int) -> bool:
+        """Dosya boyutu ve değişiklik zamanı manifestodakiyle aynı mı?"""
+        return self.file_size == file_size and self.file_mtime_ns == file_mtime_ns
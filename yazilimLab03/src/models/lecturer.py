@@ -12,7 +12,7 @@ DEFAULT_AVAILABLE_DAYS = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma
 ALL_WEEKDAYS = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma']
 
 
-@dataclass
+@dataclass(slots=True)
 class Lecturer:
     """Öğretim görevlisi entity sınıfı"""
     
@@ -30,10 +30,12 @@ class Lecturer:
     faculty_name: Optional[str] = None
     
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
         if self.available_days is None:
             self.available_days = DEFAULT_AVAILABLE_DAYS.copy()
     
@@ -67,6 +69,14 @@ class Lecturer:
             'updated_at': self.updated_at
         }
     
+    def _post_load(self):
+        """Veritabanı satırından yüklendikten sonra müsait günleri listeye çevirir."""
+        available_days = self.available_days
+        if not available_days:
+            self.available_days = DEFAULT_AVAILABLE_DAYS.copy()
+        elif isinstance(available_days, str):
+            self.available_days = [d.strip() for d in available_days.strip('{}').split(',') if d.strip()]
+    
     @classmethod
     def from_dict(cls, data: dict) -> 'Lecturer':
         available_days = data.get('available_days')
@@ -7,7 +7,7 @@ from typing import Optional
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Student:
     
     id: Optional[int] = None
@@ -25,10 +25,12 @@ class Student:
     faculty_name: Optional[str] = None
     
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
     
     def to_dict(self) -> dict:
         return {
@@ -70,7 +72,7 @@ class Student:
         return f"{self.student_number} - {self.full_name} ({dept_info}, {self.year}. Sınıf)"
 
 
-@dataclass
+@dataclass(slots=True)
 class StudentCourse:
     
     id: Optional[int] = None
@@ -8,7 +8,7 @@ from datetime import datetime
 import bcrypt
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     
     id: Optional[int] = None
@@ -25,10 +25,12 @@ class User:
     updated_at: Optional[datetime] = None
     
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
     
     @property
     def full_name(self) -> str:
@@ -12,3 +12,6 @@ from .course_repository import CourseRepository
 from .exam_schedule_repository import ExamScheduleRepository
 from .user_repository import UserRepository
 from .student_repository import StudentRepository, StudentCourseRepository
+from .reporting_repository import ReportingRepository
+from .search_repository import SearchRepository
+from .import_manifest_repository import ImportManifestRepository
@@ -5,47 +5,214 @@ Transaction yönetimi ve eager loading desteği içerir.
 """
 
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, List, Optional, Any, Callable
+from dataclasses import dataclass, field
+from typing import TypeVar, Generic, List, Optional, Any, Callable, Dict, Sequence, Set, Tuple
 from contextlib import contextmanager
+import io
+import time
 import logging
 
-from src.config.database import get_connection, release_connection
+import psycopg2
+
+from src.config.database import (
+    get_connection, release_connection,
+    get_read_connection, release_read_connection, is_read_replica_connection, mark_read_replica_down
+)
+from src.repositories.query_cache import get_query_cache, extract_write_tables
+from src.repositories.row_mapper import get_row_mapper
+from src.repositories.query_stats import get_query_stats
+from src.repositories.read_routing import is_reporting
 
 T = TypeVar('T')
 logger = logging.getLogger(__name__)
 
+# Liste ekranlarında tek seferde çekilen kayıt sayısı
+DEFAULT_PAGE_SIZE = 100
+
+
+def _copy_text_value(value: Any) -> str:
+    """Bir değeri PostgreSQL COPY text formatına uygun şekilde kodlar."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def ilike_pattern(term: str) -> str:
+    """Arama terimini ILIKE için '%terim%' kalıbına çevirir (%, _ ve \\ kaçırılır)."""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+@dataclass
+class Page(Generic[T]):
+    """
+    Keyset sayfalama sonucu. next_cursor bir sonraki sayfa için get_page(after=...)
+    parametresine verilir; None ise son sayfadır.
+    """
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[tuple] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
 
 class TransactionContext:
-    """Transaction yönetimi için context manager."""
+    """
+    Transaction yönetimi için context manager.
+
+    tx.connection ile yazan metotlar etkiledikleri tabloları touched_tables'a
+    ekler; sorgu önbelleği commit'ten sonra geçersizlenir. Böylece commit
+    öncesinde önbelleği dolduran bir okuyucu eski veriyi kalıcı hale getiremez.
+    """
     
     def __init__(self, connection):
         self.connection = connection
         self.committed = False
+        self.touched_tables: Set[str] = set()
     
     def commit(self):
         """Transaction'ı commit et."""
         if not self.committed:
             self.connection.commit()
             self.committed = True
+            if self.touched_tables:
+                get_query_cache().bump(self.touched_tables)
+                self.touched_tables = set()
             logger.debug("Transaction committed")
     
     def rollback(self):
         """Transaction'ı geri al."""
         if not self.committed:
             self.connection.rollback()
+            self.touched_tables = set()
             logger.debug("Transaction rolled back")
+    
+    @contextmanager
+    def savepoint(self, name: str = "sp"):
+        """
+        Transaction içinde geri alınabilir adım. Blokta hata olursa yalnızca bu
+        adımın yazdıkları geri alınır (ROLLBACK TO SAVEPOINT) ve hata yeniden
+        fırlatılır; transaction'ın geri kalanı kullanılmaya devam edebilir.
+        """
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"SAVEPOINT {name}")
+        try:
+            yield self
+        except Exception:
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            raise
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"RELEASE SAVEPOINT {name}")
 
 
-class BaseRepository(ABC, Generic[T]):
-    
+# transaction() ile açılmış bağlantılar; dışarıdan conn alan yazma metotları
+# önbellek geçersizlemesini bu kayıt üzerinden commit sonrasına erteler
+_open_transactions: Dict[int, TransactionContext] = {}
+
+
+class ReadOnlyRepository(ABC, Generic[T]):
+    """
+    Yalnızca okuma yapan repository'lerin tabanı (raporlama view'ları, global arama).
+    Yazma API'si (create/update/delete, transaction, toplu yükleme) BaseRepository'dedir.
+    """
+
+    # Referans tablolarında (fakülte, bölüm, derslik, hoca) True yapılır;
+    # okuma sorguları süreç genelindeki sorgu önbelleğinden karşılanır.
+    use_query_cache: bool = False
+
+    # Satırların derlenmiş eşleyici ile dönüştürüleceği dataclass model
+    model_class: Optional[type] = None
+
     def __init__(self):
         self.table_name: str = ""
-        self._current_transaction: Optional[TransactionContext] = None
     
     @abstractmethod
     def _row_to_entity(self, row: tuple, columns: List[str]) -> T:
         pass
     
+    def _rows_to_entities(self, rows: List[tuple], columns: List[str]) -> List[T]:
+        """Satırları sorgu şekline özel derlenmiş eşleyici ile entity'lere çevirir."""
+        if not rows:
+            return []
+        if self.model_class is None:
+            return [self._row_to_entity(row, columns) for row in rows]
+        return list(map(get_row_mapper(self.model_class, columns), rows))
+    
+    @staticmethod
+    def cache_stats() -> dict:
+        """Sorgu önbelleğinin hit/miss metriklerini döndürür."""
+        return get_query_cache().stats()
+    
+    @staticmethod
+    def query_stats() -> dict:
+        """SQL enstrümantasyon sayaçlarını (en yavaş sorgular, N+1 uyarıları) döndürür."""
+        return get_query_stats().snapshot()
+    
+    def _execute_query(self, query: str, params: tuple = None) -> List[tuple]:
+        cache = get_query_cache() if self.use_query_cache else None
+        cache_key = None
+        if cache is not None and cache.enabled:
+            cache_key = cache.make_key(query, params)
+            if cache_key is not None:
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    return cached
+        
+        # Raporlama okumaları replikaya gider (bkz. read_routing); yazmalar her zaman birincilde
+        routed = is_reporting() and not extract_write_tables(query)
+        conn = None
+        try:
+            conn = get_read_connection() if routed else get_connection()
+            cursor = conn.cursor()
+            started = time.perf_counter()
+            cursor.execute(query, params)
+            columns = [desc[0] for desc in cursor.description] if cursor.description else []
+            rows = cursor.fetchall()
+            get_query_stats().record(query, (time.perf_counter() - started) * 1000, len(rows))
+            cursor.close()
+            # Replika gecikmeli olabilir; önbelleğe yalnızca birincilden okunan sonuç yazılır
+            if cache_key is not None and not (routed and is_read_replica_connection(conn)):
+                cache.put(cache_key, rows, columns)
+            return rows, columns
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            if routed and conn is not None and is_read_replica_connection(conn):
+                release_read_connection(conn, broken=True)
+                conn = None
+                mark_read_replica_down(e)
+                return self._execute_query(query, params)
+            logger.error(f"Query error: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Query error: {e}")
+            raise
+        finally:
+            if conn:
+                if routed:
+                    release_read_connection(conn)
+                else:
+                    release_connection(conn)
+
+
+class BaseRepository(ReadOnlyRepository[T]):
+
+    # get_page() için sunucu tarafı arama (ILIKE) ve eşitlik filtresi sütunları
+    search_columns: Tuple[str, ...] = ()
+    filter_columns: Tuple[str, ...] = ()
+
+    def __init__(self):
+        super().__init__()
+        self._current_transaction: Optional[TransactionContext] = None
+    
     @abstractmethod
     def _entity_to_values(self, entity: T) -> tuple:
         pass
@@ -66,6 +233,7 @@ class BaseRepository(ABC, Generic[T]):
             conn = get_connection()
             tx = TransactionContext(conn)
             self._current_transaction = tx
+            _open_transactions[id(conn)] = tx
             logger.debug(f"Transaction started for {self.table_name}")
             yield tx
             
@@ -81,6 +249,7 @@ class BaseRepository(ABC, Generic[T]):
         finally:
             self._current_transaction = None
             if conn:
+                _open_transactions.pop(id(conn), None)
                 release_connection(conn)
     
     def execute_in_transaction(self, operations: List[Callable]) -> bool:
@@ -102,6 +271,7 @@ class BaseRepository(ABC, Generic[T]):
                 operation(cursor)
             
             conn.commit()
+            self._invalidate_cache()
             logger.info(f"{len(operations)} operasyon transaction içinde başarıyla tamamlandı")
             return True
             
@@ -114,23 +284,23 @@ class BaseRepository(ABC, Generic[T]):
             if conn:
                 release_connection(conn)
     
-    def _execute_query(self, query: str, params: tuple = None) -> List[tuple]:
-        conn = None
-        try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            columns = [desc[0] for desc in cursor.description] if cursor.description else []
-            rows = cursor.fetchall()
-            cursor.close()
-            logger.debug(f"Query executed: {query[:50]}... returned {len(rows)} rows")
-            return rows, columns
-        except Exception as e:
-            logger.error(f"Query error: {e}")
-            raise
-        finally:
-            if conn:
-                release_connection(conn)
+    def _invalidate_cache(self, query: str = "", conn=None) -> None:
+        """
+        Yazma işleminden sonra ilgili tabloların önbellek sürümünü artırır.
+
+        conn çağıran tarafın bağlantısıysa ve transaction() ile açıldıysa tablolar
+        transaction'a kaydedilir, sürüm commit'te artırılır.
+        """
+        tables = set(extract_write_tables(query)) if query else set()
+        if self.table_name:
+            tables.add(self.table_name)
+        if not tables:
+            return
+        tx = _open_transactions.get(id(conn)) if conn is not None else None
+        if tx is not None and not tx.committed:
+            tx.touched_tables.update(tables)
+        else:
+            get_query_cache().bump(tables)
     
     def _execute_non_query(self, query: str, params: tuple = None, return_id: bool = False) -> Optional[int]:
         """INSERT, UPDATE, DELETE sorgusu çalıştırır"""
@@ -138,7 +308,9 @@ class BaseRepository(ABC, Generic[T]):
         try:
             conn = get_connection()
             cursor = conn.cursor()
+            started = time.perf_counter()
             cursor.execute(query, params)
+            get_query_stats().record(query, (time.perf_counter() - started) * 1000, cursor.rowcount)
             
             result = None
             if return_id:
@@ -147,7 +319,7 @@ class BaseRepository(ABC, Generic[T]):
             
             conn.commit()
             cursor.close()
-            logger.debug(f"Non-query executed: {query[:50]}...")
+            self._invalidate_cache(query)
             return result
         except Exception as e:
             if conn:
@@ -158,6 +330,37 @@ class BaseRepository(ABC, Generic[T]):
             if conn:
                 release_connection(conn)
     
+    def _execute_returning(self, query: str, params: tuple = None, conn=None) -> List[tuple]:
+        """
+        RETURNING içeren tek bir INSERT/UPDATE/DELETE ifadesini çalıştırır ve
+        dönen satırları verir (toplu işlemlerde etkilenen ID'ler için).
+        
+        conn verilirse commit ve release çağıran tarafa bırakılır (_execute_copy_merge gibi).
+        """
+        owns_connection = conn is None
+        try:
+            if owns_connection:
+                conn = get_connection()
+            cursor = conn.cursor()
+            started = time.perf_counter()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            get_query_stats().record(query, (time.perf_counter() - started) * 1000, len(rows))
+            if owns_connection:
+                conn.commit()
+            cursor.close()
+            if rows:
+                self._invalidate_cache(query, conn=None if owns_connection else conn)
+            return rows
+        except Exception as e:
+            if conn and owns_connection:
+                conn.rollback()
+            logger.error(f"Returning query error: {e}")
+            raise
+        finally:
+            if conn and owns_connection:
+                release_connection(conn)
+    
     def _execute_batch(self, query: str, params_list: List[tuple]) -> int:
         """
         Batch operasyon çalıştırır (N+1 sorgu problemini çözer).
@@ -179,11 +382,14 @@ class BaseRepository(ABC, Generic[T]):
             
             # Batch execute
             from psycopg2.extras import execute_batch
+            started = time.perf_counter()
             execute_batch(cursor, query, params_list, page_size=100)
             
             affected = cursor.rowcount
+            get_query_stats().record(query, (time.perf_counter() - started) * 1000, affected)
             conn.commit()
             cursor.close()
+            self._invalidate_cache(query)
             
             logger.info(f"Batch query executed: {len(params_list)} items, {affected} affected")
             return affected
@@ -204,7 +410,83 @@ class BaseRepository(ABC, Generic[T]):
         finally:
             if conn:
                 release_connection(conn)
-    
+
+    def _execute_copy_merge(
+        self,
+        columns: List[str],
+        rows: List[tuple],
+        merge_query: str,
+        conn=None,
+        params: Optional[tuple] = None
+    ) -> List[tuple]:
+        """
+        Satırları COPY ile geçici bir staging tablosuna yükler ve tek bir
+        set tabanlı sorgu ile ana tabloya birleştirir.
+
+        Staging tablosu ana tablodaki sütun tiplerini kopyalar ve her satırın
+        giriş sırasını tutan ``_ord`` sütununu içerir.
+
+        Args:
+            columns: Yüklenecek sütunlar (ana tablodaki adlarıyla)
+            rows: Sütun sırasına uygun değer tuple'ları
+            merge_query: ``{staging}`` yer tutucusu ile staging tablosunu okuyan
+                INSERT ... SELECT ... ON CONFLICT ... RETURNING sorgusu
+            conn: Dışarıdan verilen bağlantı. Verilirse commit ve release
+                çağıran tarafa bırakılır (aynı transaction içinde birden fazla yükleme için).
+            params: merge sorgusundaki %s yer tutucularının değerleri
+
+        Returns:
+            List[tuple]: merge sorgusunun RETURNING satırları
+        """
+        if not rows:
+            return []
+
+        staging = f"_stage_{self.table_name}"
+        column_list = ', '.join(columns)
+
+        buffer = io.StringIO()
+        for ord_, row in enumerate(rows):
+            buffer.write(str(ord_))
+            for value in row:
+                buffer.write('\t')
+                buffer.write(_copy_text_value(value))
+            buffer.write('\n')
+        buffer.seek(0)
+
+        owns_connection = conn is None
+        try:
+            if owns_connection:
+                conn = get_connection()
+            cursor = conn.cursor()
+            started = time.perf_counter()
+
+            cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+            cursor.execute(f"""
+                CREATE TEMP TABLE {staging} ON COMMIT DROP AS
+                SELECT 0 AS _ord, {column_list} FROM {self.table_name} WITH NO DATA
+            """)
+            cursor.copy_expert(f"COPY {staging} (_ord, {column_list}) FROM STDIN", buffer)
+
+            cursor.execute(merge_query.format(staging=staging), params)
+            result = cursor.fetchall() if cursor.description else []
+            get_query_stats().record(merge_query, (time.perf_counter() - started) * 1000, len(rows))
+            cursor.close()
+
+            if owns_connection:
+                conn.commit()
+            self._invalidate_cache(merge_query, conn=None if owns_connection else conn)
+
+            logger.info(f"Bulk COPY merge into {self.table_name}: {len(rows)} rows staged, {len(result)} returned")
+            return result
+        except Exception as e:
+            if conn and owns_connection:
+                conn.rollback()
+            logger.error(f"Bulk COPY merge error in {self.table_name}: {e}")
+            raise
+        finally:
+            if conn and owns_connection:
+                release_connection(conn)
+
     def get_all(self, limit: Optional[int] = None, offset: int = 0) -> List[T]:
         """
         Tüm kayıtları getirir.
@@ -221,7 +503,7 @@ class BaseRepository(ABC, Generic[T]):
             params = [limit, offset]
         
         rows, columns = self._execute_query(query, tuple(params) if params else None)
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_by_id(self, id: int) -> Optional[T]:
         query = f"SELECT * FROM {self.table_name} WHERE id = %s"
@@ -246,7 +528,7 @@ class BaseRepository(ABC, Generic[T]):
         placeholders = ', '.join(['%s'] * len(ids))
         query = f"SELECT * FROM {self.table_name} WHERE id IN ({placeholders})"
         rows, columns = self._execute_query(query, tuple(ids))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def delete(self, id: int) -> bool:
         query = f"DELETE FROM {self.table_name} WHERE id = %s"
@@ -278,10 +560,13 @@ class BaseRepository(ABC, Generic[T]):
         try:
             conn = get_connection()
             cursor = conn.cursor()
+            started = time.perf_counter()
             cursor.execute(query, tuple(ids))
             affected = cursor.rowcount
+            get_query_stats().record(query, (time.perf_counter() - started) * 1000, affected)
             conn.commit()
             cursor.close()
+            self._invalidate_cache(query)
             logger.info(f"Batch deleted from {self.table_name}: {affected} records")
             return affected
         except Exception as e:
@@ -323,8 +608,91 @@ class BaseRepository(ABC, Generic[T]):
             limit: Maksimum sonuç sayısı
         """
         query = f"SELECT * FROM {self.table_name} WHERE {column} ILIKE %s LIMIT %s"
-        rows, columns = self._execute_query(query, (f"%{value}%", limit))
-        return [self._row_to_entity(row, columns) for row in rows]
+        rows, columns = self._execute_query(query, (ilike_pattern(str(value)), limit))
+        return self._rows_to_entities(rows, columns)
+    
+    def get_page(
+        self,
+        after: Optional[tuple] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        search: Optional[str] = None,
+        **filters: Any
+    ) -> Page[T]:
+        """
+        Kayıtları id sırasıyla keyset sayfalama ile getirir.
+        
+        Args:
+            after: Önceki sayfanın next_cursor değeri (None: ilk sayfa)
+            limit: Sayfa boyutu
+            search: search_columns üzerinde büyük/küçük harf duyarsız arama
+            **filters: filter_columns içindeki sütunlar için eşitlik filtresi (None yok sayılır)
+        """
+        conditions, params = self._filter_conditions(filters)
+        if search:
+            condition, search_params = self._search_condition(self.search_columns, search)
+            conditions.append(condition)
+            params.extend(search_params)
+        return self._keyset_page(
+            f"SELECT * FROM {self.table_name}", [('id', 'id')], conditions, params, after, limit
+        )
+    
+    def _filter_conditions(self, filters: Dict[str, Any], alias: str = "") -> Tuple[List[str], List[Any]]:
+        conditions, params = [], []
+        prefix = f"{alias}." if alias else ""
+        for column, value in filters.items():
+            if column not in self.filter_columns:
+                raise ValueError(f"{self.table_name} için geçersiz filtre: {column}")
+            if value is None:
+                continue
+            conditions.append(f"{prefix}{column} = %s")
+            params.append(value)
+        return conditions, params
+    
+    @staticmethod
+    def _search_condition(columns: Sequence[str], term: str) -> Tuple[str, List[Any]]:
+        """Sütunlardan herhangi birinde terimi arayan (a ILIKE %s OR b ILIKE %s ...) koşulu."""
+        if not columns:
+            raise ValueError("Arama için sütun tanımlanmamış")
+        pattern = ilike_pattern(term.strip())
+        condition = "(" + " OR ".join(f"{column} ILIKE %s" for column in columns) + ")"
+        return condition, [pattern] * len(columns)
+    
+    def _keyset_page(
+        self,
+        select_sql: str,
+        order_keys: Sequence[Tuple[str, str]],
+        conditions: Sequence[str],
+        params: Sequence[Any],
+        after: Optional[tuple],
+        limit: int
+    ) -> Page[T]:
+        """
+        WHERE'siz bir SELECT'i keyset (seek) sayfalama ile çalıştırır.
+        
+        order_keys: [(sıralama ifadesi, sonuç sütun adı), ...]. İfadeler NULL
+        olmamalı ve sonuncusu benzersiz olmalıdır (genelde id); sayfa sınırı
+        (k1, k2, ...) > (%s, %s, ...) satır karşılaştırmasıyla uygulanır, böylece
+        OFFSET'in aksine derin sayfalar da indeks üzerinden okunur.
+        """
+        conditions = list(conditions)
+        params = list(params)
+        expressions = ', '.join(expression for expression, _ in order_keys)
+        if after is not None:
+            if len(after) != len(order_keys):
+                raise ValueError("Sayfa imleci sıralama anahtarlarıyla uyuşmuyor")
+            conditions.append(f"({expressions}) > ({', '.join(['%s'] * len(after))})")
+            params.extend(after)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"{select_sql}{where} ORDER BY {expressions} LIMIT %s"
+        params.append(limit + 1)
+        
+        rows, columns = self._execute_query(query, tuple(params))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            positions = [columns.index(name) for _, name in order_keys]
+            next_cursor = tuple(rows[-1][i] for i in positions)
+        return Page(self._rows_to_entities(rows, columns), next_cursor)
     
     def get_with_relations(self, id: int, relations: List[str]) -> Optional[T]:
         """
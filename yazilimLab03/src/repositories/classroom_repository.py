@@ -2,43 +2,34 @@
 Derslik repository sınıfı
 """
 
-from typing import List, Optional
-from src.repositories.base_repository import BaseRepository
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.repositories.base_repository import BaseRepository, Page, DEFAULT_PAGE_SIZE
+from src.repositories.row_mapper import get_row_mapper
+from src.repositories.schema_probe import has_column
+from src.repositories.exam_schedule_repository import PERIOD_SQL, _period_params
 from src.models.classroom import Classroom, CLASSROOM_TYPE_MAP, CLASSROOM_TYPES
 
 
 class ClassroomRepository(BaseRepository[Classroom]):
+
+    use_query_cache = True
+    model_class = Classroom
     
     def __init__(self):
         super().__init__()
         self.table_name = "classrooms"
-        self._block_column_exists = None  # Cache for block column check
     
     def _check_block_column_exists(self) -> bool:
-        """Block sütununun veritabanında mevcut olup olmadığını kontrol eder."""
-        if self._block_column_exists is not None:
-            return self._block_column_exists
-        
-        try:
-            query = """
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name='classrooms' AND column_name='block'
-            """
-            rows, _ = self._execute_query(query)
-            self._block_column_exists = len(rows) > 0
-        except Exception:
-            self._block_column_exists = False
-        
-        return self._block_column_exists
+        """Block sütununun veritabanında mevcut olup olmadığını kontrol eder (süreç başına bir kez)."""
+        return has_column('classrooms', 'block')
     
     def _get_block_select(self) -> str:
         """Block sütunu varsa sorguda ekler."""
         return ", c.block" if self._check_block_column_exists() else ""
     
     def _row_to_entity(self, row: tuple, columns: List[str]) -> Classroom:
-        data = dict(zip(columns, row))
-        return Classroom.from_dict(data)
+        return get_row_mapper(self.model_class, columns)(row)
     
     def _entity_to_values(self, entity: Classroom) -> tuple:
         if self._check_block_column_exists():
@@ -73,24 +64,59 @@ class ClassroomRepository(BaseRepository[Classroom]):
             ORDER BY f.name, c.name
         """
         rows, columns = self._execute_query(query)
-        classrooms = [self._row_to_entity(row, columns) for row in rows]
+        classrooms = self._rows_to_entities(rows, columns)
         
         # Proximity loader'dan nearby classrooms bilgisi eklenir
         try:
             loader = get_proximity_loader()
             for classroom in classrooms:
-                neighbors = loader.get_neighbors(classroom.name)
-                if hasattr(classroom, 'nearby_classrooms'):
-                    classroom.nearby_classrooms = neighbors
-                elif hasattr(classroom, 'neighbor_classrooms'):
-                    classroom.neighbor_classrooms = neighbors
-                else:
-                    setattr(classroom, 'nearby_classrooms', neighbors)
+                classroom.nearby_classrooms = loader.get_neighbors(classroom.name)
         except Exception:
             pass  # Hata durumunda sessizce devam et
         
         return classrooms
     
+    def get_page(
+        self,
+        after: Optional[tuple] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        search: Optional[str] = None,
+        faculty_id: Optional[int] = None,
+        suitable_only: bool = False
+    ) -> Page[Classroom]:
+        """Derslikleri fakülte ve ad sırasıyla sayfa sayfa getirir; arama derslik ve fakülte adında yapılır."""
+        from src.utils.classroom_proximity_loader import get_proximity_loader
+        
+        conditions = []
+        params = []
+        if faculty_id is not None:
+            conditions.append("c.faculty_id = %s")
+            params.append(faculty_id)
+        if suitable_only:
+            conditions.append("c.is_suitable = TRUE")
+        if search:
+            condition, search_params = self._search_condition(("c.name", "f.name"), search)
+            conditions.append(condition)
+            params.extend(search_params)
+        
+        block_select = self._get_block_select()
+        select_sql = f"""
+            SELECT c.id, c.name, c.faculty_id, c.capacity, c.has_computer, c.is_suitable, c.room_type{block_select},
+                   f.name as faculty_name, COALESCE(f.name, '') as faculty_sort_name
+            FROM classrooms c
+            LEFT JOIN faculties f ON c.faculty_id = f.id
+        """
+        order_keys = [("COALESCE(f.name, '')", 'faculty_sort_name'), ('c.name', 'name'), ('c.id', 'id')]
+        page = self._keyset_page(select_sql, order_keys, conditions, params, after, limit)
+        
+        try:
+            loader = get_proximity_loader()
+            for classroom in page.items:
+                classroom.nearby_classrooms = loader.get_neighbors(classroom.name)
+        except Exception:
+            pass
+        return page
+    
     def get_by_id(self, id: int) -> Optional[Classroom]:
         block_select = self._get_block_select()
         query = f"""
@@ -141,6 +167,80 @@ class ClassroomRepository(BaseRepository[Classroom]):
         except Exception:
             return False
     
+    def get_ids_by_names(self, names: Sequence[str], conn=None) -> Dict[str, int]:
+        """
+        Adı verilen dersliklerin ID'leri: {name: id}. conn verilirse transaction içinde
+        o bağlantının cursor'ıyla okunur; yalnızca okuma olduğundan önbellek geçersizlenmez.
+        """
+        if not names:
+            return {}
+        query = "SELECT name, id FROM classrooms WHERE name = ANY(%s)"
+        params = (list(names),)
+        if conn is None:
+            rows, _ = self._execute_query(query, params)
+        else:
+            with conn.cursor() as cursor:
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+        return {name: classroom_id for name, classroom_id in rows}
+    
+    def bulk_upsert_capacities(self, classrooms: List[Classroom], conn=None) -> Tuple[int, int, int]:
+        """
+        Derslik kapasitelerini (ve varsa blok bilgisini) derslik adına göre COPY +
+        tek bir birleştirme sorgusuyla yazar. Mevcut derslikler yalnızca değer
+        değiştiyse güncellenir; olmayanlar tüm alanlarıyla eklenir.
+        
+        Sayılar derslik adı başınadır: tabloda aynı adlı birden çok satır olsa da
+        her ad bir kez sayılır ve toplam yüklenen benzersiz ad sayısına eşittir.
+        
+        Returns:
+            (eklenen, güncellenen, değişmeyen) derslik sayıları
+        """
+        unique = {classroom.name: classroom for classroom in classrooms if classroom.name}
+        if not unique:
+            return 0, 0, 0
+        
+        columns = ['name', 'faculty_id', 'capacity', 'has_computer', 'is_suitable', 'room_type']
+        block_set = block_changed = block_insert = ''
+        if self._check_block_column_exists():
+            columns.append('block')
+            block_set = ', block = s.block'
+            block_changed = ' OR c.block IS DISTINCT FROM s.block'
+            block_insert = ', s.block'
+        column_list = ', '.join(columns)
+        
+        query = f"""
+            WITH updated AS (
+                UPDATE classrooms c
+                SET capacity = s.capacity{block_set}
+                FROM {{staging}} s
+                WHERE c.name = s.name
+                  AND (c.capacity IS DISTINCT FROM s.capacity{block_changed})
+                RETURNING c.name
+            ),
+            inserted AS (
+                INSERT INTO classrooms ({column_list})
+                SELECT s.name, s.faculty_id, s.capacity, s.has_computer, s.is_suitable, s.room_type{block_insert}
+                FROM {{staging}} s
+                WHERE NOT EXISTS (SELECT 1 FROM classrooms c WHERE c.name = s.name)
+                ORDER BY s._ord
+                RETURNING id
+            )
+            SELECT (SELECT COUNT(*) FROM inserted),
+                   (SELECT COUNT(DISTINCT name) FROM updated),
+                   (SELECT COUNT(*) FROM {{staging}} s
+                    WHERE EXISTS (SELECT 1 FROM classrooms c WHERE c.name = s.name)
+                      AND s.name NOT IN (SELECT name FROM updated))
+        """
+        rows = self._execute_copy_merge(
+            columns,
+            [self._entity_to_values(classroom) for classroom in unique.values()],
+            query,
+            conn=conn
+        )
+        inserted, updated, unchanged = rows[0]
+        return inserted, updated, unchanged
+    
     def get_by_faculty(self, faculty_id: int) -> List[Classroom]:
         block_select = self._get_block_select()
         query = f"""
@@ -152,7 +252,7 @@ class ClassroomRepository(BaseRepository[Classroom]):
             ORDER BY c.name
         """
         rows, columns = self._execute_query(query, (faculty_id,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_by_room_type(self, room_type: str) -> List[Classroom]:
         """Belirli bir tipteki derslikleri getirir"""
@@ -170,7 +270,7 @@ class ClassroomRepository(BaseRepository[Classroom]):
             ORDER BY c.capacity DESC
         """
         rows, columns = self._execute_query(query, (normalized_type,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_by_types(self, room_types: List[str]) -> List[Classroom]:
         """Birden fazla tipteki derslikleri getirir"""
@@ -189,7 +289,7 @@ class ClassroomRepository(BaseRepository[Classroom]):
             ORDER BY c.capacity DESC
         """
         rows, columns = self._execute_query(query, tuple(normalized_types))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_by_min_capacity(self, min_capacity: int) -> List[Classroom]:
         block_select = self._get_block_select()
@@ -202,12 +302,12 @@ class ClassroomRepository(BaseRepository[Classroom]):
             ORDER BY c.capacity
         """
         rows, columns = self._execute_query(query, (min_capacity,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_available_for_exam(self, exam_date: str, start_time: str, end_time: str, room_type: Optional[str] = None) -> List[Classroom]:
         """Belirtilen tarihte müsait olan derslikleri getirir. İsteğe bağlı oda tipi filtresi."""
         type_filter = ""
-        params = [exam_date, start_time, start_time, end_time, end_time, start_time, end_time]
+        params = []
         
         if room_type and room_type.upper() in CLASSROOM_TYPE_MAP:
             type_filter = " AND c.room_type = %s"
@@ -230,20 +330,79 @@ class ClassroomRepository(BaseRepository[Classroom]):
             LEFT JOIN faculties f ON c.faculty_id = f.id
             WHERE c.is_suitable = TRUE
             {type_filter}
-            AND c.id NOT IN (
-                SELECT es.classroom_id FROM exam_schedule es
-                WHERE es.exam_date = %s
+            AND NOT EXISTS (
+                SELECT 1 FROM exam_schedule es
+                WHERE es.classroom_id = c.id
+                AND es.exam_date = %s
                 AND es.status != 'cancelled'
-                AND (
-                    (es.start_time <= %s AND es.end_time > %s)
-                    OR (es.start_time < %s AND es.end_time >= %s)
-                    OR (es.start_time >= %s AND es.end_time <= %s)
-                )
+                AND es.period && {PERIOD_SQL}
             )
             ORDER BY c.capacity
         """
+        params += [exam_date, *_period_params(exam_date, start_time, end_time)]
+        rows, columns = self._execute_query(query, tuple(params))
+        return self._rows_to_entities(rows, columns)
+    
+    def get_availability_matrix(
+        self,
+        exam_date: date,
+        slots: Sequence[Tuple],
+        room_type: Optional[str] = None,
+        classroom_ids: Optional[List[int]] = None
+    ) -> List[Tuple[Classroom, List[bool]]]:
+        """
+        Bir tarihteki tüm zaman dilimleri için derslik müsaitliğini tek sorguda getirir.
+        
+        Args:
+            exam_date: Sınav tarihi
+            slots: (başlangıç, bitiş) saat çiftleri
+            room_type: İsteğe bağlı oda tipi filtresi
+            classroom_ids: Verilirse yalnızca bu derslikler (uygunluk filtresi uygulanmaz)
+        
+        Returns:
+            List[Tuple[Classroom, List[bool]]]: Derslik ve slot sırasına göre müsaitlik
+        """
+        if not slots:
+            return []
+        
+        filters = ""
+        params: list = [exam_date, exam_date, exam_date]
+        if classroom_ids is not None:
+            if not classroom_ids:
+                return []
+            filters += " AND c.id = ANY(%s)"
+            params.append(list(classroom_ids))
+        else:
+            filters += " AND c.is_suitable = TRUE"
+        if room_type and room_type.upper() in CLASSROOM_TYPE_MAP:
+            filters += " AND c.room_type = %s"
+            params.append(room_type.upper())
+        
+        block_select = self._get_block_select()
+        query = f"""
+            SELECT c.id, c.name, c.faculty_id, c.capacity, c.has_computer, c.is_suitable, c.room_type{block_select},
+                   f.name as faculty_name,
+                   array_agg(NOT EXISTS (
+                       SELECT 1 FROM exam_schedule es
+                       WHERE es.classroom_id = c.id
+                       AND es.exam_date = %s
+                       AND es.status != 'cancelled'
+                       AND es.period && tsrange(%s::date + s.start_time, %s::date + s.end_time, '[)')
+                   ) ORDER BY s.idx) as free_slots
+            FROM classrooms c
+            LEFT JOIN faculties f ON c.faculty_id = f.id
+            CROSS JOIN unnest(%s::time[], %s::time[]) WITH ORDINALITY AS s(start_time, end_time, idx)
+            WHERE TRUE{filters}
+            GROUP BY c.id, f.name
+            ORDER BY c.capacity
+        """
+        # unnest parametreleri FROM'da, filtreler WHERE'de yer alır
+        params[3:3] = [[start for start, _ in slots], [end for _, end in slots]]
         rows, columns = self._execute_query(query, tuple(params))
-        return [self._row_to_entity(row, columns) for row in rows]
+        if not rows:
+            return []
+        mapper = get_row_mapper(self.model_class, columns)
+        return [(mapper(row), list(row[-1])) for row in rows]
     
     def get_faculties(self) -> List[dict]:
         query = """
@@ -274,7 +433,7 @@ class ClassroomRepository(BaseRepository[Classroom]):
             ORDER BY c.capacity
         """
         rows, columns = self._execute_query(query, tuple(params))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_exam_suitable_classrooms(self, room_type: Optional[str] = None) -> List[Classroom]:
         """Sınav için uygun derslikleri getirir. İsteğe bağlı oda tipi filtresi."""
@@ -296,7 +455,7 @@ class ClassroomRepository(BaseRepository[Classroom]):
             ORDER BY f.name, c.name
         """
         rows, columns = self._execute_query(query, tuple(params))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_room_types(self) -> List[dict]:
         """Mevcut derslik tiplerini döndürür"""
@@ -328,7 +487,7 @@ class ClassroomRepository(BaseRepository[Classroom]):
     def get_available_classrooms(self, exam_date: str, start_time: str, end_time: str, room_type: Optional[str] = None) -> List[Classroom]:
         """Belirtilen zaman diliminde müsait derslikleri getirir. İsteğe bağlı oda tipi filtresi."""
         type_filter = ""
-        params = [exam_date, end_time, start_time, end_time, start_time, start_time, end_time]
+        params = []
         
         if room_type and room_type.upper() in CLASSROOM_TYPE_MAP:
             type_filter = " AND c.room_type = %s"
@@ -342,17 +501,15 @@ class ClassroomRepository(BaseRepository[Classroom]):
             LEFT JOIN faculties f ON c.faculty_id = f.id
             WHERE c.is_suitable = TRUE
             {type_filter}
-            AND c.id NOT IN (
-                SELECT es.classroom_id FROM exam_schedule es
-                WHERE es.exam_date = %s
+            AND NOT EXISTS (
+                SELECT 1 FROM exam_schedule es
+                WHERE es.classroom_id = c.id
+                AND es.exam_date = %s
                 AND es.status != 'cancelled'
-                AND (
-                    (es.start_time < %s AND es.end_time > %s)
-                    OR (es.start_time < %s AND es.end_time > %s)
-                    OR (es.start_time >= %s AND es.end_time <= %s)
-                )
+                AND es.period && {PERIOD_SQL}
             )
             ORDER BY f.name, c.name
         """
+        params += [exam_date, *_period_params(exam_date, start_time, end_time)]
         rows, columns = self._execute_query(query, tuple(params))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
@@ -2,20 +2,24 @@
 Ders repository sınıfı
 """
 
-from typing import List, Optional
-from src.repositories.base_repository import BaseRepository
+from typing import Dict, List, Optional
+from src.repositories.base_repository import BaseRepository, Page, DEFAULT_PAGE_SIZE
+from src.repositories.row_mapper import get_row_mapper
 from src.models.course import Course
 
 
 class CourseRepository(BaseRepository[Course]):
+
+    model_class = Course
+    search_columns = ("c.code", "c.name", "d.name")
+    filter_columns = ("department_id", "lecturer_id")
     
     def __init__(self):
         super().__init__()
         self.table_name = "courses"
     
     def _row_to_entity(self, row: tuple, columns: List[str]) -> Course:
-        data = dict(zip(columns, row))
-        return Course.from_dict(data)
+        return get_row_mapper(self.model_class, columns)(row)
     
     def _entity_to_values(self, entity: Course) -> tuple:
         return (
@@ -68,6 +72,31 @@ class CourseRepository(BaseRepository[Course]):
         except Exception:
             return False
     
+    def refresh_student_counts(self, course_ids: List[int], conn=None) -> Dict[int, int]:
+        """
+        Derslerin student_count değerini aktif ders kayıtlarından tek UPDATE ile yeniler.
+        
+        Args:
+            conn: Verilirse aynı transaction içinde çalışır (commit çağırana aittir)
+            
+        Returns:
+            dict: {course_id: student_count}
+        """
+        if not course_ids:
+            return {}
+        query = """
+            UPDATE courses c
+            SET student_count = (
+                    SELECT COUNT(*) FROM student_courses sc
+                    WHERE sc.course_id = c.id AND sc.is_active = TRUE
+                ),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE c.id = ANY(%s)
+            RETURNING c.id, c.student_count
+        """
+        rows = self._execute_returning(query, ([int(i) for i in course_ids],), conn=conn)
+        return {course_id: count for course_id, count in rows}
+    
     def get_by_code(self, code: str) -> Optional[Course]:
         query = "SELECT * FROM courses WHERE code = %s"
         rows, columns = self._execute_query(query, (code,))
@@ -86,7 +115,7 @@ class CourseRepository(BaseRepository[Course]):
             ORDER BY c.year, c.semester, c.code
         """
         rows, columns = self._execute_query(query, (department_id,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_by_lecturer_id(self, lecturer_id: int) -> List[Course]:
         query = """
@@ -97,7 +126,7 @@ class CourseRepository(BaseRepository[Course]):
             ORDER BY c.code
         """
         rows, columns = self._execute_query(query, (lecturer_id,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_all_with_details(self) -> List[Course]:
         query = """
@@ -111,7 +140,32 @@ class CourseRepository(BaseRepository[Course]):
             ORDER BY f.name, d.name, c.year, c.semester, c.code
         """
         rows, columns = self._execute_query(query)
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
+    
+    def get_page(
+        self,
+        after: Optional[tuple] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        search: Optional[str] = None,
+        department_id: Optional[int] = None,
+        lecturer_id: Optional[int] = None
+    ) -> Page[Course]:
+        """Dersleri bölüm ve hoca adlarıyla birlikte id sırasıyla sayfa sayfa getirir."""
+        conditions, params = self._filter_conditions(
+            {'department_id': department_id, 'lecturer_id': lecturer_id}, alias='c'
+        )
+        if search:
+            condition, search_params = self._search_condition(self.search_columns, search)
+            conditions.append(condition)
+            params.extend(search_params)
+        select_sql = """
+            SELECT c.*, d.name as department_name,
+                   CONCAT(l.title, ' ', l.first_name, ' ', l.last_name) as lecturer_name
+            FROM courses c
+            LEFT JOIN departments d ON c.department_id = d.id
+            LEFT JOIN lecturers l ON c.lecturer_id = l.id
+        """
+        return self._keyset_page(select_sql, [('c.id', 'id')], conditions, params, after, limit)
     
     def get_by_year_semester(self, year: int, semester: int) -> List[Course]:
         query = """
@@ -124,7 +178,7 @@ class CourseRepository(BaseRepository[Course]):
             ORDER BY d.name, c.code
         """
         rows, columns = self._execute_query(query, (year, semester))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_unscheduled_courses(self, exam_type: str = None) -> List[Course]:
  
@@ -137,9 +191,11 @@ class CourseRepository(BaseRepository[Course]):
                 LEFT JOIN departments d ON c.department_id = d.id
                 LEFT JOIN lecturers l ON c.lecturer_id = l.id
                 LEFT JOIN faculties f ON d.faculty_id = f.id
-                WHERE c.id NOT IN (
-                    SELECT DISTINCT course_id FROM exam_schedule
-                    WHERE status != 'cancelled' AND exam_type = %s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM exam_schedule es
+                    WHERE es.course_id = c.id
+                    AND es.status != 'cancelled'
+                    AND es.exam_type = %s
                 )
                 AND c.has_exam = TRUE
                 AND c.exam_duration > 0
@@ -155,13 +211,14 @@ class CourseRepository(BaseRepository[Course]):
                 LEFT JOIN departments d ON c.department_id = d.id
                 LEFT JOIN lecturers l ON c.lecturer_id = l.id
                 LEFT JOIN faculties f ON d.faculty_id = f.id
-                WHERE c.id NOT IN (
-                    SELECT DISTINCT course_id FROM exam_schedule
-                    WHERE status != 'cancelled'
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM exam_schedule es
+                    WHERE es.course_id = c.id
+                    AND es.status != 'cancelled'
                 )
                 AND c.has_exam = TRUE
                 AND c.exam_duration > 0
                 ORDER BY f.name, d.name, c.year, c.semester, c.code
             """
             rows, columns = self._execute_query(query)
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
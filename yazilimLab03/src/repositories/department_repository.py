@@ -4,18 +4,21 @@ Bölüm repository sınıfı
 
 from typing import List, Optional
 from src.repositories.base_repository import BaseRepository
+from src.repositories.row_mapper import get_row_mapper
 from src.models.department import Department
 
 
 class DepartmentRepository(BaseRepository[Department]):
+
+    use_query_cache = True
+    model_class = Department
     
     def __init__(self):
         super().__init__()
         self.table_name = "departments"
     
     def _row_to_entity(self, row: tuple, columns: List[str]) -> Department:
-        data = dict(zip(columns, row))
-        return Department.from_dict(data)
+        return get_row_mapper(self.model_class, columns)(row)
     
     def _entity_to_values(self, entity: Department) -> tuple:
         return (
@@ -63,7 +66,7 @@ class DepartmentRepository(BaseRepository[Department]):
             ORDER BY d.name
         """
         rows, columns = self._execute_query(query, (faculty_id,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_all_with_faculty(self) -> List[Department]:
         query = """
@@ -73,4 +76,4 @@ class DepartmentRepository(BaseRepository[Department]):
             ORDER BY f.name, d.name
         """
         rows, columns = self._execute_query(query)
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
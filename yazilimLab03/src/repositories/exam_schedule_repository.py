@@ -2,21 +2,58 @@
 Sınav programı repository sınıfı
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 from datetime import date
-from src.repositories.base_repository import BaseRepository
+from psycopg2 import errors as pg_errors
+from src.config.database import get_connection, release_connection
+from src.repositories.base_repository import BaseRepository, Page, DEFAULT_PAGE_SIZE
+from src.repositories.row_mapper import get_row_mapper
 from src.models.exam_schedule import ExamSchedule
 
+# Derslik çift rezervasyonunu engelleyen kısıtlar (bkz. migrations/002)
+CLASSROOM_CONFLICT_CONSTRAINTS = ('exam_schedule_no_classroom_overlap', 'unique_classroom_time')
+
+# (exam_date, start_time, exam_date, end_time) parametreleriyle [başlangıç, bitiş) aralığı
+PERIOD_SQL = "tsrange(%s::date + %s::time, %s::date + %s::time, '[)')"
+
+
+def _period_params(exam_date, start_time, end_time) -> tuple:
+    return (exam_date, start_time, exam_date, end_time)
+
+
+class ExamConflictError(Exception):
+    """Aynı derslikte zaman aralığı çakışan bir sınav yazılmaya çalışıldığında fırlatılır."""
+    
+    def __init__(self, message: str, classroom_id: Optional[int] = None, exam_date: Optional[date] = None):
+        super().__init__(message)
+        self.classroom_id = classroom_id
+        self.exam_date = exam_date
+
+
+def _raise_if_classroom_conflict(error: Exception, exam: Optional[ExamSchedule] = None) -> None:
+    """Exclusion/unique ihlalini ExamConflictError'a çevirir; başka hatalara dokunmaz."""
+    if not isinstance(error, (pg_errors.ExclusionViolation, pg_errors.UniqueViolation)):
+        return
+    constraint = getattr(getattr(error, 'diag', None), 'constraint_name', None)
+    if constraint not in CLASSROOM_CONFLICT_CONSTRAINTS:
+        return
+    if exam is not None:
+        message = (f"Derslik (ID: {exam.classroom_id}) {exam.exam_date} tarihinde "
+                   f"{exam.start_time}-{exam.end_time} aralığında başka bir sınav için ayrılmış.")
+        raise ExamConflictError(message, exam.classroom_id, exam.exam_date) from error
+    raise ExamConflictError("Derslik belirtilen zaman aralığında başka bir sınav için ayrılmış.") from error
+
 
 class ExamScheduleRepository(BaseRepository[ExamSchedule]):
+
+    model_class = ExamSchedule
     
     def __init__(self):
         super().__init__()
         self.table_name = "exam_schedule"
     
     def _row_to_entity(self, row: tuple, columns: List[str]) -> ExamSchedule:
-        data = dict(zip(columns, row))
-        return ExamSchedule.from_dict(data)
+        return get_row_mapper(self.model_class, columns)(row)
     
     def _entity_to_values(self, entity: ExamSchedule) -> tuple:
         return (
@@ -31,14 +68,141 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
         )
     
     def create(self, exam_schedule: ExamSchedule) -> int:
+        """
+        Sınav kaydı oluşturur. Derslik çakışması ön sorgu ile değil, veritabanındaki
+        exclusion constraint ile yakalanır.
+        
+        Raises:
+            ExamConflictError: Aynı derslikte çakışan iptal edilmemiş sınav varsa
+        """
         query = """
             INSERT INTO exam_schedule (course_id, classroom_id, exam_date, start_time, end_time, exam_type, status, notes)
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
             RETURNING id
         """
         values = self._entity_to_values(exam_schedule)
-        return self._execute_non_query(query, values, return_id=True)
+        try:
+            return self._execute_non_query(query, values, return_id=True)
+        except Exception as e:
+            _raise_if_classroom_conflict(e, exam_schedule)
+            raise
     
+    def create_all(self, exams: List[ExamSchedule]) -> List[int]:
+        """
+        Birden fazla sınav kaydını tek transaction içinde oluşturur (birleşik derslikli
+        sınavlar için). Herhangi bir derslikte çakışma olursa hiçbir kayıt yazılmaz.
+        
+        Raises:
+            ExamConflictError: Derslik çakışması varsa
+        """
+        if not exams:
+            return []
+        
+        query = """
+            INSERT INTO exam_schedule (course_id, classroom_id, exam_date, start_time, end_time, exam_type, status, notes)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            RETURNING id
+        """
+        conn = None
+        current = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            ids = []
+            for exam in exams:
+                current = exam
+                cursor.execute(query, self._entity_to_values(exam))
+                exam.id = cursor.fetchone()[0]
+                ids.append(exam.id)
+            conn.commit()
+            cursor.close()
+            self._invalidate_cache(query)
+            return ids
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            for exam in exams:
+                exam.id = None
+            _raise_if_classroom_conflict(e, current)
+            raise
+        finally:
+            if conn:
+                release_connection(conn)
+
+    def bulk_upsert(self, exams: List[ExamSchedule], conn=None) -> List[int]:
+        """
+        Sınavları COPY + tek INSERT ... ON CONFLICT ile toplu yükler.
+
+        Çakışma anahtarı unique_classroom_time (derslik, tarih, başlangıç) kısıtıdır;
+        aynı slottaki mevcut kayıt gelen kayıtla güncellenir. Dersliği olmayan
+        (classroom_id NULL) kayıtlar bu anahtarla eşleşmez; her biri ayrı satır
+        olarak eklenir ve ID'leri sıradan önceden alınır. Atanan ID'ler
+        entity'lere de yazılır.
+
+        Returns:
+            List[int]: Giriş sırasına göre sınav ID'leri
+
+        Raises:
+            ExamConflictError: Yüklenen sınavlardan biri aynı derslikte başka bir
+                sınavla çakışıyorsa (hiçbir kayıt yazılmaz)
+        """
+        if not exams:
+            return []
+
+        columns = ['course_id', 'classroom_id', 'exam_date', 'start_time',
+                   'end_time', 'exam_type', 'status', 'notes']
+        query = """
+            WITH src AS (
+                SELECT DISTINCT ON (classroom_id, exam_date, start_time) *
+                FROM {staging}
+                WHERE classroom_id IS NOT NULL
+                ORDER BY classroom_id, exam_date, start_time, _ord DESC
+            ), unassigned AS (
+                SELECT nextval(pg_get_serial_sequence('exam_schedule', 'id')) AS id, *
+                FROM {staging}
+                WHERE classroom_id IS NULL
+            ), inserted_unassigned AS (
+                INSERT INTO exam_schedule (id, course_id, classroom_id, exam_date, start_time, end_time, exam_type, status, notes)
+                SELECT id, course_id, classroom_id, exam_date, start_time, end_time, exam_type, status, notes
+                FROM unassigned
+                RETURNING id
+            ), merged AS (
+                INSERT INTO exam_schedule (course_id, classroom_id, exam_date, start_time, end_time, exam_type, status, notes)
+                SELECT course_id, classroom_id, exam_date, start_time, end_time, exam_type, status, notes
+                FROM src
+                ON CONFLICT ON CONSTRAINT unique_classroom_time DO UPDATE
+                SET course_id = EXCLUDED.course_id,
+                    end_time = EXCLUDED.end_time,
+                    exam_type = EXCLUDED.exam_type,
+                    status = EXCLUDED.status,
+                    notes = EXCLUDED.notes,
+                    updated_at = CURRENT_TIMESTAMP
+                RETURNING id, classroom_id, exam_date, start_time
+            )
+            SELECT s._ord, m.id
+            FROM {staging} s
+            JOIN merged m USING (classroom_id, exam_date, start_time)
+            UNION ALL
+            SELECT _ord, id FROM unassigned
+        """
+        try:
+            rows = self._execute_copy_merge(
+                columns,
+                [self._entity_to_values(e) for e in exams],
+                query,
+                conn=conn
+            )
+        except Exception as e:
+            _raise_if_classroom_conflict(e)
+            raise
+
+        ids_by_ord = dict(rows)
+        ids = []
+        for ord_, exam in enumerate(exams):
+            exam.id = ids_by_ord.get(ord_)
+            ids.append(exam.id)
+        return ids
+
     def update(self, exam_schedule: ExamSchedule) -> bool:
         query = """
             UPDATE exam_schedule
@@ -50,7 +214,8 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
         try:
             self._execute_non_query(query, values)
             return True
-        except Exception:
+        except Exception as e:
+            _raise_if_classroom_conflict(e, exam_schedule)
             return False
     
     def get_by_date(self, exam_date: date) -> List[ExamSchedule]:
@@ -69,7 +234,7 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             ORDER BY es.start_time, f.name, cl.name
         """
         rows, columns = self._execute_query(query, (exam_date,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_by_date_range(self, start_date: date, end_date: date) -> List[ExamSchedule]:
         query = """
@@ -87,7 +252,7 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             ORDER BY es.exam_date, es.start_time
         """
         rows, columns = self._execute_query(query, (start_date, end_date))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_by_course_id(self, course_id: int) -> List[ExamSchedule]:
         query = """
@@ -101,7 +266,7 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             ORDER BY es.exam_date, es.start_time
         """
         rows, columns = self._execute_query(query, (course_id,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_by_classroom_id(self, classroom_id: int) -> List[ExamSchedule]:
         query = """
@@ -115,7 +280,7 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             ORDER BY es.exam_date, es.start_time
         """
         rows, columns = self._execute_query(query, (classroom_id,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_all_with_details(self) -> List[ExamSchedule]:
         query = """
@@ -132,7 +297,136 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             ORDER BY es.exam_date, es.start_time
         """
         rows, columns = self._execute_query(query)
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
+    
+    # get_page() arama alanları: ders kodu/adı, hoca adı, derslik ve tarih
+    PAGE_SEARCH_COLUMNS = (
+        "c.code", "c.name", "(l.first_name || ' ' || l.last_name)", "cl.name", "es.exam_date::text"
+    )
+    
+    def get_page(
+        self,
+        after: Optional[tuple] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        search: Optional[str] = None,
+        department_id: Optional[int] = None,
+        lecturer_id: Optional[int] = None,
+        student_id: Optional[int] = None,
+        status: Optional[str] = None,
+        include_cancelled: bool = True
+    ) -> Page[ExamSchedule]:
+        """
+        Sınavları (tarih, saat, id) sırasıyla sayfa sayfa getirir. Rol filtreleri
+        (bölüm, hoca, öğrenci) ve arama sunucuda uygulanır.
+        
+        Args:
+            after: Önceki sayfanın next_cursor değeri
+            student_id: Öğrencinin aktif kayıtlı olduğu derslerin sınavları
+        """
+        conditions, params = self._scope_conditions(
+            department_id, lecturer_id, student_id, status, include_cancelled
+        )
+        if search:
+            condition, search_params = self._search_condition(self.PAGE_SEARCH_COLUMNS, search)
+            conditions.append(condition)
+            params.extend(search_params)
+        
+        select_sql = """
+            SELECT es.*, c.code as course_code, c.name as course_name, c.student_count,
+                   cl.name as classroom_name, f.name as faculty_name,
+                   CONCAT(l.title, ' ', l.first_name, ' ', l.last_name) as lecturer_name,
+                   d.name as department_name
+            FROM exam_schedule es
+            LEFT JOIN courses c ON es.course_id = c.id
+            LEFT JOIN classrooms cl ON es.classroom_id = cl.id
+            LEFT JOIN faculties f ON cl.faculty_id = f.id
+            LEFT JOIN lecturers l ON c.lecturer_id = l.id
+            LEFT JOIN departments d ON c.department_id = d.id
+        """
+        order_keys = [('es.exam_date', 'exam_date'), ('es.start_time', 'start_time'), ('es.id', 'id')]
+        return self._keyset_page(select_sql, order_keys, conditions, params, after, limit)
+    
+    @staticmethod
+    def _scope_conditions(
+        department_id: Optional[int] = None,
+        lecturer_id: Optional[int] = None,
+        student_id: Optional[int] = None,
+        status: Optional[str] = None,
+        include_cancelled: bool = True
+    ) -> Tuple[List[str], List[Any]]:
+        """Rol filtrelerini (es/c takma adlarıyla) WHERE koşullarına çevirir."""
+        conditions = []
+        params = []
+        if department_id is not None:
+            conditions.append("c.department_id = %s")
+            params.append(department_id)
+        if lecturer_id is not None:
+            conditions.append("c.lecturer_id = %s")
+            params.append(lecturer_id)
+        if student_id is not None:
+            conditions.append("""EXISTS (
+                SELECT 1 FROM student_courses sc
+                WHERE sc.course_id = es.course_id AND sc.student_id = %s AND sc.is_active = TRUE
+            )""")
+            params.append(student_id)
+        if status is not None:
+            conditions.append("es.status = %s")
+            params.append(status)
+        if not include_cancelled:
+            conditions.append("es.status != 'cancelled'")
+        return conditions, params
+    
+    def get_schedule_rows(
+        self,
+        department_id: Optional[int] = None,
+        lecturer_id: Optional[int] = None,
+        student_id: Optional[int] = None,
+        include_cancelled: bool = True,
+        from_date: Optional[date] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Sınav programı ekranlarının (yaklaşan sınavlar, öğrenci programı) gösterdiği
+        sütunları tek sorguda, (tarih, saat, id) sırasıyla dict olarak döndürür.
+        Rol filtreleri get_page() ile aynıdır; entity oluşturulmaz ve Python'da
+        filtreleme/sıralama yapılmaz.
+        
+        Args:
+            from_date: Yalnızca bu tarihten itibaren olan sınavlar
+            limit: En fazla satır sayısı (None: tümü)
+        """
+        conditions, params = self._scope_conditions(
+            department_id, lecturer_id, student_id, include_cancelled=include_cancelled
+        )
+        if from_date is not None:
+            conditions.append("es.exam_date >= %s")
+            params.append(from_date)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        limit_sql = ""
+        if limit is not None:
+            limit_sql = "LIMIT %s"
+            params.append(limit)
+        query = f"""
+            SELECT es.id, es.course_id, c.code AS course_code, c.name AS course_name,
+                   es.exam_date AS date, es.start_time::text AS start_time, es.end_time::text AS end_time,
+                   to_char(es.start_time, 'HH24:MI') || ' - ' || to_char(es.end_time, 'HH24:MI') AS time,
+                   COALESCE(cl.name, 'Belirsiz') AS classroom,
+                   COALESCE(f.name, 'Belirsiz') AS faculty_name,
+                   COALESCE(d.name, 'Belirsiz') AS department_name,
+                   CONCAT_WS(' ', l.title, l.first_name, l.last_name) AS lecturer_name,
+                   c.student_count, es.exam_type, es.status
+            FROM exam_schedule es
+            LEFT JOIN courses c ON es.course_id = c.id
+            LEFT JOIN classrooms cl ON es.classroom_id = cl.id
+            LEFT JOIN faculties f ON cl.faculty_id = f.id
+            LEFT JOIN lecturers l ON c.lecturer_id = l.id
+            LEFT JOIN departments d ON c.department_id = d.id
+            {where}
+            ORDER BY es.exam_date, es.start_time, es.id
+            {limit_sql}
+        """
+        rows, columns = self._execute_query(query, tuple(params))
+        return [dict(zip(columns, row)) for row in rows]
     
     def get_by_department_id(self, department_id: int) -> List[ExamSchedule]:
         query = """
@@ -150,26 +444,22 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             ORDER BY es.exam_date, es.start_time
         """
         rows, columns = self._execute_query(query, (department_id,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def check_conflict(self, classroom_id: int, exam_date: date, start_time: str, end_time: str, exclude_id: int = None) -> bool:
-        query = """
+        query = f"""
             SELECT EXISTS(
                 SELECT 1 FROM exam_schedule
                 WHERE classroom_id = %s
                 AND exam_date = %s
                 AND status != 'cancelled'
                 AND id != COALESCE(%s, -1)
-                AND (
-                    (start_time <= %s AND end_time > %s)
-                    OR (start_time < %s AND end_time >= %s)
-                    OR (start_time >= %s AND end_time <= %s)
-                )
+                AND period && {PERIOD_SQL}
             )
         """
         rows, _ = self._execute_query(
             query,
-            (classroom_id, exam_date, exclude_id, start_time, start_time, end_time, end_time, start_time, end_time)
+            (classroom_id, exam_date, exclude_id) + _period_params(exam_date, start_time, end_time)
         )
         return rows[0][0] if rows else False
     
@@ -178,7 +468,9 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
         try:
             self._execute_non_query(query, (status, exam_id))
             return True
-        except Exception:
+        except Exception as e:
+            # İptal edilmiş bir sınav yeniden açılırken derslik dolmuş olabilir
+            _raise_if_classroom_conflict(e)
             return False
     
     def get_by_classroom_and_date(self, classroom_id: int, exam_date: date) -> List[ExamSchedule]:
@@ -199,7 +491,7 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             ORDER BY es.start_time
         """
         rows, columns = self._execute_query(query, (classroom_id, exam_date))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_by_department_and_date(self, department_id: int, exam_date: date) -> List[ExamSchedule]:
         query = """
@@ -219,7 +511,7 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             ORDER BY es.start_time
         """
         rows, columns = self._execute_query(query, (department_id, exam_date))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_by_lecturer_and_date(self, lecturer_id: int, exam_date: date) -> List[ExamSchedule]:
         query = """
@@ -239,15 +531,89 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             ORDER BY es.start_time
         """
         rows, columns = self._execute_query(query, (lecturer_id, exam_date))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def delete_all(self) -> int:
         query = "DELETE FROM exam_schedule"
         return self._execute_non_query(query)
     
     def delete_planned(self) -> int:
-        query = "DELETE FROM exam_schedule WHERE status = 'planned'"
-        return self._execute_non_query(query)
+        return len(self.delete_by_filter(status='planned'))
+    
+    def delete_by_filter(
+        self,
+        ids: Optional[List[int]] = None,
+        status: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[int]:
+        """
+        Verilen filtrelere uyan sınavları tek DELETE ile siler.
+        Filtreler AND ile birleşir; en az bir filtre zorunludur.
+        
+        Returns:
+            List[int]: Silinen sınav ID'leri
+        """
+        conditions = []
+        params = []
+        if ids is not None:
+            if not ids:
+                return []
+            conditions.append("id = ANY(%s)")
+            params.append([int(i) for i in ids])
+        if status is not None:
+            conditions.append("status = %s")
+            params.append(status)
+        if start_date is not None:
+            conditions.append("exam_date >= %s")
+            params.append(start_date)
+        if end_date is not None:
+            conditions.append("exam_date <= %s")
+            params.append(end_date)
+        if not conditions:
+            raise ValueError("delete_by_filter en az bir filtre gerektirir")
+        
+        query = f"DELETE FROM exam_schedule WHERE {' AND '.join(conditions)} RETURNING id"
+        return [row[0] for row in self._execute_returning(query, tuple(params))]
+    
+    def update_status_by_ids(self, ids: List[int], status: str) -> List[int]:
+        """
+        Sınavların durumunu tek UPDATE ile değiştirir. Zaten bu durumda olan
+        kayıtlara dokunulmaz.
+        
+        Returns:
+            List[int]: Durumu değişen sınav ID'leri
+        
+        Raises:
+            ExamConflictError: İptal edilmiş bir sınav dolu bir dersliğe geri açılıyorsa
+        """
+        if not ids:
+            return []
+        query = """
+            UPDATE exam_schedule SET status = %s, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ANY(%s) AND status IS DISTINCT FROM %s
+            RETURNING id
+        """
+        try:
+            rows = self._execute_returning(query, (status, [int(i) for i in ids], status))
+        except Exception as e:
+            _raise_if_classroom_conflict(e)
+            raise
+        return [row[0] for row in rows]
+    
+    def cancel_by_date_range(self, start_date: date, end_date: date) -> List[int]:
+        """
+        Tarih aralığındaki iptal edilmemiş sınavları tek UPDATE ile iptal eder.
+        
+        Returns:
+            List[int]: İptal edilen sınav ID'leri
+        """
+        query = """
+            UPDATE exam_schedule SET status = 'cancelled', updated_at = CURRENT_TIMESTAMP
+            WHERE exam_date BETWEEN %s AND %s AND status != 'cancelled'
+            RETURNING id
+        """
+        return [row[0] for row in self._execute_returning(query, (start_date, end_date))]
     
     def get_by_status(self, status: str) -> List[ExamSchedule]:
         query = """
@@ -265,7 +631,17 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             ORDER BY es.exam_date, es.start_time
         """
         rows, columns = self._execute_query(query, (status,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
+    
+    def get_scheduled_course_ids(self, exam_type: Optional[str] = None) -> Set[int]:
+        """İptal edilmemiş sınavı olan derslerin ID'leri (exam_type verilirse yalnızca o tür)"""
+        query = "SELECT DISTINCT course_id FROM exam_schedule WHERE status != 'cancelled' AND course_id IS NOT NULL"
+        params: tuple = ()
+        if exam_type:
+            query += " AND exam_type = %s"
+            params = (exam_type,)
+        rows, _ = self._execute_query(query, params or None)
+        return {row[0] for row in rows}
     
     def check_course_exam_exists(self, course_id: int, exam_type: str, exclude_id: int = None, exclude_ids: list = None) -> bool:
         if exclude_ids is None:
@@ -307,7 +683,7 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
         exclude_course_id: int = None,
         exclude_id: int = None
     ) -> List[ExamSchedule]:
-        query = """
+        query = f"""
             SELECT es.*, c.code as course_code, c.name as course_name, c.student_count,
                    cl.name as classroom_name, f.name as faculty_name,
                    CONCAT(l.title, ' ', l.first_name, ' ', l.last_name) as lecturer_name,
@@ -324,19 +700,15 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             AND es.status != 'cancelled'
             AND es.id != COALESCE(%s, -1)
             AND c.id != COALESCE(%s, -1)
-            AND (
-                (es.start_time <= %s AND es.end_time > %s)
-                OR (es.start_time < %s AND es.end_time >= %s)
-                OR (es.start_time >= %s AND es.end_time <= %s)
-            )
+            AND es.period && {PERIOD_SQL}
             ORDER BY es.start_time
         """
         rows, columns = self._execute_query(
             query,
-            (department_id, course_year, exam_date, exclude_id, exclude_course_id,
-             start_time, start_time, end_time, end_time, start_time, end_time)
+            (department_id, course_year, exam_date, exclude_id, exclude_course_id)
+            + _period_params(exam_date, start_time, end_time)
         )
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def check_lecturer_conflict(
         self,
@@ -346,7 +718,7 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
         end_time: str,
         exclude_id: int = None
     ) -> List[ExamSchedule]:
-        query = """
+        query = f"""
             SELECT es.*, c.code as course_code, c.name as course_name, c.student_count,
                    cl.name as classroom_name, f.name as faculty_name,
                    CONCAT(l.title, ' ', l.first_name, ' ', l.last_name) as lecturer_name,
@@ -361,19 +733,14 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             AND es.exam_date = %s
             AND es.status != 'cancelled'
             AND es.id != COALESCE(%s, -1)
-            AND (
-                (es.start_time <= %s AND es.end_time > %s)
-                OR (es.start_time < %s AND es.end_time >= %s)
-                OR (es.start_time >= %s AND es.end_time <= %s)
-            )
+            AND es.period && {PERIOD_SQL}
             ORDER BY es.start_time
         """
         rows, columns = self._execute_query(
             query,
-            (lecturer_id, exam_date, exclude_id,
-             start_time, start_time, end_time, end_time, start_time, end_time)
+            (lecturer_id, exam_date, exclude_id) + _period_params(exam_date, start_time, end_time)
         )
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_by_faculty_id(self, faculty_id: int) -> List[ExamSchedule]:
         query = """
@@ -391,7 +758,7 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             ORDER BY es.exam_date, es.start_time
         """
         rows, columns = self._execute_query(query, (faculty_id,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     # ==================== KULLANICI BAZLI FİLTRELEME ====================
     
@@ -418,7 +785,7 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             ORDER BY es.exam_date, es.start_time
         """
         rows, columns = self._execute_query(query, (student_id,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_by_student_number(self, student_number: str) -> List[ExamSchedule]:
         """
@@ -444,7 +811,7 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             ORDER BY es.exam_date, es.start_time
         """
         rows, columns = self._execute_query(query, (student_number,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_by_lecturer_id_all(self, lecturer_id: int) -> List[ExamSchedule]:
         """
@@ -466,4 +833,4 @@ class ExamScheduleRepository(BaseRepository[ExamSchedule]):
             ORDER BY es.exam_date, es.start_time
         """
         rows, columns = self._execute_query(query, (lecturer_id,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
@@ -2,20 +2,23 @@
 Fakülte repository sınıfı
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 from src.repositories.base_repository import BaseRepository
+from src.repositories.row_mapper import get_row_mapper
 from src.models.faculty import Faculty
 
 
 class FacultyRepository(BaseRepository[Faculty]):
+
+    use_query_cache = True
+    model_class = Faculty
     
     def __init__(self):
         super().__init__()
         self.table_name = "faculties"
     
     def _row_to_entity(self, row: tuple, columns: List[str]) -> Faculty:
-        data = dict(zip(columns, row))
-        return Faculty.from_dict(data)
+        return get_row_mapper(self.model_class, columns)(row)
     
     def _entity_to_values(self, entity: Faculty) -> tuple:
         return (
@@ -53,10 +56,52 @@ class FacultyRepository(BaseRepository[Faculty]):
             return self._row_to_entity(rows[0], columns)
         return None
     
+    def resolve_block_faculties(self, blocks: Sequence[str], conn=None) -> Dict[str, int]:
+        """
+        Blok kodlarını tek sorguda fakülte ID'lerine çözer; kodu olmayan bloklar için
+        "<BLOK> Bloğu Fakültesi" oluşturulur. Boş blok ('') ilk fakülteye eşlenir;
+        hiç fakülte yoksa ve oluşturulacak blok fakültesi de yoksa "Genel Fakülte"
+        (GENEL) oluşturulur.
+        
+        Returns:
+            dict: {blok kodu (büyük harf): faculty_id}
+        """
+        codes = sorted({(block or '').upper().strip() for block in blocks})
+        need_default = '' in codes
+        codes = [code for code in codes if code]
+        if not codes and not need_default:
+            return {}
+        
+        query = """
+            WITH wanted(code, name) AS (
+                SELECT code, code || ' Bloğu Fakültesi' FROM unnest(%s::text[]) AS code
+                UNION ALL
+                SELECT 'GENEL', 'Genel Fakülte'
+                WHERE %s AND cardinality(%s::text[]) = 0 AND NOT EXISTS (SELECT 1 FROM faculties)
+            ),
+            inserted AS (
+                INSERT INTO faculties (name, code)
+                SELECT name, code FROM wanted
+                ON CONFLICT (code) DO NOTHING
+                RETURNING code, id
+            )
+            SELECT code, id FROM inserted
+            UNION ALL
+            SELECT f.code, f.id FROM faculties f JOIN wanted w ON f.code = w.code
+            UNION ALL
+            SELECT '', COALESCE(
+                (SELECT id FROM faculties ORDER BY id LIMIT 1),
+                (SELECT MIN(id) FROM inserted)
+            )
+            WHERE %s
+        """
+        rows = self._execute_returning(query, (codes, need_default, codes, need_default), conn=conn)
+        return {code: faculty_id for code, faculty_id in rows}
+    
     def get_all_active(self) -> List[Faculty]:
         query = "SELECT * FROM faculties ORDER BY name"
         rows, columns = self._execute_query(query)
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_with_departments(self) -> List[dict]:
         query = """
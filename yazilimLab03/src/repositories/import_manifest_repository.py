@@ -0,0 +1,74 @@
+"""
+İçe aktarma manifestosu repository sınıfı
+"""
+
+from typing import Dict, List
+
+from src.models.import_manifest import ImportManifest
+from src.repositories.base_repository import BaseRepository
+from src.repositories.row_mapper import get_row_mapper
+
+
+class ImportManifestRepository(BaseRepository[ImportManifest]):
+
+    model_class = ImportManifest
+
+    INSERT_COLUMNS = ['file_path', 'file_size', 'file_mtime_ns', 'content_hash', 'course_id', 'enrollment_count']
+
+    def __init__(self):
+        super().__init__()
+        self.table_name = "import_manifest"
+
+    def _row_to_entity(self, row: tuple, columns: List[str]) -> ImportManifest:
+        return get_row_mapper(self.model_class, columns)(row)
+
+    def _entity_to_values(self, entity: ImportManifest) -> tuple:
+        return (
+            entity.file_path,
+            entity.file_size,
+            entity.file_mtime_ns,
+            entity.content_hash,
+            entity.course_id,
+            entity.enrollment_count
+        )
+
+    def get_by_paths(self, file_paths: List[str]) -> Dict[str, ImportManifest]:
+        """Verilen dosyaların manifesto kayıtlarını tek sorguyla döndürür: {file_path: kayıt}"""
+        if not file_paths:
+            return {}
+        query = "SELECT * FROM import_manifest WHERE file_path = ANY(%s)"
+        rows, columns = self._execute_query(query, (list(file_paths),))
+        return {entry.file_path: entry for entry in self._rows_to_entities(rows, columns)}
+
+    def bulk_upsert(self, entries: List[ImportManifest], conn=None) -> int:
+        """
+        Manifesto kayıtlarını COPY + tek INSERT ... ON CONFLICT ile yazar.
+
+        Args:
+            conn: Verilirse içe aktarmayla aynı transaction içinde çalışır
+
+        Returns:
+            int: Yazılan kayıt sayısı
+        """
+        unique = {entry.file_path: entry for entry in entries if entry.file_path}
+        query = """
+            INSERT INTO import_manifest (file_path, file_size, file_mtime_ns, content_hash, course_id, enrollment_count)
+            SELECT file_path, file_size, file_mtime_ns, content_hash, course_id, enrollment_count
+            FROM {staging}
+            ORDER BY _ord
+            ON CONFLICT (file_path) DO UPDATE
+            SET file_size = EXCLUDED.file_size,
+                file_mtime_ns = EXCLUDED.file_mtime_ns,
+                content_hash = EXCLUDED.content_hash,
+                course_id = EXCLUDED.course_id,
+                enrollment_count = EXCLUDED.enrollment_count,
+                imported_at = CURRENT_TIMESTAMP
+            RETURNING id
+        """
+        rows = self._execute_copy_merge(
+            self.INSERT_COLUMNS,
+            [self._entity_to_values(entry) for entry in unique.values()],
+            query,
+            conn=conn
+        )
+        return len(rows)
@@ -3,19 +3,24 @@
 """
 
 from typing import List, Optional
-from src.repositories.base_repository import BaseRepository
+from src.repositories.base_repository import BaseRepository, Page, DEFAULT_PAGE_SIZE
+from src.repositories.row_mapper import get_row_mapper
 from src.models.lecturer import Lecturer
 
 
 class LecturerRepository(BaseRepository[Lecturer]):
+
+    use_query_cache = True
+    model_class = Lecturer
+    search_columns = ("l.title", "(l.first_name || ' ' || l.last_name)", "l.email", "d.name")
+    filter_columns = ("department_id",)
     
     def __init__(self):
         super().__init__()
         self.table_name = "lecturers"
     
     def _row_to_entity(self, row: tuple, columns: List[str]) -> Lecturer:
-        data = dict(zip(columns, row))
-        return Lecturer.from_dict(data)
+        return get_row_mapper(self.model_class, columns)(row)
     
     def _entity_to_values(self, entity: Lecturer) -> tuple:
         return (
@@ -60,7 +65,7 @@ class LecturerRepository(BaseRepository[Lecturer]):
             ORDER BY l.last_name, l.first_name
         """
         rows, columns = self._execute_query(query, (department_id,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_all_with_details(self) -> List[Lecturer]:
         query = """
@@ -71,7 +76,28 @@ class LecturerRepository(BaseRepository[Lecturer]):
             ORDER BY f.name, d.name, l.last_name, l.first_name
         """
         rows, columns = self._execute_query(query)
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
+    
+    def get_page(
+        self,
+        after: Optional[tuple] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        search: Optional[str] = None,
+        department_id: Optional[int] = None
+    ) -> Page[Lecturer]:
+        """Öğretim üyelerini bölüm adıyla birlikte id sırasıyla sayfa sayfa getirir."""
+        conditions, params = self._filter_conditions({'department_id': department_id}, alias='l')
+        if search:
+            condition, search_params = self._search_condition(self.search_columns, search)
+            conditions.append(condition)
+            params.extend(search_params)
+        select_sql = """
+            SELECT l.*, d.name as department_name, f.name as faculty_name
+            FROM lecturers l
+            LEFT JOIN departments d ON l.department_id = d.id
+            LEFT JOIN faculties f ON d.faculty_id = f.id
+        """
+        return self._keyset_page(select_sql, [('l.id', 'id')], conditions, params, after, limit)
     
     def get_by_email(self, email: str) -> Optional[Lecturer]:
         query = """
@@ -96,7 +122,7 @@ class LecturerRepository(BaseRepository[Lecturer]):
             ORDER BY l.last_name, l.first_name
         """
         rows, columns = self._execute_query(query, (day,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def update_available_days(self, lecturer_id: int, available_days: List[str]) -> bool:
         query = """
@@ -0,0 +1,184 @@
+"""
+Sorgu seviyesinde read-through önbellek
+
+Anahtar: sorgu metni + parametreler + sorgunun okuduğu tabloların sürüm numaraları.
+Her create/update/delete işlemi ilgili tablonun sürümünü artırır; böylece eski
+sürümle oluşturulmuş kayıtlar bir daha eşleşmez ve LRU ile zamanla atılır.
+
+Sürümler süreç içindedir: başka bir uygulama örneğinin veya scriptlerin (içe
+aktarma, migrate) yazmaları görülmez. Bu yüzden kayıtlar QUERY_CACHE_TTL_SECONDS
+sonra düşer ve sık değişen tabloları (VOLATILE_TABLES) okuyan sorgular hiç
+önbelleğe alınmaz.
+"""
+
+import os
+import re
+import time
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+QUERY_CACHE_ENABLED = os.getenv('QUERY_CACHE_ENABLED', 'True').lower() in ('1', 'true', 'yes')
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', '512'))
+QUERY_CACHE_MAX_ROWS = int(os.getenv('QUERY_CACHE_MAX_ROWS', '5000'))
+# Kaydın geçerlilik süresi (başka süreçlerin yazmaları en geç bu kadar sonra görülür); 0: süresiz
+QUERY_CACHE_TTL_SECONDS = float(os.getenv('QUERY_CACHE_TTL_SECONDS', '30'))
+
+# Sınav planlama ve içe aktarmalar sırasında sürekli değişen tablolar; bunları okuyan sorgu önbelleğe alınmaz
+VOLATILE_TABLES = frozenset({'exam_schedule', 'student_courses', 'students'})
+
+_READ_TABLE_PATTERN = re.compile(r'\b(?:FROM|JOIN)\s+([a-zA-Z_][\w.]*)', re.IGNORECASE)
+_WRITE_TABLE_PATTERN = re.compile(
+    r'\b(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM|TRUNCATE(?:\s+TABLE)?)\s+(?!SET\b)([a-zA-Z_][\w.]*)',
+    re.IGNORECASE
+)
+
+# Yabancı anahtar CASCADE / SET NULL ilişkileri (setup_db.py ile uyumlu).
+# Bir tabloya yazıldığında bu tabloları referans alan tablolar da değişmiş sayılır.
+CASCADE_DEPENDENTS: Dict[str, List[str]] = {
+    'faculties': ['departments', 'classrooms'],
+    'departments': ['lecturers', 'courses', 'students', 'users'],
+    'lecturers': ['courses'],
+    'courses': ['exam_schedule', 'student_courses'],
+    'classrooms': ['exam_schedule'],
+    'students': ['student_courses'],
+}
+
+
+def extract_read_tables(query: str) -> Tuple[str, ...]:
+    """Sorgunun FROM/JOIN ile okuduğu tabloları döndürür."""
+    return tuple(sorted({name.lower() for name in _READ_TABLE_PATTERN.findall(query)}))
+
+
+def extract_write_tables(query: str) -> Tuple[str, ...]:
+    """Sorgunun INSERT/UPDATE/DELETE/TRUNCATE ile yazdığı tabloları döndürür."""
+    return tuple(sorted({name.lower() for name in _WRITE_TABLE_PATTERN.findall(query)}))
+
+
+def _freeze(value: Any) -> Any:
+    """Parametreleri hashlenebilir hale getirir (liste -> tuple)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return tuple(sorted(_freeze(v) for v in value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class QueryCache:
+    """LRU sorgu önbelleği ve tablo sürüm sayaçları."""
+
+    def __init__(
+        self,
+        max_entries: int = QUERY_CACHE_MAX_ENTRIES,
+        max_rows_per_entry: int = QUERY_CACHE_MAX_ROWS,
+        enabled: bool = QUERY_CACHE_ENABLED,
+        ttl_seconds: float = QUERY_CACHE_TTL_SECONDS
+    ):
+        self.max_entries = max_entries
+        self.max_rows_per_entry = max_rows_per_entry
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        # anahtar -> (satırlar, sütunlar, kayıt zamanı)
+        self._entries: 'OrderedDict[tuple, Tuple[List[tuple], List[str], float]]' = OrderedDict()
+        self._table_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get_version(self, table: str) -> int:
+        return self._table_versions.get(table, 0)
+
+    def make_key(self, query: str, params: Any = None) -> Optional[tuple]:
+        """
+        Önbellek anahtarı üretir. Sorgu VOLATILE_TABLES'tan birini okuyorsa veya
+        parametreler hashlenemiyorsa None döner (sorgu önbelleğe alınmaz).
+        """
+        tables = extract_read_tables(query)
+        if VOLATILE_TABLES.intersection(tables):
+            return None
+        versions = tuple(self.get_version(t) for t in tables)
+        key = (query, _freeze(params), tables, versions)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key: tuple) -> Optional[Tuple[List[tuple], List[str]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds and time.monotonic() - entry[2] > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        rows, columns, _ = entry
+        return list(rows), columns
+
+    def put(self, key: tuple, rows: List[tuple], columns: List[str]) -> None:
+        if len(rows) > self.max_rows_per_entry:
+            return
+        with self._lock:
+            self._entries[key] = (list(rows), columns, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def bump(self, tables: Iterable[str]) -> None:
+        """Verilen tabloların ve bağımlı tabloların sürümünü artırır."""
+        pending = list(tables)
+        seen = set()
+        with self._lock:
+            while pending:
+                table = pending.pop()
+                if table in seen:
+                    continue
+                seen.add(table)
+                self._table_versions[table] = self._table_versions.get(table, 0) + 1
+                pending.extend(CASCADE_DEPENDENTS.get(table, []))
+            self.invalidations += 1
+        logger.debug(f"Query cache invalidated: {', '.join(sorted(seen))}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total * 100, 2) if total else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'ttl_seconds': self.ttl_seconds,
+            'invalidations': self.invalidations,
+            'table_versions': dict(self._table_versions)
+        }
+
+
+_query_cache: Optional[QueryCache] = None
+
+
+def get_query_cache() -> QueryCache:
+    """Süreç genelinde paylaşılan sorgu önbelleğini döndürür."""
+    global _query_cache
+    if _query_cache is None:
+        _query_cache = QueryCache()
+    return _query_cache
@@ -0,0 +1,291 @@
+"""
+SQL sorgu enstrümantasyonu
+
+Her ifade için süre, satır sayısı, normalize edilmiş SQL parmak izi ve çağıran
+konum kaydedilir. Toplu sayaçlar (operasyon başına sorgu sayısı, en yavaş N
+ifade, N+1 tespiti) `get_query_stats()` üzerinden okunur. Eşik değerini aşan
+sorgular logging_config.py'deki yavaş sorgu log dosyasına yazılır.
+
+Kullanım:
+    with query_operation('dashboard.get_dashboard_stats'):
+        controller.get_dashboard_stats()
+
+    get_query_stats().snapshot()
+"""
+
+import os
+import re
+import sys
+import heapq
+import hashlib
+import logging
+import threading
+from collections import deque
+from functools import lru_cache, wraps
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger('sql.slow')
+
+SQL_INSTRUMENTATION_ENABLED = os.getenv('SQL_INSTRUMENTATION_ENABLED', 'True').lower() in ('1', 'true', 'yes')
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '200'))
+N_PLUS_ONE_THRESHOLD = int(os.getenv('N_PLUS_ONE_THRESHOLD', '10'))
+QUERY_STATS_TOP_N = int(os.getenv('QUERY_STATS_TOP_N', '20'))
+
+GLOBAL_OPERATION = '(global)'
+
+_current_operation: ContextVar[Optional['_OperationScope']] = ContextVar('sql_operation', default=None)
+
+_COMMENT_PATTERN = re.compile(r'--[^\n]*|/\*.*?\*/', re.DOTALL)
+_STRING_PATTERN = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_PATTERN = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_PATTERN = re.compile(r'%\(\w+\)s|%s')
+_IN_LIST_PATTERN = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Çağıran konum tespitinde atlanacak modüller
+_INTERNAL_FILES = ('base_repository.py', 'query_stats.py', 'contextlib.py', 'extras.py')
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(query: str) -> str:
+    """
+    Sorguyu parmak izi için normalize eder: yorumlar silinir, sabitler ve
+    parametreler '?' olur, IN listeleri tek elemana indirilir, boşluklar sadeleşir.
+    """
+    text = _COMMENT_PATTERN.sub(' ', query)
+    text = _STRING_PATTERN.sub('?', text)
+    text = _PLACEHOLDER_PATTERN.sub('?', text)
+    text = _NUMBER_PATTERN.sub('?', text)
+    text = _IN_LIST_PATTERN.sub('(?)', text)
+    return _WHITESPACE_PATTERN.sub(' ', text).strip().lower()
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(query: str) -> str:
+    """Normalize edilmiş sorgunun kısa hash'ini döndürür."""
+    return hashlib.md5(normalize_sql(query).encode('utf-8')).hexdigest()[:12]
+
+
+def _caller_location() -> str:
+    """
+    Sorguyu tetikleyen kod konumunu döndürür. Repository katmanının dışındaki
+    ilk çerçeve tercih edilir (servis/controller), yoksa repository metodu.
+    """
+    frame = sys._getframe(2)
+    repository_frame = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not filename.endswith(_INTERNAL_FILES):
+            location = f"{os.path.basename(filename)}:{frame.f_lineno} {frame.f_code.co_name}"
+            if os.sep + 'repositories' + os.sep not in filename:
+                return location
+            if repository_frame is None:
+                repository_frame = location
+        frame = frame.f_back
+    return repository_frame or '?'
+
+
+class _OperationScope:
+    """Bir operasyon süresince parmak izi sayaçlarını tutar (N+1 tespiti için)."""
+
+    __slots__ = ('name', 'query_count', 'fingerprint_counts', 'reported')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.query_count = 0
+        self.fingerprint_counts: Dict[str, int] = {}
+        self.reported: set = set()
+
+
+class QueryStats:
+    """Süreç genelinde SQL ifade istatistikleri."""
+
+    def __init__(
+        self,
+        slow_query_ms: float = SLOW_QUERY_MS,
+        n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD,
+        top_n: int = QUERY_STATS_TOP_N,
+        enabled: bool = SQL_INSTRUMENTATION_ENABLED
+    ):
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.top_n = top_n
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._fingerprints: Dict[str, Dict[str, Any]] = {}
+            self._operations: Dict[str, Dict[str, Any]] = {}
+            self._slowest: List[Tuple[float, int, Dict[str, Any]]] = []
+            self._n_plus_one: Deque[Dict[str, Any]] = deque(maxlen=100)
+            self._sequence = 0
+            self.total_queries = 0
+            self.slow_queries = 0
+
+    def record(self, query: str, elapsed_ms: float, row_count: int = -1) -> None:
+        """
+        Çalıştırılmış bir SQL ifadesini kaydeder.
+
+        Args:
+            query: Çalıştırılan SQL metni
+            elapsed_ms: Süre (milisaniye)
+            row_count: Dönen veya etkilenen satır sayısı (-1: bilinmiyor)
+        """
+        if not self.enabled:
+            return
+
+        normalized = normalize_sql(query)
+        fp = fingerprint(query)
+        caller = _caller_location()
+        scope = _current_operation.get()
+        operation = scope.name if scope is not None else GLOBAL_OPERATION
+
+        with self._lock:
+            self.total_queries += 1
+
+            entry = self._fingerprints.get(fp)
+            if entry is None:
+                entry = {
+                    'fingerprint': fp,
+                    'sql': normalized,
+                    'count': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'rows': 0,
+                    'callers': {}
+                }
+                self._fingerprints[fp] = entry
+            entry['count'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            if row_count > 0:
+                entry['rows'] += row_count
+            entry['callers'][caller] = entry['callers'].get(caller, 0) + 1
+
+            op_entry = self._operations.setdefault(operation, {'queries': 0, 'total_ms': 0.0})
+            op_entry['queries'] += 1
+            op_entry['total_ms'] += elapsed_ms
+
+            if len(self._slowest) < self.top_n or elapsed_ms > self._slowest[0][0]:
+                self._sequence += 1
+                sample = (elapsed_ms, self._sequence, {
+                    'fingerprint': fp,
+                    'sql': normalized,
+                    'elapsed_ms': round(elapsed_ms, 3),
+                    'rows': row_count,
+                    'caller': caller,
+                    'operation': operation,
+                    'at': datetime.now().isoformat(timespec='seconds')
+                })
+                if len(self._slowest) < self.top_n:
+                    heapq.heappush(self._slowest, sample)
+                else:
+                    heapq.heapreplace(self._slowest, sample)
+
+            n_plus_one = None
+            if scope is not None:
+                scope.query_count += 1
+                count = scope.fingerprint_counts.get(fp, 0) + 1
+                scope.fingerprint_counts[fp] = count
+                if count > self.n_plus_one_threshold and fp not in scope.reported:
+                    scope.reported.add(fp)
+                    n_plus_one = {
+                        'operation': operation,
+                        'fingerprint': fp,
+                        'sql': normalized,
+                        'caller': caller
+                    }
+                    self._n_plus_one.append(n_plus_one)
+
+            is_slow = elapsed_ms >= self.slow_query_ms
+            if is_slow:
+                self.slow_queries += 1
+
+        logger.debug(f"SQL {fp} {elapsed_ms:.1f} ms, {row_count} satır, {caller}: {normalized[:80]}")
+        if is_slow:
+            slow_query_logger.warning(
+                f"Yavaş sorgu {elapsed_ms:.1f} ms (eşik {self.slow_query_ms:.0f} ms) "
+                f"[{fp}] {operation} @ {caller}, {row_count} satır: {normalized}"
+            )
+        if n_plus_one is not None:
+            slow_query_logger.warning(
+                f"Olası N+1: [{fp}] '{operation}' içinde {self.n_plus_one_threshold} kereden fazla "
+                f"çalıştı @ {caller}: {normalized}"
+            )
+
+    def top_slowest(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """En yavaş ifadeleri azalan sürede döndürür."""
+        with self._lock:
+            ordered = sorted(self._slowest, key=lambda item: (-item[0], item[1]))
+        return [sample for _, _, sample in ordered[:n or self.top_n]]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Toplu sayaçları döndürür."""
+        with self._lock:
+            fingerprints = sorted(
+                ({**entry, 'callers': dict(entry['callers'])} for entry in self._fingerprints.values()),
+                key=lambda e: e['total_ms'],
+                reverse=True
+            )
+            operations = {name: dict(values) for name, values in self._operations.items()}
+            n_plus_one = list(self._n_plus_one)
+            total, slow = self.total_queries, self.slow_queries
+        return {
+            'total_queries': total,
+            'slow_queries': slow,
+            'slow_query_ms': self.slow_query_ms,
+            'operations': operations,
+            'fingerprints': fingerprints,
+            'slowest': self.top_slowest(),
+            'n_plus_one': n_plus_one
+        }
+
+
+_query_stats: Optional[QueryStats] = None
+
+
+def get_query_stats() -> QueryStats:
+    """Süreç genelinde paylaşılan sorgu istatistiklerini döndürür."""
+    global _query_stats
+    if _query_stats is None:
+        _query_stats = QueryStats()
+    return _query_stats
+
+
+@contextmanager
+def query_operation(name: str):
+    """
+    Bir kullanıcı operasyonunu işaretler. Blok içinde çalışan sorgular bu
+    operasyona sayılır ve aynı parmak izi eşikten fazla tekrarlanırsa N+1
+    olarak raporlanır. İç içe kullanımda dıştaki operasyon geçerli kalır.
+    """
+    if _current_operation.get() is not None:
+        yield
+        return
+    token = _current_operation.set(_OperationScope(name))
+    try:
+        yield
+    finally:
+        _current_operation.reset(token)
+
+
+def track_queries(name: Optional[str] = None):
+    """
+    Metodu bir sorgu operasyonu olarak işaretleyen dekoratör.
+    İsim verilmezse 'Sınıf.metot' biçiminde üretilir.
+    """
+    def decorator(func):
+        operation_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with query_operation(operation_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
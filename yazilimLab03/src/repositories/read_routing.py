@@ -0,0 +1,38 @@
+"""
+Raporlama okumalarının salt okunur replikaya yönlendirilmesi
+
+@reporting_query ile işaretlenen metotların (veya reporting_reads() bloğunun)
+içinde çalışan SELECT sorguları BaseRepository tarafından DB_READ_DSN
+replikasına gönderilir. Yazma sorguları, transaction'lar ve replika
+tanımlı/erişilebilir değilken yapılan okumalar birincil sunucuda kalır.
+Böylece büyük dışa aktarımlar planlama sırasındaki yazmaları yavaşlatmaz.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+_reporting: ContextVar[bool] = ContextVar('reporting_reads', default=False)
+
+
+def is_reporting() -> bool:
+    return _reporting.get()
+
+
+@contextmanager
+def reporting_reads():
+    """Blok içindeki okuma sorgularını replikaya yönlendirir."""
+    token = _reporting.set(True)
+    try:
+        yield
+    finally:
+        _reporting.reset(token)
+
+
+def reporting_query(func):
+    """Metodu raporlama okuması olarak işaretleyen dekoratör."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with reporting_reads():
+            return func(*args, **kwargs)
+    return wrapper
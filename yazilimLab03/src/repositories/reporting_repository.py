@@ -0,0 +1,251 @@
+"""
+Raporlama repository sınıfı
+
+Dashboard ve istatistik ekranları için materialized view'lardan (bkz.
+database/migrations/003_reporting_views.sql) okuma yapar. View'ların hangi
+tablolardan beslendiği REPORTING_VIEWS'da tutulur. Bayatlık veritabanında
+izlenir (migrations/009): kaynak tabloların sayacı pg_stat_user_tables'taki
+n_tup_ins + n_tup_upd + n_tup_del toplamıdır; kilit almaz ve yazma hangi
+süreçten gelirse gelsin (içe aktarma scriptleri, başka bir istemci) transaction
+bittikten birkaç saniye içinde görülür. View'ın son yenilemesindeki sayaç
+toplamı reporting_view_state'te durur.
+
+Okuma metotları view'ı beklemeden okur: toplam değişmişse yenileme arka plan
+iş parçacığında (REFRESH ... CONCURRENTLY, ayrı bağlantıyla) başlatılır ve
+sonraki okumalar yeni veriyi görür. Planlama sonrası refresh() doğrudan çağrılır.
+"""
+
+import time
+import threading
+import logging
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import psycopg2
+
+from src.config.database import DatabaseConfig, get_connection, release_connection
+from src.repositories.base_repository import ReadOnlyRepository
+from src.repositories.query_stats import get_query_stats
+from src.repositories.read_routing import reporting_query
+
+logger = logging.getLogger(__name__)
+
+# view adı -> beslendiği tablolar
+REPORTING_VIEWS: Dict[str, Tuple[str, ...]] = {
+    'mv_exam_schedule_stats': ('exam_schedule', 'classrooms', 'courses', 'departments'),
+    'mv_faculty_department_counts': ('faculties', 'departments'),
+    'mv_dashboard_counts': ('faculties', 'departments', 'classrooms', 'lecturers', 'courses', 'exam_schedule'),
+}
+
+# Kaynak tabloların yazma sayaçları (kilit almaz; TRUNCATE sayılmaz)
+TABLE_WRITE_COUNTS_QUERY = """
+    SELECT relname, n_tup_ins + n_tup_upd + n_tup_del
+    FROM pg_stat_user_tables
+    WHERE schemaname = current_schema() AND relname = ANY(%s)
+"""
+
+
+class ReportingRepository(ReadOnlyRepository[Dict[str, Any]]):
+
+    _refresh_lock = threading.Lock()
+
+    def _row_to_entity(self, row: tuple, columns: List[str]) -> Dict[str, Any]:
+        return dict(zip(columns, row))
+
+    @staticmethod
+    def _source_state() -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Kaynak tablo sayaçları ve view'ların son yenilemedeki sayaç toplamları.
+        Replikada gecikme olabileceği için her zaman birincilden okunur.
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            source_tables = sorted({table for tables in REPORTING_VIEWS.values() for table in tables})
+            cursor.execute(TABLE_WRITE_COUNTS_QUERY, (source_tables,))
+            tables: Dict[str, int] = dict(cursor.fetchall())
+            cursor.execute("SELECT view_name, source_version FROM reporting_view_state")
+            views: Dict[str, int] = dict(cursor.fetchall())
+            cursor.close()
+            conn.commit()
+            return tables, views
+        finally:
+            if conn:
+                release_connection(conn)
+
+    @staticmethod
+    def _source_version(view: str, table_versions: Dict[str, int]) -> int:
+        return sum(table_versions.get(table, 0) for table in REPORTING_VIEWS[view])
+
+    def stale_views(self, views: Optional[Iterable[str]] = None) -> List[str]:
+        """Kaynak tabloları son yenilemeden sonra değişmiş (veya hiç yenilenmemiş) view'lar."""
+        names = list(views) if views is not None else list(REPORTING_VIEWS)
+        tables, refreshed = self._source_state()
+        return [name for name in names if refreshed.get(name) != self._source_version(name, tables)]
+
+    def is_stale(self, view: str) -> bool:
+        return bool(self.stale_views((view,)))
+
+    def _refresh_view(self, view: str, mode: str, conn=None) -> None:
+        """
+        View'ı yeniler ve yenilemeden önceki sayaç toplamını aynı transaction'da kaydeder.
+        conn verilirse (arka plan yenilemesi) havuz yerine o bağlantı kullanılır.
+        """
+        owns_connection = conn is None
+        try:
+            if owns_connection:
+                conn = get_connection()
+            cursor = conn.cursor()
+            started = time.perf_counter()
+            # Sayaç yenilemeden önce okunur; yenileme sırasında gelen yazma view'ı tekrar bayat bırakır
+            cursor.execute(TABLE_WRITE_COUNTS_QUERY, (list(REPORTING_VIEWS[view]),))
+            source_version = sum(count for _, count in cursor.fetchall())
+            query = f"REFRESH MATERIALIZED VIEW{mode} {view}"
+            cursor.execute(query)
+            cursor.execute("""
+                INSERT INTO reporting_view_state (view_name, source_version, refreshed_at)
+                VALUES (%s, %s, CURRENT_TIMESTAMP)
+                ON CONFLICT (view_name) DO UPDATE
+                SET source_version = EXCLUDED.source_version, refreshed_at = EXCLUDED.refreshed_at
+            """, (view, source_version))
+            conn.commit()
+            get_query_stats().record(query, (time.perf_counter() - started) * 1000, 0)
+            cursor.close()
+        except Exception:
+            if conn:
+                conn.rollback()
+            raise
+        finally:
+            if conn and owns_connection:
+                release_connection(conn)
+
+    def refresh(self, views: Optional[Iterable[str]] = None, concurrently: bool = True) -> List[str]:
+        """
+        Materialized view'ları yeniler.
+
+        Args:
+            views: Yenilenecek view'lar (None: tümü)
+            concurrently: Okumaları bloklamadan yenile (unique index gerektirir)
+
+        Returns:
+            List[str]: Yenilenen view adları
+        """
+        names = list(views) if views is not None else list(REPORTING_VIEWS)
+        mode = " CONCURRENTLY" if concurrently else ""
+        with self._refresh_lock:
+            for name in names:
+                self._refresh_view(name, mode)
+        logger.info(f"Raporlama view'ları yenilendi: {', '.join(names)}")
+        return names
+
+    def refresh_if_stale(self, views: Optional[Iterable[str]] = None) -> List[str]:
+        """Yalnızca kaynak tabloları son yenilemeden sonra değişmiş view'ları yeniler."""
+        stale = self.stale_views(views)
+        if not stale:
+            return []
+        return self.refresh(stale)
+
+    def refresh_in_background(self, views: Optional[Iterable[str]] = None) -> Optional[threading.Thread]:
+        """
+        Bayat view'ları arka plan iş parçacığında CONCURRENTLY yeniler; çağıran beklemez.
+        Bağlantı havuzu thread'ler arasında paylaşılmadığı için iş parçacığı kendi
+        bağlantısını açar. Süren bir yenileme varsa yenisi başlatılmaz.
+
+        Returns:
+            Başlatılan iş parçacığı; bayat view yoksa veya yenileme sürüyorsa None
+        """
+        stale = self.stale_views(views)
+        if not stale or self._refresh_lock.locked():
+            return None
+        thread = threading.Thread(
+            target=self._refresh_detached, args=(stale,), name="reporting-refresh", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _refresh_detached(self, views: List[str]) -> None:
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        conn = None
+        try:
+            conn = psycopg2.connect(**DatabaseConfig().get_connection_dict())
+            for view in views:
+                self._refresh_view(view, " CONCURRENTLY", conn=conn)
+            logger.info(f"Raporlama view'ları arka planda yenilendi: {', '.join(views)}")
+        except Exception as e:
+            logger.warning(f"Raporlama view'ları arka planda yenilenemedi: {e}")
+        finally:
+            if conn:
+                conn.close()
+            self._refresh_lock.release()
+
+    @reporting_query
+    def get_dashboard_counts(self, today: date, week_end: date) -> Dict[str, int]:
+        """Dashboard toplamlarını ve bugünkü/bu haftaki sınav sayılarını tek satırda döndürür."""
+        self.refresh_in_background(('mv_dashboard_counts', 'mv_exam_schedule_stats'))
+        query = """
+            SELECT d.total_faculties, d.total_departments, d.total_classrooms,
+                   d.total_lecturers, d.total_courses, d.total_exams, d.pending_exams,
+                   (SELECT COALESCE(SUM(s.exam_count), 0) FROM mv_exam_schedule_stats s
+                    WHERE s.exam_date BETWEEN %s AND %s) AS this_week_exams,
+                   (SELECT COALESCE(SUM(s.exam_count), 0) FROM mv_exam_schedule_stats s
+                    WHERE s.exam_date = %s) AS today_exams
+            FROM mv_dashboard_counts d
+        """
+        rows, columns = self._execute_query(query, (today, week_end, today))
+        if not rows:
+            return {column: 0 for column in columns}
+        return {column: int(value or 0) for column, value in zip(columns, rows[0])}
+
+    @reporting_query
+    def get_faculty_distribution(self) -> List[Dict[str, Any]]:
+        self.refresh_in_background(('mv_faculty_department_counts',))
+        query = """
+            SELECT faculty_name, department_count, code
+            FROM mv_faculty_department_counts
+            ORDER BY faculty_name
+        """
+        rows, columns = self._execute_query(query)
+        return self._rows_to_entities(rows, columns)
+
+    @reporting_query
+    def get_schedule_statistics(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Sınav sayılarını durum, tarih, derslik ve bölüm kırılımında döndürür.
+        Tarih aralığı verilmezse tüm sınavlar sayılır.
+        """
+        self.refresh_in_background(('mv_exam_schedule_stats',))
+        where = ""
+        params: tuple = ()
+        if start_date and end_date:
+            where = "WHERE exam_date BETWEEN %s AND %s"
+            params = (start_date, end_date)
+        query = f"""
+            SELECT exam_date, classroom_name, department_name, status, exam_count
+            FROM mv_exam_schedule_stats
+            {where}
+            ORDER BY exam_date
+        """
+        rows, _ = self._execute_query(query, params or None)
+
+        stats = {
+            'total': 0,
+            'planned': 0,
+            'confirmed': 0,
+            'cancelled': 0,
+            'by_date': {},
+            'by_classroom': {},
+            'by_department': {}
+        }
+        for exam_date, classroom_name, department_name, status, count in rows:
+            stats['total'] += count
+            if status in ('planned', 'confirmed', 'cancelled'):
+                stats[status] += count
+            date_str = str(exam_date) if exam_date else 'unknown'
+            stats['by_date'][date_str] = stats['by_date'].get(date_str, 0) + count
+            classroom_name = classroom_name or 'unknown'
+            stats['by_classroom'][classroom_name] = stats['by_classroom'].get(classroom_name, 0) + count
+            department_name = department_name or 'unknown'
+            stats['by_department'][department_name] = stats['by_department'].get(department_name, 0) + count
+        return stats
@@ -0,0 +1,66 @@
+"""
+Derlenmiş satır eşleyiciler (row mapper)
+
+Her (model sınıfı, sütun listesi) ikilisi için bir kez kaynak kodu üretilip
+derlenen bir fonksiyon oluşturulur. Bu fonksiyon satırdaki tuple pozisyonlarını
+doğrudan entity alanlarına yazar; ara dict, from_dict ve __post_init__ adımları
+atlanır. Sorguda bulunmayan alanlar dataclass varsayılanlarını alır.
+
+Modelde `_post_load` metodu varsa (ör. Course, Classroom) yükleme sonrası
+normalizasyon için çağrılır.
+"""
+
+import threading
+import dataclasses
+from typing import Any, Callable, Dict, Sequence, Tuple, Type
+
+_mappers: Dict[Tuple[type, Tuple[str, ...]], Callable[[tuple], Any]] = {}
+_lock = threading.Lock()
+
+
+def _compile_mapper(model_cls: type, columns: Tuple[str, ...]) -> Callable[[tuple], Any]:
+    # Aynı isimli sütunlarda dict(zip(...)) davranışıyla uyumlu olarak son sütun kazanır
+    positions = {name: index for index, name in enumerate(columns)}
+    namespace: Dict[str, Any] = {'_new': object.__new__, '_cls': model_cls}
+    lines = ["def _map(row):", "    obj = _new(_cls)"]
+
+    for f in dataclasses.fields(model_cls):
+        if f.name in positions:
+            lines.append(f"    obj.{f.name} = row[{positions[f.name]}]")
+        elif f.default is not dataclasses.MISSING:
+            namespace[f"_d_{f.name}"] = f.default
+            lines.append(f"    obj.{f.name} = _d_{f.name}")
+        elif f.default_factory is not dataclasses.MISSING:
+            namespace[f"_f_{f.name}"] = f.default_factory
+            lines.append(f"    obj.{f.name} = _f_{f.name}()")
+        else:
+            lines.append(f"    obj.{f.name} = None")
+
+    if hasattr(model_cls, '_post_load'):
+        lines.append("    obj._post_load()")
+    lines.append("    return obj")
+
+    exec("\n".join(lines), namespace)
+    return namespace['_map']
+
+
+def get_row_mapper(model_cls: Type, columns: Sequence[str]) -> Callable[[tuple], Any]:
+    """
+    Verilen model ve sütun listesi için derlenmiş eşleyiciyi döndürür.
+
+    Args:
+        model_cls: Dataclass model sınıfı
+        columns: cursor.description'dan gelen sütun adları
+
+    Returns:
+        Callable: row tuple -> entity
+    """
+    key = (model_cls, tuple(columns))
+    mapper = _mappers.get(key)
+    if mapper is None:
+        with _lock:
+            mapper = _mappers.get(key)
+            if mapper is None:
+                mapper = _compile_mapper(model_cls, key[1])
+                _mappers[key] = mapper
+    return mapper
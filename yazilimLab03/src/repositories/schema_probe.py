@@ -0,0 +1,93 @@
+"""
+Şema yetenek kontrolü
+
+Sütunların varlığı (ör. classrooms.block) ve kurulu eklentiler (ör. pg_trgm)
+süreç başına bir kez katalogdan okunur ve tüm repository örnekleri tarafından
+paylaşılır. Şema değiştiren migration'lardan sonra reset_schema_probe()
+çağrılmalıdır.
+"""
+
+import threading
+import logging
+from typing import Dict, FrozenSet, Optional
+
+from src.config.database import get_connection, release_connection
+
+logger = logging.getLogger(__name__)
+
+_columns: Optional[Dict[str, FrozenSet[str]]] = None
+_extensions: Optional[FrozenSet[str]] = None
+_lock = threading.Lock()
+
+
+def _load_columns() -> Dict[str, FrozenSet[str]]:
+    conn = None
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT table_name, column_name
+            FROM information_schema.columns
+            WHERE table_schema = current_schema()
+        """)
+        columns: Dict[str, set] = {}
+        for table, column in cursor.fetchall():
+            columns.setdefault(table, set()).add(column)
+        cursor.close()
+        return {table: frozenset(names) for table, names in columns.items()}
+    finally:
+        if conn:
+            release_connection(conn)
+
+
+def _load_extensions() -> FrozenSet[str]:
+    conn = None
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT extname FROM pg_extension")
+        names = frozenset(row[0] for row in cursor.fetchall())
+        cursor.close()
+        return names
+    finally:
+        if conn:
+            release_connection(conn)
+
+
+def has_column(table: str, column: str) -> bool:
+    """
+    Tabloda sütunun bulunup bulunmadığını döndürür. İlk çağrıda şema okunur;
+    okuma başarısız olursa False döner ve bir sonraki çağrıda tekrar denenir.
+    """
+    global _columns
+    if _columns is None:
+        with _lock:
+            if _columns is None:
+                try:
+                    _columns = _load_columns()
+                except Exception as e:
+                    logger.warning(f"Şema bilgisi okunamadı: {e}")
+                    return False
+    return column in _columns.get(table, ())
+
+
+def has_extension(name: str) -> bool:
+    """Veritabanında eklentinin kurulu olup olmadığını döndürür (okuma hatasında False)."""
+    global _extensions
+    if _extensions is None:
+        with _lock:
+            if _extensions is None:
+                try:
+                    _extensions = _load_extensions()
+                except Exception as e:
+                    logger.warning(f"Eklenti bilgisi okunamadı: {e}")
+                    return False
+    return name in _extensions
+
+
+def reset_schema_probe() -> None:
+    """Önbelleğe alınmış şema bilgisini siler."""
+    global _columns, _extensions
+    with _lock:
+        _columns = None
+        _extensions = None
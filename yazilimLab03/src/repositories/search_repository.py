@@ -0,0 +1,144 @@
+"""
+Global arama repository sınıfı
+
+Ders, öğretim üyesi, derslik ve öğrenci kayıtlarında tek sorguyla (UNION ALL)
+sıralı arama yapar. pg_trgm kuruluysa eşleşme ILIKE '%terim%' veya trigram
+benzerliği (%) ile bulunur ve similarity() ile puanlanır; her iki koşulu da
+migrations/005 ile oluşturulan GIN indeksleri karşılar. Eklenti yoksa aynı
+arama indekssiz ILIKE ve tam/önek eşleşmesine göre basit bir puanla çalışır.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.repositories.base_repository import ReadOnlyRepository, ilike_pattern
+from src.repositories.schema_probe import has_extension
+
+
+@dataclass(slots=True)
+class SearchResult:
+    """Global arama sonucu"""
+    kind: str                   # 'course' | 'lecturer' | 'classroom' | 'student'
+    id: int
+    label: str
+    detail: Optional[str] = None
+    search_text: Optional[str] = None   # İlgili liste ekranının arama kutusuna yazılacak metin
+    score: float = 0.0
+
+
+# tür -> (SELECT sütunları, FROM [JOIN ...], aranan ifadeler, ek WHERE koşulu)
+# Aranan ifadeler 005_trigram_search indeks ifadeleriyle aynı olmalıdır.
+SEARCH_SOURCES: Dict[str, Tuple[str, str, Tuple[str, ...], str]] = {
+    'course': (
+        "c.id, c.code || ' - ' || c.name AS label, d.name AS detail, c.code AS search_text",
+        "courses c LEFT JOIN departments d ON c.department_id = d.id",
+        ('c.code', 'c.name'),
+        "",
+    ),
+    'lecturer': (
+        "l.id, CONCAT_WS(' ', l.title, l.first_name, l.last_name) AS label, d.name AS detail, "
+        "l.first_name || ' ' || l.last_name AS search_text",
+        "lecturers l LEFT JOIN departments d ON l.department_id = d.id",
+        ("(l.first_name || ' ' || l.last_name)",),
+        "",
+    ),
+    'classroom': (
+        "cl.id, cl.name AS label, f.name AS detail, cl.name AS search_text",
+        "classrooms cl LEFT JOIN faculties f ON cl.faculty_id = f.id",
+        ('cl.name',),
+        "",
+    ),
+    'student': (
+        "s.id, s.student_number || ' - ' || s.first_name || ' ' || s.last_name AS label, "
+        "d.name AS detail, s.student_number AS search_text",
+        "students s LEFT JOIN departments d ON s.department_id = d.id",
+        ('s.student_number', "(s.first_name || ' ' || s.last_name)"),
+        "s.is_active = TRUE",
+    ),
+}
+
+
+class SearchRepository(ReadOnlyRepository[SearchResult]):
+
+    # Aynı terim (debounce sonrası tekrar, geri silme) önbellekten karşılanır;
+    # kaynak tablolara yazıldığında önbellek sürümü değişir.
+    use_query_cache = True
+
+    def _row_to_entity(self, row: tuple, columns: List[str]) -> SearchResult:
+        data = dict(zip(columns, row))
+        return SearchResult(
+            kind=data['kind'],
+            id=data['id'],
+            label=data['label'],
+            detail=data.get('detail'),
+            search_text=data.get('search_text'),
+            score=float(data.get('score') or 0)
+        )
+
+    @staticmethod
+    def _branch(kind: str, term: str, use_trigram: bool, limit: int) -> Tuple[str, List[Any]]:
+        """Bir kayıt türü için puanlı alt sorgu ve parametreleri (puan parametreleri WHERE'den önce gelir)."""
+        columns_sql, from_sql, expressions, extra = SEARCH_SOURCES[kind]
+        pattern = ilike_pattern(term)
+        escaped = pattern[1:-1]
+
+        score_params: List[Any] = []
+        match_params: List[Any] = []
+        if use_trigram:
+            scores = [f"similarity({e}, %s)" for e in expressions]
+            matches = [f"{e} ILIKE %s OR {e} %% %s" for e in expressions]
+            for _ in expressions:
+                score_params.append(term)
+                match_params.extend([pattern, term])
+        else:
+            # Tam eşleşme > önek eşleşmesi > içerme
+            scores = [f"CASE WHEN {e} ILIKE %s THEN 1.0 WHEN {e} ILIKE %s THEN 0.75 ELSE 0.5 END"
+                      for e in expressions]
+            matches = [f"{e} ILIKE %s" for e in expressions]
+            for _ in expressions:
+                score_params.extend([escaped, escaped + '%'])
+                match_params.append(pattern)
+
+        score_sql = scores[0] if len(scores) == 1 else f"GREATEST({', '.join(scores)})"
+        where = f"({' OR '.join(matches)})"
+        if extra:
+            where += f" AND {extra}"
+        query = (
+            f"(SELECT '{kind}' AS kind, {columns_sql}, {score_sql} AS score"
+            f" FROM {from_sql} WHERE {where} ORDER BY score DESC LIMIT %s)"
+        )
+        return query, score_params + match_params + [limit]
+
+    def search(self, term: str, kinds: Optional[Iterable[str]] = None, limit: int = 20) -> List[SearchResult]:
+        """
+        Terimi seçili kayıt türlerinde arar ve puana göre sıralı döndürür.
+
+        Args:
+            term: Arama terimi (büyük/küçük harf duyarsız)
+            kinds: SEARCH_SOURCES anahtarları (None: tümü)
+            limit: Toplam en fazla sonuç sayısı
+        """
+        term = term.strip()
+        names = list(kinds) if kinds is not None else list(SEARCH_SOURCES)
+        unknown = [kind for kind in names if kind not in SEARCH_SOURCES]
+        if unknown:
+            raise ValueError(f"Geçersiz arama türü: {', '.join(unknown)}")
+        if not term or not names:
+            return []
+
+        use_trigram = has_extension('pg_trgm')
+        branches, params = [], []
+        for kind in names:
+            branch_sql, branch_params = self._branch(kind, term, use_trigram, limit)
+            branches.append(branch_sql)
+            params.extend(branch_params)
+
+        query = f"""
+            SELECT kind, id, label, detail, search_text, score
+            FROM ({' UNION ALL '.join(branches)}) results
+            ORDER BY score DESC, label
+            LIMIT %s
+        """
+        params.append(limit)
+        rows, columns = self._execute_query(query, tuple(params))
+        return self._rows_to_entities(rows, columns)
@@ -2,20 +2,24 @@
 Öğrenci ve Öğrenci-Ders repository sınıfları
 """
 
-from typing import List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from src.repositories.base_repository import BaseRepository
+from src.repositories.row_mapper import get_row_mapper
 from src.models.student import Student, StudentCourse
 
 
 class StudentRepository(BaseRepository[Student]):
-    
+
+    model_class = Student
+
+    INSERT_COLUMNS = ['student_number', 'first_name', 'last_name', 'email', 'department_id', 'year', 'is_active']
+
     def __init__(self):
         super().__init__()
         self.table_name = "students"
     
     def _row_to_entity(self, row: tuple, columns: List[str]) -> Student:
-        data = dict(zip(columns, row))
-        return Student.from_dict(data)
+        return get_row_mapper(self.model_class, columns)(row)
     
     def _entity_to_values(self, entity: Student) -> tuple:
         return (
@@ -63,7 +67,42 @@ class StudentRepository(BaseRepository[Student]):
         
         values_list = [self._entity_to_values(s) for s in students]
         return self._execute_batch(query, values_list)
-    
+
+    def bulk_upsert(self, students: List[Student], conn=None) -> Dict[str, int]:
+        """
+        Öğrencileri COPY + tek INSERT ... ON CONFLICT ile toplu yükler.
+
+        Aynı öğrenci numarası birden fazla kez gelirse son kayıt geçerlidir.
+
+        Returns:
+            dict: {student_number: id}
+        """
+        unique = {s.student_number: s for s in students if s.student_number}
+        if not unique:
+            return {}
+
+        query = """
+            INSERT INTO students (student_number, first_name, last_name, email, department_id, year, is_active)
+            SELECT student_number, first_name, last_name, email, department_id, year, is_active
+            FROM {staging}
+            ORDER BY _ord
+            ON CONFLICT (student_number) DO UPDATE
+            SET first_name = EXCLUDED.first_name,
+                last_name = EXCLUDED.last_name,
+                email = EXCLUDED.email,
+                department_id = EXCLUDED.department_id,
+                year = EXCLUDED.year,
+                updated_at = CURRENT_TIMESTAMP
+            RETURNING student_number, id
+        """
+        rows = self._execute_copy_merge(
+            self.INSERT_COLUMNS,
+            [self._entity_to_values(s) for s in unique.values()],
+            query,
+            conn=conn
+        )
+        return {student_number: student_id for student_number, student_id in rows}
+
     def update(self, student: Student) -> bool:
         query = """
             UPDATE students
@@ -114,7 +153,7 @@ class StudentRepository(BaseRepository[Student]):
             ORDER BY s.student_number
         """
         rows, columns = self._execute_query(query, (department_id,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_all_with_details(self) -> List[Student]:
         query = """
@@ -126,7 +165,7 @@ class StudentRepository(BaseRepository[Student]):
             ORDER BY d.name, s.year, s.student_number
         """
         rows, columns = self._execute_query(query)
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_student_numbers_by_course(self, course_id: int) -> Set[str]:
         """
@@ -177,14 +216,17 @@ class StudentRepository(BaseRepository[Student]):
 
 
 class StudentCourseRepository(BaseRepository[StudentCourse]):
-    
+
+    model_class = StudentCourse
+
+    INSERT_COLUMNS = ['student_id', 'course_id', 'semester', 'is_active']
+
     def __init__(self):
         super().__init__()
         self.table_name = "student_courses"
     
     def _row_to_entity(self, row: tuple, columns: List[str]) -> StudentCourse:
-        data = dict(zip(columns, row))
-        return StudentCourse.from_dict(data)
+        return get_row_mapper(self.model_class, columns)(row)
     
     def _entity_to_values(self, entity: StudentCourse) -> tuple:
         return (
@@ -221,7 +263,109 @@ class StudentCourseRepository(BaseRepository[StudentCourse]):
         
         values_list = [self._entity_to_values(sc) for sc in student_courses]
         return self._execute_batch(query, values_list)
-    
+
+    def bulk_upsert(self, student_courses: List[StudentCourse], conn=None) -> Dict[Tuple[int, int], int]:
+        """
+        Öğrenci-ders ilişkilerini COPY + tek INSERT ... ON CONFLICT ile toplu yükler.
+
+        Returns:
+            dict: {(student_id, course_id): id}
+        """
+        unique = {
+            (sc.student_id, sc.course_id): sc
+            for sc in student_courses
+            if sc.student_id and sc.course_id
+        }
+        if not unique:
+            return {}
+
+        query = """
+            INSERT INTO student_courses (student_id, course_id, semester, is_active)
+            SELECT student_id, course_id, semester, is_active
+            FROM {staging}
+            ORDER BY _ord
+            ON CONFLICT (student_id, course_id) DO UPDATE
+            SET semester = EXCLUDED.semester,
+                is_active = EXCLUDED.is_active
+            RETURNING student_id, course_id, id
+        """
+        rows = self._execute_copy_merge(
+            self.INSERT_COLUMNS,
+            [self._entity_to_values(sc) for sc in unique.values()],
+            query,
+            conn=conn
+        )
+        return {(student_id, course_id): sc_id for student_id, course_id, sc_id in rows}
+
+    def sync_enrollments(
+        self,
+        student_courses: List[StudentCourse],
+        conn=None,
+        keep: Optional[Iterable[Tuple[str, int]]] = None
+    ) -> Tuple[int, int]:
+        """
+        Listedeki derslerin aktif kayıtlarını verilen kümeye eşitler: yalnızca yeni
+        (veya pasif/dönemi farklı) kayıtlar yazılır, listede olmayan aktif kayıtlar
+        pasife alınır (soft delete). Değişmeyen satırlara dokunulmaz.
+
+        Args:
+            keep: Listede olmasa da pasife alınmayacak (öğrenci numarası, ders ID) çiftleri,
+                ör. satırı okunamayan öğrenciler
+
+        Returns:
+            (eklenen/güncellenen kayıt sayısı, pasife alınan kayıt sayısı)
+        """
+        unique = {
+            (sc.student_id, sc.course_id): sc
+            for sc in student_courses
+            if sc.student_id and sc.course_id
+        }
+        if not unique:
+            return 0, 0
+
+        query = """
+            WITH removed AS (
+                UPDATE student_courses sc
+                SET is_active = FALSE
+                WHERE sc.is_active = TRUE
+                  AND sc.course_id IN (SELECT course_id FROM {staging})
+                  AND NOT EXISTS (
+                      SELECT 1 FROM {staging} s
+                      WHERE s.student_id = sc.student_id AND s.course_id = sc.course_id
+                  )
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM unnest(%s::text[], %s::int[]) AS k(student_number, course_id)
+                      JOIN students st ON st.student_number = k.student_number
+                      WHERE st.id = sc.student_id AND k.course_id = sc.course_id
+                  )
+                RETURNING sc.id
+            ),
+            added AS (
+                INSERT INTO student_courses (student_id, course_id, semester, is_active)
+                SELECT student_id, course_id, semester, TRUE
+                FROM {staging}
+                ORDER BY _ord
+                ON CONFLICT (student_id, course_id) DO UPDATE
+                SET semester = EXCLUDED.semester,
+                    is_active = TRUE
+                WHERE student_courses.is_active = FALSE
+                   OR student_courses.semester IS DISTINCT FROM EXCLUDED.semester
+                RETURNING id
+            )
+            SELECT (SELECT COUNT(*) FROM added), (SELECT COUNT(*) FROM removed)
+        """
+        keep = list(keep or ())
+        rows = self._execute_copy_merge(
+            self.INSERT_COLUMNS,
+            [self._entity_to_values(sc) for sc in unique.values()],
+            query,
+            conn=conn,
+            params=([number for number, _ in keep], [course_id for _, course_id in keep])
+        )
+        added, removed = rows[0]
+        return added, removed
+
     def get_by_student_id(self, student_id: int) -> List[StudentCourse]:
         query = """
             SELECT sc.*, s.student_number, 
@@ -235,7 +379,7 @@ class StudentCourseRepository(BaseRepository[StudentCourse]):
             ORDER BY c.code
         """
         rows, columns = self._execute_query(query, (student_id,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_by_course_id(self, course_id: int) -> List[StudentCourse]:
         query = """
@@ -250,7 +394,7 @@ class StudentCourseRepository(BaseRepository[StudentCourse]):
             ORDER BY s.student_number
         """
         rows, columns = self._execute_query(query, (course_id,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_student_ids_by_course(self, course_id: int) -> Set[int]:
         """
@@ -5,18 +5,20 @@ Kullanıcı repository sınıfı
 from typing import List, Optional
 from datetime import datetime
 from src.repositories.base_repository import BaseRepository
+from src.repositories.row_mapper import get_row_mapper
 from src.models.user import User
 
 
 class UserRepository(BaseRepository[User]):
+
+    model_class = User
     
     def __init__(self):
         super().__init__()
         self.table_name = "users"
     
     def _row_to_entity(self, row: tuple, columns: List[str]) -> User:
-        data = dict(zip(columns, row))
-        return User.from_dict(data)
+        return get_row_mapper(self.model_class, columns)(row)
     
     def _entity_to_values(self, entity: User) -> tuple:
         return (
@@ -70,12 +72,12 @@ class UserRepository(BaseRepository[User]):
     def get_active_users(self) -> List[User]:
         query = "SELECT * FROM users WHERE is_active = TRUE ORDER BY username"
         rows, columns = self._execute_query(query)
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def get_by_role(self, role: str) -> List[User]:
         query = "SELECT * FROM users WHERE role = %s ORDER BY username"
         rows, columns = self._execute_query(query, (role,))
-        return [self._row_to_entity(row, columns) for row in rows]
+        return self._rows_to_entities(rows, columns)
     
     def update_last_login(self, user_id: int) -> bool:
         query = "UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = %s"
@@ -12,3 +12,5 @@ from .course_service import CourseService
 from .exam_schedule_service import ExamScheduleService
 from .scheduler_service import SchedulerService
 from .student_import_service import StudentImportService
+from .reporting_service import ReportingService
+from .search_service import SearchService
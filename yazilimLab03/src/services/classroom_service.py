@@ -5,6 +5,7 @@ Derslik servisi
 from typing import List, Optional, Tuple
 from src.models.classroom import Classroom, CLASSROOM_TYPES, CLASSROOM_TYPE_MAP
 from src.repositories.classroom_repository import ClassroomRepository
+from src.repositories.base_repository import Page, DEFAULT_PAGE_SIZE
 
 
 class ClassroomService:
@@ -15,6 +16,10 @@ class ClassroomService:
     def get_all(self) -> List[Classroom]:
         return self.repository.get_all()
     
+    def get_page(self, after: Optional[tuple] = None, limit: int = DEFAULT_PAGE_SIZE,
+                 search: Optional[str] = None, suitable_only: bool = False) -> Page[Classroom]:
+        return self.repository.get_page(after=after, limit=limit, search=search, suitable_only=suitable_only)
+    
     def get_by_id(self, classroom_id: int) -> Optional[Classroom]:
         return self.repository.get_by_id(classroom_id)
     
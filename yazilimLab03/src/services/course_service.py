@@ -8,6 +8,7 @@ from src.models.course import (
     REQUIRED_ROOM_TYPE_MAP, EXAM_TYPE_MAP, COURSE_TYPE_MAP
 )
 from src.repositories.course_repository import CourseRepository
+from src.repositories.base_repository import Page, DEFAULT_PAGE_SIZE
 
 
 class CourseService:
@@ -17,6 +18,10 @@ class CourseService:
     def get_all(self) -> List[Course]:
         return self.repository.get_all_with_details()
     
+    def get_page(self, after: Optional[tuple] = None, limit: int = DEFAULT_PAGE_SIZE,
+                 search: Optional[str] = None, department_id: Optional[int] = None) -> Page[Course]:
+        return self.repository.get_page(after=after, limit=limit, search=search, department_id=department_id)
+    
     def get_by_id(self, course_id: int) -> Optional[Course]:
         return self.repository.get_by_id(course_id)
     
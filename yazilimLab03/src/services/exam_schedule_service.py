@@ -5,7 +5,8 @@ Sınav programı servisi
 from typing import List, Optional, Tuple, Set
 from datetime import date, time, datetime
 from src.models.exam_schedule import ExamSchedule
-from src.repositories.exam_schedule_repository import ExamScheduleRepository
+from src.repositories.exam_schedule_repository import ExamScheduleRepository, ExamConflictError
+from src.repositories.base_repository import Page, DEFAULT_PAGE_SIZE
 from src.repositories.course_repository import CourseRepository
 from src.repositories.classroom_repository import ClassroomRepository
 from src.repositories.lecturer_repository import LecturerRepository
@@ -53,6 +54,16 @@ class ExamScheduleService:
     def get_all(self) -> List[ExamSchedule]:
         return self.repository.get_all_with_details()
     
+    def get_page(self, after: Optional[tuple] = None, limit: int = DEFAULT_PAGE_SIZE,
+                 search: Optional[str] = None, **scope) -> Page[ExamSchedule]:
+        """Sınav listesinin bir sayfası; scope: department_id, lecturer_id, student_id, status, include_cancelled"""
+        return self.repository.get_page(after=after, limit=limit, search=search, **scope)
+    
+    def get_schedule_rows(self, from_date: Optional[date] = None, limit: Optional[int] = None,
+                          **scope) -> List[dict]:
+        """Sınav programı satırları (dict); scope: department_id, lecturer_id, student_id, include_cancelled"""
+        return self.repository.get_schedule_rows(from_date=from_date, limit=limit, **scope)
+    
     def get_by_id(self, schedule_id: int) -> Optional[ExamSchedule]:
         return self.repository.get_by_id(schedule_id)
     
@@ -183,6 +194,12 @@ class ExamScheduleService:
     def clear_student_cache(self):
         self._course_student_cache.clear()
     
+    def _classroom_conflict_message(self, error: ExamConflictError) -> str:
+        classroom = self.classroom_repo.get_by_id(error.classroom_id) if error.classroom_id else None
+        if classroom:
+            return f"Bu derslik ({classroom.name}) belirtilen tarih ve saatte başka bir sınav için ayrılmış. Bir derslikte aynı anda birden fazla sınav yapılamaz."
+        return str(error)
+    
     def validate_exam_constraints(
         self,
         course_id: int,
@@ -193,7 +210,8 @@ class ExamScheduleService:
         exam_type: str = "final",
         exclude_id: int = None,
         skip_course_exam_check: bool = False,
-        skip_capacity_check: bool = False
+        skip_capacity_check: bool = False,
+        skip_classroom_conflict_check: bool = False
     ) -> Tuple[bool, str]:
         course = self.course_repo.get_by_id(course_id)
         if not course:
@@ -217,7 +235,10 @@ class ExamScheduleService:
                 exam_label = exam_type_labels.get(exam_type, exam_type)
                 return False, f"Bu ders için zaten bir {exam_label} sınavı planlanmış. Bir ders için birden fazla sınav saati atanamaz."
         
-        if self.repository.check_conflict(classroom_id, exam_date, start_time_str, end_time_str, exclude_id):
+        # Kayıt hemen yazılacaksa derslik çakışmasını exclusion constraint yakalar
+        if not skip_classroom_conflict_check and self.repository.check_conflict(
+            classroom_id, exam_date, start_time_str, end_time_str, exclude_id
+        ):
             return False, f"Bu derslik ({classroom.name}) belirtilen tarih ve saatte başka bir sınav için ayrılmış. Bir derslikte aynı anda birden fazla sınav yapılamaz."
         
         if self.use_student_based_conflict:
@@ -285,7 +306,8 @@ class ExamScheduleService:
         start_time: time,
         end_time: time,
         exam_type: str = "final",
-        exclude_id: int = None
+        exclude_id: int = None,
+        skip_classroom_conflict_check: bool = False
     ) -> Tuple[bool, str]:
         if not classroom_ids:
             return False, "En az bir derslik seçilmelidir."
@@ -323,6 +345,8 @@ class ExamScheduleService:
         end_time_str = end_time.strftime('%H:%M') if isinstance(end_time, time) else str(end_time)[:5]
         
         for classroom in classrooms:
+            if skip_classroom_conflict_check:
+                break
             if self.repository.check_conflict(classroom.id, exam_date, start_time_str, end_time_str, exclude_id):
                 return False, f"Derslik ({classroom.name}) belirtilen tarih ve saatte başka bir sınav için ayrılmış."
         
@@ -394,7 +418,8 @@ class ExamScheduleService:
             start_time=start_time,
             end_time=end_time,
             exam_type=exam_type,
-            exclude_id=None
+            exclude_id=None,
+            skip_classroom_conflict_check=True
         )
         
         if not is_valid:
@@ -415,6 +440,8 @@ class ExamScheduleService:
             schedule_id = self.repository.create(exam_schedule)
             self.clear_student_cache()
             return True, "Sınav programı başarıyla oluşturuldu.", schedule_id
+        except ExamConflictError as e:
+            return False, self._classroom_conflict_message(e), None
         except Exception as e:
             return False, f"Sınav programı oluşturulamadı: {str(e)}", None
     
@@ -444,7 +471,8 @@ class ExamScheduleService:
             start_time=start_time,
             end_time=end_time,
             exam_type=exam_type,
-            exclude_id=None
+            exclude_id=None,
+            skip_classroom_conflict_check=True
         )
         
         if not is_valid:
@@ -478,8 +506,7 @@ class ExamScheduleService:
                 notes=combined_notes
             )
             
-            primary_id = self.repository.create(exam_schedule)
-            
+            exams = [exam_schedule]
             for i, classroom_id in enumerate(classroom_ids[1:], start=2):
                 additional_notes = f"Birleşik sınav ({i}/{len(classroom_ids)}) - Ana derslik: {classroom_names[0]}"
                 if notes:
@@ -495,15 +522,19 @@ class ExamScheduleService:
                     status="planned",
                     notes=additional_notes
                 )
-                self.repository.create(additional_exam)
+                exams.append(additional_exam)
             
+            # Tüm derslikler tek transaction'da yazılır; biri doluysa hiçbiri yazılmaz
+            primary_id = self.repository.create_all(exams)[0]
             self.clear_student_cache()
             
             if len(classroom_ids) > 1:
                 return True, f"Sınav programı {len(classroom_ids)} derslikte başarıyla oluşturuldu.", primary_id
             else:
                 return True, "Sınav programı başarıyla oluşturuldu.", primary_id
-                
+        
+        except ExamConflictError as e:
+            return False, self._classroom_conflict_message(e), None
         except Exception as e:
             return False, f"Sınav programı oluşturulamadı: {str(e)}", None
     
@@ -525,7 +556,8 @@ class ExamScheduleService:
                 start_time=start_time,
                 end_time=end_time,
                 exam_type=exam_type,
-                exclude_id=schedule_id
+                exclude_id=schedule_id,
+                skip_classroom_conflict_check=True
             )
             
             if not is_valid:
@@ -540,7 +572,11 @@ class ExamScheduleService:
         exam_schedule.status = status
         exam_schedule.notes = notes.strip() if notes else None
         
-        if self.repository.update(exam_schedule):
+        try:
+            updated = self.repository.update(exam_schedule)
+        except ExamConflictError as e:
+            return False, self._classroom_conflict_message(e)
+        if updated:
             self.clear_student_cache()
             return True, "Sınav programı başarıyla güncellendi."
         return False, "Sınav programı güncellenemedi."
@@ -552,10 +588,49 @@ class ExamScheduleService:
         return False, "Sınav programı silinemedi."
     
     def update_status(self, schedule_id: int, status: str) -> Tuple[bool, str]:
-        if self.repository.update_status(schedule_id, status):
+        try:
+            updated = self.repository.update_status(schedule_id, status)
+        except ExamConflictError as e:
+            return False, self._classroom_conflict_message(e)
+        if updated:
             return True, f"Sınav durumu '{status}' olarak güncellendi."
         return False, "Durum güncellenemedi."
     
+    def delete_many(self, schedule_ids: List[int]) -> Tuple[bool, str, List[int]]:
+        if not schedule_ids:
+            return False, "Silinecek sınav seçilmedi.", []
+        try:
+            deleted_ids = self.repository.delete_by_filter(ids=schedule_ids)
+        except Exception as e:
+            return False, f"Sınavlar silinemedi: {str(e)}", []
+        self.clear_student_cache()
+        missing = len(set(schedule_ids)) - len(deleted_ids)
+        if missing:
+            return True, f"{len(deleted_ids)} sınav silindi, {missing} sınav bulunamadı.", deleted_ids
+        return True, f"{len(deleted_ids)} sınav başarıyla silindi.", deleted_ids
+    
+    def update_status_many(self, schedule_ids: List[int], status: str) -> Tuple[bool, str, List[int]]:
+        if not schedule_ids:
+            return False, "Sınav seçilmedi.", []
+        try:
+            updated_ids = self.repository.update_status_by_ids(schedule_ids, status)
+        except ExamConflictError as e:
+            return False, self._classroom_conflict_message(e), []
+        except Exception as e:
+            return False, f"Durumlar güncellenemedi: {str(e)}", []
+        self.clear_student_cache()
+        return True, f"{len(updated_ids)} sınavın durumu '{status}' olarak güncellendi.", updated_ids
+    
+    def cancel_by_date_range(self, start_date: date, end_date: date) -> Tuple[bool, str, List[int]]:
+        if start_date > end_date:
+            return False, "Başlangıç tarihi bitiş tarihinden sonra olamaz.", []
+        try:
+            cancelled_ids = self.repository.cancel_by_date_range(start_date, end_date)
+        except Exception as e:
+            return False, f"Sınavlar iptal edilemedi: {str(e)}", []
+        self.clear_student_cache()
+        return True, f"{len(cancelled_ids)} sınav iptal edildi.", cancelled_ids
+    
     def get_exam_types(self) -> List[dict]:
         return [
             {"value": "midterm", "label": "Vize"},
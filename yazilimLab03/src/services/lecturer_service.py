@@ -6,6 +6,7 @@ import re
 from typing import List, Optional, Tuple
 from src.models.lecturer import Lecturer, DEFAULT_AVAILABLE_DAYS, ALL_WEEKDAYS
 from src.repositories.lecturer_repository import LecturerRepository
+from src.repositories.base_repository import Page, DEFAULT_PAGE_SIZE
 
 
 def normalize_turkish_chars(text: str) -> str:
@@ -34,6 +35,10 @@ class LecturerService:
     def get_all(self) -> List[Lecturer]:
         return self.repository.get_all_with_details()
     
+    def get_page(self, after: Optional[tuple] = None, limit: int = DEFAULT_PAGE_SIZE,
+                 search: Optional[str] = None, department_id: Optional[int] = None) -> Page[Lecturer]:
+        return self.repository.get_page(after=after, limit=limit, search=search, department_id=department_id)
+    
     def get_by_id(self, lecturer_id: int) -> Optional[Lecturer]:
         return self.repository.get_by_id(lecturer_id)
     
@@ -0,0 +1,27 @@
+"""
+Raporlama servisi
+"""
+
+from typing import Any, Dict, List, Tuple
+from datetime import date, timedelta
+from src.repositories.reporting_repository import ReportingRepository
+
+
+class ReportingService:
+    
+    def __init__(self):
+        self.repository = ReportingRepository()
+    
+    def get_dashboard_stats(self) -> Dict[str, int]:
+        today = date.today()
+        return self.repository.get_dashboard_counts(today, today + timedelta(days=7))
+    
+    def get_faculty_distribution(self) -> List[Dict[str, Any]]:
+        return self.repository.get_faculty_distribution()
+    
+    def refresh(self) -> Tuple[bool, str]:
+        try:
+            views = self.repository.refresh()
+            return True, f"{len(views)} raporlama görünümü yenilendi."
+        except Exception as e:
+            return False, f"Raporlama görünümleri yenilenemedi: {str(e)}"
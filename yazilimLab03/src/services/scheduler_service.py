@@ -14,10 +14,11 @@ from src.models.exam_schedule import ExamSchedule
 from src.models.lecturer import Lecturer, DEFAULT_AVAILABLE_DAYS
 from src.repositories.course_repository import CourseRepository
 from src.repositories.classroom_repository import ClassroomRepository
-from src.repositories.exam_schedule_repository import ExamScheduleRepository
+from src.repositories.exam_schedule_repository import ExamScheduleRepository, ExamConflictError
 from src.repositories.lecturer_repository import LecturerRepository
 from src.repositories.department_repository import DepartmentRepository
 from src.repositories.student_repository import StudentCourseRepository
+from src.repositories.reporting_repository import ReportingRepository
 from src.utils.classroom_proximity_loader import get_proximity_loader
 
 
@@ -100,13 +101,20 @@ class SchedulerService:
         'cuma': 'Cuma'
     }
     
-    def __init__(self, use_student_based_conflict: bool = True):
+    def __init__(self, use_student_based_conflict: bool = True, snapshot=None):
+        """
+        snapshot: scheduler_snapshot.load_snapshot() sonucu; verilirse dersler, derslikler,
+                  ders kayıtları ve hoca müsait günleri veritabanı yerine bu anlık
+                  görüntüden okunur. Mevcut sınavlar (planlanmış dersler, çakışmalar)
+                  her zaman veritabanından okunur.
+        """
         self.course_repo = CourseRepository()
         self.classroom_repo = ClassroomRepository()
         self.exam_repo = ExamScheduleRepository()
         self.lecturer_repo = LecturerRepository()
         self.department_repo = DepartmentRepository()
         self.student_course_repo = StudentCourseRepository()
+        self.reporting_repo = ReportingRepository()
         
         self.time_slots = self.DEFAULT_TIME_SLOTS
         
@@ -115,6 +123,7 @@ class SchedulerService:
         self.use_student_based_conflict = use_student_based_conflict
         
         self._course_student_cache: Dict[int, Set[int]] = {}
+        self.snapshot = snapshot
     
     def get_time_slots_for_duration(self, exam_duration: int) -> List[TimeSlot]:
 
@@ -236,7 +245,7 @@ class SchedulerService:
             reverse=True
         )
         
-        classrooms = self.classroom_repo.get_all()
+        classrooms = self.snapshot.classrooms() if self.snapshot is not None else self.classroom_repo.get_all()
         if not classrooms:
             return {
                 'success': False,
@@ -283,6 +292,9 @@ class SchedulerService:
         
         stats = self._calculate_statistics(scheduled, exam_dates, classrooms)
         
+        if scheduled:
+            self.refresh_reporting_views()
+        
         if len(failed) == 0:
             message = f"Tüm dersler ({len(scheduled)}) başarıyla planlandı."
             success = True
@@ -386,7 +398,10 @@ class SchedulerService:
             }
         
         for exam_date in available_exam_dates:
-            for time_slot in appropriate_time_slots:
+            free_by_slot = self._free_classroom_ids_by_slot(
+                exam_date, appropriate_time_slots, exam_duration, suitable_classrooms
+            )
+            for slot_index, time_slot in enumerate(appropriate_time_slots):
                 actual_end_time = self._calculate_end_time(time_slot.start_time, exam_duration)
                 
                 for classroom in suitable_classrooms:
@@ -398,7 +413,8 @@ class SchedulerService:
                         end_time=actual_end_time,
                         department_id=department_id,
                         course_year=course_year,
-                        lecturer_id=lecturer_id
+                        lecturer_id=lecturer_id,
+                        classroom_free=classroom.id in free_by_slot[slot_index]
                     )
                     
                     if conflict['has_conflict']:
@@ -494,14 +510,13 @@ class SchedulerService:
             }
         
         for exam_date in dates:
-            for time_slot in appropriate_time_slots:
+            free_by_slot = self._free_classroom_ids_by_slot(
+                exam_date, appropriate_time_slots, exam_duration, sorted_classrooms
+            )
+            for slot_index, time_slot in enumerate(appropriate_time_slots):
                 actual_end_time = self._calculate_end_time(time_slot.start_time, exam_duration)
                 
-                available_classrooms = []
-                for classroom in sorted_classrooms:
-                    if self._has_classroom_conflict(classroom.id, exam_date, time_slot.start_time, actual_end_time):
-                        continue
-                    available_classrooms.append(classroom)
+                available_classrooms = [c for c in sorted_classrooms if c.id in free_by_slot[slot_index]]
                 
                 if not available_classrooms:
                     continue
@@ -557,36 +572,36 @@ class SchedulerService:
                     student_count=student_count
                 )
                 
+                exams = [exam]
+                for i, additional_classroom in enumerate(selected_classrooms[1:], start=2):
+                    exams.append(ExamSchedule(
+                        course_id=course.id,
+                        classroom_id=additional_classroom.id,
+                        exam_date=exam_date,
+                        start_time=time_slot.start_time,
+                        end_time=actual_end_time,
+                        exam_type=exam_type,
+                        status="planned",
+                        notes=f"Birleşik sınav ({i}/{len(selected_classrooms)}) - Ana derslik: {primary_classroom.name} - {notes_text}",
+                        course_code=course.code,
+                        course_name=course.name,
+                        classroom_name=additional_classroom.name,
+                        faculty_name=additional_classroom.faculty_name,
+                        lecturer_name=course.lecturer_name,
+                        student_count=0
+                    ))
+                
+                # Tüm derslikler tek transaction'da yazılır; biri çakışırsa grup geri alınır
                 try:
-                    exam_id = self.exam_repo.create(exam)
-                    exam.id = exam_id
-                    
-                    for i, additional_classroom in enumerate(selected_classrooms[1:], start=2):
-                        additional_exam = ExamSchedule(
-                            course_id=course.id,
-                            classroom_id=additional_classroom.id,
-                            exam_date=exam_date,
-                            start_time=time_slot.start_time,
-                            end_time=actual_end_time,
-                            exam_type=exam_type,
-                            status="planned",
-                            notes=f"Birleşik sınav ({i}/{len(selected_classrooms)}) - Ana derslik: {primary_classroom.name} - {notes_text}",
-                            course_code=course.code,
-                            course_name=course.name,
-                            classroom_name=additional_classroom.name,
-                            faculty_name=additional_classroom.faculty_name,
-                            lecturer_name=course.lecturer_name,
-                            student_count=0
-                        )
-                        self.exam_repo.create(additional_exam)
-                    
-                    return {
-                        'success': True,
-                        'exam': exam,
-                        'reason': None
-                    }
-                except Exception as e:
+                    self.exam_repo.create_all(exams)
+                except ExamConflictError:
                     continue
+                
+                return {
+                    'success': True,
+                    'exam': exam,
+                    'reason': None
+                }
         
         conflict_details = []
         if self.use_student_based_conflict:
@@ -616,43 +631,20 @@ class SchedulerService:
         selected = [primary_classroom]
         current_capacity = primary_classroom.capacity
         
-        available_names = [c.name for c in available_classrooms if c != primary_classroom]
-        
-        primary_name = primary_classroom.name
-        
-        neighbors = self.proximity_loader.get_available_neighbors_for_combination(
-            primary_name, available_names
+        # Adaylar kapasiteye göre sıralı verilir: yakınlık eşitse (örn. bağlantısız derslikler) büyük olan önce
+        candidates = sorted(
+            (c for c in available_classrooms if c is not primary_classroom),
+            key=lambda c: c.capacity, reverse=True
+        )
+        order = self.proximity_loader.order_by_distance(
+            primary_classroom.name, [c.name for c in candidates]
         )
         
-        for neighbor_name in neighbors:
-            neighbor = next((c for c in available_classrooms if c.name == neighbor_name), None)
-            if neighbor and neighbor not in selected:
-                selected.append(neighbor)
-                current_capacity += neighbor.capacity
-                if current_capacity >= required_capacity:
-                    break
-        
-        if current_capacity < required_capacity:
-            primary_block = self.proximity_loader.get_block(primary_name)
-            if primary_block:
-                same_block_classrooms = self.proximity_loader.get_classrooms_in_block(primary_block)
-                for classroom_name in same_block_classrooms:
-                    if classroom_name in available_names:
-                        classroom = next((c for c in available_classrooms if c.name == classroom_name), None)
-                        if classroom and classroom not in selected:
-                            selected.append(classroom)
-                            current_capacity += classroom.capacity
-                            if current_capacity >= required_capacity:
-                                break
-        
-        if current_capacity < required_capacity:
-            remaining = [c for c in available_classrooms if c not in selected]
-            remaining.sort(key=lambda c: c.capacity, reverse=True)
-            for classroom in remaining:
-                selected.append(classroom)
-                current_capacity += classroom.capacity
-                if current_capacity >= required_capacity:
-                    break
+        for i in order:
+            if current_capacity >= required_capacity:
+                break
+            selected.append(candidates[i])
+            current_capacity += candidates[i].capacity
         
         selected.sort(key=lambda c: c.capacity, reverse=True)
         
@@ -667,12 +659,16 @@ class SchedulerService:
         end_time: time,
         department_id: Optional[int],
         course_year: Optional[int],
-        lecturer_id: Optional[int]
+        lecturer_id: Optional[int],
+        classroom_free: Optional[bool] = None
     ) -> Dict:
         start_str = start_time.strftime('%H:%M') if isinstance(start_time, time) else str(start_time)
         end_str = end_time.strftime('%H:%M') if isinstance(end_time, time) else str(end_time)
         
-        if self._has_classroom_conflict(classroom_id, exam_date, start_time, end_time):
+        # classroom_free: müsaitlik matrisinden önceden bilinen derslik durumu (None: sorgula)
+        if classroom_free is None:
+            classroom_free = not self._has_classroom_conflict(classroom_id, exam_date, start_time, end_time)
+        if not classroom_free:
             return {'has_conflict': True, 'reason': 'Derslik çakışması'}
         
         if self._has_student_conflict(
@@ -686,6 +682,28 @@ class SchedulerService:
         
         return {'has_conflict': False, 'reason': None}
     
+    def _free_classroom_ids_by_slot(
+        self,
+        exam_date: date,
+        time_slots: List[TimeSlot],
+        exam_duration: int,
+        classrooms: List[Classroom]
+    ) -> List[Set[int]]:
+        """Bir tarihteki tüm slotlar için boş derslik ID'lerini tek sorguda getirir."""
+        slots = [
+            (slot.start_time, self._calculate_end_time(slot.start_time, exam_duration))
+            for slot in time_slots
+        ]
+        free_by_slot: List[Set[int]] = [set() for _ in slots]
+        matrix = self.classroom_repo.get_availability_matrix(
+            exam_date, slots, classroom_ids=[c.id for c in classrooms]
+        )
+        for classroom, free_slots in matrix:
+            for index, is_free in enumerate(free_slots):
+                if is_free:
+                    free_by_slot[index].add(classroom.id)
+        return free_by_slot
+    
     def _has_classroom_conflict(
         self, 
         classroom_id: int, 
@@ -776,7 +794,10 @@ class SchedulerService:
             return self._course_student_cache[course_id]
         
         try:
-            student_ids = self.student_course_repo.get_student_ids_by_course(course_id)
+            if self.snapshot is not None:
+                student_ids = set(self.snapshot.students_for_course(course_id).tolist())
+            else:
+                student_ids = self.student_course_repo.get_student_ids_by_course(course_id)
             self._course_student_cache[course_id] = student_ids
             return student_ids
         except Exception as e:
@@ -864,6 +885,8 @@ class SchedulerService:
     def _get_lecturer_available_days(self, lecturer_id: Optional[int]) -> List[str]:
         if not lecturer_id:
             return list(DEFAULT_AVAILABLE_DAYS)
+        if self.snapshot is not None:
+            return self.snapshot.lecturer_available_days(lecturer_id)
         
         try:
             lecturer = self.lecturer_repo.get_by_id(lecturer_id)
@@ -880,7 +903,14 @@ class SchedulerService:
         return list(DEFAULT_AVAILABLE_DAYS)
     
     def _get_unscheduled_courses(self, department_id: Optional[int] = None, exam_type: str = None) -> List[Course]:
-        courses = self.course_repo.get_unscheduled_courses(exam_type=exam_type)
+        if self.snapshot is not None:
+            scheduled_ids = self.exam_repo.get_scheduled_course_ids(exam_type)
+            courses = [
+                c for c in self.snapshot.courses()
+                if c.has_exam and c.exam_duration > 0 and c.id not in scheduled_ids
+            ]
+        else:
+            courses = self.course_repo.get_unscheduled_courses(exam_type=exam_type)
         
         if department_id:
             courses = [c for c in courses if c.department_id == department_id]
@@ -1031,14 +1061,12 @@ class SchedulerService:
                 start = datetime.strptime(start_date, '%Y-%m-%d').date()
                 end = datetime.strptime(end_date, '%Y-%m-%d').date()
                 
-                schedules = self.exam_repo.get_by_date_range(start, end)
-                planned = [s for s in schedules if s.status == 'planned']
-                
-                deleted_count = 0
-                for schedule in planned:
-                    if self.exam_repo.delete(schedule.id):
-                        deleted_count += 1
+                deleted_ids = self.exam_repo.delete_by_filter(
+                    status='planned', start_date=start, end_date=end
+                )
+                deleted_count = len(deleted_ids)
                 
+                self.refresh_reporting_views()
                 return {
                     'success': True,
                     'deleted_count': deleted_count,
@@ -1046,6 +1074,7 @@ class SchedulerService:
                 }
             else:
                 deleted_count = self.exam_repo.delete_planned()
+                self.refresh_reporting_views()
                 return {
                     'success': True,
                     'deleted_count': deleted_count or 0,
@@ -1059,37 +1088,32 @@ class SchedulerService:
             }
     
     def get_schedule_statistics(self, start_date: str = None, end_date: str = None) -> Dict:
+        start = end = None
         try:
             if start_date and end_date:
                 start = datetime.strptime(start_date, '%Y-%m-%d').date()
                 end = datetime.strptime(end_date, '%Y-%m-%d').date()
-                schedules = self.exam_repo.get_by_date_range(start, end)
-            else:
-                schedules = self.exam_repo.get_all_with_details()
+            return self.reporting_repo.get_schedule_statistics(start, end)
         except Exception:
-            schedules = []
-        
-        stats = {
-            'total': len(schedules),
-            'planned': len([s for s in schedules if s.status == 'planned']),
-            'confirmed': len([s for s in schedules if s.status == 'confirmed']),
-            'cancelled': len([s for s in schedules if s.status == 'cancelled']),
-            'by_date': {},
-            'by_classroom': {},
-            'by_department': {}
-        }
-        
-        for schedule in schedules:
-            date_str = str(schedule.exam_date) if schedule.exam_date else 'unknown'
-            stats['by_date'][date_str] = stats['by_date'].get(date_str, 0) + 1
-            
-            classroom_name = schedule.classroom_name or 'unknown'
-            stats['by_classroom'][classroom_name] = stats['by_classroom'].get(classroom_name, 0) + 1
-            
-            dept_name = schedule.department_name or 'unknown'
-            stats['by_department'][dept_name] = stats['by_department'].get(dept_name, 0) + 1
-        
-        return stats
+            return {
+                'total': 0,
+                'planned': 0,
+                'confirmed': 0,
+                'cancelled': 0,
+                'by_date': {},
+                'by_classroom': {},
+                'by_department': {}
+            }
+    
+    def refresh_reporting_views(self) -> bool:
+        """Planlama/temizleme sonrası dashboard ve istatistik view'larını yeniler."""
+        try:
+            self.reporting_repo.refresh()
+            return True
+        except Exception as e:
+            import logging
+            logging.warning(f"Raporlama view'ları yenilenemedi: {e}")
+            return False
     
     def set_time_slots(self, slots: List[Tuple[str, str]]) -> None:
         self.time_slots = []
@@ -0,0 +1,245 @@
+"""
+Planlayıcı girdilerinin sütunlu anlık görüntüsü (NumPy .npz)
+
+export_snapshot() dersleri, derslikleri, öğretim üyelerini ve aktif ders
+kayıtlarını (sınav kayıtlarında gösterilen hoca ve fakülte adlarıyla) tek bir REPEATABLE READ READ ONLY transaction içinde okur ve
+sıkıştırılmamış bir .npz dosyasına sütun sütun yazar. load_snapshot() bu
+dizileri kopyalamadan np.memmap ile açar. Aynı dosyayı açan süreçler işletim
+sisteminin sayfa önbelleğini paylaşır. Böylece deneyler, benchmark'lar ve
+paralel planlayıcı süreçleri veritabanına gitmeden milisaniyeler içinde
+başlayabilir.
+
+Ders kayıtları CSR biçiminde tutulur: enrollment_student_ids dizisi ders
+sırasına göre gruplanmıştır ve
+enrollment_student_ids[course_offsets[i]:course_offsets[i + 1]] aralığı
+course_id[i] dersinin öğrencileridir.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.config.database import get_connection, release_connection
+from src.models.classroom import Classroom
+from src.models.course import Course
+from src.models.lecturer import ALL_WEEKDAYS, DEFAULT_AVAILABLE_DAYS
+from src.services.exam_schedule_service import DAY_ALIASES
+from src.utils.file_cache import memmap_npz, write_npz
+
+SNAPSHOT_VERSION = 2
+
+# tablo -> (sorgu, [(dizi adı, dtype), ...]); NULL değerler sorguda varsayılana çevrilir.
+# 'U' (str) sütunlarının genişliği en uzun değere göre belirlenir.
+SNAPSHOT_TABLES = {
+    'course': (
+        """
+        SELECT c.id, c.code, c.name, COALESCE(c.department_id, -1), COALESCE(c.lecturer_id, -1),
+               COALESCE(c.student_count, 0), COALESCE(c.exam_duration, 60), COALESCE(c.year, 1),
+               COALESCE(c.has_exam, TRUE), COALESCE(c.required_room_type, 'ANY'),
+               CONCAT(l.title, ' ', l.first_name, ' ', l.last_name), f.name
+        FROM courses c
+        LEFT JOIN departments d ON c.department_id = d.id
+        LEFT JOIN lecturers l ON c.lecturer_id = l.id
+        LEFT JOIN faculties f ON d.faculty_id = f.id
+        ORDER BY c.id
+        """,
+        [('id', np.int32), ('code', str), ('name', str), ('department_id', np.int32),
+         ('lecturer_id', np.int32), ('student_count', np.int32), ('exam_duration', np.int16),
+         ('year', np.int16), ('has_exam', np.bool_), ('required_room_type', str),
+         ('lecturer_name', str), ('faculty_name', str)],
+    ),
+    'classroom': (
+        """
+        SELECT c.id, c.name, COALESCE(c.faculty_id, -1), COALESCE(c.capacity, 0),
+               COALESCE(c.has_computer, FALSE), COALESCE(c.is_suitable, TRUE),
+               COALESCE(c.room_type, 'STANDART'), f.name
+        FROM classrooms c
+        LEFT JOIN faculties f ON c.faculty_id = f.id
+        ORDER BY c.id
+        """,
+        [('id', np.int32), ('name', str), ('faculty_id', np.int32), ('capacity', np.int32),
+         ('has_computer', np.bool_), ('is_suitable', np.bool_), ('room_type', str),
+         ('faculty_name', str)],
+    ),
+    'lecturer': (
+        """
+        SELECT id, COALESCE(department_id, -1), available_days
+        FROM lecturers
+        ORDER BY id
+        """,
+        [('id', np.int32), ('department_id', np.int32), ('available_days', np.uint8)],
+    ),
+}
+
+ENROLLMENT_QUERY = """
+    SELECT course_id, student_id
+    FROM student_courses
+    WHERE is_active = TRUE
+    ORDER BY course_id, student_id
+"""
+
+
+def days_to_mask(days: Optional[Sequence[str]]) -> int:
+    """Gün adlarını ALL_WEEKDAYS sırasına göre bit maskesine çevirir (boş: varsayılan günler)."""
+    mask = 0
+    for day in days or DEFAULT_AVAILABLE_DAYS:
+        name = DAY_ALIASES.get(str(day).lower().strip(), day)
+        if name in ALL_WEEKDAYS:
+            mask |= 1 << ALL_WEEKDAYS.index(name)
+    return mask
+
+
+def mask_to_days(mask: int) -> List[str]:
+    return [day for i, day in enumerate(ALL_WEEKDAYS) if mask & (1 << i)]
+
+
+def _text_or_none(value) -> Optional[str]:
+    """Boş dizeye çevrilmiş NULL adları (ve hocasız derslerin boşluk dizesini) None yapar."""
+    return str(value).strip() or None
+
+
+def _column(values: List[Any], dtype) -> np.ndarray:
+    if dtype is str:
+        return np.array([value or '' for value in values], dtype=str)
+    return np.array(values, dtype=dtype)
+
+
+def build_arrays(
+    table_rows: Dict[str, List[tuple]],
+    enrollment_rows: List[tuple]
+) -> Dict[str, np.ndarray]:
+    """
+    Sorgu satırlarını anlık görüntü dizilerine çevirir.
+
+    Args:
+        table_rows: SNAPSHOT_TABLES anahtarı -> sorgu satırları
+        enrollment_rows: (course_id, student_id) satırları, course_id'ye göre sıralı
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    for table, (_, columns) in SNAPSHOT_TABLES.items():
+        rows = table_rows.get(table, [])
+        for index, (name, dtype) in enumerate(columns):
+            values = [row[index] for row in rows]
+            if table == 'lecturer' and name == 'available_days':
+                values = [days_to_mask(days) for days in values]
+            arrays[f'{table}_{name}'] = _column(values, dtype)
+
+    course_ids = arrays['course_id']
+    enrolled_courses = np.array([row[0] for row in enrollment_rows], dtype=np.int32)
+    course_index = np.searchsorted(course_ids, enrolled_courses)
+    counts = np.bincount(course_index, minlength=len(course_ids))[:len(course_ids)]
+    offsets = np.zeros(len(course_ids) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    arrays['course_offsets'] = offsets
+    arrays['enrollment_student_ids'] = np.array([row[1] for row in enrollment_rows], dtype=np.int32)
+    return arrays
+
+
+def write_snapshot(path: str, arrays: Dict[str, np.ndarray]) -> str:
+    """Dizileri sürüm ve oluşturulma zamanıyla birlikte write_npz() ile yazar."""
+    arrays = dict(arrays)
+    arrays['version'] = np.array(SNAPSHOT_VERSION, dtype=np.int32)
+    arrays['created_at'] = np.array(datetime.now().isoformat(timespec='seconds'))
+    return write_npz(path, arrays)
+
+
+def export_snapshot(path: str) -> str:
+    """Planlayıcı girdilerini tutarlı tek bir okumayla path dosyasına yazar."""
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+        table_rows = {}
+        for table, (query, _) in SNAPSHOT_TABLES.items():
+            cursor.execute(query)
+            table_rows[table] = cursor.fetchall()
+        cursor.execute(ENROLLMENT_QUERY)
+        enrollment_rows = cursor.fetchall()
+        cursor.close()
+        conn.rollback()
+    finally:
+        release_connection(conn)
+    return write_snapshot(path, build_arrays(table_rows, enrollment_rows))
+
+
+@dataclass
+class SchedulerSnapshot:
+    """load_snapshot() ile açılan salt okunur planlayıcı girdileri"""
+    path: str
+    arrays: Dict[str, np.ndarray]
+
+    @property
+    def created_at(self) -> str:
+        return str(self.arrays['created_at'])
+
+    def column(self, table: str, name: str) -> np.ndarray:
+        return self.arrays[f'{table}_{name}']
+
+    def _course_index(self, course_id: int) -> Optional[int]:
+        course_ids = self.arrays['course_id']
+        index = int(np.searchsorted(course_ids, course_id))
+        if index < len(course_ids) and course_ids[index] == course_id:
+            return index
+        return None
+
+    def students_for_course(self, course_id: int) -> np.ndarray:
+        """Dersin aktif öğrenci ID'leri (kopyasız dilim)."""
+        index = self._course_index(course_id)
+        if index is None:
+            return self.arrays['enrollment_student_ids'][:0]
+        offsets = self.arrays['course_offsets']
+        return self.arrays['enrollment_student_ids'][offsets[index]:offsets[index + 1]]
+
+    def lecturer_available_days(self, lecturer_id: Optional[int]) -> List[str]:
+        lecturer_ids = self.arrays['lecturer_id']
+        index = int(np.searchsorted(lecturer_ids, lecturer_id or 0))
+        if not lecturer_id or index >= len(lecturer_ids) or lecturer_ids[index] != lecturer_id:
+            return list(DEFAULT_AVAILABLE_DAYS)
+        return mask_to_days(int(self.arrays['lecturer_available_days'][index]))
+
+    def courses(self) -> List[Course]:
+        a = self.arrays
+        return [
+            Course(
+                id=int(a['course_id'][i]),
+                code=str(a['course_code'][i]),
+                name=str(a['course_name'][i]),
+                department_id=int(a['course_department_id'][i]) if a['course_department_id'][i] >= 0 else None,
+                lecturer_id=int(a['course_lecturer_id'][i]) if a['course_lecturer_id'][i] >= 0 else None,
+                student_count=int(a['course_student_count'][i]),
+                exam_duration=int(a['course_exam_duration'][i]),
+                year=int(a['course_year'][i]),
+                has_exam=bool(a['course_has_exam'][i]),
+                required_room_type=str(a['course_required_room_type'][i]),
+                lecturer_name=_text_or_none(a['course_lecturer_name'][i]),
+                faculty_name=_text_or_none(a['course_faculty_name'][i])
+            )
+            for i in range(len(a['course_id']))
+        ]
+
+    def classrooms(self) -> List[Classroom]:
+        a = self.arrays
+        return [
+            Classroom(
+                id=int(a['classroom_id'][i]),
+                name=str(a['classroom_name'][i]),
+                faculty_id=int(a['classroom_faculty_id'][i]) if a['classroom_faculty_id'][i] >= 0 else None,
+                capacity=int(a['classroom_capacity'][i]),
+                has_computer=bool(a['classroom_has_computer'][i]),
+                is_suitable=bool(a['classroom_is_suitable'][i]),
+                room_type=str(a['classroom_room_type'][i]),
+                faculty_name=_text_or_none(a['classroom_faculty_name'][i])
+            )
+            for i in range(len(a['classroom_id']))
+        ]
+
+
+def load_snapshot(path: str) -> SchedulerSnapshot:
+    """Anlık görüntüyü kopyasız (memmap) açar."""
+    arrays = memmap_npz(path)
+    version = int(arrays.get('version', -1))
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Desteklenmeyen anlık görüntü sürümü: {version} (beklenen {SNAPSHOT_VERSION})")
+    return SchedulerSnapshot(path=path, arrays=arrays)
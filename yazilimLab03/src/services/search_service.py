@@ -0,0 +1,32 @@
+"""
+Global arama servisi
+"""
+
+from typing import Iterable, List, Optional
+from src.repositories.search_repository import SearchRepository, SearchResult
+
+# Bundan kısa terimler için arama yapılmaz (trigram indeksleri 3 karakterden itibaren seçicidir)
+MIN_TERM_LENGTH = 2
+
+# Rollere göre aranabilen kayıt türleri
+ROLE_SEARCH_KINDS = {
+    'admin': ('course', 'lecturer', 'classroom', 'student'),
+    'bolum_yetkilisi': ('course', 'lecturer', 'classroom', 'student'),
+    'hoca': ('course', 'classroom'),
+    'ogrenci': ('course',),
+}
+
+
+class SearchService:
+    
+    def __init__(self):
+        self.repository = SearchRepository()
+    
+    def search(self, term: str, kinds: Optional[Iterable[str]] = None, limit: int = 20) -> List[SearchResult]:
+        term = (term or '').strip()
+        if len(term) < MIN_TERM_LENGTH:
+            return []
+        return self.repository.search(term, kinds=kinds, limit=limit)
+    
+    def search_for_role(self, term: str, role: str, limit: int = 20) -> List[SearchResult]:
+        return self.search(term, kinds=ROLE_SEARCH_KINDS.get(role, ('course',)), limit=limit)
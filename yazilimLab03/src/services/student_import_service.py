@@ -9,8 +9,9 @@ Kullanım:
     result = service.import_from_excel("exceller/SınıfListesi[BLM111].xls", course_id=1)
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from src.utils.student_importer import StudentImporter, ImportResult
+from src.utils.import_validation import ImportValidationReport
 from src.repositories.course_repository import CourseRepository
 from src.repositories.department_repository import DepartmentRepository
 
@@ -45,11 +46,41 @@ class StudentImportService:
         self,
         directory_path: str,
         semester: Optional[str] = None,
-        department_id: Optional[int] = None
+        department_id: Optional[int] = None,
+        workers: Optional[int] = None,
+        force: bool = False
     ) -> Dict[str, ImportResult]:
         return self.importer.import_from_excel_directory(
             directory_path=directory_path,
             semester=semester,
+            department_id=department_id,
+            workers=workers,
+            force=force
+        )
+    
+    def import_staged(
+        self,
+        directory_path: Optional[str] = None,
+        semester: Optional[str] = None,
+        department_id: Optional[int] = None,
+        dry_run: bool = False
+    ) -> Tuple[ImportResult, ImportValidationReport]:
+        return self.importer.import_staged(
+            directory_path=directory_path,
+            semester=semester,
+            department_id=department_id,
+            dry_run=dry_run
+        )
+    
+    def import_enrollment_feed(
+        self,
+        file_path: str,
+        semester: Optional[str] = None,
+        department_id: Optional[int] = None
+    ) -> ImportResult:
+        return self.importer.import_enrollment_feed(
+            file_path=file_path,
+            semester=semester,
             department_id=department_id
         )
     
@@ -8,24 +8,54 @@ Yeni Excel Formatı (DerslikYakinlik.xlsx):
 - Sütun 2: Derslik 2
 - Sütun 3: Mesafe (km)
 - Sütun 4: Yakınlık Derecesi (1-5, 1=en yakın, 5=en uzak)
+
+Kenarlar ağırlıklıdır ve bir kaynaktaki tüm ağırlıklar aynı birimdedir (en kısa
+yollar farklı birimleri toplamasın). Excel'de birim km'dir: mesafesi olmayan
+satırın yakınlık derecesi, mesafesi olan satırlardaki km/derece oranının
+medyanıyla km tahminine çevrilir. Dosyada hiç mesafe yoksa birim derecedir.
+Komşu listeli CSV/manuel veride her kenar DEFAULT_EDGE_WEIGHT'tir. Tüm derslik
+çiftleri arasındaki en kısa yol mesafeleri NumPy ile (Floyd–Warshall) yoğun bir
+matrise hesaplanır; "en yakın müsait derslikler" sorguları bu matrisin tek
+satırı üzerinde vektörel sıralamadır.
+
+Ayrıştırılan graf, kaynak dosyanın SHA-256 özetiyle adlandırılmış bir .npz
+önbelleğine (CSR komşuluk dizileri + blok indeksi) yazılır. Sonraki süreçler ve
+planlayıcı işçileri Excel'i yeniden ayrıştırmadan bu dosyayı memmap ile açar;
+kaynak değişince özet değiştiği için eski önbellek kendiliğinden geçersiz olur.
 """
 
 import os
+import glob
 import logging
-from typing import Dict, List, Set, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Set, Optional, Sequence
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from src.utils.file_cache import file_content_hash, memmap_npz, write_npz
+from src.utils.sheet_reader import iter_sheet_rows, normalize_headers
 
 logger = logging.getLogger(__name__)
 
+# Önbellek dizini; boşsa kaynak dosyanın yanındaki .cache dizini kullanılır
+PROXIMITY_CACHE_DIR = os.getenv('PROXIMITY_CACHE_DIR', '')
+PROXIMITY_CACHE_VERSION = 3
+
+# Ağırlığı bilinmeyen kenarların (komşu listesi formatı) mesafesi
+DEFAULT_EDGE_WEIGHT = 1.0
+
 
 @dataclass
 class ClassroomNode:
     name: str
     block: str
     neighbors: Set[str]
+    distances: Dict[str, float] = field(default_factory=dict)
     
-    def add_neighbor(self, neighbor_name: str) -> None:
+    def add_neighbor(self, neighbor_name: str, distance: float = DEFAULT_EDGE_WEIGHT) -> None:
+        """Komşuyu ekler; aynı kenar birden çok kez gelirse en kısa mesafe tutulur."""
         self.neighbors.add(neighbor_name)
+        self.distances[neighbor_name] = min(distance, self.distances.get(neighbor_name, distance))
     
     def is_neighbor(self, other_name: str) -> bool:
         return other_name in self.neighbors
@@ -45,9 +75,12 @@ class ClassroomProximityLoader:
         self._classroom_graph: Dict[str, ClassroomNode] = {}
         self._block_classrooms: Dict[str, List[str]] = {}
         self._loaded = False
+        self._manual_data_used = False
+        self._distance_matrix: Optional[np.ndarray] = None
+        self._name_index: Optional[Dict[str, int]] = None
+        self._block_ids: Optional[np.ndarray] = None
         self._fallback_warning_logged = False  # Uyarı tekrarını engelle
-        
-        self._load_data()
+        # Graf ilk sorguda yüklenir (_ensure_loaded)
     
     def _resolve_default_path(self) -> str:
         # src/utils/ dizininden projenin kök dizinine çık
@@ -63,10 +96,34 @@ class ClassroomProximityLoader:
             return csv_path
         return excel_path
     
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self._load_data()
+    
     def _load_data(self) -> None:
         if self._loaded:
             return
         
+        source_path = self._get_source_path()
+        source_hash = None
+        if source_path:
+            try:
+                source_hash = file_content_hash(source_path)
+                cache_path = self._get_cache_path(source_path, source_hash)
+                if os.path.exists(cache_path) and self._read_cache(cache_path, source_hash):
+                    logger.info(f"Yakınlık verileri önbellekten yüklendi: {cache_path}")
+                    return
+            except Exception as e:
+                logger.warning(f"Yakınlık önbelleği okunamadı, kaynak dosya ayrıştırılacak: {e}")
+                self._classroom_graph = {}
+                self._block_classrooms = {}
+        
+        self._parse_source()
+        
+        if source_hash and self._loaded and not self._manual_data_used:
+            self._write_cache(source_path, source_hash)
+    
+    def _parse_source(self) -> None:
         try:
             self._load_from_excel()
         except ImportError:
@@ -86,15 +143,9 @@ class ClassroomProximityLoader:
         file_path = self._get_actual_file_path()
         
         try:
-            import openpyxl
-            wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
-            ws = wb.active
-            
-            # Başlık satırını bul
-            headers = []
-            for row in ws.iter_rows(min_row=1, max_row=1, values_only=True):
-                headers = [str(h).strip().lower() if h else '' for h in row]
-                break
+            # Başlık ve veri satırları aynı akıştan tek geçişte okunur (read_only, values_only)
+            rows = iter_sheet_rows(file_path)
+            headers = normalize_headers(next(rows, ()))
             
             # Sütun indekslerini bul
             col_map = {}
@@ -105,11 +156,12 @@ class ClassroomProximityLoader:
                     col_map['classroom2'] = idx
                 elif 'mesafe' in header or 'distance' in header:
                     col_map['distance'] = idx
-                elif 'yakınlık' in header or 'yakinlik' in header or 'proximity' in header:
+                elif 'yakinlik' in header or 'proximity' in header:
                     col_map['proximity'] = idx
             
-            # Veri satırlarını oku
-            for row in ws.iter_rows(min_row=2, values_only=True):
+            # Veri satırlarını oku: (derslik 1, derslik 2, mesafe km veya None, yakınlık derecesi)
+            pairs = []
+            for row in rows:
                 if not row or all(c is None for c in row):
                     continue
                 
@@ -127,11 +179,27 @@ class ClassroomProximityLoader:
                     except (ValueError, TypeError):
                         proximity = 1
                 
-                # Sadece yakın derslikleri (1-3) komşu olarak ekle
+                distance = None
+                if col_map.get('distance') is not None:
+                    try:
+                        distance = float(row[col_map['distance']])
+                    except (ValueError, TypeError):
+                        distance = None
+                if distance is not None and distance <= 0:
+                    distance = None
+                pairs.append((c1, c2, distance, proximity))
+            
+            # Kenar ağırlığı km: mesafesi olmayan satırda derece * (km/derece oranının medyanı);
+            # dosyada hiç mesafe yoksa oran 1 ve tüm ağırlıklar derecedir
+            ratios = [distance / max(proximity, 1) for _, _, distance, proximity in pairs if distance is not None]
+            km_per_degree = float(np.median(ratios)) if ratios else 1.0
+            
+            # Sadece yakın derslikleri (1-3) komşu olarak ekle
+            for c1, c2, distance, proximity in pairs:
                 if proximity <= 3:
-                    self._add_proximity_pair(c1, c2)
+                    weight = distance if distance is not None else max(proximity, 1) * km_per_degree
+                    self._add_proximity_pair(c1, c2, weight)
             
-            wb.close()
             self._loaded = True
             logger.info(f"Yakınlık verileri {file_path} dosyasından yüklendi")
             
@@ -158,21 +226,14 @@ class ClassroomProximityLoader:
         except Exception:
             raise FileNotFoundError("Excel dosyası okunamadı")
     
-    def _add_proximity_pair(self, classroom1: str, classroom2: str) -> None:
-        """İki dersliği karşılıklı komşu olarak ekler."""
-        # Classroom1 için
-        if classroom1 not in self._classroom_graph:
-            node = ClassroomNode(name=classroom1, block=self._extract_block(classroom1), neighbors={classroom2})
-            self._classroom_graph[classroom1] = node
-        else:
-            self._classroom_graph[classroom1].neighbors.add(classroom2)
-        
-        # Classroom2 için
-        if classroom2 not in self._classroom_graph:
-            node = ClassroomNode(name=classroom2, block=self._extract_block(classroom2), neighbors={classroom1})
-            self._classroom_graph[classroom2] = node
-        else:
-            self._classroom_graph[classroom2].neighbors.add(classroom1)
+    def _add_proximity_pair(self, classroom1: str, classroom2: str, distance: float = DEFAULT_EDGE_WEIGHT) -> None:
+        """İki dersliği verilen mesafeyle karşılıklı komşu olarak ekler."""
+        for classroom, other in ((classroom1, classroom2), (classroom2, classroom1)):
+            if classroom not in self._classroom_graph:
+                self._classroom_graph[classroom] = ClassroomNode(
+                    name=classroom, block=self._extract_block(classroom), neighbors=set()
+                )
+            self._classroom_graph[classroom].add_neighbor(other, distance)
         
         # Blok bilgisini güncelle
         block1 = self._extract_block(classroom1)
@@ -293,6 +354,7 @@ class ClassroomProximityLoader:
         for block, classroom, nearby_str in manual_data:
             self._add_classroom_data(block, classroom, nearby_str)
         
+        self._manual_data_used = True
         self._loaded = True
     
     def _get_actual_file_path(self) -> str:
@@ -308,7 +370,165 @@ class ClassroomProximityLoader:
         path = os.path.join(base_dir, "database", "exceller", "DerslikYakinlik.csv")
         return os.path.normpath(path)
     
+    def _get_source_path(self) -> Optional[str]:
+        """Ayrıştırılacak dosya: Excel, yoksa CSV; ikisi de yoksa None (manuel veri)"""
+        for path in (self._get_actual_file_path(), self._get_csv_path()):
+            if os.path.exists(path):
+                return path
+        return None
+    
+    def _get_cache_path(self, source_path: str, source_hash: str) -> str:
+        cache_dir = PROXIMITY_CACHE_DIR or os.path.join(os.path.dirname(source_path), ".cache")
+        return os.path.join(cache_dir, f"{os.path.basename(source_path)}.{source_hash[:16]}.npz")
+    
+    def _read_cache(self, cache_path: str, source_hash: str) -> bool:
+        """
+        Önbellekteki CSR dizilerinden grafı ve blok indeksini kurar; mesafe matrisi
+        memmap olarak kalır (kopyalanmaz). Sürüm/özet uyuşmazsa False.
+        """
+        arrays = memmap_npz(cache_path)
+        if int(arrays['version']) != PROXIMITY_CACHE_VERSION or str(arrays['source_hash']) != source_hash:
+            return False
+        
+        names = arrays['names'].tolist()
+        blocks = arrays['blocks'].tolist()
+        offsets = arrays['neighbor_offsets'].tolist()
+        neighbor_index = arrays['neighbor_index'].tolist()
+        neighbor_weights = arrays['neighbor_weights'].tolist()
+        self._classroom_graph = {}
+        for i, name in enumerate(names):
+            distances = {
+                names[j]: weight
+                for j, weight in zip(neighbor_index[offsets[i]:offsets[i + 1]],
+                                     neighbor_weights[offsets[i]:offsets[i + 1]])
+            }
+            self._classroom_graph[name] = ClassroomNode(
+                name=name, block=blocks[i], neighbors=set(distances), distances=distances
+            )
+        
+        block_offsets = arrays['block_offsets'].tolist()
+        block_members = arrays['block_members'].tolist()
+        self._block_classrooms = {
+            block: [names[j] for j in block_members[block_offsets[i]:block_offsets[i + 1]]]
+            for i, block in enumerate(arrays['block_names'].tolist())
+        }
+        self._distance_matrix = arrays['distances']
+        self._name_index = None
+        self._loaded = True
+        return True
+    
+    def _write_cache(self, source_path: str, source_hash: str) -> None:
+        """Grafı CSR dizileri olarak yazar ve aynı kaynağın eski önbelleklerini siler."""
+        cache_path = self._get_cache_path(source_path, source_hash)
+        try:
+            names = list(self._classroom_graph)
+            index = {name: i for i, name in enumerate(names)}
+            neighbor_lists = [
+                [(index[n], self._classroom_graph[name].distances.get(n, DEFAULT_EDGE_WEIGHT))
+                 for n in self._classroom_graph[name].neighbors if n in index]
+                for name in names
+            ]
+            block_lists = [
+                [index[c] for c in classrooms if c in index]
+                for classrooms in self._block_classrooms.values()
+            ]
+            arrays = {
+                'version': np.array(PROXIMITY_CACHE_VERSION, dtype=np.int32),
+                'source_hash': np.array(source_hash),
+                'names': np.array(names, dtype=str),
+                'blocks': np.array([self._classroom_graph[name].block or '' for name in names], dtype=str),
+                'neighbor_offsets': np.cumsum([0] + [len(n) for n in neighbor_lists], dtype=np.int64),
+                'neighbor_index': np.array([j for n in neighbor_lists for j, _ in n], dtype=np.int32),
+                'neighbor_weights': np.array([w for n in neighbor_lists for _, w in n], dtype=np.float32),
+                'block_names': np.array(list(self._block_classrooms), dtype=str),
+                'block_offsets': np.cumsum([0] + [len(b) for b in block_lists], dtype=np.int64),
+                'block_members': np.array([j for b in block_lists for j in b], dtype=np.int32),
+                'distances': self._get_distance_matrix(),
+            }
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            write_npz(cache_path, arrays)
+            stale_pattern = os.path.join(os.path.dirname(cache_path), f"{os.path.basename(source_path)}.*.npz")
+            for stale in glob.glob(stale_pattern):
+                if stale != cache_path:
+                    os.remove(stale)
+        except Exception as e:
+            logger.warning(f"Yakınlık önbelleği yazılamadı: {e}")
+    
+    def _get_name_index(self) -> Dict[str, int]:
+        """Derslik adı -> matris satırı; blok kodları da aynı sırayla self._block_ids'e (-1: blok yok)."""
+        if self._name_index is None:
+            block_codes: Dict[str, int] = {}
+            self._block_ids = np.array(
+                [block_codes.setdefault(node.block, len(block_codes)) if node.block else -1
+                 for node in self._classroom_graph.values()],
+                dtype=np.int32
+            )
+            self._name_index = {name: i for i, name in enumerate(self._classroom_graph)}
+        return self._name_index
+    
+    def _get_distance_matrix(self) -> np.ndarray:
+        """
+        Tüm derslik çiftleri arasındaki en kısa yol mesafeleri (float32, n x n,
+        satır/sütun sırası grafın ekleme sırası; ulaşılamayan çiftler inf).
+        Floyd–Warshall'ın her adımı tek bir NumPy yayın (broadcast) işlemidir.
+        """
+        if self._distance_matrix is None:
+            index = self._get_name_index()
+            n = len(index)
+            matrix = np.full((n, n), np.inf, dtype=np.float32)
+            np.fill_diagonal(matrix, 0)
+            for name, node in self._classroom_graph.items():
+                i = index[name]
+                for neighbor, distance in node.distances.items():
+                    j = index.get(neighbor)
+                    if j is not None and distance < matrix[i, j]:
+                        matrix[i, j] = matrix[j, i] = distance
+            for k in range(n):
+                np.minimum(matrix, matrix[:, k, None] + matrix[None, k, :], out=matrix)
+            self._distance_matrix = matrix
+        return self._distance_matrix
+    
+    def get_distance(self, classroom1: str, classroom2: str) -> float:
+        """İki derslik arasındaki en kısa yol mesafesi; bağlantı yoksa inf."""
+        self._ensure_loaded()
+        index = self._get_name_index()
+        if classroom1 not in index or classroom2 not in index:
+            return float('inf')
+        return float(self._get_distance_matrix()[index[classroom1], index[classroom2]])
+    
+    def order_by_distance(self, classroom_name: str, candidates: Sequence[str]) -> np.ndarray:
+        """
+        Aday dersliklerin classroom_name'e yakınlık sırası (aday listesindeki konumlar).
+        
+        Sıralama: en kısa yol mesafesi; bağlantısız adaylarda önce aynı bloktakiler,
+        sonra diğerleri. Eşitlikte adayların verilen sırası korunur, böylece çağıran
+        taraf ikincil ölçütü (örn. kapasite) aday sırasıyla belirleyebilir. Mesafeler
+        matrisin tek satırından alınır ve np.lexsort ile tek seferde sıralanır.
+        """
+        self._ensure_loaded()
+        if not candidates:
+            return np.empty(0, dtype=np.int64)
+        
+        index = self._get_name_index()
+        candidate_index = np.array([index.get(name, -1) for name in candidates], dtype=np.int64)
+        known = candidate_index >= 0
+        distances = np.full(len(candidates), np.inf)
+        tier = np.full(len(candidates), 2, dtype=np.int8)
+        
+        source = index.get(classroom_name)
+        if source is not None:
+            distances[known] = self._get_distance_matrix()[source, candidate_index[known]]
+            tier[np.isfinite(distances)] = 0
+            block_id = self._block_ids[source]
+            if block_id >= 0:
+                same_block = known & (self._block_ids[candidate_index] == block_id)
+                tier[(tier == 2) & same_block] = 1
+        
+        distances[~np.isfinite(distances)] = 0
+        return np.lexsort((np.arange(len(candidates)), distances, tier))
+    
     def get_neighbors(self, classroom_name: str) -> List[str]:
+        self._ensure_loaded()
         if classroom_name in self._classroom_graph:
             return list(self._classroom_graph[classroom_name].neighbors)
         return []
@@ -318,14 +538,17 @@ class ClassroomProximityLoader:
         return classroom2 in neighbors
     
     def get_block(self, classroom_name: str) -> str:
+        self._ensure_loaded()
         if classroom_name in self._classroom_graph:
             return self._classroom_graph[classroom_name].block
         return ""
     
     def get_classrooms_in_block(self, block: str) -> List[str]:
+        self._ensure_loaded()
         return self._block_classrooms.get(block, [])
     
     def get_all_classrooms(self) -> List[str]:
+        self._ensure_loaded()
         return list(self._classroom_graph.keys())
     
     def get_available_neighbors_for_combination(
@@ -337,8 +560,9 @@ class ClassroomProximityLoader:
         available_set = set(available_classrooms)
         
         available_neighbors = [n for n in all_neighbors if n in available_set]
+        distances = self._classroom_graph[classroom_name].distances if available_neighbors else {}
         
-        return available_neighbors
+        return sorted(available_neighbors, key=lambda n: distances.get(n, DEFAULT_EDGE_WEIGHT))
     
     def get_closest_classrooms(
         self, 
@@ -346,37 +570,24 @@ class ClassroomProximityLoader:
         available_classrooms: List[str],
         limit: int = 5
     ) -> List[str]:
-        available_set = set(available_classrooms)
-        result = []
-        
-        direct_neighbors = self.get_neighbors(classroom_name)
-        for neighbor in direct_neighbors:
-            if neighbor in available_set and neighbor not in result:
-                result.append(neighbor)
-        
-        block = self.get_block(classroom_name)
-        if block:
-            same_block = self.get_classrooms_in_block(block)
-            for other in same_block:
-                if other != classroom_name and other in available_set and other not in result:
-                    result.append(other)
-        
-        for other in available_classrooms:
-            if other != classroom_name and other not in result:
-                result.append(other)
-        
-        return result[:limit]
+        candidates = list(dict.fromkeys(c for c in available_classrooms if c != classroom_name))
+        order = self.order_by_distance(classroom_name, candidates)[:limit]
+        return [candidates[i] for i in order]
     
     def reload(self) -> None:
-        self._classroom_graph.clear()
-        self._block_classrooms.clear()
+        self._classroom_graph = {}
+        self._block_classrooms = {}
         self._loaded = False
+        self._manual_data_used = False
+        self._distance_matrix = None
+        self._name_index = None
         self._load_data()
     
     def is_loaded(self) -> bool:
         return self._loaded
     
     def get_graph_stats(self) -> Dict:
+        self._ensure_loaded()
         return {
             'total_classrooms': len(self._classroom_graph),
             'total_blocks': len(self._block_classrooms),
@@ -390,8 +601,7 @@ _global_fallback_warning_logged = False  # Global flag for singleton warning
 
 
 def get_proximity_loader() -> ClassroomProximityLoader:
-    global _instance, _global_fallback_warning_logged
+    global _instance
     if _instance is None:
         _instance = ClassroomProximityLoader()
-        _global_fallback_warning_logged = _instance._fallback_warning_logged
     return _instance
@@ -9,6 +9,8 @@ import logging
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+from src.utils.sheet_reader import iter_sheet_rows, normalize_headers
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +34,7 @@ class CapacityImportResult:
     total_classrooms: int = 0
     updated_classrooms: int = 0
     new_classrooms: int = 0
+    unchanged_classrooms: int = 0
     failed_count: int = 0
     errors: List[str] = None
     
@@ -112,15 +115,9 @@ class ExamCapacityImporter:
     def _load_excel_file(self, file_path: str) -> List[CapacityData]:
         """Excel dosyasını okur ve kapasite verilerini döndürür"""
         try:
-            import openpyxl
-            wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
-            ws = wb.active
-            
-            # Başlık satırını bul
-            headers = []
-            for row in ws.iter_rows(min_row=1, max_row=1, values_only=True):
-                headers = [str(h).strip().lower() if h else '' for h in row]
-                break
+            # Başlık ve veri satırları aynı akıştan tek geçişte okunur (read_only, values_only)
+            rows = iter_sheet_rows(file_path)
+            headers = normalize_headers(next(rows, ()))
             
             # Sütun indekslerini bul
             col_map = {}
@@ -129,7 +126,7 @@ class ExamCapacityImporter:
                     col_map['block'] = idx
                 elif 'derslik' in header and 'numara' in header or 'derslik no' in header or 'classroom' in header:
                     col_map['classroom'] = idx
-                elif 'kapasite' in header or 'capacity' in header or 'kişi' in header:
+                elif 'kapasite' in header or 'capacity' in header or 'kisi' in header:
                     col_map['capacity'] = idx
             
             # Eğer başlık bulunamazsa varsayılan sütun sırasını kullan
@@ -139,7 +136,7 @@ class ExamCapacityImporter:
             
             capacity_data = []
             
-            for row in ws.iter_rows(min_row=2, values_only=True):
+            for row in rows:
                 if not row or all(c is None for c in row):
                     continue
                 
@@ -171,7 +168,6 @@ class ExamCapacityImporter:
                     logger.warning(f"Satır işlenirken hata: {row} -> {e}")
                     continue
             
-            wb.close()
             logger.info(f"{len(capacity_data)} adet kapasite verisi okundu")
             return capacity_data
             
@@ -241,126 +237,61 @@ class ExamCapacityImporter:
             raise
     
     def _update_classroom_capacities(self, capacity_data: List[CapacityData]) -> CapacityImportResult:
-        """Classroom kapasitelerini günceller"""
-        updated_count = 0
-        new_count = 0
-        failed_count = 0
-        errors = []
+        """
+        Classroom kapasitelerini tek transaction içinde yazar: mevcut derslik adları
+        tek sorguda okunur, yeni dersliklerin blok -> fakülte eşlemesi tek sorguda
+        çözülür ve tüm satırlar derslik adına göre tek bir toplu upsert ile yüklenir.
+        Aynı derslik birden çok satırda geçiyorsa son satır geçerlidir.
+        """
+        from src.models.classroom import Classroom
+        from src.repositories.faculty_repository import FacultyRepository
         
-        existing_classrooms = self.classroom_repo.get_all()
-        existing_names = {c.name: c for c in existing_classrooms}
+        rows = {data.classroom_name: data for data in capacity_data}
         
-        for data in capacity_data:
-            try:
-                if data.classroom_name in existing_names:
-                    # Mevcut dersliği güncelle
-                    classroom = existing_names[data.classroom_name]
-                    classroom.capacity = data.capacity
-                    classroom.block = data.block  # Blok bilgisini de güncelle
-                    success = self.classroom_repo.update(classroom)
-                    
-                    if success:
-                        updated_count += 1
-                    else:
-                        failed_count += 1
-                        errors.append(f"{data.classroom_name}: Güncelleme başarısız")
-                else:
-                    # Yeni derslik oluştur (varsayılan faculty_id ile)
-                    # Öncelikle blok bilgisi varsa o bloktaki bir fakülteyi bul
-                    from src.models.classroom import Classroom
-                    
-                    faculty_id = self._get_faculty_id_for_block(data.block)
-                    
-                    # Classroom nesnesi oluştur
-                    new_classroom = Classroom(
+        try:
+            with self.classroom_repo.transaction() as tx:
+                existing_ids = self.classroom_repo.get_ids_by_names(list(rows), conn=tx.connection)
+                new_blocks = [data.block for name, data in rows.items() if name not in existing_ids]
+                faculty_ids = FacultyRepository().resolve_block_faculties(new_blocks, conn=tx.connection)
+                
+                classrooms = [
+                    Classroom(
                         name=data.classroom_name,
-                        faculty_id=faculty_id,
+                        faculty_id=faculty_ids.get((data.block or '').upper().strip()),
                         capacity=data.capacity,
                         has_computer=False,
                         is_suitable=True,
                         room_type=None,
-                        block=data.block  # Blok bilgisini ekle
+                        block=data.block
                     )
-                    
-                    classroom_id = self.classroom_repo.create(new_classroom)
-                    success = (classroom_id > 0)
-                    message = "Derslik oluşturuldu" if success else "Derslik oluşturulamadı"
-                    
-                    if success:
-                        new_count += 1
-                    else:
-                        failed_count += 1
-                        errors.append(f"{data.classroom_name}: {message}")
-                        
-            except Exception as e:
-                failed_count += 1
-                errors.append(f"{data.classroom_name}: {str(e)}")
-                logger.error(f"Derslik güncellenirken hata: {data.classroom_name} -> {e}")
-        
-        total = len(capacity_data)
-        success = (failed_count == 0)
+                    for data in rows.values()
+                ]
+                new_count, updated_count, unchanged_count = self.classroom_repo.bulk_upsert_capacities(
+                    classrooms, conn=tx.connection
+                )
+        except Exception as e:
+            logger.error(f"Kapasite verileri yazılamadı: {e}")
+            return CapacityImportResult(
+                success=False,
+                message=f"Kapasite verileri içe aktarılamadı, değişiklikler geri alındı: {str(e)}",
+                total_classrooms=len(rows),
+                failed_count=len(rows),
+                errors=[str(e)]
+            )
         
-        if success:
-            message = f"Kapasite verileri başarıyla içe aktarıldı. {updated_count} derslik güncellendi, {new_count} yeni derslik oluşturuldu."
-        else:
-            message = f"Kapasite verileri kısmen içe aktarıldı. {updated_count} güncellendi, {new_count} yeni, {failed_count} başarısız."
+        message = (
+            f"Kapasite verileri başarıyla içe aktarıldı. {updated_count} derslik güncellendi, "
+            f"{new_count} yeni derslik oluşturuldu, {unchanged_count} derslik değişmedi."
+        )
         
         return CapacityImportResult(
-            success=success,
+            success=True,
             message=message,
-            total_classrooms=total,
+            total_classrooms=len(rows),
             updated_classrooms=updated_count,
             new_classrooms=new_count,
-            failed_count=failed_count,
-            errors=errors if errors else []
+            unchanged_classrooms=unchanged_count
         )
-    
-    def _get_faculty_id_for_block(self, block: str) -> int:
-        """Bloka uygun bir faculty_id döndürür. Mevcut fakülteleri kullanır veya yeni oluşturur."""
-        try:
-            from src.repositories.faculty_repository import FacultyRepository
-            from src.models.faculty import Faculty
-            faculty_repo = FacultyRepository()
-            
-            if not block or block.strip() == '':
-                # Blok boşsa, mevcut ilk fakülteyi kullan veya oluştur
-                faculties = faculty_repo.get_all()
-                if faculties:
-                    return faculties[0].id
-                default_faculty = Faculty(
-                    name="Genel Fakülte",
-                    code="GENEL"
-                )
-                return faculty_repo.create(default_faculty)
-            
-            block_upper = block.upper().strip()
-            
-            # Önce bu blok koduna sahip fakülteyi ara
-            existing_faculty = faculty_repo.get_by_code(block_upper)
-            if existing_faculty:
-                return existing_faculty.id
-            
-            # Blok için yeni bir fakülte oluştur
-            new_faculty = Faculty(
-                name=f"{block_upper} Bloğu Fakültesi",
-                code=block_upper
-            )
-            new_id = faculty_repo.create(new_faculty)
-            logger.info(f"Blok '{block_upper}' için yeni fakülte oluşturuldu: {new_faculty.name} (ID: {new_id})")
-            return new_id
-            
-        except Exception as e:
-            logger.warning(f"Fakülte alınırken hata oluştu, varsayılan kullanılıyor: {e}")
-            # Hata durumunda mevcut fakülteleri tekrar dene
-            try:
-                from src.repositories.faculty_repository import FacultyRepository
-                faculty_repo = FacultyRepository()
-                faculties = faculty_repo.get_all()
-                if faculties:
-                    return faculties[0].id
-            except:
-                pass
-            return 1
 
 
 def get_capacity_importer(classroom_repository=None) -> ExamCapacityImporter:
@@ -0,0 +1,67 @@
+"""
+Dosya tabanlı önbellekler için ortak yardımcılar
+
+file_content_hash() kaynak dosyaların SHA-256 özetini hesaplar. Önbellekler bu
+özetle anahtarlanır. write_npz() dizileri sıkıştırılmamış bir .npz dosyasına
+yazar: önce geçici bir dosyaya yazar, sonra os.replace ile yerine koyar; böylece
+aynı anda çalışan süreçler yarım dosya görmez. memmap_npz() bu dosyanın her
+üyesini kopyalamadan np.memmap ile açar.
+"""
+
+import os
+import struct
+import hashlib
+import zipfile
+from typing import Dict
+
+import numpy as np
+
+
+def file_content_hash(file_path: str) -> str:
+    """Dosya içeriğinin SHA-256 özeti"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_npz(path: str, arrays: Dict[str, np.ndarray]) -> str:
+    """Dizileri sıkıştırmadan yazar (memmap için); yarım dosya bırakmamak için önce geçici dosyaya."""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as fh:
+            np.savez(fh, **arrays)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return path
+
+
+def memmap_npz(path: str) -> Dict[str, np.ndarray]:
+    """
+    Sıkıştırılmamış .npz içindeki her .npy üyesini dosyadaki konumundan np.memmap ile açar
+    (np.load, .npz için mmap_mode'u yok sayar). Boş ve skaler diziler normal okunur.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as fh:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Sıkıştırılmış .npz memmap ile açılamaz: {path}")
+            fh.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack('<HH', fh.read(4))
+            fh.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(fh)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fh)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fh)
+            name = info.filename[:-len('.npy')]
+            if shape == () or 0 in shape:
+                fh.seek(info.header_offset + 30 + name_length + extra_length)
+                arrays[name] = np.lib.format.read_array(fh)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=fh.tell(),
+                                         shape=shape, order='F' if fortran_order else 'C')
+    return arrays
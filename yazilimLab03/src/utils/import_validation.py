@@ -0,0 +1,157 @@
+"""
+Sınıf listesi içe aktarmasının doğrulama aşaması
+
+validate_class_lists() ayrıştırılmış tüm sınıf listelerini (ParsedClassList)
+veritabanına yazmadan önce bir bütün olarak denetler ve ImportValidationReport
+üretir. Öğrenci numaraları ve adlar tek NumPy dizisinde toplanır; mükerrer
+kayıtlar, çakışan adlar ve numara uzunluğu sapmaları satır satır değil
+np.unique/bincount ile tüm parti üzerinde bulunur.
+
+Hatalar (okunamayan dosya, bilinmeyen ders kodu, aynı numaranın farklı adlarla
+gelmesi) içe aktarmayı durdurur; uyarılar rapora yazılır ama engellemez.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from src.utils.sheet_reader import TR_ASCII
+
+
+@dataclass
+class ImportValidationReport:
+    """Aşamalı içe aktarmanın doğrulama raporu"""
+    file_count: int = 0
+    student_rows: int = 0
+    unique_students: int = 0
+    failed_files: Dict[str, str] = field(default_factory=dict)
+    unknown_course_codes: Dict[str, List[str]] = field(default_factory=dict)
+    conflicting_names: Dict[str, List[str]] = field(default_factory=dict)
+    duplicate_rows: Dict[str, List[str]] = field(default_factory=dict)
+    number_anomalies: Dict[str, List[str]] = field(default_factory=dict)
+    rejected_rows: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def errors(self) -> List[str]:
+        errors = [f"{filename}: {reason}" for filename, reason in self.failed_files.items()]
+        errors += [
+            f"Bilinmeyen ders kodu {code}: {', '.join(files)}"
+            for code, files in self.unknown_course_codes.items()
+        ]
+        errors += [
+            f"{number} numarası farklı adlarla geçiyor: {' / '.join(names)}"
+            for number, names in self.conflicting_names.items()
+        ]
+        return errors
+
+    @property
+    def warnings(self) -> List[str]:
+        warnings = [
+            f"{filename}: aynı listede tekrarlanan numaralar {', '.join(numbers)}"
+            for filename, numbers in self.duplicate_rows.items()
+        ]
+        warnings += [
+            f"{filename}: olağan dışı uzunlukta numaralar {', '.join(numbers)}"
+            for filename, numbers in self.number_anomalies.items()
+        ]
+        warnings += [
+            f"{filename}: numarası/adı geçersiz satırlar atlandı {', '.join(rows)}"
+            for filename, rows in self.rejected_rows.items()
+        ]
+        return warnings
+
+    @property
+    def is_valid(self) -> bool:
+        return not (self.failed_files or self.unknown_course_codes or self.conflicting_names)
+
+    def summary(self) -> str:
+        lines = [
+            f"{self.file_count} dosya, {self.student_rows} kayıt satırı, {self.unique_students} öğrenci",
+            f"{len(self.errors)} hata, {len(self.warnings)} uyarı",
+        ]
+        lines += [f"HATA: {error}" for error in self.errors]
+        lines += [f"UYARI: {warning}" for warning in self.warnings]
+        return "\n".join(lines)
+
+
+def _normalize_name(first_name: str, last_name: str) -> str:
+    """Ad karşılaştırması: Türkçe karakterler ASCII, küçük harf, tek boşluk; '-' soyad yer tutucusu yok sayılır."""
+    last_name = '' if last_name == '-' else last_name
+    return ' '.join(f"{first_name} {last_name}".translate(TR_ASCII).lower().split())
+
+
+def validate_class_lists(parsed: Sequence, known_course_codes: Iterable[str]) -> ImportValidationReport:
+    """
+    Ayrıştırılmış sınıf listelerini toplu olarak doğrular.
+
+    Args:
+        parsed: ParsedClassList benzeri nesneler (filename, course_code, students, error, rejected_rows)
+        known_course_codes: Veritabanında bulunan ders kodları
+    """
+    known_course_codes = set(known_course_codes)
+    report = ImportValidationReport(file_count=len(parsed))
+    filenames: List[str] = []
+    numbers: List[str] = []
+    names: List[str] = []
+    file_ids: List[int] = []
+
+    for item in parsed:
+        if item.error:
+            report.failed_files[item.filename] = f"okunamadı ({item.error})"
+            continue
+        if not item.course_code:
+            report.failed_files[item.filename] = "dosya adında ders kodu yok"
+            continue
+        if item.course_code not in known_course_codes:
+            report.unknown_course_codes.setdefault(item.course_code, []).append(item.filename)
+        if not item.students:
+            report.failed_files[item.filename] = "öğrenci verisi bulunamadı"
+            continue
+        if item.rejected_rows:
+            report.rejected_rows[item.filename] = [
+                f"{number} ({name or 'ad yok'})" for number, name in item.rejected_rows
+            ]
+
+        file_id = len(filenames)
+        filenames.append(item.filename)
+        for student in item.students:
+            numbers.append(student['student_number'])
+            names.append(_normalize_name(student['first_name'], student['last_name']))
+            file_ids.append(file_id)
+
+    report.student_rows = len(numbers)
+    if not numbers:
+        return report
+
+    student_numbers, number_ids = np.unique(np.array(numbers, dtype=str), return_inverse=True)
+    name_values, name_ids = np.unique(np.array(names, dtype=str), return_inverse=True)
+    file_ids = np.array(file_ids, dtype=np.int64)
+    report.unique_students = len(student_numbers)
+
+    # Aynı numaranın aynı listede birden çok satırı
+    row_keys, row_counts = np.unique(number_ids * len(filenames) + file_ids, return_counts=True)
+    for key in row_keys[row_counts > 1]:
+        report.duplicate_rows.setdefault(filenames[key % len(filenames)], []).append(
+            str(student_numbers[key // len(filenames)])
+        )
+
+    # Aynı numara için birden fazla farklı ad
+    pairs = np.unique(np.stack([number_ids, name_ids]), axis=1)
+    names_per_number = np.bincount(pairs[0], minlength=len(student_numbers))
+    for number_id in np.flatnonzero(names_per_number > 1):
+        report.conflicting_names[str(student_numbers[number_id])] = [
+            str(name_values[name_id]) for name_id in pairs[1][pairs[0] == number_id]
+        ]
+
+    # Partideki en yaygın uzunluktan farklı numaralar (yazım hatası şüphesi)
+    lengths = np.char.str_len(student_numbers)
+    usual_length = np.bincount(lengths).argmax()
+    unusual = lengths != usual_length
+    if unusual.any():
+        rows = np.flatnonzero(unusual[number_ids])
+        first_rows = rows[np.unique(number_ids[rows], return_index=True)[1]]
+        for row in first_rows:
+            report.number_anomalies.setdefault(filenames[file_ids[row]], []).append(numbers[row])
+
+    return report
@@ -129,6 +129,20 @@ def setup_logging(
         error_handler.setFormatter(detailed_formatter)
         root_logger.addHandler(error_handler)
 
+        # Yavaş SQL sorguları ve N+1 uyarıları için ayrı bir dosya
+        slow_query_log_file = log_file.replace('.log', '_slow_sql.log')
+        slow_query_handler = RotatingFileHandler(
+            slow_query_log_file,
+            maxBytes=10*1024*1024,
+            backupCount=5,
+            encoding='utf-8'
+        )
+        slow_query_handler.setLevel(logging.WARNING)
+        slow_query_handler.setFormatter(detailed_formatter)
+        slow_query_logger = logging.getLogger('sql.slow')
+        slow_query_logger.handlers.clear()
+        slow_query_logger.addHandler(slow_query_handler)
+
     return root_logger
 
 
@@ -0,0 +1,64 @@
+"""
+Excel sayfalarını satır satır okuyan ortak yardımcılar
+
+iter_sheet_rows() .xlsx dosyalarını openpyxl read_only modunda (hücre modeli
+kurmadan, sabit bellekle), .xls dosyalarını xlrd row_values ile ilk sayfadan,
+.csv/.tsv dosyalarını csv modülüyle satır satır değer tuple'ları olarak akıtır. Okuyucular başlığı ve verileri aynı
+iteratörden tek geçişte alır; başlık eşleştirmesi normalize_header() ile
+bir kez derlenmiş Türkçe -> ASCII tablosu üzerinden yapılır.
+"""
+
+import csv
+from typing import Any, Iterator, Sequence
+
+# Metin dosyalarının kodlaması (Excel'in "CSV UTF-8" çıktısındaki BOM atlanır) ve ayraç adayları
+CSV_ENCODING = 'utf-8-sig'
+CSV_DELIMITERS = ',;\t'
+
+# Başlık eşleştirmesi için Türkçe karakter tablosu (bir kez derlenir)
+TR_ASCII = str.maketrans('ıİğĞşŞöÖçÇüÜ', 'iIgGsSoOcCuU')
+
+
+def normalize_header(value: Any) -> str:
+    """Başlık hücresini karşılaştırma biçimine çevirir: 'Öğrenci No' -> 'ogrenci no'"""
+    if value is None:
+        return ''
+    return str(value).translate(TR_ASCII).lower().strip()
+
+
+def normalize_headers(row: Sequence[Any]) -> list:
+    return [normalize_header(value) for value in row]
+
+
+def iter_sheet_rows(file_path: str) -> Iterator[tuple]:
+    """
+    Dosyanın ilk (etkin) sayfasındaki satırları değer tuple'ları olarak verir.
+    Dosya iteratör tüketildiğinde veya kapatıldığında serbest bırakılır.
+    CSV'de ayraç ilk satırda en sık geçen CSV_DELIMITERS karakteridir; .tsv her zaman sekme.
+    """
+    lower_path = file_path.lower()
+    if lower_path.endswith(('.csv', '.tsv')):
+        with open(file_path, newline='', encoding=CSV_ENCODING) as fh:
+            if lower_path.endswith('.tsv'):
+                delimiter = '\t'
+            else:
+                first_line = fh.readline()
+                fh.seek(0)
+                delimiter = max(CSV_DELIMITERS, key=first_line.count)
+            yield from map(tuple, csv.reader(fh, delimiter=delimiter))
+    elif lower_path.endswith('.xls'):
+        import xlrd
+        workbook = xlrd.open_workbook(file_path, formatting_info=False, on_demand=True)
+        try:
+            sheet = workbook.sheet_by_index(0)
+            for row_idx in range(sheet.nrows):
+                yield tuple(sheet.row_values(row_idx))
+        finally:
+            workbook.release_resources()
+    else:
+        import openpyxl
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            yield from workbook.active.iter_rows(values_only=True)
+        finally:
+            workbook.close()
@@ -4,25 +4,54 @@ Excel'den Öğrenci Listesi İçe Aktarma Sınıfı
 
 import os
 import logging
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Tuple, Optional, Set
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import chain, islice
 import re
 
-import openpyxl
-import xlrd
-
 from src.models.student import Student, StudentCourse
 from src.models.course import Course
 from src.models.department import Department
 from src.models.lecturer import Lecturer, DEFAULT_AVAILABLE_DAYS
+from src.models.import_manifest import ImportManifest
 from src.repositories.student_repository import StudentRepository, StudentCourseRepository
 from src.repositories.course_repository import CourseRepository
 from src.repositories.department_repository import DepartmentRepository
 from src.repositories.lecturer_repository import LecturerRepository
+from src.repositories.import_manifest_repository import ImportManifestRepository
+from src.utils.file_cache import file_content_hash
+from src.utils.import_validation import ImportValidationReport, validate_class_lists
+from src.utils.sheet_reader import TR_ASCII, iter_sheet_rows, normalize_headers
 
 logger = logging.getLogger(__name__)
 
+# Başlık satırı yalnızca ilk HEADER_SCAN_ROWS satırda, öğretim üyesi ilk LECTURER_SCAN_ROWS satırda aranır
+HEADER_SCAN_ROWS = 15
+LECTURER_SCAN_ROWS = 5
+
+# Normalize edilmiş (Türkçe karaktersiz, küçük harf) başlık kalıpları
+HEADER_STUDENT_NO_MARKERS = ('ogrenci no', 'ogr no', 'student no')
+STUDENT_NO_HEADERS = ('ogrenci no', 'ogr no', 'ogr. no', 'numara', 'no', 'student no')
+FULL_NAME_HEADERS = ('adi soyadi', 'ad soyad', 'adi ve soyadi')
+EMAIL_HEADERS = ('e-posta', 'eposta', 'email', 'e-post', 'mail')
+
+# Klasör içe aktarmasında dosyaları ayrıştıran süreç sayısının ortam değişkeni
+# (0 veya boş: CPU sayısı, 1: süreç havuzu kullanma); her içe aktarmada okunur
+IMPORT_PARSE_WORKERS_ENV = 'IMPORT_PARSE_WORKERS'
+
+# Kayıt akışı (CSV/TSV) içe aktarmasında bir seferde yüklenen satır sayısı
+CSV_IMPORT_CHUNK_ROWS = int(os.getenv('CSV_IMPORT_CHUNK_ROWS', '20000'))
+
+# Kayıt akışı başlıkları (normalize edilmiş, '_' -> ' '); eşleşmeyenler için sınıf listesi sezgileri kullanılır
+FEED_STUDENT_NO_HEADERS = ('student number', 'ogrenci no', 'ogrenci numarasi', 'ogr no', 'numara')
+FEED_FULL_NAME_HEADERS = ('name', 'full name', 'ad soyad', 'adi soyadi')
+FEED_FIRST_NAME_HEADERS = ('first name', 'ad', 'adi')
+FEED_LAST_NAME_HEADERS = ('last name', 'soyad', 'soyadi')
+FEED_COURSE_CODE_HEADERS = ('course code', 'ders kodu', 'ders', 'kod', 'ders no', 'course no')
+
 
 @dataclass
 class ImportResult:
@@ -41,6 +70,77 @@ class ImportResult:
             self.warnings = []
 
 
+@dataclass
+class ParsedClassList:
+    """Bir sınıf listesi dosyasının ayrıştırma sonucu (işçi süreçten yazıcıya taşınır)"""
+    filename: str
+    file_path: str
+    course_code: Optional[str]
+    students: List[Dict]
+    lecturer_name: Optional[str] = None
+    error: Optional[str] = None
+    content_hash: Optional[str] = None
+    rejected_rows: List[Tuple[str, str]] = field(default_factory=list)
+
+
+class LecturerIndex:
+    """
+    İçe aktarma oturumu boyunca öğretim üyelerini normalize tam ad ve soyada göre
+    tutan indeks. Tablo oturum başında bir kez okunur, yeni kayıtlar add() ile eklenir.
+    Aynı anahtarda ilk eklenen öğretim üyesi korunur (eski doğrusal taramayla aynı).
+    """
+    
+    def __init__(self, lecturers: List[Lecturer]):
+        self.by_full_name: Dict[str, Lecturer] = {}
+        self.by_last_name: Dict[str, Lecturer] = {}
+        for lecturer in lecturers:
+            self.add(lecturer)
+    
+    @staticmethod
+    def normalize(name: Optional[str]) -> str:
+        return ' '.join((name or '').translate(TR_ASCII).lower().split())
+    
+    def add(self, lecturer: Lecturer) -> None:
+        full_name = self.normalize(f"{lecturer.first_name} {lecturer.last_name}")
+        if full_name:
+            self.by_full_name.setdefault(full_name, lecturer)
+        last_name = self.normalize(lecturer.last_name)
+        if last_name:
+            self.by_last_name.setdefault(last_name, lecturer)
+    
+    def find(self, full_name: str, last_name: str) -> Tuple[Optional[Lecturer], bool]:
+        """(öğretim üyesi, tam ad eşleşmesi mi) döndürür; önce tam ad, sonra soyad."""
+        lecturer = self.by_full_name.get(self.normalize(full_name))
+        if lecturer:
+            return lecturer, True
+        return self.by_last_name.get(self.normalize(last_name)), False
+
+
+_parser: Optional['StudentImporter'] = None
+
+
+def parse_class_list(file_path: str, course_code: Optional[str] = None) -> ParsedClassList:
+    """
+    Sınıf listesini veritabanına dokunmadan ayrıştırır; süreç havuzunda çalışır.
+    Bölüm ve sınıf bilgisi dersi çözen yazıcı aşamasında doldurulur.
+    """
+    global _parser
+    if _parser is None:
+        _parser = StudentImporter()
+    filename = os.path.basename(file_path)
+    try:
+        content_hash = file_content_hash(file_path)
+        students, lecturer_name, rejected_rows = _parser._read_class_list(file_path)
+    except Exception as e:
+        return ParsedClassList(filename, file_path, course_code, [], error=str(e))
+    return ParsedClassList(
+        filename, file_path, course_code, students,
+        lecturer_name=lecturer_name,
+        content_hash=content_hash,
+        rejected_rows=rejected_rows
+    )
+
+
 class StudentImporter:
     
     TURKISH_CHAR_MAP = {
@@ -74,6 +174,15 @@ class StudentImporter:
         self.course_repo = CourseRepository()
         self.department_repo = DepartmentRepository()
         self.lecturer_repo = LecturerRepository()
+        self.manifest_repo = ImportManifestRepository()
+        self._lecturer_index: Optional[LecturerIndex] = None
+    
+    @property
+    def lecturer_index(self) -> LecturerIndex:
+        """Oturumun öğretim üyesi indeksi (ilk erişimde tek sorguyla yüklenir)"""
+        if self._lecturer_index is None:
+            self._lecturer_index = LecturerIndex(self.lecturer_repo.get_all())
+        return self._lecturer_index
     
     def import_from_excel(
         self,
@@ -84,6 +193,7 @@ class StudentImporter:
         semester: Optional[str] = None,
         year: Optional[int] = None
     ) -> ImportResult:
+        self._lecturer_index = None
         if not os.path.exists(file_path):
             return ImportResult(
                 success=False,
@@ -140,64 +250,110 @@ class StudentImporter:
         directory_path: Optional[str] = None,
         semester: Optional[str] = None,
         department_id: Optional[int] = None,
-        auto_detect_course: bool = True
+        auto_detect_course: bool = True,
+        workers: Optional[int] = None,
+        force: bool = False
     ) -> Dict[str, ImportResult]:
+        """
+        Klasördeki sınıf listelerini iki aşamada içe aktarır: dosyalar süreç
+        havuzunda paralel ayrıştırılır, ardından tek yazıcı tüm öğrenci ve ders
+        kayıtlarını tek transaction'da toplu yükler.
+        
+        İçe aktarma artımlıdır: import_manifest'teki boyutu, zamanı veya içerik
+        özeti değişmeyen dosyalar atlanır. Değişen bir dosyanın dersi daha önce bu
+        klasörden yüklendiyse (dersin tüm dosyaları yeniden okunarak) yalnızca
+        kayıt farkı uygulanır: yeni öğrenciler eklenir, listeden çıkanlar pasife alınır.
+        
+        Args:
+            workers: Ayrıştırma süreç sayısı (None: IMPORT_PARSE_WORKERS ortam değişkeni)
+            force: True ise manifestoya bakmadan tüm dosyalar yeniden işlenir
+        """
+        self._lecturer_index = None
         if directory_path is None:
             base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             directory_path = os.path.join(base_dir, "..", "exceller")
         
-        directory_path = os.path.abspath(directory_path)
+        # Manifesto anahtarları gerçek yoldur; göreli yol veya sembolik bağlantıyla verilen klasör aynı kayıtları bulur
+        directory_path = os.path.realpath(directory_path)
         
         if not os.path.exists(directory_path):
             logger.error(f"Klasör bulunamadı: {directory_path}")
             return {'': ImportResult(False, f"Klasör bulunamadı: {directory_path}")}
         
-        logger.info(f"Excel dosyaları '{directory_path}' klasöründen taranıyor...")
+        file_paths, course_codes = self._list_class_list_files(directory_path, auto_detect_course)
         
-        results = {}
-        imported_count = 0
-        failed_count = 0
-        total_students = 0
-        total_errors = []
+        stats = {path: os.stat(path) for path in file_paths}
+        manifest = self.manifest_repo.get_by_paths(file_paths)
         
-        for filename in os.listdir(directory_path):
-            if not (filename.endswith('.xls') or filename.endswith('.xlsx')):
+        # Değişen dosyalar ve (boyut/zaman değişip içerik aynı kalan) yalnızca dokunulmuş dosyalar
+        changed = set()
+        touched = []
+        for path in file_paths:
+            entry = manifest.get(path)
+            stat = stats[path]
+            if force or entry is None:
+                changed.add(path)
+            elif entry.matches_stat(stat.st_size, stat.st_mtime_ns):
                 continue
-            
-            # Zone.Identifier dosyalarını atla
-            if 'Zone.Identifier' in filename or '~$' in filename:
-                continue
-            
-            file_path = os.path.join(directory_path, filename)
-            
-            course_code = None
-            if auto_detect_course:
-                course_code = self._extract_course_code_from_filename(filename)
-            
-            logger.info(f"İçe aktarılıyor: {filename} (Ders Kodu: {course_code or 'Otomatik'})")
-            
-            result = self.import_from_excel(
-                file_path=file_path,
-                course_code=course_code,
-                department_id=department_id,
-                semester=semester
-            )
-            
-            results[filename] = result
-            
-            if result.success:
-                imported_count += 1
-                total_students += result.students_imported
+            elif file_content_hash(path) == entry.content_hash:
+                entry.file_size, entry.file_mtime_ns = stat.st_size, stat.st_mtime_ns
+                touched.append(entry)
             else:
-                failed_count += 1
-                if result.errors:
-                    total_errors.extend(result.errors)
+                changed.add(path)
+        
+        # Farkı doğru hesaplamak için değişen dersin diğer dosyaları da okunur
+        changed_codes = {code for path, code in zip(file_paths, course_codes) if path in changed and code}
+        to_parse = [
+            (path, code) for path, code in zip(file_paths, course_codes)
+            if path in changed or code in changed_codes
+        ]
+        sync_codes = {
+            code for path, code in to_parse
+            if code and manifest.get(path) and manifest[path].course_id
+        }
         
-        # Öğretim üyesi bilgisini Excel dosyalarından çıkar ve mevcut dersleri güncelle
+        results: Dict[str, ImportResult] = {}
+        skipped_count = len(file_paths) - len(to_parse)
+        parsed_paths = {path for path, _ in to_parse}
+        for path in file_paths:
+            if path not in parsed_paths:
+                results[os.path.basename(path)] = ImportResult(True, "Değişiklik yok, atlandı")
+        
+        parsed = self._parse_class_lists([p for p, _ in to_parse], [c for _, c in to_parse], workers)
+        # Dosyalarından biri okunamayan derste fark uygulanmaz (öğrencileri yanlışlıkla pasife alınmasın)
+        sync_codes -= {item.course_code for item in parsed if item.error or not item.students}
+        written, courses_by_file = self._write_parsed_class_lists(parsed, semester, department_id, sync_codes)
+        results.update(written)
+        
+        # Manifesto veriden sonra yazılır; arada kesilirse dosyalar bir sonraki çalıştırmada yeniden işlenir
+        manifest_entries = touched + [
+            ImportManifest(
+                file_path=item.file_path,
+                file_size=stats[item.file_path].st_size,
+                file_mtime_ns=stats[item.file_path].st_mtime_ns,
+                content_hash=item.content_hash,
+                course_id=courses_by_file[item.filename].id,
+                enrollment_count=written[item.filename].students_imported
+            )
+            for item in parsed
+            if item.filename in courses_by_file and written[item.filename].success
+        ]
+        if manifest_entries:
+            self.manifest_repo.bulk_upsert(manifest_entries)
+        
+        # Öğretim üyesi bilgisini ayrıştırılan dosyalardan alıp dersleri güncelle
         logger.info("Mevcut dersler öğretim üyesi bilgisi ile güncelleniyor...")
-        self._update_courses_with_lecturer_from_files(directory_path)
+        self._update_courses_with_lecturers(parsed, courses_by_file)
+        
+        imported_count = sum(1 for r in written.values() if r.success)
+        failed_count = len(written) - imported_count
+        total_students = sum(r.students_imported for r in written.values() if r.success)
+        total_errors = [error for r in results.values() if not r.success and r.errors for error in r.errors]
         
-        summary_msg = f"İçe Aktarma Tamamlandı: {imported_count} başarılı, {failed_count} başarısız, {total_students} öğrenci"
+        summary_msg = (
+            f"İçe Aktarma Tamamlandı: {imported_count} başarılı, {skipped_count} değişmedi, "
+            f"{failed_count} başarısız, {total_students} öğrenci"
+        )
         
         if total_errors:
             summary_msg += f", {len(total_errors)} hata"
@@ -206,7 +362,7 @@ class StudentImporter:
             logger.info(summary_msg)
         
         summary_result = ImportResult(
-            success=imported_count > 0,
+            success=imported_count + skipped_count > 0,
             message=summary_msg,
             students_imported=total_students,
             errors=total_errors if total_errors else None
@@ -216,6 +372,253 @@ class StudentImporter:
         
         return results
     
+    def _list_class_list_files(
+        self,
+        directory_path: str,
+        auto_detect_course: bool = True
+    ) -> Tuple[List[str], List[Optional[str]]]:
+        """
+        Klasördeki .xls/.xlsx sınıf listeleri (os.path.realpath ile; manifestonun
+        anahtarı budur) ve dosya adından çıkarılan ders kodları. Aynı dosyaya çıkan
+        sembolik bağlantılar bir kez listelenir.
+        """
+        logger.info(f"Excel dosyaları '{directory_path}' klasöründen taranıyor...")
+        
+        file_paths = []
+        course_codes = []
+        seen: Set[str] = set()
+        for filename in sorted(os.listdir(directory_path)):
+            if not (filename.endswith('.xls') or filename.endswith('.xlsx')):
+                continue
+            
+            # Zone.Identifier dosyalarını atla
+            if 'Zone.Identifier' in filename or '~$' in filename:
+                continue
+            
+            file_path = os.path.realpath(os.path.join(directory_path, filename))
+            if file_path in seen:
+                continue
+            seen.add(file_path)
+            file_paths.append(file_path)
+            course_codes.append(self._extract_course_code_from_filename(filename) if auto_detect_course else None)
+        
+        return file_paths, course_codes
+    
+    def import_staged(
+        self,
+        directory_path: Optional[str] = None,
+        semester: Optional[str] = None,
+        department_id: Optional[int] = None,
+        dry_run: bool = False,
+        workers: Optional[int] = None
+    ) -> Tuple[ImportResult, ImportValidationReport]:
+        """
+        Aşamalı içe aktarma: klasördeki tüm listeler önce ayrıştırılır ve bir bütün
+        olarak doğrulanır (validate_class_lists); rapor hatasızsa öğrenciler, kayıtlar,
+        öğrenci sayıları ve dosyaların import_manifest kayıtları tek transaction'da
+        yazılır. Hata varsa veya dry_run=True ise veritabanına hiçbir şey yazılmaz.
+        
+        Ders oluşturulmaz: dosyadaki ders kodu veritabanında yoksa doğrulama hatasıdır.
+        
+        Returns:
+            (özet ImportResult, doğrulama raporu)
+        """
+        self._lecturer_index = None
+        if directory_path is None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            directory_path = os.path.join(base_dir, "..", "exceller")
+        directory_path = os.path.realpath(directory_path)
+        
+        if not os.path.exists(directory_path):
+            report = ImportValidationReport()
+            return ImportResult(False, f"Klasör bulunamadı: {directory_path}"), report
+        
+        file_paths, course_codes = self._list_class_list_files(directory_path)
+        stats = {path: os.stat(path) for path in file_paths}
+        parsed = self._parse_class_lists(file_paths, course_codes, workers)
+        courses_by_code = {course.code: course for course in self.course_repo.get_all()}
+        report = validate_class_lists(parsed, courses_by_code.keys())
+        
+        if not report.is_valid or dry_run:
+            verdict = "Doğrulama başarılı (deneme, yazılmadı)" if report.is_valid else "Doğrulama başarısız, hiçbir kayıt yazılmadı"
+            return ImportResult(
+                success=report.is_valid,
+                message=f"{verdict}: {report.file_count} dosya, {report.unique_students} öğrenci",
+                errors=report.errors,
+                warnings=report.warnings
+            ), report
+        
+        batches = []
+        courses_by_file: Dict[str, Course] = {}
+        for item in parsed:
+            course = courses_by_code[item.course_code]
+            courses_by_file[item.filename] = course
+            for student in item.students:
+                student['department_id'] = department_id or course.department_id
+                if course.year:
+                    student['year'] = course.year
+            batches.append((course.id, item.students))
+        
+        try:
+            with self.student_repo.transaction() as tx:
+                written = self._write_class_lists(batches, semester, tx=tx)
+                # Manifesto verilerle birlikte commit edilir; biri yazılıp diğeri eksik kalamaz
+                self.manifest_repo.bulk_upsert([
+                    ImportManifest(
+                        file_path=item.file_path,
+                        file_size=stats[item.file_path].st_size,
+                        file_mtime_ns=stats[item.file_path].st_mtime_ns,
+                        content_hash=item.content_hash,
+                        course_id=courses_by_file[item.filename].id,
+                        enrollment_count=count
+                    )
+                    for item, (count, _) in zip(parsed, written)
+                ], conn=tx.connection)
+        except Exception as e:
+            return ImportResult(
+                False, f"Kayıt sırasında hata, değişiklikler geri alındı: {str(e)}",
+                errors=[str(e)], warnings=report.warnings
+            ), report
+        
+        self._update_courses_with_lecturers(parsed, courses_by_file)
+        
+        enrollments = sum(count for count, _ in written)
+        row_errors = [error for _, errors in written for error in errors]
+        return ImportResult(
+            success=True,
+            message=f"Aşamalı içe aktarma tamamlandı: {report.file_count} dosya, "
+                    f"{report.unique_students} öğrenci, {enrollments} ders kaydı",
+            students_imported=report.unique_students,
+            student_courses_created=enrollments,
+            errors=row_errors,
+            warnings=report.warnings
+        ), report
+    
+    def _parse_class_lists(
+        self,
+        file_paths: List[str],
+        course_codes: List[Optional[str]],
+        workers: Optional[int] = None
+    ) -> List[ParsedClassList]:
+        """Dosyaları süreç havuzunda ayrıştırır; tek dosya veya workers=1 ise aynı süreçte."""
+        workers = workers or self._parse_workers_from_env() or os.cpu_count() or 1
+        workers = min(workers, len(file_paths))
+        if workers <= 1:
+            return [parse_class_list(path, code) for path, code in zip(file_paths, course_codes)]
+        
+        logger.info(f"{len(file_paths)} dosya {workers} süreçte ayrıştırılıyor...")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(file_paths) // (workers * 4))
+            return list(executor.map(parse_class_list, file_paths, course_codes, chunksize=chunksize))
+    
+    @staticmethod
+    def _parse_workers_from_env() -> int:
+        """IMPORT_PARSE_WORKERS değeri; sayı değilse veya negatifse uyarı yazılır ve 0 (CPU sayısı) döner."""
+        value = os.getenv(IMPORT_PARSE_WORKERS_ENV, '').strip()
+        if not value:
+            return 0
+        try:
+            workers = int(value)
+        except ValueError:
+            workers = -1
+        if workers < 0:
+            logger.warning(f"Geçersiz {IMPORT_PARSE_WORKERS_ENV}={value!r}, CPU sayısı kullanılıyor")
+            return 0
+        return workers
+    
+    def _write_parsed_class_lists(
+        self,
+        parsed: List[ParsedClassList],
+        semester: Optional[str] = None,
+        department_id: Optional[int] = None,
+        sync_codes: Optional[Set[str]] = None
+    ) -> Tuple[Dict[str, ImportResult], Dict[str, Course]]:
+        """
+        Yazıcı aşaması: dersleri tek sorguyla eşler (eksikleri oluşturur) ve tüm
+        dosyaların öğrencilerini _write_class_lists ile tek transaction'da yazar.
+        sync_codes içindeki derslerin kayıtları eklenmek yerine listeye eşitlenir.
+        
+        Her dosya kendi SAVEPOINT'inde yazılır: kayıt hatası yalnızca o dosyayı
+        geri alır ve o dosyanın sonucunda raporlanır, diğer dosyalar commit edilir.
+        Eşitlenen bir dersin dosyaları birlikte yazılır (aynı savepoint), çünkü
+        fark dersin tüm listelerine göre hesaplanır.
+        
+        Returns:
+            (dosya adı -> ImportResult, dosya adı -> Course)
+        """
+        results: Dict[str, ImportResult] = {}
+        courses_by_file: Dict[str, Course] = {}
+        courses_by_code = {course.code: course for course in self.course_repo.get_all()}
+        batches = []
+        
+        for item in parsed:
+            if item.error:
+                results[item.filename] = ImportResult(False, f"Excel dosyası okunamadı: {item.error}")
+                continue
+            if not item.course_code:
+                results[item.filename] = ImportResult(False, "Ders belirtilmedi veya bulunamadı")
+                continue
+            
+            course = courses_by_code.get(item.course_code)
+            if course is None:
+                logger.info(f"Ders bulunamadı: {item.course_code}, otomatik oluşturuluyor...")
+                course = self._create_course_from_code(item.course_code, item.file_path, item.lecturer_name)
+                if course is None:
+                    results[item.filename] = ImportResult(
+                        False, f"Ders bulunamadı ve oluşturulamadı: {item.course_code}"
+                    )
+                    continue
+                courses_by_code[course.code] = course
+            courses_by_file[item.filename] = course
+            
+            if not item.students:
+                results[item.filename] = ImportResult(False, "Öğrenci verisi bulunamadı")
+                continue
+            
+            for student in item.students:
+                student['department_id'] = department_id or course.department_id
+                if course.year:
+                    student['year'] = course.year
+            batches.append((item.filename, course.id, item.students))
+        
+        if batches:
+            sync_course_ids = {
+                course.id for course in courses_by_file.values() if course.code in (sync_codes or ())
+            }
+            units: Dict[object, List[Tuple[str, int, List[Dict]]]] = {}
+            for filename, course_id, rows in batches:
+                key = ('course', course_id) if course_id in sync_course_ids else filename
+                units.setdefault(key, []).append((filename, course_id, rows))
+            
+            try:
+                with self.student_repo.transaction() as tx:
+                    for unit in units.values():
+                        try:
+                            with tx.savepoint('class_list'):
+                                written = self._write_class_lists(
+                                    [(course_id, rows) for _, course_id, rows in unit],
+                                    semester, sync_course_ids, tx=tx
+                                )
+                        except Exception as e:
+                            logger.error(f"Sınıf listesi yazılamadı ({', '.join(f for f, _, _ in unit)}): {e}")
+                            for filename, _, _ in unit:
+                                results[filename] = ImportResult(False, f"Kayıt sırasında hata: {str(e)}")
+                            continue
+                        for (filename, _, _), (count, errors) in zip(unit, written):
+                            results[filename] = ImportResult(
+                                success=True,
+                                message=f"{count} öğrenci başarıyla içe aktarıldı",
+                                students_imported=count,
+                                student_courses_created=count,
+                                errors=errors if errors else None
+                            )
+            except Exception as e:
+                # Commit başarısızsa hiçbir dosya yazılmamıştır
+                for filename, _, _ in batches:
+                    results[filename] = ImportResult(False, f"Kayıt sırasında hata: {str(e)}")
+        
+        return results, courses_by_file
+    
     def import_all_courses(self, semester: Optional[str] = None) -> ImportResult:
         logger.info("Tüm derslerin içe aktarılması başlatılıyor...")
         
@@ -246,48 +649,29 @@ class StudentImporter:
                 errors=all_errors if all_errors else None
             )
     
-    def _update_courses_with_lecturer_from_files(self, directory_path: str) -> None:
+    def _update_courses_with_lecturers(
+        self,
+        parsed: List[ParsedClassList],
+        courses_by_file: Dict[str, Course]
+    ) -> None:
         """
-        Dizindeki Excel dosyalarından öğretim üyesi bilgisini çıkararak,
-        mevcut dersleri günceller.
-        
-        Args:
-            directory_path: Excel dosyalarının bulunduğu klasör yolu
+        Ayrıştırma sırasında dosyalardan çıkarılan öğretim üyesi adlarıyla
+        mevcut derslerin öğretim üyesini günceller.
         """
         try:
-            for filename in os.listdir(directory_path):
-                if not (filename.endswith('.xls') or filename.endswith('.xlsx')):
-                    continue
-                
-                # Zone.Identifier dosyalarını atla
-                if 'Zone.Identifier' in filename or '~$' in filename:
-                    continue
-                
-                file_path = os.path.join(directory_path, filename)
-                
-                # Ders kodunu çıkar
-                course_code = self._extract_course_code_from_filename(filename)
-                if not course_code:
-                    continue
-                
-                # Dersi bul
-                course = self.course_repo.get_by_code(course_code)
-                if not course:
-                    continue
-                
-                # Excel'den öğretim üyesi bilgisini çıkar
-                lecturer_name = self.extract_lecturer_from_file(file_path)
-                if not lecturer_name:
+            for item in parsed:
+                course = courses_by_file.get(item.filename)
+                if not course or not item.lecturer_name:
                     continue
                 
                 # Öğretim üyesini bul veya oluştur
-                lecturer = self._find_or_create_lecturer(lecturer_name, course.department_id)
-                if lecturer:
+                lecturer = self._find_or_create_lecturer(item.lecturer_name, course.department_id)
+                if lecturer and course.lecturer_id != lecturer.id:
                     # Dersi güncelle
                     course.lecturer_id = lecturer.id
                     course.lecturer_name = f"{lecturer.first_name} {lecturer.last_name}"
                     self.course_repo.update(course)
-                    logger.info(f"Ders güncellendi: {course_code} - Öğretim Üyesi: {course.lecturer_name}")
+                    logger.info(f"Ders güncellendi: {course.code} - Öğretim Üyesi: {course.lecturer_name}")
         
         except Exception as e:
             logger.error(f"Dersler öğretim üyesi bilgisi ile güncellenirken hata: {str(e)}")
@@ -335,13 +719,43 @@ class StudentImporter:
         department_id: Optional[int] = None,
         year: Optional[int] = None
     ) -> List[Dict]:
-
-        students = []
+        return self._read_class_list(file_path, department_id, year)[0]
+    
+    def _read_class_list(
+        self,
+        file_path: str,
+        department_id: Optional[int] = None,
+        year: Optional[int] = None
+    ) -> Tuple[List[Dict], Optional[str], List[Tuple[str, str]]]:
+        """
+        Sınıf listesini tek geçişte okur. İlk HEADER_SCAN_ROWS satır başlık ve
+        öğretim üyesi için tutulur, kalan satırlar aynı iteratörden akıtılır.
+        
+        Returns:
+            (öğrenci satırları, öğretim üyesi adı veya None,
+             adı olup numarası _is_valid_student_number'dan geçemeyen (numara, ad) satırları)
+        """
+        kind = 'XLSX' if file_path.lower().endswith('.xlsx') else 'XLS'
+        try:
+            rows = iter_sheet_rows(file_path)
+            head = list(islice(rows, HEADER_SCAN_ROWS))
+            lecturer_name = self._extract_lecturer_name_from_text(self._head_text(head))
+            header_row, col_indices = self._find_header(head)
+            
+            students = []
+            rejected = []
+            for row in chain(head[header_row + 1:], rows):
+                student = self._row_to_student(row, col_indices, department_id, year)
+                if student:
+                    students.append(student)
+                else:
+                    rejected_row = self._rejected_row(row, col_indices)
+                    if rejected_row:
+                        rejected.append(rejected_row)
+        except Exception as e:
+            raise Exception(f"{kind} okuma hatası: {str(e)}")
         
-        if file_path.endswith('.xlsx'):
-            return self._read_xlsx(file_path, department_id, year)
-        else:  # .xls
-            return self._read_xls(file_path, department_id, year)
+        return students, lecturer_name, rejected
     
     def extract_lecturer_from_file(self, file_path: str) -> Optional[str]:
         """
@@ -357,30 +771,14 @@ class StudentImporter:
             Öğretim üyesi adı veya None
         """
         try:
-            if file_path.endswith('.xlsx'):
-                workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
-                sheet = workbook.active
-            else:  # .xls
-                workbook = xlrd.open_workbook(file_path, formatting_info=False)
-                sheet = workbook.sheet_by_index(0)
-            
             # Öğretim üyesi adı genellikle ilk 5 satırda yer almaktadır
-            full_text = ""
-            for row_idx in range(min(5, sheet.nrows)):
-                # .xls dosyası için
-                if file_path.endswith('.xls'):
-                    for col_idx in range(sheet.ncols):
-                        cell_val = str(sheet.cell_value(row_idx, col_idx))
-                        full_text += cell_val + " "
-                # .xlsx dosyası için
-                else:
-                    for cell in list(sheet.rows)[row_idx]:
-                        if cell.value:
-                            full_text += str(cell.value) + " "
+            rows = iter_sheet_rows(file_path)
+            head = list(islice(rows, LECTURER_SCAN_ROWS))
+            rows.close()
             
             # Metin içinde öğretim üyesi desenini ara
             # Desen: "Dr. Öğr. Üyesi İSIM" veya "Öğr.Gör. İSIM" vb.
-            lecturer = self._extract_lecturer_name_from_text(full_text)
+            lecturer = self._extract_lecturer_name_from_text(self._head_text(head))
             
             if lecturer:
                 logger.info(f"Öğretim üyesi bulundu: {lecturer}")
@@ -393,6 +791,13 @@ class StudentImporter:
             logger.error(f"Öğretim üyesi çıkarma hatası ({file_path}): {str(e)}")
             return None
     
+    def _head_text(self, head: List[tuple]) -> str:
+        """İlk LECTURER_SCAN_ROWS satırın dolu hücrelerini tek metinde birleştirir."""
+        return ' '.join(
+            str(value) for row in head[:LECTURER_SCAN_ROWS] for value in row
+            if value is not None and value != ''
+        )
+    
     def _extract_lecturer_name_from_text(self, text: str) -> Optional[str]:
         """
         Metin içinde öğretim üyesi adını çıkarır.
@@ -462,213 +867,35 @@ class StudentImporter:
         
         return None
     
-    def _read_xls(
-        self,
-        file_path: str,
-        department_id: Optional[int] = None,
-        year: Optional[int] = None
-    ) -> List[Dict]:
-
-        students = []
-        
-        try:
-            workbook = xlrd.open_workbook(file_path, formatting_info=False)
-            sheet = workbook.sheet_by_index(0)
-            
-            header_row = self._find_header_row_xls(sheet)
-            if header_row is None:
-                header_row = 0
-            
-            col_indices = self._get_column_indices_xls(sheet, header_row)
-            
-            # Eğer col_indices ile sütun bulunamadıysa, sabit pozisyonları dene
-            # Analiz sonucuna göre: Sütun 4 = Öğrenci no, Sütun 5 = Adı Soyadı
-            if col_indices.get('student_number') is None:
-                col_indices['student_number'] = 4
-            if col_indices.get('full_name') is None and col_indices.get('first_name') is None:
-                col_indices['full_name'] = 5
-            
-            for row_idx in range(header_row + 1, sheet.nrows):
-                row_data = {}
-                
-                for key, col_idx in col_indices.items():
-                    if col_idx is not None and col_idx < sheet.ncols:
-                        cell_value = sheet.cell_value(row_idx, col_idx)
-                        row_data[key] = self._clean_cell_value(cell_value)
-                
-                student_number = row_data.get('student_number', '').strip()
-                if not student_number or not self._is_valid_student_number(student_number):
-                    continue
-                
-                first_name = row_data.get('first_name', '').strip()
-                last_name = row_data.get('last_name', '').strip()
-                
-                if not first_name and not last_name:
-                    full_name = row_data.get('full_name', '').strip()
-                    if full_name:
-                        name_parts = full_name.split()
-                        if len(name_parts) >= 2:
-                            first_name = ' '.join(name_parts[:-1])
-                            last_name = name_parts[-1]
-                        elif len(name_parts) == 1:
-                            # Tek isim varsa, adı olarak kullan ve soyadı boş bırak
-                            first_name = full_name
-                            last_name = "-"  # Boş soyad için yer tutucu
-                
-                # İsim yoksa satırı atla
-                if not first_name:
-                    continue
-                
-                # Soyad yoksa varsayılan değer ata
-                if not last_name:
-                    last_name = "-"
-                
-                first_name = first_name[:50]
-                last_name = last_name[:50]
-                
-                student = {
-                    'student_number': student_number,
-                    'first_name': first_name,
-                    'last_name': last_name,
-                    'email': row_data.get('email', ''),
-                    'department_id': department_id,
-                    'year': year or self._parse_year(row_data.get('year', ''))
-                }
-                
-                students.append(student)
-                
-        except Exception as e:
-            raise Exception(f"XLS okuma hatası: {str(e)}")
-        
-        return students
-    
-    def _read_xlsx(
-        self,
-        file_path: str,
-        department_id: Optional[int] = None,
-        year: Optional[int] = None
-    ) -> List[Dict]:
-        students = []
-        
-        try:
-            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
-            sheet = workbook.active
-            
-            header_row = self._find_header_row_xlsx(sheet)
-            if header_row is None:
-                header_row = 1
-            
-            col_indices = self._get_column_indices_xlsx(sheet, header_row)
-            
-            for row in sheet.iter_rows(min_row=header_row + 1, values_only=True):
-                row_data = {}
-                
-                for key, col_idx in col_indices.items():
-                    if col_idx is not None and col_idx < len(row):
-                        row_data[key] = self._clean_cell_value(row[col_idx])
-                
-                student_number = row_data.get('student_number', '').strip()
-                if not student_number or not self._is_valid_student_number(student_number):
-                    continue
-                
-                first_name = row_data.get('first_name', '').strip()
-                last_name = row_data.get('last_name', '').strip()
-                
-                if not first_name and not last_name:
-                    full_name = row_data.get('full_name', '').strip()
-                    if full_name:
-                        name_parts = full_name.split()
-                        if len(name_parts) >= 2:
-                            first_name = ' '.join(name_parts[:-1])
-                            last_name = name_parts[-1]
-                        else:
-                            first_name = full_name
-                
-                if not first_name or not last_name:
-                    continue
-                
-                # Ad ve soyadı 50 karaktere kırp (database sütun limiti)
-                first_name = first_name[:50]
-                last_name = last_name[:50]
-                
-                student = {
-                    'student_number': student_number,
-                    'first_name': first_name,
-                    'last_name': last_name,
-                    'email': row_data.get('email', ''),
-                    'department_id': department_id,
-                    'year': year or self._parse_year(row_data.get('year', ''))
-                }
-                
-                students.append(student)
-                
-        except Exception as e:
-            raise Exception(f"XLSX okuma hatası: {str(e)}")
-        
-        return students
-    
-    def _find_header_row_xls(self, sheet) -> Optional[int]:
-        # Türkçe karakter normalize etme fonksiyonu
-        def normalize_turkish(text: str) -> str:
-            # Türkçe karakterleri İngilizce karşılıklarına dönüştür
-            tr_map = str.maketrans('ıİğĞşŞöÖçÇüÜ', 'iIgGsSoOcCuU')
-            return text.translate(tr_map).lower().strip()
-        
-        common_headers = [
-            'ogrenci no', 'ogrenci no.', 'ogr no', 'ogr no',
-            'ogrenci no', 'öğrenci no', 'numara', 'no', 'no.', 'sıra no',
-            'student no', 'student number'
-        ]
-        
-        # Başlık satırını bulmak için her satırı kontrol et
-        # Başlık satırı "Öğrenci No" ve "Adı Soyadı" gibi temel bilgileri içermeli
-        for row_idx in range(min(15, sheet.nrows)):
-            row_values = []
-            for col_idx in range(min(10, sheet.ncols)):  # İlk 10 sütunu kontrol et
-                cell_value = str(sheet.cell_value(row_idx, col_idx)).strip()
-                if cell_value:
-                    row_values.append(cell_value)
-            
-            # "Öğrenci no" içeren satırı bul
-            row_text = ' '.join(row_values)
-            normalized_row = normalize_turkish(row_text)
-            
-            # En az 2 başlık alanını içermeli
+    def _find_header(self, head: List[tuple]) -> Tuple[int, Dict[str, Optional[int]]]:
+        """
+        Başlık satırını ("Öğrenci No" ve "Adı Soyadı" içeren ilk satır) ve sütun
+        indekslerini bulur. Bulunamazsa ilk satır başlık kabul edilir ve analiz
+        sonucuna göre sabit pozisyonlar kullanılır (Sütun 4 = Öğrenci no, Sütun 5 = Adı Soyadı).
+        """
+        header_row = 0
+        for row_idx, row in enumerate(head):
+            headers = normalize_headers(row)
             student_no_found = False
             ad_soyad_found = False
-            
-            for col_idx in range(sheet.ncols):
-                cell_value = str(sheet.cell_value(row_idx, col_idx))
-                normalized_value = normalize_turkish(cell_value)
-                lower_value = cell_value.lower().strip()
-                
-                # Öğrenci no kontrolü
-                if any(normalize_turkish(h) in normalized_value for h in ['ogrenci no', 'ogr no', 'student no']):
+            for header in headers:
+                if any(marker in header for marker in HEADER_STUDENT_NO_MARKERS):
                     student_no_found = True
-                # Ad Soyadı kontrolü
-                elif any(h in normalized_value for h in ['adi soyadi', 'ad soyad', 'adi ve soyadi']):
+                elif any(marker in header for marker in FULL_NAME_HEADERS):
                     ad_soyad_found = True
-            
-            # Her iki alan da bulunduysa bu başlık satırıdır
             if student_no_found and ad_soyad_found:
-                return row_idx
-        
-        return None
-    
-    def _find_header_row_xlsx(self, sheet) -> Optional[int]:
-        common_headers = ['ogrenci no', 'öğrenci no', 'numara', 'no', 'no.', 'sıra no']
-        
-        for row_idx, row in enumerate(sheet.iter_rows(min_row=1, max_row=10, values_only=True)):
-            for cell_value in row:
-                if cell_value:
-                    cell_str = str(cell_value).lower().strip()
-                    for header in common_headers:
-                        if header in cell_str:
-                            return row_idx + 1
-        
-        return None
+                header_row = row_idx
+                break
+        
+        col_indices = self._column_indices(normalize_headers(head[header_row]) if head else [])
+        if col_indices.get('student_number') is None:
+            col_indices['student_number'] = 4
+        if col_indices.get('full_name') is None and col_indices.get('first_name') is None:
+            col_indices['full_name'] = 5
+        return header_row, col_indices
     
-    def _get_column_indices_xls(self, sheet, header_row: int) -> Dict[str, Optional[int]]:
+    def _column_indices(self, headers: List[str]) -> Dict[str, Optional[int]]:
+        """Normalize edilmiş başlıklardan sütun indekslerini çıkarır."""
         indices = {
             'student_number': None,
             'first_name': None,
@@ -678,73 +905,98 @@ class StudentImporter:
             'year': None
         }
         
-        # Türkçe karakter normalize etme fonksiyonu
-        def normalize_turkish(text: str) -> str:
-            tr_map = str.maketrans('ıİğĞşŞöÖçÇüÜ', 'iIgGsSoOcCuU')
-            return text.translate(tr_map).lower().strip()
-        
-        if header_row >= sheet.nrows:
-            return indices
-        
-        for col_idx in range(sheet.ncols):
-            header = str(sheet.cell_value(header_row, col_idx)).lower().strip()
-            normalized_header = normalize_turkish(header)
-            
+        for col_idx, header in enumerate(headers):
             # Öğrenci numarası kontrolü - öncelik sırasına göre kontrol et
-            student_no_patterns = ['ogrenci no', 'ogr no', 'ogr. no', 'numara', 'no', 'student no']
-            for pattern in student_no_patterns:
-                if pattern in normalized_header and 'ad soyad' not in normalized_header:
-                    indices['student_number'] = col_idx
-                    break
+            if 'ad soyad' not in header and any(pattern in header for pattern in STUDENT_NO_HEADERS):
+                indices['student_number'] = col_idx
             
             # Ad Soyadı kontrolü (birleşik isim)
-            if any(p in normalized_header for p in ['adi soyadi', 'ad soyad', 'adi ve soyadi']) and indices['full_name'] is None:
+            if any(p in header for p in FULL_NAME_HEADERS) and indices['full_name'] is None:
                 indices['full_name'] = col_idx
             # Ayrı ad kontrolü - sadece 'ad' varsa ve 'ad soyad' yoksa
-            elif 'ad' in normalized_header and 'soyad' not in normalized_header and 'ad soyad' not in normalized_header and indices['first_name'] is None:
+            elif 'ad' in header and 'soyad' not in header and indices['first_name'] is None:
                 indices['first_name'] = col_idx
             # Soyad kontrolü - sadece 'soyad' varsa ve 'ad soyad' yoksa
-            elif 'soyad' in normalized_header and 'ad soyad' not in normalized_header and indices['last_name'] is None:
+            elif 'soyad' in header and 'ad soyad' not in header and indices['last_name'] is None:
                 indices['last_name'] = col_idx
             # E-posta kontrolü
-            elif any(p in normalized_header for p in ['e-posta', 'eposta', 'email', 'e-post', 'mail']) and indices['email'] is None:
+            elif any(p in header for p in EMAIL_HEADERS) and indices['email'] is None:
                 indices['email'] = col_idx
             # Sınıf kontrolü
-            elif ('sinif' in normalized_header or 'sınıf' in header) and indices['year'] is None:
+            elif 'sinif' in header and indices['year'] is None:
                 indices['year'] = col_idx
         
         return indices
     
-    def _get_column_indices_xlsx(self, sheet, header_row: int) -> Dict[str, Optional[int]]:
-        indices = {
-            'student_number': None,
-            'first_name': None,
-            'last_name': None,
-            'full_name': None,
-            'email': None,
-            'year': None
-        }
+    def _row_to_student(
+        self,
+        row: tuple,
+        col_indices: Dict[str, Optional[int]],
+        department_id: Optional[int] = None,
+        year: Optional[int] = None
+    ) -> Optional[Dict]:
+        """Veri satırını öğrenci sözlüğüne çevirir; öğrenci satırı değilse None."""
+        row_data = {}
+        for key, col_idx in col_indices.items():
+            if col_idx is not None and col_idx < len(row):
+                row_data[key] = self._clean_cell_value(row[col_idx])
+        
+        student_number = row_data.get('student_number', '').strip()
+        if not student_number or not self._is_valid_student_number(student_number):
+            return None
         
-        header_values = list(sheet.iter_rows(min_row=header_row, max_row=header_row, values_only=True))[0]
+        first_name = row_data.get('first_name', '').strip()
+        last_name = row_data.get('last_name', '').strip()
+        
+        if not first_name and not last_name:
+            full_name = row_data.get('full_name', '').strip()
+            if full_name:
+                name_parts = full_name.split()
+                if len(name_parts) >= 2:
+                    first_name = ' '.join(name_parts[:-1])
+                    last_name = name_parts[-1]
+                elif len(name_parts) == 1:
+                    # Tek isim varsa, adı olarak kullan ve soyadı boş bırak
+                    first_name = full_name
+                    last_name = "-"  # Boş soyad için yer tutucu
+        
+        # İsim yoksa satırı atla
+        if not first_name:
+            return None
         
-        for col_idx, header in enumerate(header_values):
-            if header:
-                header_str = str(header).lower().strip()
-                
-                if any(x in header_str for x in ['öğrenci no', 'ogrenci no', 'numara', 'no.', 'no ']):
-                    indices['student_number'] = col_idx
-                elif 'ad' in header_str and 'soyad' not in header_str and 'ad soyad' not in header_str:
-                    indices['first_name'] = col_idx
-                elif 'soyad' in header_str:
-                    indices['last_name'] = col_idx
-                elif 'ad soyad' in header_str or 'adı soyadı' in header_str:
-                    indices['full_name'] = col_idx
-                elif any(x in header_str for x in ['e-posta', 'eposta', 'email', 'e-post']):
-                    indices['email'] = col_idx
-                elif 'sınıf' in header_str:
-                    indices['year'] = col_idx
+        # Soyad yoksa varsayılan değer ata
+        if not last_name:
+            last_name = "-"
         
-        return indices
+        # Ad ve soyadı 50 karaktere kırp (database sütun limiti)
+        return {
+            'student_number': student_number,
+            'first_name': first_name[:50],
+            'last_name': last_name[:50],
+            'email': row_data.get('email', ''),
+            'department_id': department_id,
+            'year': year or self._parse_year(row_data.get('year', ''))
+        }
+    
+    def _rejected_row(
+        self,
+        row: tuple,
+        col_indices: Dict[str, Optional[int]]
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Öğrenciye çevrilemeyen satır; rakam içeren numarası ve adı varsa (geçersiz numara)
+        ya da geçerli numarası olup adı yoksa (numara, ad) olarak döner. Boş, başlık
+        veya toplam satırları için None.
+        """
+        def cell(key: str) -> str:
+            col_idx = col_indices.get(key)
+            return self._clean_cell_value(row[col_idx]) if col_idx is not None and col_idx < len(row) else ''
+        
+        number = cell('student_number')
+        name = ' '.join(part for part in (cell('first_name'), cell('last_name')) if part) or cell('full_name')
+        if number and any(ch.isdigit() for ch in number) and (name or self._is_valid_student_number(number)):
+            return number, name
+        return None
     
     def _clean_cell_value(self, value) -> str:
         if value is None:
@@ -921,21 +1173,14 @@ class StudentImporter:
             first_name = ' '.join(name_parts[:-1])
             last_name = name_parts[-1]
         
-        # İlk olarak var olan öğretim üyelerinde ara
-        all_lecturers = self.lecturer_repo.get_all()
-        
-        # Tam eşleşme ara
-        for lecturer in all_lecturers:
-            full_name = f"{lecturer.first_name} {lecturer.last_name}".strip()
-            if lecturer_name.lower() == full_name.lower():
+        # İlk olarak oturum indeksinde ara: tam ad, sonra soyad eşleşmesi
+        lecturer, exact = self.lecturer_index.find(lecturer_name, last_name)
+        if lecturer:
+            if exact:
                 logger.info(f"Mevcut öğretim üyesi bulundu: {lecturer_name}")
-                return lecturer
-        
-        # Kısmi eşleşme ara (soyadı kontrol et)
-        for lecturer in all_lecturers:
-            if lecturer.last_name and lecturer.last_name.lower() == last_name.lower():
+            else:
                 logger.info(f"Öğretim üyesi soyadı eşleşmesi bulundu: {lecturer_name} -> {lecturer}")
-                return lecturer
+            return lecturer
         
         # Yeni öğretim üyesi oluştur
         try:
@@ -951,6 +1196,7 @@ class StudentImporter:
             lecturer_id = self.lecturer_repo.create(new_lecturer)
             if lecturer_id:
                 new_lecturer.id = lecturer_id
+                self.lecturer_index.add(new_lecturer)
                 logger.info(f"Yeni öğretim üyesi oluşturuldu: {lecturer_name} (ID: {lecturer_id})")
                 return new_lecturer
             else:
@@ -961,7 +1207,12 @@ class StudentImporter:
             logger.error(f"Öğretim üyesi oluşturma hatası ({lecturer_name}): {str(e)}")
             return None
     
-    def _create_course_from_code(self, course_code: str, file_path: str) -> Optional[Course]:
+    def _create_course_from_code(
+        self,
+        course_code: str,
+        file_path: str,
+        lecturer_name: Optional[str] = None
+    ) -> Optional[Course]:
         """
         Ders kodundan yeni bir ders oluşturur.
         
@@ -970,6 +1221,7 @@ class StudentImporter:
         Args:
             course_code: Ders kodu (örn: BLM331)
             file_path: Excel dosya yolu (ders adını ve öğretim üyesini çıkarmak için)
+            lecturer_name: Dosyadan önceden çıkarılmış öğretim üyesi adı (yoksa dosya okunur)
             
         Returns:
             Oluşturulan Course nesnesi veya None
@@ -986,7 +1238,8 @@ class StudentImporter:
             year = self._get_year_from_course_code(course_code)
             
             # Excel'den öğretim üyesi bilgisini çıkar
-            lecturer_name = self.extract_lecturer_from_file(file_path)
+            if lecturer_name is None:
+                lecturer_name = self.extract_lecturer_from_file(file_path)
             
             # Öğretim üyesini bul veya oluştur
             lecturer_id = None
@@ -1035,92 +1288,250 @@ class StudentImporter:
         course_id: int,
         semester: Optional[str] = None
     ) -> ImportResult:
-        errors = []
-        warnings = []
-        
-        students_to_create = []
-        student_courses_to_create = []
-        
-        for data in students_data:
-            try:
-                student = Student(
-                    student_number=data['student_number'],
-                    first_name=data['first_name'],
-                    last_name=data['last_name'],
-                    email=data.get('email') or None,
-                    department_id=data.get('department_id'),
-                    year=data.get('year', 1),
-                    is_active=True
-                )
-                
-                students_to_create.append(student)
-                
-            except Exception as e:
-                errors.append(f"{data.get('student_number', 'Bilinmeyen')}: {str(e)}")
-        
         try:
-            created_count = self.student_repo.create_batch(students_to_create)
-            
-            imported_students = []
-            for data in students_data:
-                student = self.student_repo.get_by_student_number(data['student_number'])
-                if student:
-                    imported_students.append(student)
-            
-            for student in imported_students:
-                student_course = StudentCourse(
-                    student_id=student.id,
-                    course_id=course_id,
-                    semester=semester,
-                    is_active=True
-                )
-                student_courses_to_create.append(student_course)
-            
-            if student_courses_to_create:
-                self.student_course_repo.create_batch(student_courses_to_create)
-            
-            # Dersin öğrenci sayısını güncelle
-            student_count = len(imported_students)
-            self._update_course_student_count(course_id, student_count)
-            
+            [(count, errors)] = self._write_class_lists([(course_id, students_data)], semester)
             return ImportResult(
                 success=True,
-                message=f"{len(imported_students)} öğrenci başarıyla içe aktarıldı",
-                students_imported=len(imported_students),
-                student_courses_created=len(student_courses_to_create),
-                errors=errors if errors else None,
-                warnings=warnings if warnings else None
+                message=f"{count} öğrenci başarıyla içe aktarıldı",
+                students_imported=count,
+                student_courses_created=count,
+                errors=errors if errors else None
             )
             
         except Exception as e:
             return ImportResult(
                 success=False,
-                message=f"Kayıt sırasında hata: {str(e)}",
-                errors=errors
+                message=f"Kayıt sırasında hata: {str(e)}"
             )
     
-    def _update_course_student_count(self, course_id: int, student_count: int) -> bool:
+    def _write_class_lists(
+        self,
+        batches: List[Tuple[int, List[Dict]]],
+        semester: Optional[str] = None,
+        sync_course_ids: Optional[Set[int]] = None,
+        tx=None
+    ) -> List[Tuple[int, List[str]]]:
         """
-        Dersin öğrenci sayısını günceller.
+        Öğrencileri, ders kayıtlarını ve derslerin öğrenci sayısını tek transaction'da yazar:
+        öğrenciler COPY + upsert ile yüklenir (RETURNING student_number, id), kayıtlar
+        bellekteki numara -> id eşlemesiyle oluşturulur ve student_count tek UPDATE ile yenilenir.
         
         Args:
-            course_id: Ders ID'si
-            student_count: Öğrenci sayısı
+            batches: (course_id, öğrenci satırları) listesi; her sınıf listesi bir eleman
+            sync_course_ids: Kayıtları sync_enrollments ile listeye eşitlenecek dersler
+                (listede olmayan aktif kayıtlar pasife alınır; satırı hatalı öğrenciler
+                pasife alınmaz); diğer dersler yalnızca eklenir
+            tx: Açık TransactionContext; verilirse yazma onun içinde yapılır, commit çağıranındır
             
         Returns:
-            Güncelleme başarılı mı
+            Her eleman için (kaydedilen öğrenci sayısı, satır hataları)
         """
+        students_to_create = []
+        batch_errors = []
+        # Satırı Student'a çevrilemeyen öğrencilerin mevcut kayıtları fark uygulanırken korunur
+        kept_enrollments: Set[Tuple[str, int]] = set()
+        
+        for course_id, students_data in batches:
+            errors = []
+            for data in students_data:
+                try:
+                    students_to_create.append(self._to_student(data))
+                except Exception as e:
+                    errors.append(f"{data.get('student_number', 'Bilinmeyen')}: {str(e)}")
+                    if data.get('student_number'):
+                        kept_enrollments.add((data['student_number'], course_id))
+            batch_errors.append(errors)
+        
+        with nullcontext(tx) if tx is not None else self.student_repo.transaction() as tx:
+            student_ids = self.student_repo.bulk_upsert(students_to_create, conn=tx.connection)
+            
+            student_courses_to_create = []
+            student_courses_to_sync = []
+            counts = []
+            for course_id, students_data in batches:
+                numbers = {data.get('student_number') for data in students_data}
+                enrolled = [student_ids[number] for number in numbers if number in student_ids]
+                target = student_courses_to_sync if course_id in (sync_course_ids or ()) else student_courses_to_create
+                target.extend(
+                    StudentCourse(student_id=student_id, course_id=course_id, semester=semester, is_active=True)
+                    for student_id in enrolled
+                )
+                counts.append(len(enrolled))
+            self.student_course_repo.bulk_upsert(student_courses_to_create, conn=tx.connection)
+            if student_courses_to_sync:
+                added, removed = self.student_course_repo.sync_enrollments(
+                    student_courses_to_sync, conn=tx.connection, keep=kept_enrollments
+                )
+                logger.info(f"Kayıt farkı uygulandı: {added} eklendi/güncellendi, {removed} pasife alındı")
+            
+            # Derslerin öğrenci sayısı aktif kayıtlardan yeniden hesaplanır
+            self.course_repo.refresh_student_counts(
+                list({course_id for course_id, _ in batches}), conn=tx.connection
+            )
+        
+        return list(zip(counts, batch_errors))
+    
+    def _to_student(self, data: Dict) -> Student:
+        return Student(
+            student_number=data['student_number'],
+            first_name=data['first_name'],
+            last_name=data['last_name'],
+            email=data.get('email') or None,
+            department_id=data.get('department_id'),
+            year=data.get('year', 1),
+            is_active=True
+        )
+    
+    def import_enrollment_feed(
+        self,
+        file_path: str,
+        semester: Optional[str] = None,
+        department_id: Optional[int] = None,
+        chunk_rows: Optional[int] = None
+    ) -> ImportResult:
+        """
+        Öğrenci işlerinin tek dosyalık kayıt akışını (CSV/TSV: öğrenci numarası,
+        ad soyad, ders kodu) içe aktarır. Dosya iter_sheet_rows ile akıtılır ve
+        chunk_rows satırlık parçalar halinde işlenir; ders kodları bellekteki
+        kod -> ders eşlemesiyle çözülür, her parça öğrenci ve kayıt bulk_upsert'lerine
+        doğrudan verilir. Tüm parçalar ve öğrenci sayısı güncellemesi tek transaction'dır.
+        
+        Kayıtlar yalnızca eklenir/etkinleştirilir; akışta olmayan kayıtlar pasife alınmaz.
+        Veritabanında olmayan bir ders kodu varsa import_staged'deki gibi içe aktarma
+        başarısız olur ve hiçbir kayıt kalıcı olmaz: o parçadan itibaren yazma durur,
+        dosyanın kalanı yalnızca bilinmeyen kodları raporlamak için taranır ve
+        transaction geri alınır.
+        """
+        if not os.path.exists(file_path):
+            return ImportResult(success=False, message=f"Dosya bulunamadı: {file_path}")
+        
+        chunk_rows = chunk_rows or CSV_IMPORT_CHUNK_ROWS
+        courses_by_code = {course.code.upper(): course for course in self.course_repo.get_all()}
+        rows = iter_sheet_rows(file_path)
         try:
-            course = self.course_repo.get_by_id(course_id)
-            if course:
-                course.student_count = student_count
-                self.course_repo.update(course)
-                logger.info(f"Ders öğrenci sayısı güncellendi: ID={course_id}, student_count={student_count}")
-                return True
-            return False
+            headers = [header.replace('_', ' ') for header in normalize_headers(next(rows, ()))]
+            col_indices, course_col = self._feed_column_indices(headers)
+            if col_indices['student_number'] is None or course_col is None:
+                return ImportResult(
+                    success=False,
+                    message="Başlıkta öğrenci numarası ve ders kodu sütunları bulunamadı"
+                )
+            
+            row_count = skipped = enrollment_count = 0
+            unknown_codes: Dict[str, int] = {}
+            student_numbers: Set[str] = set()
+            course_ids: Set[int] = set()
+            
+            with self.student_repo.transaction() as tx:
+                while True:
+                    chunk = list(islice(rows, chunk_rows))
+                    if not chunk:
+                        break
+                    row_count += len(chunk)
+                    
+                    chunk_courses = []
+                    for row in chunk:
+                        code = self._clean_cell_value(row[course_col]).upper() if course_col < len(row) else ''
+                        course = courses_by_code.get(code)
+                        if course is None and code:
+                            unknown_codes[code] = unknown_codes.get(code, 0) + 1
+                        chunk_courses.append(course)
+                    # Bilinmeyen kod görüldükten sonra hiçbir parça yazılmaz
+                    if unknown_codes:
+                        continue
+                    
+                    students: Dict[str, Dict] = {}
+                    enrollments: Set[Tuple[str, int]] = set()
+                    for row, course in zip(chunk, chunk_courses):
+                        if course is None:
+                            skipped += 1
+                            continue
+                        student = self._row_to_student(
+                            row, col_indices, department_id or course.department_id, course.year
+                        )
+                        if student is None:
+                            skipped += 1
+                            continue
+                        students[student['student_number']] = student
+                        enrollments.add((student['student_number'], course.id))
+                    
+                    student_ids = self.student_repo.bulk_upsert(
+                        [self._to_student(data) for data in students.values()], conn=tx.connection
+                    )
+                    self.student_course_repo.bulk_upsert(
+                        [
+                            StudentCourse(student_id=student_ids[number], course_id=course_id,
+                                          semester=semester, is_active=True)
+                            for number, course_id in enrollments if number in student_ids
+                        ],
+                        conn=tx.connection
+                    )
+                    student_numbers.update(students)
+                    course_ids.update(course_id for _, course_id in enrollments)
+                    enrollment_count += len(enrollments)
+                    logger.info(f"Kayıt akışı: {row_count} satır işlendi")
+                
+                if unknown_codes:
+                    tx.rollback()
+                else:
+                    self.course_repo.refresh_student_counts(list(course_ids), conn=tx.connection)
         except Exception as e:
-            logger.error(f"Ders öğrenci sayısı güncellenemedi (ID={course_id}): {str(e)}")
-            return False
+            logger.error(f"Kayıt akışı içe aktarılamadı ({file_path}): {e}")
+            return ImportResult(
+                success=False,
+                message=f"Kayıt sırasında hata, değişiklikler geri alındı: {str(e)}"
+            )
+        finally:
+            rows.close()
+        
+        if unknown_codes:
+            return ImportResult(
+                success=False,
+                message=f"Kayıt akışında {len(unknown_codes)} bilinmeyen ders kodu var, hiçbir kayıt yazılmadı",
+                errors=[
+                    f"Bilinmeyen ders kodu {code}: {count} satır"
+                    for code, count in sorted(unknown_codes.items(), key=lambda item: -item[1])
+                ]
+            )
+        
+        warnings = [f"{skipped} satır geçersiz numara/ad veya boş ders kodu nedeniyle atlandı"] if skipped else []
+        return ImportResult(
+            success=True,
+            message=f"Kayıt akışı içe aktarıldı: {row_count} satır, {len(student_numbers)} öğrenci, "
+                    f"{enrollment_count} ders kaydı, {len(course_ids)} ders",
+            students_imported=len(student_numbers),
+            student_courses_created=enrollment_count,
+            warnings=warnings
+        )
+    
+    def _feed_column_indices(self, headers: List[str]) -> Tuple[Dict[str, Optional[int]], Optional[int]]:
+        """
+        Kayıt akışı başlıklarından (_row_to_student sütunları, ders kodu sütunu) çıkarır.
+        Önce FEED_* başlıkları birebir eşlenir; numara veya ad bulunamazsa eksik
+        sütunlar sınıf listesi sezgileriyle (_column_indices) tamamlanır. Sezgiler ders
+        kodu sütununu görmez ('ders no' gibi bir başlık numara sütunu sanılmasın).
+        """
+        indices: Dict[str, Optional[int]] = dict.fromkeys(
+            ('student_number', 'first_name', 'last_name', 'full_name', 'email', 'year')
+        )
+        course_col = None
+        for col_idx, header in enumerate(headers):
+            if header in FEED_STUDENT_NO_HEADERS:
+                indices['student_number'] = col_idx
+            elif header in FEED_FULL_NAME_HEADERS:
+                indices['full_name'] = col_idx
+            elif header in FEED_FIRST_NAME_HEADERS:
+                indices['first_name'] = col_idx
+            elif header in FEED_LAST_NAME_HEADERS:
+                indices['last_name'] = col_idx
+            elif header in FEED_COURSE_CODE_HEADERS and course_col is None:
+                course_col = col_idx
+        if indices['student_number'] is None or (indices['full_name'] is None and indices['first_name'] is None):
+            masked = ['' if col_idx == course_col else header for col_idx, header in enumerate(headers)]
+            for key, col_idx in self._column_indices(masked).items():
+                if indices[key] is None:
+                    indices[key] = col_idx
+        return indices, course_col
     
     def get_students_by_course(self, course_id: int) -> List[Student]:
         student_courses = self.student_course_repo.get_by_course_id(course_id)
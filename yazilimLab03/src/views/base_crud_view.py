@@ -3,6 +3,8 @@ Base CRUD View - Temel CRUD Görünümü
 Tüm CRUD ekranları için ortak yapı sağlar
 """
 
+from abc import ABCMeta, abstractmethod
+
 import tkinter as tk
 from tkinter import ttk, messagebox
 from src.views.components.data_table import DataTable
@@ -12,10 +14,14 @@ class BaseCrudView(tk.Frame):
     title = "Veri Yönetimi"
     columns = []  # [('id', 'ID', 50), ('name', 'Ad', 150), ...]
     
+    # Arama kutusunda yazma durduktan sonra sorguya kadar beklenen süre
+    search_delay_ms = 250
+    
     def __init__(self, parent, dashboard):
         super().__init__(parent, bg='#ecf0f1')
         self.dashboard = dashboard
         self.controller = dashboard.controller
+        self._search_job = None
         
         self._create_widgets()
         self.load_data()
@@ -158,7 +164,7 @@ class BaseCrudView(tk.Frame):
     
     # ==================== Override edilecek metodlar ====================
     
-    def load_data(self):
+    def load_data(self, search_term=''):
         """Veriyi yükler - Alt sınıflar tarafından override edilecek"""
         pass
     
@@ -201,8 +207,20 @@ class BaseCrudView(tk.Frame):
     # ==================== Event handler'lar ====================
     
     def _on_search(self, *args):
-        search_term = self.search_var.get().lower()
-        self.load_data(search_term)
+        # Her tuşta sorgu atılmaz; son tuştan search_delay_ms sonra bir kez aranır
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(self.search_delay_ms, self._run_search)
+    
+    def _run_search(self):
+        self._search_job = None
+        self.load_data(self.search_var.get().lower())
+    
+    def destroy(self):
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+            self._search_job = None
+        super().destroy()
     
     def _on_select(self, item):
         pass
@@ -270,6 +288,84 @@ class BaseCrudView(tk.Frame):
             return False
 
 
+class PaginatedCrudView(BaseCrudView, metaclass=ABCMeta):
+    """
+    Listesi fetch_page() ile sayfa sayfa yüklenen ve "Daha Fazla Yükle" gösteren
+    CRUD ekranı. fetch_page ve to_row override edilmeden sınıf örneklenemez.
+    """
+    page_size = 100
+    
+    def __init__(self, parent, dashboard):
+        self._search_term = ''
+        self._next_cursor = None
+        super().__init__(parent, dashboard)
+    
+    def _create_widgets(self):
+        super()._create_widgets()
+        
+        self._create_pager()
+    
+    def _create_pager(self):
+        pager_frame = tk.Frame(self, bg='#ecf0f1')
+        pager_frame.pack(fill='x', padx=20, pady=(0, 15))
+        
+        self.page_info_label = tk.Label(
+            pager_frame,
+            text='',
+            font=('Segoe UI', 9),
+            bg='#ecf0f1',
+            fg='#7f8c8d'
+        )
+        self.page_info_label.pack(side='left')
+        
+        self.load_more_btn = tk.Button(
+            pager_frame,
+            text='⬇ Daha Fazla Yükle',
+            font=('Segoe UI', 10),
+            bg='#95a5a6',
+            fg='white',
+            bd=0,
+            padx=15,
+            pady=6,
+            cursor='hand2',
+            state='disabled',
+            command=self._load_more
+        )
+        self.load_more_btn.pack(side='right')
+    
+    def load_data(self, search_term=''):
+        """İlk sayfayı getirir; arama sunucuda yapılır."""
+        self._search_term = search_term
+        page = self.fetch_page(search_term, None)
+        self.data_table.load_data([self.to_row(item) for item in page.items])
+        self._update_pager(page)
+    
+    def _load_more(self):
+        if self._next_cursor is None:
+            return
+        page = self.fetch_page(self._search_term, self._next_cursor)
+        self.data_table.append_data([self.to_row(item) for item in page.items])
+        self._update_pager(page)
+    
+    def _update_pager(self, page):
+        self._next_cursor = page.next_cursor
+        shown = len(self.data_table.tree.get_children())
+        suffix = ' (devamı var)' if page.has_more else ''
+        self.page_info_label.config(text=f'{shown} kayıt gösteriliyor{suffix}')
+        self.load_more_btn.config(state='normal' if page.has_more else 'disabled')
+    
+    @abstractmethod
+    def fetch_page(self, search_term, after):
+        """
+        Sayfalı ekranlarda bir sayfa kayıt döndürür (Page: items, next_cursor).
+        after: Önceki sayfanın next_cursor değeri, ilk sayfa için None
+        """
+    
+    @abstractmethod
+    def to_row(self, item):
+        """fetch_page'den gelen bir kaydı tablo satırı (dict) yapar"""
+
+
 class FormDialog(tk.Toplevel):    
     def __init__(self, parent, title, fields, data=None, on_save=None):
         super().__init__(parent)
@@ -5,10 +5,10 @@ Derslik CRUD işlemlerini yönetir
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from src.views.base_crud_view import BaseCrudView
+from src.views.base_crud_view import PaginatedCrudView
 
 
-class ClassroomView(BaseCrudView):    
+class ClassroomView(PaginatedCrudView):    
     title = "🚪 Derslik Yönetimi"
     columns = [
         ('id', 'ID', 50),
@@ -260,44 +260,34 @@ class ClassroomView(BaseCrudView):
             }
         ]
     
-    def load_data(self, search_term=''):
-        if self.filter_suitable_only.get():
-            classrooms = self.controller.get_exam_suitable_classrooms()
+    def fetch_page(self, search_term, after):
+        return self.controller.get_classrooms_page(
+            after=after, search=search_term,
+            suitable_only=self.filter_suitable_only.get(), limit=self.page_size
+        )
+    
+    def to_row(self, classroom):
+        nearby = getattr(classroom, 'nearby_classrooms', None)
+        if nearby is None:
+            nearby = getattr(classroom, 'neighbor_classrooms', None)
+        if nearby is None:
+            nearby = getattr(classroom, 'adjacent_classrooms', None)
+        if isinstance(nearby, (list, tuple)):
+            nearby_display = ', '.join(str(item) for item in nearby) if nearby else '-'
+        elif isinstance(nearby, str):
+            nearby_display = nearby if nearby.strip() else '-'
         else:
-            classrooms = self.controller.get_all_classrooms()
-        
-        data = []
-        for classroom in classrooms:
-            nearby = getattr(classroom, 'nearby_classrooms', None)
-            if nearby is None:
-                nearby = getattr(classroom, 'neighbor_classrooms', None)
-            if nearby is None:
-                nearby = getattr(classroom, 'adjacent_classrooms', None)
-            if isinstance(nearby, (list, tuple)):
-                nearby_display = ', '.join(str(item) for item in nearby) if nearby else '-'
-            elif isinstance(nearby, str):
-                nearby_display = nearby if nearby.strip() else '-'
-            else:
-                nearby_display = '-'
+            nearby_display = '-'
 
-            row = {
-                'id': classroom.id,
-                'name': classroom.name,
-                'faculty_name': classroom.faculty_name if classroom.faculty_name else 'Belirsiz',
-                'capacity': classroom.capacity,
-                'has_computer': '✓' if classroom.has_computer else '✗',
-                'is_suitable': '✓' if classroom.is_suitable else '✗',
-                'nearby_classrooms': nearby_display
-            }
-            
-            if search_term:
-                searchable = f"{row['name']} {row['faculty_name']}".lower()
-                if search_term not in searchable:
-                    continue
-            
-            data.append(row)
-        
-        self.data_table.load_data(data)
+        return {
+            'id': classroom.id,
+            'name': classroom.name,
+            'faculty_name': classroom.faculty_name if classroom.faculty_name else 'Belirsiz',
+            'capacity': classroom.capacity,
+            'has_computer': '✓' if classroom.has_computer else '✗',
+            'is_suitable': '✓' if classroom.is_suitable else '✗',
+            'nearby_classrooms': nearby_display
+        }
     
     def validate_form(self, data):
         if not data.get('name'):
@@ -2,5 +2,6 @@
 from .sidebar import Sidebar
 from .data_table import DataTable
 from .form_dialog import FormDialog
+from .search_box import GlobalSearchBox
 
-__all__ = ['Sidebar', 'DataTable', 'FormDialog']
+__all__ = ['Sidebar', 'DataTable', 'FormDialog', 'GlobalSearchBox']
@@ -51,6 +51,9 @@ class DataTable(tk.Frame):
     
     def load_data(self, data: list):
         self.clear()
+        self.append_data(data)
+    
+    def append_data(self, data: list):
         for row in data:
             values = [row.get(col[0], '') for col in self.columns]
             self.tree.insert('', 'end', values=values, tags=(str(row.get('id', '')),))
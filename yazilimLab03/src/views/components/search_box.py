@@ -0,0 +1,102 @@
+import tkinter as tk
+
+
+class GlobalSearchBox(tk.Frame):
+    """
+    Gecikmeli (debounce) global arama kutusu.
+    Yazma durduktan delay_ms sonra search(term) çağrılır ve sonuçlar altta listelenir.
+    """
+
+    KIND_ICONS = {
+        'course': '📖',
+        'lecturer': '👨‍🏫',
+        'classroom': '🚪',
+        'student': '👨‍🎓',
+    }
+
+    def __init__(self, parent, search, on_select=None, delay_ms: int = 250, bg='#2c3e50'):
+        """
+        search: term -> [SearchResult, ...]
+        on_select: Seçilen SearchResult ile çağrılır
+        """
+        super().__init__(parent, bg=bg)
+        self.search = search
+        self.on_select = on_select
+        self.delay_ms = delay_ms
+        self.results = []
+        self._job = None
+
+        self._create_widgets(bg)
+
+    def _create_widgets(self, bg):
+        self.search_var = tk.StringVar()
+        self.search_var.trace('w', self._on_change)
+
+        self.entry = tk.Entry(
+            self,
+            textvariable=self.search_var,
+            font=('Segoe UI', 10),
+            bd=1,
+            relief='solid'
+        )
+        self.entry.pack(fill='x', padx=10, pady=(10, 5), ipady=4)
+        self.entry.bind('<Return>', lambda e: self._select(0))
+        self.entry.bind('<Down>', lambda e: self._focus_results())
+        self.entry.bind('<Escape>', lambda e: self.search_var.set(''))
+
+        self.listbox = tk.Listbox(
+            self,
+            font=('Segoe UI', 9),
+            height=8,
+            bd=0,
+            activestyle='none',
+            exportselection=False
+        )
+        self.listbox.bind('<Double-1>', lambda e: self._select_current())
+        self.listbox.bind('<Return>', lambda e: self._select_current())
+
+    def _on_change(self, *args):
+        if self._job is not None:
+            self.after_cancel(self._job)
+        self._job = self.after(self.delay_ms, self._run_search)
+
+    def _run_search(self):
+        self._job = None
+        term = self.search_var.get().strip()
+        self.results = self.search(term) if term else []
+        self._show_results()
+
+    def _show_results(self):
+        self.listbox.delete(0, 'end')
+        if not self.results:
+            self.listbox.pack_forget()
+            return
+        for result in self.results:
+            icon = self.KIND_ICONS.get(result.kind, '•')
+            detail = f" ({result.detail})" if result.detail else ''
+            self.listbox.insert('end', f"{icon} {result.label}{detail}")
+        self.listbox.pack(fill='x', padx=10, pady=(0, 10))
+
+    def _focus_results(self):
+        if self.results:
+            self.listbox.focus_set()
+            self.listbox.selection_set(0)
+
+    def _select_current(self):
+        selection = self.listbox.curselection()
+        if selection:
+            self._select(selection[0])
+
+    def _select(self, index):
+        if index >= len(self.results):
+            return
+        result = self.results[index]
+        self.search_var.set('')
+        if self.on_select:
+            self.on_select(result)
+
+    def destroy(self):
+        if self._job is not None:
+            self.after_cancel(self._job)
+            self._job = None
+        super().destroy()
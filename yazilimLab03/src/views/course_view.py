@@ -4,11 +4,11 @@ Course View - Ders Yönetimi Görünümü
 
 import tkinter as tk
 from tkinter import messagebox, filedialog
-from src.views.base_crud_view import BaseCrudView
+from src.views.base_crud_view import PaginatedCrudView
 from src.models.course import COURSE_TYPES, COURSE_TYPE_MAP, EXAM_TYPES, EXAM_DURATION_OPTIONS
 
 
-class CourseView(BaseCrudView):    
+class CourseView(PaginatedCrudView):    
     title = "📖 Ders Yönetimi"
     columns = [
         ('id', 'ID', 50),
@@ -296,62 +296,53 @@ class CourseView(BaseCrudView):
             }
         ]
     
-    def load_data(self, search_term=''):
-        courses = self.controller.get_all_courses()
-        departments = {d.id: d.name for d in self.controller.get_all_departments()}
-        
+    def fetch_page(self, search_term, after):
+        department_id = None
         if self.user_role == 'bolum_yetkilisi' and self.user_department_id:
-            courses = [c for c in courses if c.department_id == self.user_department_id]
+            department_id = self.user_department_id
+        return self.controller.get_courses_page(
+            after=after, search=search_term, department_id=department_id, limit=self.page_size
+        )
+    
+    def to_row(self, course):
+        type_display = COURSE_TYPE_MAP.get(course.course_type, course.course_type)
         
-        data = []
-        for course in courses:
-            type_display = COURSE_TYPE_MAP.get(course.course_type, course.course_type)
-            
-            if course.has_exam and course.exam_duration > 0:
-                exam_duration_display = f"{course.exam_duration} dk"
-            else:
-                exam_duration_display = "-"
-            
-            if course.has_exam and course.exam_type:
-                exam_type_display = course.exam_type
-            else:
-                exam_type_display = "-"
-
-            row = {
-                'id': course.id,
-                'code': course.code,
-                'name': course.name,
-                'department_id': course.department_id,
-                'department_name': departments.get(course.department_id, '-'),
-                'credit': course.credit if course.credit else 3,
-                'student_count': course.student_count if course.student_count else 0,
-                'lecturer_count': course.lecturer_count if course.lecturer_count else 1,
-                'semester': f"{course.period}. Dönem" if course.period else '-',
-                '_semester_value': course.period if course.period else 1,
-                '_credit_value': course.credit if course.credit else 3,
-                '_student_count_value': course.student_count if course.student_count else 0,
-                '_lecturer_count_value': course.lecturer_count if course.lecturer_count else 1,
-                '_theory_hours': course.theory_hours if course.theory_hours else 0,
-                '_lab_hours': course.lab_hours if course.lab_hours else 0,
-                'type': type_display,
-                '_type_value': course.course_type,
-                'exam_type': exam_type_display,
-                '_exam_type_value': course.exam_type if course.exam_type else 'Yazılı',
-                'exam_duration': exam_duration_display,
-                '_exam_duration_value': course.exam_duration if course.exam_duration else 60,
-                'has_exam': 'Evet' if course.has_exam else 'Hayır',
-                '_has_exam_value': course.has_exam,
-                'description': course.description or ''
-            }
-            
-            if search_term:
-                searchable = f"{row['code']} {row['name']} {row['department_name']} {row['type']} {row['exam_type']}".lower()
-                if search_term not in searchable:
-                    continue
-            
-            data.append(row)
+        if course.has_exam and course.exam_duration > 0:
+            exam_duration_display = f"{course.exam_duration} dk"
+        else:
+            exam_duration_display = "-"
         
-        self.data_table.load_data(data)
+        if course.has_exam and course.exam_type:
+            exam_type_display = course.exam_type
+        else:
+            exam_type_display = "-"
+
+        return {
+            'id': course.id,
+            'code': course.code,
+            'name': course.name,
+            'department_id': course.department_id,
+            'department_name': course.department_name or '-',
+            'credit': course.credit if course.credit else 3,
+            'student_count': course.student_count if course.student_count else 0,
+            'lecturer_count': course.lecturer_count if course.lecturer_count else 1,
+            'semester': f"{course.period}. Dönem" if course.period else '-',
+            '_semester_value': course.period if course.period else 1,
+            '_credit_value': course.credit if course.credit else 3,
+            '_student_count_value': course.student_count if course.student_count else 0,
+            '_lecturer_count_value': course.lecturer_count if course.lecturer_count else 1,
+            '_theory_hours': course.theory_hours if course.theory_hours else 0,
+            '_lab_hours': course.lab_hours if course.lab_hours else 0,
+            'type': type_display,
+            '_type_value': course.course_type,
+            'exam_type': exam_type_display,
+            '_exam_type_value': course.exam_type if course.exam_type else 'Yazılı',
+            'exam_duration': exam_duration_display,
+            '_exam_duration_value': course.exam_duration if course.exam_duration else 60,
+            'has_exam': 'Evet' if course.has_exam else 'Hayır',
+            '_has_exam_value': course.has_exam,
+            'description': course.description or ''
+        }
     
     def validate_form(self, data):
         if not data.get('department_id'):
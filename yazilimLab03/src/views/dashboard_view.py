@@ -5,12 +5,24 @@ Rol bazlı içerik gösterimi sağlar
 """
 
 import tkinter as tk
-from tkinter import ttk
+from datetime import date
+from tkinter import ttk, messagebox
 from src.views.components.sidebar import Sidebar
+from src.views.components.search_box import GlobalSearchBox
 from src.controllers.dashboard_controller import DashboardController
 
 
 class DashboardView(tk.Frame):    
+    # Global arama sonucu türü -> açılacak menü (yönetim ekranları olan roller için)
+    SEARCH_RESULT_VIEWS = {
+        'course': 'courses',
+        'lecturer': 'lecturers',
+        'classroom': 'classrooms',
+    }
+    
+    # Ana sayfadaki "Yaklaşan Sınavlar" listesinde gösterilen sınav sayısı
+    UPCOMING_LIMIT = 5
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app 
@@ -55,6 +67,13 @@ class DashboardView(tk.Frame):
         )
         logout_btn.pack(pady=10)
         
+        self.search_box = GlobalSearchBox(
+            self.sidebar,
+            search=lambda term: self.controller.global_search(term, self.user_role),
+            on_select=self._on_search_result
+        )
+        self.search_box.pack(side='bottom', fill='x')
+        
         self.content_frame = tk.Frame(self, bg='#ecf0f1')
         self.content_frame.pack(side='right', fill='both', expand=True)
     
@@ -105,6 +124,22 @@ class DashboardView(tk.Frame):
         if self.current_view:
             self.current_view.pack(fill='both', expand=True)
     
+    def _on_search_result(self, result):
+        """Global arama sonucunu ilgili liste ekranında, arama kutusu doldurulmuş olarak açar."""
+        if self.user_role in ['admin', 'bolum_yetkilisi']:
+            key = self.SEARCH_RESULT_VIEWS.get(result.kind)
+        else:
+            key = 'schedule'
+        
+        if key is None:
+            detail = f"\n{result.detail}" if result.detail else ''
+            messagebox.showinfo('Arama Sonucu', f"{result.label}{detail}")
+            return
+        
+        self._on_menu_click(key, None)
+        if self.current_view is not None and hasattr(self.current_view, 'search_var'):
+            self.current_view.search_var.set(result.search_text or '')
+    
     def _show_home(self):
         if self.user_role == 'admin':
             self._show_admin_home()
@@ -361,16 +396,18 @@ class DashboardView(tk.Frame):
         exams_frame = tk.Frame(parent, bg='white', bd=1, relief='solid')
         exams_frame.pack(fill='x')
         
-        # Kullanıcı bazlı filtreleme
+        # Kullanıcı/bölüm filtresi ve ilk 5 kayıt sunucuda uygulanır
         if use_user_filter and self.user_info:
-            upcoming = self.controller.filter_schedule_by_user(self.user_info)
+            upcoming = self.controller.filter_schedule_by_user(
+                self.user_info, from_date=date.today(), limit=self.UPCOMING_LIMIT
+            )
+        elif department_filter:
+            upcoming = self.controller.filter_schedule_by_user(
+                {'role': 'bolum_yetkilisi', 'department_id': department_filter},
+                from_date=date.today(), limit=self.UPCOMING_LIMIT
+            )
         else:
             upcoming = self.controller.get_upcoming_exams(days=7)
-            
-            if department_filter:
-                all_courses = self.controller.get_all_courses()
-                dept_course_ids = [c.id for c in all_courses if c.department_id == department_filter]
-                upcoming = [e for e in upcoming if e.get('course_id') in dept_course_ids]
         
         if not upcoming:
             no_exam_label = tk.Label(
@@ -383,7 +420,7 @@ class DashboardView(tk.Frame):
             )
             no_exam_label.pack()
         else:
-            for exam in upcoming[:5]:
+            for exam in upcoming[:self.UPCOMING_LIMIT]:
                 exam_row = tk.Frame(exams_frame, bg='white', pady=8, padx=15)
                 exam_row.pack(fill='x', padx=1, pady=1)
                 
@@ -5,10 +5,10 @@ Exam Schedule View - Sınav Programı Görünümü
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import date, datetime, timedelta
-from src.views.base_crud_view import BaseCrudView
+from src.views.base_crud_view import PaginatedCrudView
 
 
-class ExamScheduleView(BaseCrudView):    
+class ExamScheduleView(PaginatedCrudView):    
     title = "📅 Sınav Programı"
     columns = [
         ('id', 'ID', 50),
@@ -151,6 +151,21 @@ class ExamScheduleView(BaseCrudView):
             bulk_delete_btn.pack(side='left', padx=5)
             self._add_button_hover(bulk_delete_btn, '#c0392b', '#e74c3c')
             
+            bulk_cancel_btn = tk.Button(
+                self.btn_frame,
+                text='⛔ Toplu İptal',
+                font=('Segoe UI', 10),
+                bg='#d35400',
+                fg='white',
+                bd=0,
+                padx=15,
+                pady=8,
+                cursor='hand2',
+                command=self._on_bulk_cancel
+            )
+            bulk_cancel_btn.pack(side='left', padx=5)
+            self._add_button_hover(bulk_cancel_btn, '#d35400', '#e67e22')
+            
             auto_btn = tk.Button(
                 self.btn_frame,
                 text='Otomatik Dağıt',
@@ -293,97 +308,47 @@ class ExamScheduleView(BaseCrudView):
             }
         ]
     
-    def load_data(self, search_term=''):
+    STATUS_MAP = {
+        'planned': 'Planlandı',
+        'confirmed': 'Onaylandı',
+        'completed': 'Tamamlandı',
+        'cancelled': 'İptal Edildi'
+    }
+    
+    def fetch_page(self, search_term, after):
         """
-        Kullanıcı rolüne göre sınav verilerini yükler.
+        Kullanıcı rolüne göre sınavların bir sayfasını getirir; rol filtresi ve
+        arama sunucuda uygulanır (bkz. DashboardController.get_exams_page).
         - Hoca: Kendi derslerinin sınavları
         - Öğrenci: Aldığı derslerin sınavları
         - Bölüm Yetkilisi: Kendi bölümünün sınavları
         - Admin: Tüm sınavlar
         """
-        # Kullanıcı bilgilerini al
-        user_info = self.dashboard.app.auth_controller.get_current_user()
-        
-        if self.user_role == 'ogrenci' and user_info:
-            # Öğrenci için kişiselleştirilmiş liste
-            exams_dict = self.controller.filter_schedule_by_user(user_info)
-            # Dict listesini ExamSchedule nesnelerine benzer bir yapıya çevir
-            exams = self._convert_dict_to_exam_objects(exams_dict)
-        elif self.user_role == 'hoca' and user_info:
-            # Hoca için kişiselleştirilmiş liste
-            exams_dict = self.controller.filter_schedule_by_user(user_info)
-            exams = self._convert_dict_to_exam_objects(exams_dict)
-        else:
-            # Admin ve Bölüm Yetkilisi için mevcut mantık
-            exams = self.controller.get_all_exams()
-            
-            if self.user_role == 'bolum_yetkilisi' and self.user_department_id:
-                all_courses = self.controller.get_all_courses()
-                dept_course_ids = [c.id for c in all_courses if c.department_id == self.user_department_id]
-                exams = [e for e in exams if e.course_id in dept_course_ids]
-        
-        status_map = {
-            'planned': 'Planlandı',
-            'confirmed': 'Onaylandı',
-            'completed': 'Tamamlandı',
-            'cancelled': 'İptal Edildi'
-        }
-        
-        data = []
-        for exam in exams:
-            classrooms_display = self._format_classrooms(exam)
-            row = {
-                'id': exam.id,
-                'exam_date': str(exam.exam_date),
-                'time': f"{exam.start_time} - {exam.end_time}",
-                'start_time': str(exam.start_time),
-                'end_time': str(exam.end_time),
-                'course_id': exam.course_id,
-                'course_code': exam.course_code or '-',
-                'course_name': exam.course_name or '-',
-                'lecturer_name': exam.lecturer_name or '-',
-                'classroom_id': exam.classroom_id,
-                'classroom_ids': [exam.classroom_id], 
-                'classrooms': classrooms_display,
-                'student_count': exam.student_count,
-                'exam_type': exam.exam_type,
-                'status': status_map.get(exam.status, exam.status),
-                'notes': exam.notes or ''
-            }
-            
-            if search_term:
-                searchable = f"{row['course_code']} {row['course_name']} {row['lecturer_name']} {row['classrooms']} {row['exam_date']}".lower()
-                if search_term not in searchable:
-                    continue
-            
-            data.append(row)
-        
-        self.data_table.load_data(data)
+        user_info = dict(self.dashboard.app.auth_controller.get_current_user() or {})
+        user_info.setdefault('role', self.user_role)
+        if self.user_role == 'bolum_yetkilisi' and self.user_department_id:
+            user_info['department_id'] = self.user_department_id
+        return self.controller.get_exams_page(user_info, after=after, search=search_term, limit=self.page_size)
     
-    def _convert_dict_to_exam_objects(self, exams_dict):
-        """
-        Dict formatındaki sınav listesini ExamSchedule benzeri nesnelere çevirir.
-        filter_schedule_by_user'dan gelen dict verileri işlemek için kullanılır.
-        """
-        class SimpleExam:
-            """Basit bir sınav sınıfı - ExamSchedule özelliklerini taşır"""
-            def __init__(self, data):
-                self.id = data.get('id')
-                self.exam_date = data.get('date')
-                self.start_time = data.get('start_time', data.get('time', ''))
-                self.end_time = data.get('end_time', '')
-                self.course_id = data.get('course_id')
-                self.course_code = data.get('course_code')
-                self.course_name = data.get('course_name')
-                self.lecturer_name = data.get('lecturer_name', data.get('lecturer', ''))
-                self.classroom_id = None
-                self.classroom_name = data.get('classroom_name', data.get('classroom', ''))
-                self.student_count = data.get('student_count', 0)
-                self.exam_type = data.get('exam_type', 'final')
-                self.status = data.get('status', 'planned')
-                self.notes = ''
-        
-        return [SimpleExam(exam) for exam in exams_dict]
+    def to_row(self, exam):
+        return {
+            'id': exam.id,
+            'exam_date': str(exam.exam_date),
+            'time': f"{exam.start_time} - {exam.end_time}",
+            'start_time': str(exam.start_time),
+            'end_time': str(exam.end_time),
+            'course_id': exam.course_id,
+            'course_code': exam.course_code or '-',
+            'course_name': exam.course_name or '-',
+            'lecturer_name': exam.lecturer_name or '-',
+            'classroom_id': exam.classroom_id,
+            'classroom_ids': [exam.classroom_id],
+            'classrooms': self._format_classrooms(exam),
+            'student_count': exam.student_count,
+            'exam_type': exam.exam_type,
+            'status': self.STATUS_MAP.get(exam.status, exam.status),
+            'notes': exam.notes or ''
+        }
     
     def validate_form(self, data):
         if not data.get('course_id'):
@@ -489,20 +454,13 @@ class ExamScheduleView(BaseCrudView):
         if not confirm:
             return
         
-        success_count = 0
-        failed_count = 0
+        result = self.controller.delete_exams(selected_ids)
+        success_count = len(result['ids'])
+        failed_count = count - success_count
         
-        for exam_id in selected_ids:
-            try:
-                result = self.controller.delete_exam(exam_id)
-                if result and result.get('success'):
-                    success_count += 1
-                else:
-                    failed_count += 1
-            except Exception:
-                failed_count += 1
-        
-        if failed_count == 0:
+        if not result['success']:
+            messagebox.showerror('Hata', result['message'])
+        elif failed_count == 0:
             messagebox.showinfo('Başarılı', f'{success_count} sınav başarıyla silindi.')
         else:
             messagebox.showwarning(
@@ -512,6 +470,33 @@ class ExamScheduleView(BaseCrudView):
         
         self.load_data()
     
+    def _on_bulk_cancel(self):
+        if self.user_role != 'admin':
+            messagebox.showwarning('Uyarı', 'Bu işlem için yetkiniz yok.')
+            return
+        
+        selected_ids = self.data_table.get_selected_ids()
+        
+        if not selected_ids:
+            messagebox.showwarning('Uyarı', 'Lütfen iptal etmek için en az bir kayıt seçin.')
+            return
+        
+        confirm = messagebox.askyesno(
+            'Toplu İptal Onayı',
+            f'{len(selected_ids)} adet sınavı iptal etmek istediğinize emin misiniz?'
+        )
+        
+        if not confirm:
+            return
+        
+        result = self.controller.update_exams_status(selected_ids, 'cancelled')
+        if result['success']:
+            messagebox.showinfo('Başarılı', result['message'])
+        else:
+            messagebox.showerror('Hata', result['message'])
+        
+        self.load_data()
+    
     def _on_auto_schedule(self):
         if self.user_role != 'admin':
             messagebox.showwarning('Uyarı', 'Bu işlem için yetkiniz yok.')
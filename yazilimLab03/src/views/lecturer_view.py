@@ -6,11 +6,11 @@ Lecturer View - Öğretim Üyesi Yönetimi Görünümü
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from src.views.base_crud_view import BaseCrudView
+from src.views.base_crud_view import PaginatedCrudView
 from src.models.lecturer import ALL_WEEKDAYS
 
 
-class LecturerView(BaseCrudView):
+class LecturerView(PaginatedCrudView):
     
     title = "👨‍🏫 Öğretim Üyesi Yönetimi"
     columns = [
@@ -89,40 +89,27 @@ class LecturerView(BaseCrudView):
             }
         ]
     
-    def load_data(self, search_term=''):
-        lecturers = self.controller.get_all_lecturers()
-        departments = {d.id: d.name for d in self.controller.get_all_departments()}
-        
+    def fetch_page(self, search_term, after):
+        department_id = None
         if self.user_role == 'bolum_yetkilisi' and self.user_department_id:
-            lecturers = [l for l in lecturers if l.department_id == self.user_department_id]
-        
-        data = []
-        for lecturer in lecturers:
-            full_name = f"{lecturer.first_name} {lecturer.last_name}"
-            
-            available_days_display = lecturer.available_days_display
-            
-            row = {
-                'id': lecturer.id,
-                'title': lecturer.title or '-',
-                'name': full_name,
-                'first_name': lecturer.first_name,
-                'last_name': lecturer.last_name,
-                'department_id': lecturer.department_id,
-                'department_name': departments.get(lecturer.department_id, '-'),
-                'email': lecturer.email or '-',
-                'available_days': available_days_display,
-                'available_days_list': lecturer.available_days  # Form düzenleme için
-            }
-            
-            if search_term:
-                searchable = f"{lecturer.title} {row['name']} {row['department_name']} {row['email']}".lower()
-                if search_term not in searchable:
-                    continue
-            
-            data.append(row)
-        
-        self.data_table.load_data(data)
+            department_id = self.user_department_id
+        return self.controller.get_lecturers_page(
+            after=after, search=search_term, department_id=department_id, limit=self.page_size
+        )
+    
+    def to_row(self, lecturer):
+        return {
+            'id': lecturer.id,
+            'title': lecturer.title or '-',
+            'name': f"{lecturer.first_name} {lecturer.last_name}",
+            'first_name': lecturer.first_name,
+            'last_name': lecturer.last_name,
+            'department_id': lecturer.department_id,
+            'department_name': lecturer.department_name or '-',
+            'email': lecturer.email or '-',
+            'available_days': lecturer.available_days_display,
+            'available_days_list': lecturer.available_days  # Form düzenleme için
+        }
     
     def validate_form(self, data):
         if not data.get('department_id'):
@@ -1,3 +1,4 @@
+import os
 import sys
 
 import unittest
@@ -16,8 +17,44 @@ for mod_name, mod_mock in sys_modules.items():
         sys.modules[mod_name] = mod_mock
 
 from src.models.course import Course
-from src.models.student import Student
+from src.models.student import Student, StudentCourse
 from src.models.classroom import Classroom
+from src.repositories.base_repository import _copy_text_value, ilike_pattern
+from src.controllers.dashboard_controller import DashboardController
+from src.repositories.query_cache import QueryCache, extract_read_tables, extract_write_tables
+from src.repositories.row_mapper import get_row_mapper
+from src.repositories.query_stats import QueryStats, normalize_sql, fingerprint, query_operation
+from src.repositories.exam_schedule_repository import (
+    ExamScheduleRepository, ExamConflictError, _raise_if_classroom_conflict, _period_params, pg_errors
+)
+from src.models.exam_schedule import ExamSchedule
+from src.repositories.reporting_repository import ReportingRepository
+from src.repositories.course_repository import CourseRepository
+from src.repositories.student_repository import StudentCourseRepository
+from src.repositories.classroom_repository import ClassroomRepository
+from src.repositories.query_cache import get_query_cache
+from src.repositories import schema_probe
+from src.repositories.search_repository import SearchRepository
+from src.services.search_service import SearchService
+from src.repositories.read_routing import reporting_query, is_reporting
+from src.repositories import base_repository
+from src.services.scheduler_snapshot import build_arrays, write_snapshot, load_snapshot, days_to_mask
+from src.utils.sheet_reader import iter_sheet_rows, normalize_header
+from src.utils.import_validation import validate_class_lists
+from src.utils import classroom_proximity_loader
+from src.utils.classroom_proximity_loader import ClassroomProximityLoader
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database', 'core'))
+import migrate
+
+# src.utils.student_importer yukarıda taklit edildiği için gerçek modül ayrı adla yüklenir
+import importlib.util
+_importer_spec = importlib.util.spec_from_file_location(
+    'student_importer_under_test',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'utils', 'student_importer.py')
+)
+student_importer = importlib.util.module_from_spec(_importer_spec)
+_importer_spec.loader.exec_module(student_importer)
 
 
 class TestModels(unittest.TestCase):
@@ -212,6 +249,782 @@ class TestDateLogic(unittest.TestCase):
         self.assertEqual(len(weekdays), 0, "Hafta sonu olmamalı")
 
 
+class TestBulkCopyEncoding(unittest.TestCase):
+
+    def test_null_and_bool_encoding(self):
+        self.assertEqual(_copy_text_value(None), '\\N')
+        self.assertEqual(_copy_text_value(True), 't')
+        self.assertEqual(_copy_text_value(False), 'f')
+
+    def test_special_characters_escaped(self):
+        self.assertEqual(_copy_text_value("a\tb\nc"), "a\\tb\\nc")
+        self.assertEqual(_copy_text_value("C:\\yol"), "C:\\\\yol")
+
+    def test_date_and_time_values(self):
+        self.assertEqual(_copy_text_value(date(2025, 1, 20)), '2025-01-20')
+        self.assertEqual(_copy_text_value(time(9, 30)), '09:30:00')
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def test_table_extraction(self):
+        query = "SELECT * FROM classrooms c JOIN faculties f ON c.faculty_id = f.id"
+        self.assertEqual(extract_read_tables(query), ('classrooms', 'faculties'))
+        upsert = "INSERT INTO students (x) VALUES (%s) ON CONFLICT (x) DO UPDATE SET x = 1"
+        self.assertEqual(extract_write_tables(upsert), ('students',))
+
+    def test_hit_miss_and_lru_eviction(self):
+        cache = QueryCache(max_entries=2, max_rows_per_entry=10, enabled=True)
+        k1 = cache.make_key("SELECT * FROM faculties WHERE id = %s", (1,))
+        k2 = cache.make_key("SELECT * FROM faculties WHERE id = %s", (2,))
+        k3 = cache.make_key("SELECT * FROM faculties WHERE id = %s", (3,))
+        self.assertIsNone(cache.get(k1))
+        cache.put(k1, [(1,)], ['id'])
+        cache.put(k2, [(2,)], ['id'])
+        self.assertEqual(cache.get(k1), ([(1,)], ['id']))
+        cache.put(k3, [(3,)], ['id'])
+        self.assertIsNone(cache.get(k2), "En eski kullanılan kayıt atılmalı")
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_version_bump_invalidates_dependents(self):
+        cache = QueryCache(max_entries=10, max_rows_per_entry=10, enabled=True)
+        query = "SELECT * FROM classrooms WHERE id = %s"
+        cache.put(cache.make_key(query, (5,)), [(5,)], ['id'])
+        cache.bump(['faculties'])
+        self.assertIsNone(cache.get(cache.make_key(query, (5,))))
+
+    def test_large_results_not_cached(self):
+        cache = QueryCache(max_entries=10, max_rows_per_entry=1, enabled=True)
+        key = cache.make_key("SELECT * FROM lecturers", None)
+        cache.put(key, [(1,), (2,)], ['id'])
+        self.assertIsNone(cache.get(key))
+
+    def test_volatile_tables_not_cached(self):
+        cache = QueryCache(max_entries=10, max_rows_per_entry=10, enabled=True)
+        self.assertIsNone(cache.make_key(
+            "SELECT c.id FROM classrooms c WHERE NOT EXISTS (SELECT 1 FROM exam_schedule e WHERE e.classroom_id = c.id)"
+        ))
+        self.assertIsNone(cache.make_key("SELECT * FROM students WHERE student_number ILIKE %s", ('%a%',)))
+        self.assertIsNotNone(cache.make_key("SELECT * FROM classrooms"))
+
+    def test_entries_expire_after_ttl(self):
+        cache = QueryCache(max_entries=10, max_rows_per_entry=10, enabled=True, ttl_seconds=30)
+        key = cache.make_key("SELECT * FROM faculties")
+        with patch('src.repositories.query_cache.time.monotonic', side_effect=[100.0, 120.0, 131.0]):
+            cache.put(key, [(1,)], ['id'])
+            self.assertEqual(cache.get(key), ([(1,)], ['id']))
+            self.assertIsNone(cache.get(key), "Başka süreçlerin yazmaları TTL sonunda görülmeli")
+        self.assertEqual(cache.stats()['expirations'], 1)
+
+
+class TestRowMapper(unittest.TestCase):
+
+    def test_mapper_matches_from_dict(self):
+        columns = ['id', 'code', 'semester', 'period', 'course_type', 'exam_type',
+                   'has_exam', 'required_room_type', 'created_at', 'updated_at']
+        row = (7, 'BLM101', 1, 2, 'mandatory', None, None, 'lab',
+               datetime(2025, 1, 1), datetime(2025, 1, 1))
+        mapped = get_row_mapper(Course, columns)(row)
+        self.assertEqual(mapped, Course.from_dict(dict(zip(columns, row))))
+        self.assertEqual(mapped.required_room_type, 'LAB')
+
+    def test_missing_columns_use_defaults_without_timestamps(self):
+        classroom = get_row_mapper(Classroom, ['id', 'name', 'room_type'])((3, 'D101', None))
+        self.assertEqual(classroom.capacity, 0)
+        self.assertEqual(classroom.room_type, 'STANDART')
+        self.assertIsNone(classroom.created_at)
+
+    def test_mapper_cached_per_shape(self):
+        columns = ['id', 'student_number']
+        self.assertIs(get_row_mapper(Student, columns), get_row_mapper(Student, list(columns)))
+        self.assertFalse(hasattr(Student(), '__dict__'))
+
+
+class TestQueryStats(unittest.TestCase):
+
+    def test_fingerprint_ignores_literals_and_in_lists(self):
+        a = "SELECT * FROM students WHERE id IN (%s, %s, %s) AND name = 'Ali'"
+        b = "select *  from students\n WHERE id IN (%s) AND name = 'Veli'"
+        self.assertEqual(normalize_sql(a), "select * from students where id in (?) and name = ?")
+        self.assertEqual(fingerprint(a), fingerprint(b))
+
+    def test_n_plus_one_detected_within_operation(self):
+        stats = QueryStats(slow_query_ms=10_000, n_plus_one_threshold=3, top_n=5, enabled=True)
+        with query_operation('test.islem'):
+            for i in range(5):
+                stats.record("SELECT * FROM classrooms WHERE id = %s", 1.0, 1)
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot['operations']['test.islem']['queries'], 5)
+        self.assertEqual(len(snapshot['n_plus_one']), 1)
+
+    def test_top_slowest_ordering(self):
+        stats = QueryStats(slow_query_ms=10_000, n_plus_one_threshold=100, top_n=2, enabled=True)
+        for ms in (5.0, 50.0, 1.0, 20.0):
+            stats.record(f"SELECT {ms} FROM courses", ms, 0)
+        self.assertEqual([s['elapsed_ms'] for s in stats.top_slowest()], [50.0, 20.0])
+
+
+class TestExamConflictTranslation(unittest.TestCase):
+
+    def _exclusion_error(self, constraint):
+        error_cls = type('FakeExclusion', (pg_errors.ExclusionViolation,), {
+            'diag': Mock(constraint_name=constraint)
+        })
+        return error_cls("conflicting key value violates exclusion constraint")
+
+    def test_classroom_overlap_raises_conflict_error(self):
+        exam = ExamSchedule(course_id=1, classroom_id=7, exam_date=date(2025, 1, 20),
+                            start_time=time(9, 0), end_time=time(10, 0))
+        with self.assertRaises(ExamConflictError) as ctx:
+            _raise_if_classroom_conflict(self._exclusion_error('exam_schedule_no_classroom_overlap'), exam)
+        self.assertEqual(ctx.exception.classroom_id, 7)
+
+    def test_other_errors_are_ignored(self):
+        _raise_if_classroom_conflict(self._exclusion_error('baska_kisit'))
+        _raise_if_classroom_conflict(ValueError("x"))
+
+    def test_bulk_upsert_overlap_raises_conflict_error(self):
+        repo = ExamScheduleRepository()
+        repo._execute_copy_merge = MagicMock(side_effect=self._exclusion_error('exam_schedule_no_classroom_overlap'))
+        exam = ExamSchedule(course_id=1, classroom_id=7, exam_date=date(2025, 1, 20),
+                            start_time=time(9, 0), end_time=time(10, 0))
+        with self.assertRaises(ExamConflictError):
+            repo.bulk_upsert([exam])
+
+    def test_period_params_order(self):
+        d = date(2025, 1, 20)
+        self.assertEqual(_period_params(d, '09:00', '10:30'), (d, '09:00', d, '10:30'))
+
+
+class TestBulkExamOperations(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = ExamScheduleRepository()
+        self.repo._execute_returning = MagicMock(return_value=[(3,), (5,)])
+
+    def test_delete_by_filter_requires_filter(self):
+        with self.assertRaises(ValueError):
+            self.repo.delete_by_filter()
+        self.assertEqual(self.repo.delete_by_filter(ids=[]), [])
+
+    def test_delete_by_filter_combines_conditions(self):
+        d = date(2025, 1, 20)
+        deleted = self.repo.delete_by_filter(ids=['3', 5], status='planned', start_date=d, end_date=d)
+        query, params = self.repo._execute_returning.call_args[0]
+        self.assertEqual(deleted, [3, 5])
+        self.assertIn("RETURNING id", query)
+        self.assertEqual(params, ([3, 5], 'planned', d, d))
+
+    def test_update_status_skips_empty_ids(self):
+        self.assertEqual(self.repo.update_status_by_ids([], 'cancelled'), [])
+        self.repo._execute_returning.assert_not_called()
+
+
+class TestScheduleRows(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = ExamScheduleRepository()
+        self.repo._execute_query = MagicMock(return_value=([(7, 'C1', date(2025, 1, 20))], ['id', 'course_code', 'date']))
+
+    def test_role_scope_and_limit_in_single_query(self):
+        d = date(2025, 1, 20)
+        rows = self.repo.get_schedule_rows(student_id=9, include_cancelled=False, from_date=d, limit=5)
+        query, params = self.repo._execute_query.call_args[0]
+        self.repo._execute_query.assert_called_once()
+        self.assertIn("sc.student_id = %s", query)
+        self.assertIn("es.status != 'cancelled'", query)
+        self.assertTrue(query.rstrip().endswith("LIMIT %s"))
+        self.assertEqual(params, (9, d, 5))
+        self.assertEqual(rows, [{'id': 7, 'course_code': 'C1', 'date': d}])
+
+    def test_admin_scope_has_no_where(self):
+        self.repo.get_schedule_rows()
+        query, params = self.repo._execute_query.call_args[0]
+        self.assertNotIn("WHERE", query)
+        self.assertEqual(params, ())
+
+
+class TestExamScope(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = DashboardController.__new__(DashboardController)
+        self.controller.exam_service = MagicMock()
+
+    def test_unscoped_roles_see_nothing(self):
+        for user_info in ({'role': 'misafir'}, {'role': ''}, None,
+                          {'role': 'department_head', 'department_id': None}):
+            self.assertEqual(self.controller.filter_schedule_by_user(user_info), [])
+            self.assertEqual(self.controller.get_exams_page(user_info).items, [])
+        self.controller.exam_service.get_schedule_rows.assert_not_called()
+        self.controller.exam_service.get_page.assert_not_called()
+
+    def test_admin_is_unfiltered(self):
+        self.controller.filter_schedule_by_user({'role': 'admin'})
+        self.assertEqual(self.controller.exam_service.get_schedule_rows.call_args[1],
+                         {'from_date': None, 'limit': None})
+
+
+class TestStudentCountRefresh(unittest.TestCase):
+
+    def test_refresh_runs_in_callers_transaction(self):
+        repo = CourseRepository()
+        conn = MagicMock()
+        conn.cursor.return_value.fetchall.return_value = [(4, 61)]
+        self.assertEqual(repo.refresh_student_counts(['4'], conn=conn), {4: 61})
+        query, params = conn.cursor.return_value.execute.call_args[0]
+        self.assertIn("COUNT(*)", query)
+        self.assertEqual(params, ([4],))
+        conn.commit.assert_not_called()
+        self.assertEqual(repo.refresh_student_counts([]), {})
+
+    def test_cache_invalidated_after_transaction_commit(self):
+        repo = CourseRepository()
+        conn = MagicMock()
+        conn.cursor.return_value.fetchall.return_value = [(4, 61)]
+        with patch.object(base_repository, 'get_connection', return_value=conn), \
+                patch.object(base_repository, 'release_connection'), \
+                patch.object(get_query_cache(), 'bump') as bump:
+            with repo.transaction() as tx:
+                repo.refresh_student_counts([4], conn=tx.connection)
+                bump.assert_not_called()
+            conn.commit.assert_called_once()
+            self.assertIn('courses', bump.call_args[0][0])
+
+    def test_savepoint_rolls_back_only_failed_step(self):
+        conn = MagicMock()
+        tx = base_repository.TransactionContext(conn)
+        with tx.savepoint('class_list'):
+            pass
+        with self.assertRaises(ValueError):
+            with tx.savepoint('class_list'):
+                raise ValueError("bozuk liste")
+        statements = [c[0][0] for c in conn.cursor.return_value.__enter__.return_value.execute.call_args_list]
+        self.assertEqual(statements, [
+            "SAVEPOINT class_list", "RELEASE SAVEPOINT class_list",
+            "SAVEPOINT class_list", "ROLLBACK TO SAVEPOINT class_list",
+        ])
+        conn.rollback.assert_not_called()
+
+
+class TestEnrollmentSync(unittest.TestCase):
+
+    def test_sync_stages_unique_pairs_and_returns_diff(self):
+        repo = StudentCourseRepository()
+        repo._execute_copy_merge = MagicMock(return_value=[(2, 5)])
+        conn = MagicMock()
+        pairs = [StudentCourse(student_id=1, course_id=4), StudentCourse(student_id=1, course_id=4),
+                 StudentCourse(student_id=2, course_id=4), StudentCourse(student_id=None, course_id=4)]
+        self.assertEqual(repo.sync_enrollments(pairs, conn=conn), (2, 5))
+        columns, rows, query = repo._execute_copy_merge.call_args[0]
+        self.assertEqual(len(rows), 2)
+        self.assertIn("SET is_active = FALSE", query)
+        self.assertIs(repo._execute_copy_merge.call_args[1]['conn'], conn)
+        self.assertEqual(repo.sync_enrollments([]), (0, 0))
+
+    def test_sync_keeps_enrollments_of_failed_rows(self):
+        repo = StudentCourseRepository()
+        repo._execute_copy_merge = MagicMock(return_value=[(1, 0)])
+        repo.sync_enrollments([StudentCourse(student_id=1, course_id=4)], keep={('2021001', 4)})
+        self.assertEqual(repo._execute_copy_merge.call_args[1]['params'], (['2021001'], [4]))
+
+
+
+class TestCapacityUpsert(unittest.TestCase):
+
+    def test_upsert_stages_unique_names_and_returns_diff(self):
+        repo = ClassroomRepository()
+        repo._check_block_column_exists = MagicMock(return_value=False)
+        repo._execute_copy_merge = MagicMock(return_value=[(1, 1, 1)])
+        rooms = [Classroom(name='A101', capacity=40), Classroom(name='A101', capacity=45),
+                 Classroom(name='B201', capacity=30), Classroom(name='C301', capacity=20)]
+        self.assertEqual(repo.bulk_upsert_capacities(rooms), (1, 1, 1))
+        columns, rows, query = repo._execute_copy_merge.call_args[0]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0][columns.index('capacity')], 45)
+        self.assertNotIn('block', columns)
+        self.assertIn("IS DISTINCT FROM", query)
+        self.assertEqual(repo.bulk_upsert_capacities([]), (0, 0, 0))
+
+    def test_get_ids_by_names_reads_without_invalidating_cache(self):
+        repo = ClassroomRepository()
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__.return_value.fetchall.return_value = [('A101', 7)]
+        with patch.object(repo, '_invalidate_cache') as invalidate:
+            self.assertEqual(repo.get_ids_by_names(['A101'], conn=conn), {'A101': 7})
+        invalidate.assert_not_called()
+        conn.commit.assert_not_called()
+
+
+class TestProximityCache(unittest.TestCase):
+
+    def test_graph_round_trips_through_hash_keyed_cache(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.object(classroom_proximity_loader, 'PROXIMITY_CACHE_DIR', directory):
+            loader = ClassroomProximityLoader()
+            self.assertFalse(loader.is_loaded())
+            loader._add_proximity_pair('M101', 'M201', 0.25)
+            loader._add_classroom_data('S', 'S101', 'M101,AMFİA')
+            source = os.path.join(directory, 'DerslikYakinlik.xlsx')
+            loader._write_cache(source, 'a' * 64)
+
+            cached = ClassroomProximityLoader()
+            self.assertTrue(cached._read_cache(loader._get_cache_path(source, 'a' * 64), 'a' * 64))
+            self.assertEqual(set(cached.get_neighbors('M101')), {'M201', 'S101'})
+            self.assertEqual(cached.get_classrooms_in_block('S'), ['S101', 'AMFİA'])
+            self.assertEqual(cached.get_block('M201'), 'M')
+            self.assertEqual(cached._classroom_graph['M201'].distances, {'M101': 0.25})
+            self.assertAlmostEqual(cached.get_distance('M201', 'AMFİA'), 2.25)
+            self.assertFalse(ClassroomProximityLoader()._read_cache(
+                loader._get_cache_path(source, 'a' * 64), 'b' * 64))
+
+    def test_closest_classrooms_follow_shortest_paths_then_block(self):
+        loader = ClassroomProximityLoader()
+        loader._loaded = True
+        loader._add_proximity_pair('M101', 'M102', 3.0)
+        loader._add_proximity_pair('M101', 'S101', 1.0)
+        loader._add_proximity_pair('S101', 'M102', 1.0)
+        loader._add_proximity_pair('M103', 'D101', 1.0)
+        loader._add_proximity_pair('D102', 'D103', 1.0)
+        self.assertEqual(loader.get_distance('M101', 'M102'), 2.0)
+        self.assertEqual(loader.get_distance('M101', 'D101'), float('inf'))
+        self.assertEqual(
+            loader.get_closest_classrooms('M101', ['D102', 'D101', 'M102', 'X1', 'M103', 'S101'], limit=5),
+            ['S101', 'M102', 'M103', 'D102', 'D101']
+        )
+
+    def test_excel_weights_use_one_unit(self):
+        rows = [('Derslik 1', 'Derslik 2', 'Mesafe (km)', 'Yakınlık Derecesi'),
+                ('M101', 'M102', 0.2, 1), ('M102', 'M103', 0.6, 3), ('M103', 'M104', None, 2),
+                ('M101', 'M104', None, 3)]
+        loader = ClassroomProximityLoader()
+        with patch.object(classroom_proximity_loader, 'iter_sheet_rows', return_value=iter(rows)):
+            loader._load_from_excel()
+        # km/derece medyanı 0.2: derece 2 -> 0.4 km, derece 3 -> 0.6 km
+        self.assertAlmostEqual(loader._classroom_graph['M103'].distances['M104'], 0.4)
+        self.assertAlmostEqual(loader.get_distance('M101', 'M104'), 0.6)
+
+
+class TestImportValidation(unittest.TestCase):
+
+    @staticmethod
+    def class_list(filename, code, rows, error=None, rejected=()):
+        students = [{'student_number': n, 'first_name': f, 'last_name': l} for n, f, l in rows]
+        return Mock(filename=filename, course_code=code, students=students, error=error,
+                    rejected_rows=list(rejected))
+
+    def test_batch_checks_block_on_errors_and_report_warnings(self):
+        report = validate_class_lists([
+            self.class_list('a.xls', 'BLM111', [('220201001', 'Ali', 'Veli'), ('220201001', 'Ali', 'Veli'),
+                                                ('220201002', 'Ayşe', 'Kaya')], rejected=[('22A01', 'Can')]),
+            self.class_list('b.xls', 'BLM112', [('220201002', 'AYSE', 'KAYA'), ('22020100', 'Eda', '-')]),
+            self.class_list('c.xls', 'BLM999', [('220201001', 'Ali', 'Yılmaz')]),
+            self.class_list('d.xls', 'BLM113', [], error='bozuk dosya'),
+        ], ['BLM111', 'BLM112', 'BLM113'])
+        self.assertEqual((report.student_rows, report.unique_students), (6, 3))
+        self.assertEqual(report.unknown_course_codes, {'BLM999': ['c.xls']})
+        self.assertEqual(report.conflicting_names, {'220201001': ['ali veli', 'ali yilmaz']})
+        self.assertEqual(report.duplicate_rows, {'a.xls': ['220201001']})
+        self.assertEqual(report.number_anomalies, {'b.xls': ['22020100']})
+        self.assertEqual(list(report.failed_files), ['d.xls'])
+        self.assertEqual(len(report.warnings), 3)
+        self.assertFalse(report.is_valid)
+
+
+class TestStagedImport(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'Liste[BLM111].xls')
+        open(self.path, 'wb').close()
+        self.importer = student_importer.StudentImporter.__new__(student_importer.StudentImporter)
+        for repo in ('student_repo', 'student_course_repo', 'course_repo', 'lecturer_repo', 'manifest_repo'):
+            setattr(self.importer, repo, MagicMock())
+        self.importer.course_repo.get_all.return_value = [Course(id=4, code='BLM111', department_id=2)]
+        self.importer.student_repo.bulk_upsert.return_value = {'220201001': 11}
+        self.importer._list_class_list_files = MagicMock(return_value=([self.path], ['BLM111']))
+        self.importer._update_courses_with_lecturers = MagicMock()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def stage(self, code, **kwargs):
+        parsed = student_importer.ParsedClassList(
+            'Liste[BLM111].xls', self.path, code,
+            [{'student_number': '220201001', 'first_name': 'Ali', 'last_name': 'Veli'}], content_hash='ab'
+        )
+        self.importer._parse_class_lists = MagicMock(return_value=[parsed])
+        return self.importer.import_staged(self.directory.name, **kwargs)
+
+    def assert_nothing_written(self):
+        self.importer.student_repo.transaction.assert_not_called()
+        self.importer.student_repo.bulk_upsert.assert_not_called()
+        self.importer.student_course_repo.bulk_upsert.assert_not_called()
+        self.importer.manifest_repo.bulk_upsert.assert_not_called()
+
+    def test_dry_run_writes_nothing(self):
+        result, report = self.stage('BLM111', dry_run=True)
+        self.assertTrue(result.success and report.is_valid)
+        self.assert_nothing_written()
+
+    def test_failed_validation_writes_nothing(self):
+        result, report = self.stage('BLM999')
+        self.assertFalse(result.success or report.is_valid)
+        self.assert_nothing_written()
+
+    def test_manifest_written_in_data_transaction(self):
+        result, _ = self.stage('BLM111', semester='2024-2025 Güz')
+        self.assertTrue(result.success)
+        self.importer.student_repo.transaction.assert_called_once()
+        tx = self.importer.student_repo.transaction.return_value.__enter__.return_value
+        [entry], = self.importer.manifest_repo.bulk_upsert.call_args[0]
+        self.assertIs(self.importer.manifest_repo.bulk_upsert.call_args[1]['conn'], tx.connection)
+        self.assertEqual((entry.course_id, entry.enrollment_count, entry.content_hash), (4, 1, 'ab'))
+
+
+class TestEnrollmentFeed(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.TemporaryDirectory()
+        self.importer = student_importer.StudentImporter.__new__(student_importer.StudentImporter)
+        for repo in ('student_repo', 'student_course_repo', 'course_repo'):
+            setattr(self.importer, repo, MagicMock())
+        self.importer.course_repo.get_all.return_value = [
+            Course(id=4, code='BLM111', department_id=2), Course(id=5, code='BLM112', department_id=2)
+        ]
+        self.importer.student_repo.bulk_upsert.side_effect = lambda students, conn=None: {
+            s.student_number: int(s.student_number[-2:]) for s in students
+        }
+        self.tx = self.importer.student_repo.transaction.return_value.__enter__.return_value
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def feed(self, lines, chunk_rows):
+        path = os.path.join(self.directory.name, 'kayitlar.csv')
+        with open(path, 'w', encoding='utf-8') as fh:
+            fh.write('\n'.join(lines) + '\n')
+        return self.importer.import_enrollment_feed(path, semester='2024-2025 Güz', chunk_rows=chunk_rows)
+
+    def test_chunks_are_upserted_in_one_transaction(self):
+        result = self.feed([
+            'ogrenci_no,ad_soyad,ders_kodu',
+            '220201001,Ali Veli,BLM111', '220201002,Ayşe Kaya,blm111',
+            '220201001,Ali Veli,BLM112', 'x,Geçersiz,BLM111', '220201003,Can Er,BLM112',
+        ], chunk_rows=2)
+        self.assertTrue(result.success)
+        self.assertEqual((result.students_imported, result.student_courses_created), (3, 4))
+        self.assertEqual(self.importer.student_repo.bulk_upsert.call_count, 3)
+        enrollments = {(sc.student_id, sc.course_id)
+                       for c in self.importer.student_course_repo.bulk_upsert.call_args_list for sc in c[0][0]}
+        self.assertEqual(enrollments, {(1, 4), (2, 4), (1, 5), (3, 5)})
+        self.assertEqual(sorted(self.importer.course_repo.refresh_student_counts.call_args[0][0]), [4, 5])
+        self.importer.student_repo.transaction.assert_called_once()
+        self.assertEqual(len(result.warnings), 1)
+
+    def test_unknown_course_code_fails_without_writing(self):
+        result = self.feed([
+            'ogrenci_no,ad_soyad,ders_kodu',
+            '220201001,Ali Veli,BLM111', '220201002,Ayşe Kaya,BLM111',
+            '220201003,Can Er,BLM999', '220201004,Eda Su,BLM111', '220201005,Naz Ak,MAT101',
+        ], chunk_rows=2)
+        self.assertFalse(result.success)
+        self.assertEqual(result.errors, ['Bilinmeyen ders kodu BLM999: 1 satır', 'Bilinmeyen ders kodu MAT101: 1 satır'])
+        # İlk parça yazılmış olsa da transaction geri alınır; sonraki parçalar hiç yazılmaz
+        self.assertEqual(self.importer.student_repo.bulk_upsert.call_count, 1)
+        self.tx.rollback.assert_called_once()
+        self.importer.course_repo.refresh_student_counts.assert_not_called()
+
+    def test_course_column_is_hidden_from_name_heuristics(self):
+        indices, course_col = self.importer._feed_column_indices(['ogr. no', 'adi soyadi', 'ders no'])
+        self.assertEqual(course_col, 2)
+        self.assertEqual((indices['student_number'], indices['full_name']), (0, 1))
+        indices, course_col = self.importer._feed_column_indices(['student number', 'first name', 'last name', 'kod'])
+        self.assertEqual((indices['student_number'], indices['first_name'], indices['last_name'], course_col),
+                         (0, 1, 2, 3))
+
+
+class TestReportingViews(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = ReportingRepository()
+        self.repo._refresh_view = MagicMock()
+        self.tables = {'faculties': 3, 'departments': 5}
+        self.views = {'mv_faculty_department_counts': 8}
+        self.repo._source_state = MagicMock(side_effect=lambda: (self.tables, self.views))
+
+    def test_refresh_only_when_source_tables_change(self):
+        self.assertEqual(self.repo.refresh_if_stale(('mv_faculty_department_counts',)), [])
+        self.tables['departments'] += 1   # başka bir süreçten gelen yazma
+        self.assertEqual(self.repo.refresh_if_stale(('mv_faculty_department_counts',)),
+                         ['mv_faculty_department_counts'])
+        self.assertTrue(self.repo.is_stale('mv_dashboard_counts'), "Hiç yenilenmemiş view bayattır")
+        self.repo._refresh_view.assert_called_once_with('mv_faculty_department_counts', ' CONCURRENTLY')
+
+    def test_reads_refresh_stale_views_in_background(self):
+        self.tables['departments'] += 1
+        self.repo._execute_query = MagicMock(return_value=([], ['faculty_name', 'department_count', 'code']))
+        conn = MagicMock()
+        with patch('src.repositories.reporting_repository.psycopg2.connect', return_value=conn), \
+                patch('src.repositories.reporting_repository.threading.Thread') as thread:
+            self.assertEqual(self.repo.get_faculty_distribution(), [])
+            self.repo._refresh_view.assert_not_called()
+            target, args = thread.call_args[1]['target'], thread.call_args[1]['args']
+            target(*args)
+        self.repo._refresh_view.assert_called_once_with('mv_faculty_department_counts', ' CONCURRENTLY', conn=conn)
+        conn.close.assert_called_once()
+        self.assertFalse(ReportingRepository._refresh_lock.locked())
+
+    def test_read_only_api(self):
+        self.assertFalse(hasattr(self.repo, 'delete'))
+        self.assertFalse(hasattr(self.repo, '_entity_to_values'))
+
+    def test_schedule_statistics_aggregates_view_rows(self):
+        self.repo.refresh_in_background = MagicMock(return_value=None)
+        self.repo._execute_query = MagicMock(return_value=([
+            (date(2025, 1, 20), 'A101', 'Bilgisayar', 'planned', 3),
+            (date(2025, 1, 20), None, 'Bilgisayar', 'cancelled', 1),
+        ], ['exam_date', 'classroom_name', 'department_name', 'status', 'exam_count']))
+        stats = self.repo.get_schedule_statistics()
+        self.assertEqual((stats['total'], stats['planned'], stats['cancelled']), (4, 3, 1))
+        self.assertEqual(stats['by_date'], {'2025-01-20': 4})
+        self.assertEqual(stats['by_classroom'], {'A101': 3, 'unknown': 1})
+
+
+class TestSchemaProbe(unittest.TestCase):
+
+    def tearDown(self):
+        schema_probe.reset_schema_probe()
+
+    def test_columns_loaded_once_per_process(self):
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [('classrooms', 'id'), ('classrooms', 'block'), ('courses', 'id')]
+        conn = MagicMock()
+        conn.cursor.return_value = cursor
+        schema_probe.reset_schema_probe()
+        with patch.object(schema_probe, 'get_connection', return_value=conn), \
+                patch.object(schema_probe, 'release_connection'):
+            self.assertTrue(schema_probe.has_column('classrooms', 'block'))
+            self.assertFalse(schema_probe.has_column('courses', 'block'))
+            self.assertFalse(schema_probe.has_column('yok', 'id'))
+        self.assertEqual(cursor.execute.call_count, 1)
+
+
+class TestMigrationRunner(unittest.TestCase):
+
+    def test_split_keeps_quoted_and_dollar_blocks(self):
+        text = (
+            "DO $$ BEGIN PERFORM 1; END $$;\n"
+            "-- yorum; ayırıcı değil\n"
+            "SELECT 'a;b';\n"
+            "/* sadece yorum */;\n"
+        )
+        statements = migrate.split_sql_statements(text)
+        self.assertEqual(len(statements), 2)
+        self.assertEqual(statements[0], "DO $$ BEGIN PERFORM 1; END $$")
+        self.assertTrue(statements[1].endswith("SELECT 'a;b'"))
+
+    def test_discover_orders_by_version_and_reads_directive(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            files = {
+                '010_b.sql': "SELECT 1;",
+                '002_a.sql': "-- migrate:no-transaction\nCREATE INDEX CONCURRENTLY x ON t (a);",
+                'notlar.txt': "",
+            }
+            for name, content in files.items():
+                with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+                    f.write(content)
+            migrations = migrate.discover_migrations(directory)
+        self.assertEqual([m.version for m in migrations], ['002', '010'])
+        self.assertFalse(migrations[0].transactional)
+        self.assertTrue(migrations[1].transactional)
+
+    def test_deferred_migration_stays_pending(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            files = {
+                '001_a.py': "def upgrade(ctx):\n    ctx.defer('eklenti yok')\n",
+                '002_b.sql': "SELECT 1;",
+            }
+            for name, content in files.items():
+                with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+                    f.write(content)
+            conn = MagicMock()
+            conn.cursor.return_value.fetchall.return_value = []
+            applied = migrate.run_migrations(conn, out=lambda message: None, directory=directory)
+        self.assertEqual(applied, ['002_b.sql'])
+        recorded = [c[0][1][0] for c in conn.cursor.return_value.execute.call_args_list
+                    if 'INSERT INTO schema_version' in c[0][0]]
+        self.assertEqual(recorded, ['002'])
+
+
+
+class TestKeysetPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = ExamScheduleRepository()
+        columns = ['id', 'exam_date', 'start_time']
+        rows = [(i, date(2025, 1, 20), time(9, 0)) for i in (4, 7, 9)]
+        self.repo._execute_query = MagicMock(return_value=(rows, columns))
+
+    def test_next_cursor_from_extra_row(self):
+        cursor = (date(2025, 1, 20), time(8, 0), 2)
+        page = self.repo.get_page(after=cursor, limit=2, department_id=3)
+        query, params = self.repo._execute_query.call_args[0]
+        self.assertIn("(es.exam_date, es.start_time, es.id) > (%s, %s, %s)", query)
+        self.assertEqual(params, (3,) + cursor + (3,))
+        self.assertEqual([e.id for e in page.items], [4, 7])
+        self.assertEqual(page.next_cursor, (date(2025, 1, 20), time(9, 0), 7))
+
+    def test_last_page_has_no_cursor(self):
+        page = self.repo.get_page(limit=3)
+        self.assertFalse(page.has_more)
+
+    def test_ilike_pattern_escapes_wildcards(self):
+        self.assertEqual(ilike_pattern('100%_a'), '%100\\%\\_a%')
+
+
+
+class TestGlobalSearch(unittest.TestCase):
+
+    def test_branch_params_follow_placeholders(self):
+        for use_trigram in (True, False):
+            query, params = SearchRepository._branch('student', 'ali', use_trigram, 20)
+            self.assertEqual(query.replace('%%', '').count('%s'), len(params))
+            self.assertEqual(params[-1], 20)
+            self.assertIn("'student' AS kind", query)
+        self.assertIn("similarity(", SearchRepository._branch('course', 'ali', True, 5)[0])
+
+    @patch('src.repositories.search_repository.has_extension', return_value=False)
+    def test_search_unions_requested_kinds(self, _):
+        repo = SearchRepository()
+        repo._execute_query = MagicMock(return_value=([('course', 1, 'MAT101 - Matematik', None, 'MAT101', 1.0)],
+                                                      ['kind', 'id', 'label', 'detail', 'search_text', 'score']))
+        results = repo.search(' mat ', kinds=['course', 'classroom'])
+        query, params = repo._execute_query.call_args[0]
+        self.assertEqual(query.count('UNION ALL'), 1)
+        self.assertEqual(results[0].search_text, 'MAT101')
+        with self.assertRaises(ValueError):
+            repo.search('mat', kinds=['bilinmeyen'])
+
+    def test_short_terms_are_not_searched(self):
+        service = SearchService()
+        service.repository.search = MagicMock()
+        self.assertEqual(service.search_for_role('m', 'admin'), [])
+        service.repository.search.assert_not_called()
+
+
+class TestReadRouting(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = ReportingRepository()
+        self.replica = MagicMock()
+        self.primary = MagicMock()
+        self.primary.cursor.return_value.description = [('n',)]
+        self.primary.cursor.return_value.fetchall.return_value = [(1,)]
+
+    def test_reporting_query_sets_context(self):
+        self.assertEqual(reporting_query(is_reporting)(), True)
+        self.assertFalse(is_reporting())
+
+    def test_reporting_reads_fall_back_to_primary(self):
+        self.replica.cursor.return_value.execute.side_effect = base_repository.psycopg2.OperationalError('down')
+        with patch.object(base_repository, 'get_read_connection', side_effect=[self.replica, self.primary]), \
+                patch.object(base_repository, 'is_read_replica_connection', side_effect=lambda c: c is self.replica), \
+                patch.object(base_repository, 'release_read_connection') as release, \
+                patch.object(base_repository, 'mark_read_replica_down') as mark_down:
+            rows, _ = reporting_query(self.repo._execute_query)("SELECT 1 AS n")
+        self.assertEqual(rows, [(1,)])
+        mark_down.assert_called_once()
+        release.assert_any_call(self.replica, broken=True)
+
+    def test_writes_stay_on_primary(self):
+        with patch.object(base_repository, 'get_read_connection') as read_conn, \
+                patch.object(base_repository, 'get_connection', return_value=self.primary), \
+                patch.object(base_repository, 'release_connection'):
+            reporting_query(self.repo._execute_query)("UPDATE courses SET name = 'x' RETURNING id")
+        read_conn.assert_not_called()
+
+    def test_replica_pool_closed_after_borrowed_connections_return(self):
+        from src.config import database
+        with patch.object(database.pool, 'SimpleConnectionPool') as pool_cls:
+            old_pool = pool_cls.return_value
+            old_pool.getconn.side_effect = lambda: MagicMock(closed=0)
+            replica = database.ReadReplicaConnection('dbname=replika')
+            borrowed = replica.get_connection()
+            replica.mark_down(RuntimeError('down'))
+            self.assertIsNone(replica.get_connection())
+            old_pool.closeall.assert_not_called()
+            replica.release_connection(borrowed)
+        old_pool.putconn.assert_called_once_with(borrowed, close=True)
+        old_pool.closeall.assert_called_once()
+
+
+class TestSheetReader(unittest.TestCase):
+
+    def test_header_normalization(self):
+        self.assertEqual(normalize_header(' Öğrenci NO '), 'ogrenci no')
+        self.assertEqual(normalize_header('Adı Soyadı'), 'adi soyadi')
+        self.assertEqual(normalize_header(None), '')
+
+    def test_xlsx_rows_stream_as_values(self):
+        import tempfile
+        import openpyxl
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'liste.xlsx')
+            workbook = openpyxl.Workbook()
+            workbook.active.append(['Öğrenci No', 'Adı Soyadı'])
+            workbook.active.append(['220501001', 'ALİ VELİ'])
+            workbook.save(path)
+            self.assertEqual(list(iter_sheet_rows(path)),
+                             [('Öğrenci No', 'Adı Soyadı'), ('220501001', 'ALİ VELİ')])
+
+    def test_csv_delimiter_is_detected_and_bom_skipped(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'kayitlar.csv')
+            with open(path, 'w', encoding='utf-8-sig', newline='') as fh:
+                fh.write('Öğrenci No;Ad Soyad;Ders Kodu\r\n220501001;"Veli; Ali";BLM111\r\n')
+            self.assertEqual(list(iter_sheet_rows(path)),
+                             [('Öğrenci No', 'Ad Soyad', 'Ders Kodu'), ('220501001', 'Veli; Ali', 'BLM111')])
+
+
+class TestSchedulerSnapshot(unittest.TestCase):
+
+    def test_roundtrip_is_memory_mapped(self):
+        import tempfile
+        import numpy as np
+        table_rows = {
+            'course': [(1, 'MAT101', 'Matematik', 3, -1, 2, 90, 1, True, 'ANY', '  ', 'Fen Fakültesi'),
+                       (2, 'FIZ101', 'Fizik', 3, 7, 0, 60, 1, True, 'LAB', 'Dr. Ayşe Kaya', None)],
+            'classroom': [(5, 'M101', -1, 40, False, True, 'STANDART', None),
+                          (6, 'D201', 2, 60, False, True, 'STANDART', 'Mühendislik Fakültesi')],
+            'lecturer': [(7, 3, ['pazartesi', 'Cuma'])],
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            path = write_snapshot(os.path.join(directory, 's.npz'),
+                                  build_arrays(table_rows, [(1, 11), (1, 12)]))
+            snapshot = load_snapshot(path)
+            self.assertIsInstance(snapshot.arrays['enrollment_student_ids'], np.memmap)
+            self.assertEqual(snapshot.students_for_course(1).tolist(), [11, 12])
+            self.assertEqual(len(snapshot.students_for_course(2)), 0)
+            self.assertEqual(snapshot.lecturer_available_days(7), ['Pazartesi', 'Cuma'])
+            course = snapshot.courses()[0]
+            self.assertEqual((course.code, course.lecturer_id, course.exam_duration), ('MAT101', None, 90))
+            self.assertEqual((course.lecturer_name, course.faculty_name), (None, 'Fen Fakültesi'))
+            self.assertEqual(snapshot.courses()[1].lecturer_name, 'Dr. Ayşe Kaya')
+            self.assertEqual([c.faculty_name for c in snapshot.classrooms()],
+                             [None, 'Mühendislik Fakültesi'])
+            del snapshot
+
+    def test_missing_days_use_default_mask(self):
+        self.assertEqual(days_to_mask(None), 0b11111)
+
+
 def run_tests():
     print("=" * 60)
     print("ÜNİVERSİTE SINAV PROGRAMI SİSTEMİ - TEST SUİTİ")
@@ -226,6 +1039,29 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestClassroomCapacity))
     suite.addTests(loader.loadTestsFromTestCase(TestSchedulingLogic))
     suite.addTests(loader.loadTestsFromTestCase(TestDateLogic))
+    suite.addTests(loader.loadTestsFromTestCase(TestBulkCopyEncoding))
+    suite.addTests(loader.loadTestsFromTestCase(TestQueryCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestRowMapper))
+    suite.addTests(loader.loadTestsFromTestCase(TestQueryStats))
+    suite.addTests(loader.loadTestsFromTestCase(TestExamConflictTranslation))
+    suite.addTests(loader.loadTestsFromTestCase(TestBulkExamOperations))
+    suite.addTests(loader.loadTestsFromTestCase(TestScheduleRows))
+    suite.addTests(loader.loadTestsFromTestCase(TestStudentCountRefresh))
+    suite.addTests(loader.loadTestsFromTestCase(TestEnrollmentSync))
+    suite.addTests(loader.loadTestsFromTestCase(TestCapacityUpsert))
+    suite.addTests(loader.loadTestsFromTestCase(TestProximityCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestImportValidation))
+    suite.addTests(loader.loadTestsFromTestCase(TestReportingViews))
+    suite.addTests(loader.loadTestsFromTestCase(TestSchemaProbe))
+    suite.addTests(loader.loadTestsFromTestCase(TestMigrationRunner))
+    suite.addTests(loader.loadTestsFromTestCase(TestKeysetPagination))
+    suite.addTests(loader.loadTestsFromTestCase(TestGlobalSearch))
+    suite.addTests(loader.loadTestsFromTestCase(TestReadRouting))
+    suite.addTests(loader.loadTestsFromTestCase(TestSchedulerSnapshot))
+    suite.addTests(loader.loadTestsFromTestCase(TestSheetReader))
+    suite.addTests(loader.loadTestsFromTestCase(TestExamScope))
+    suite.addTests(loader.loadTestsFromTestCase(TestStagedImport))
+    suite.addTests(loader.loadTestsFromTestCase(TestEnrollmentFeed))
 
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)